@@ -0,0 +1,127 @@
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional
+from kivy.clock import Clock
+from kivy.animation import Animation
+from kivy.uix.widget import Widget
+
+# 每一帧最多启动的动画数量
+DEFAULT_FRAME_BUDGET = 8
+
+# 同时运行的动画数量上限，达到上限后新的动画等到已有动画结束后再启动
+DEFAULT_MAX_ACTIVE = 32
+
+# 一次更新涉及的任务数量超过该值时不再播放动画
+DEFAULT_DEGRADE_THRESHOLD = 200
+
+
+class AnimationScheduler:
+    """
+    AnimationScheduler类统一调度界面中的动画，避免大量动画同时争抢同一帧：
+    - 动画请求先进入等待队列，每一帧最多启动frame_budget个，同时运行的动画不超过max_active个；
+    - 同一部件在启动前被多次请求时只保留最后一次请求（合并），批量更新不会为同一行重复排队；
+    - 一次更新涉及的任务数量超过degrade_threshold时直接放弃动画，部件立即以最终状态显示。
+    动画函数需启动动画并返回Animation对象，调度器据此统计正在运行的动画数量。
+    """
+    def __init__(self, frame_budget: int = DEFAULT_FRAME_BUDGET, max_active: int = DEFAULT_MAX_ACTIVE,
+                 degrade_threshold: int = DEFAULT_DEGRADE_THRESHOLD, clock=Clock):
+        """
+        初始化AnimationScheduler对象。
+
+        参数：
+        - frame_budget (int)：每一帧最多启动的动画数量，默认为DEFAULT_FRAME_BUDGET。
+        - max_active (int)：同时运行的动画数量上限，默认为DEFAULT_MAX_ACTIVE。
+        - degrade_threshold (int)：一次更新涉及的任务数量超过该值时不播放动画，默认为DEFAULT_DEGRADE_THRESHOLD。
+        - clock：提供create_trigger方法的时钟对象，默认为Kivy的Clock。
+
+        抛出异常：
+        - ValueError：如果frame_budget或max_active不是正整数，或degrade_threshold为负数，抛出此异常。
+        """
+        if frame_budget <= 0 or max_active <= 0:
+            raise ValueError("每帧动画预算和同时运行的动画数量上限需为正整数")
+        if degrade_threshold < 0:
+            raise ValueError("动画降级阈值不能为负数")
+        self.frame_budget = frame_budget
+        self.max_active = max_active
+        self.degrade_threshold = degrade_threshold
+        self._pending: "OrderedDict[int, tuple]" = OrderedDict()
+        self._active = 0
+        self._trigger = clock.create_trigger(self._on_frame)
+
+    def schedule(self, widget: Widget, animate: Callable[[Widget], Animation]) -> None:
+        """
+        请求为部件播放动画，动画在预算允许的帧中启动；部件已在等待队列中时以本次请求替换之前的请求。
+
+        参数：
+        - widget (Widget)：要播放动画的部件。
+        - animate (Callable[[Widget], Animation])：启动动画并返回Animation对象的函数。
+        """
+        self._pending.pop(id(widget), None)
+        self._pending[id(widget)] = (widget, animate)
+        self._trigger()
+
+    def schedule_batch(self, widgets: Iterable[Widget], animate: Callable[[Widget], Animation],
+                       item_count: Optional[int] = None) -> bool:
+        """
+        为一次批量更新中的部件请求动画，更新涉及的任务数量超过降级阈值时不播放动画。
+
+        参数：
+        - widgets (Iterable[Widget])：要播放动画的部件。
+        - animate (Callable[[Widget], Animation])：启动动画并返回Animation对象的函数。
+        - item_count (Optional[int])：本次更新涉及的任务数量，默认为部件数量。
+
+        返回：
+        - bool：是否为这些部件安排了动画。
+        """
+        widgets = list(widgets)
+        if (len(widgets) if item_count is None else item_count) > self.degrade_threshold:
+            for widget in widgets:
+                self._pending.pop(id(widget), None)
+            return False
+        for widget in widgets:
+            self.schedule(widget, animate)
+        return True
+
+    def get_active_count(self) -> int:
+        """
+        获取正在运行的动画数量。
+        """
+        return self._active
+
+    def get_pending_count(self) -> int:
+        """
+        获取等待启动的动画数量。
+        """
+        return len(self._pending)
+
+    def cancel_all(self) -> None:
+        """
+        丢弃全部等待启动的动画，已在运行的动画不受影响。
+        """
+        self._pending.clear()
+
+    def _on_frame(self, dt: float) -> None:
+        """
+        私有方法，在一帧中按预算启动等待队列中的动画，队列未清空时在下一帧继续。
+        """
+        started = 0
+        while self._pending and started < self.frame_budget and self._active < self.max_active:
+            _, (widget, animate) = self._pending.popitem(last=False)
+            animation = animate(widget)
+            started += 1
+            if animation is not None:
+                self._active += 1
+                animation.bind(on_complete=self._on_complete)
+        if self._pending:
+            self._trigger()
+
+    def _on_complete(self, animation: Animation, widget: Widget) -> None:
+        """
+        私有方法，动画结束时更新正在运行的动画数量，并继续启动等待中的动画。
+        """
+        self._active -= 1
+        if self._pending:
+            self._trigger()
+
+
+# 整个应用共用的动画调度器
+animation_scheduler = AnimationScheduler()
\ No newline at end of file
@@ -0,0 +1,91 @@
+from typing import Dict, List
+from task_model import Task, TASK_CATEGORIES
+from task_events import TaskListener
+
+
+class CategoryIndex(TaskListener):
+    """
+    CategoryIndex类按类别维护任务列表，各类别内的任务保持与任务列表中相同的先后顺序。
+    作为TaskManager的监听者，任务增删改时只更新受影响的类别；按类别分页查询时只需切取所需的片段，
+    无需每次扫描全部任务。
+    """
+    def __init__(self):
+        """
+        初始化CategoryIndex对象。
+        """
+        self._tasks: List[Task] = []
+        self._by_category: Dict[str, List[Task]] = {category: [] for category in TASK_CATEGORIES}
+
+    def get_count(self, category: str) -> int:
+        """
+        获取指定类别的任务数量。
+
+        参数：
+        - category (str)：任务类别。
+
+        返回：
+        - int：该类别的任务数量，未知类别返回0。
+        """
+        return len(self._by_category.get(category, ()))
+
+    def get_page(self, category: str, start: int, limit: int) -> List[Task]:
+        """
+        获取指定类别中从start开始的至多limit个任务。
+
+        参数：
+        - category (str)：任务类别。
+        - start (int)：起始位置。
+        - limit (int)：最多返回的任务数量。
+
+        返回：
+        - List[Task]：该类别中对应位置的任务列表，超出范围的部分被忽略。
+
+        抛出异常：
+        - ValueError：如果start或limit为负数，抛出此异常。
+        """
+        if start < 0 or limit < 0:
+            raise ValueError("分页的起始位置和数量不能为负数")
+        return self._by_category.get(category, [])[start:start + limit]
+
+    def get_tasks(self, category: str) -> List[Task]:
+        """
+        获取指定类别的全部任务。
+
+        参数：
+        - category (str)：任务类别。
+
+        返回：
+        - List[Task]：该类别全部任务的新列表。
+        """
+        return list(self._by_category.get(category, ()))
+
+    def on_tasks_reset(self, tasks: List[Task]) -> None:
+        self._tasks = tasks
+        self._by_category = {category: [] for category in TASK_CATEGORIES}
+        for task in tasks:
+            self._by_category[task.category].append(task)
+
+    def on_task_added(self, index: int, task: Task) -> None:
+        self._by_category[task.category].insert(self._position(index, task.category), task)
+
+    def on_task_updated(self, index: int, old_task: Task, new_task: Task) -> None:
+        old_tasks = self._by_category[old_task.category]
+        position = old_tasks.index(old_task)
+        if old_task.category == new_task.category:
+            old_tasks[position] = new_task
+        else:
+            del old_tasks[position]
+            self._by_category[new_task.category].insert(self._position(index, new_task.category), new_task)
+
+    def on_task_removed(self, index: int, task: Task) -> None:
+        tasks = self._by_category[task.category]
+        tasks.remove(task)
+
+    def _position(self, index: int, category: str) -> int:
+        """
+        私有方法，计算任务列表中index处的任务在其类别内的位置。索引中恰好包含index之前的全部任务时
+        （在末尾添加，或批量添加时依次通知），任务位于类别末尾，无需扫描。
+        """
+        if index >= sum(len(tasks) for tasks in self._by_category.values()):
+            return len(self._by_category[category])
+        return sum(1 for task in self._tasks[:index] if task.category == category)
@@ -0,0 +1,134 @@
+import atexit
+import json
+import os
+import threading
+from typing import Dict, Optional
+
+# 配置文件路径，用于存储一些应用相关的配置信息，如上次使用的备份路径等
+CONFIG_PATH = "config.json"
+
+# 配置修改后等待该时长（秒）没有新的修改才写入文件，连续的多次修改只写入一次
+CONFIG_SAVE_DELAY = 1.0
+
+
+class ConfigStore:
+    """
+    ConfigStore类是整个应用共用的配置服务：配置文件只在第一次访问时读取一次，之后的读写都在内存中进行。
+    修改配置只会把配置标记为已修改，并在CONFIG_SAVE_DELAY秒内没有新的修改后由后台线程写入文件；
+    写入时先写临时文件再原子替换，写入中断不会留下不完整的配置文件。应用退出时调用flush立即写入尚未保存的修改。
+    """
+    def __init__(self, config_path: str = CONFIG_PATH, save_delay: float = CONFIG_SAVE_DELAY):
+        """
+        初始化ConfigStore对象，此时不读取配置文件。
+
+        参数：
+        - config_path (str)：配置文件路径，默认为CONFIG_PATH。
+        - save_delay (float)：修改后延迟写入的时长（秒），默认为CONFIG_SAVE_DELAY。
+        """
+        self.config_path = config_path
+        self.save_delay = save_delay
+        self._data: Optional[Dict[str, object]] = None
+        self._version = 0
+        self._saved_version = 0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    def load(self) -> None:
+        """
+        读取配置文件，已读取过时不做任何处理。文件不存在或已损坏时以空配置开始。
+        """
+        with self._lock:
+            self._ensure_loaded()
+
+    def get(self, key: str, default: object = None) -> object:
+        """
+        获取配置项的值。
+
+        参数：
+        - key (str)：配置项名称。
+        - default (object)：配置项不存在时返回的默认值，默认为None。
+
+        返回：
+        - object：配置项的值。
+        """
+        with self._lock:
+            return self._ensure_loaded().get(key, default)
+
+    def set(self, key: str, value: object) -> None:
+        """
+        设置配置项的值，值发生变化时安排延迟写入。
+
+        参数：
+        - key (str)：配置项名称。
+        - value (object)：配置项的值，需可被序列化为JSON。
+        """
+        with self._lock:
+            data = self._ensure_loaded()
+            if key in data and data[key] == value:
+                return
+            data[key] = value
+            self._version += 1
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.save_delay, self._save)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def is_dirty(self) -> bool:
+        """
+        判断是否存在尚未写入文件的修改。
+        """
+        with self._lock:
+            return self._version != self._saved_version
+
+    def flush(self) -> None:
+        """
+        取消延迟写入并立即写入尚未保存的修改，没有修改时不做任何处理。
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        self._save()
+
+    def _ensure_loaded(self) -> Dict[str, object]:
+        """
+        私有方法，在持有锁的情况下确保配置已读取，返回内存中的配置字典。
+        """
+        if self._data is None:
+            self._data = {}
+            if os.path.exists(self.config_path):
+                try:
+                    with open(self.config_path, 'r', encoding='utf-8') as file:
+                        self._data = json.load(file)
+                except (IOError, json.JSONDecodeError) as e:
+                    print(f"加载配置文件 {self.config_path} 时出错: {str(e)}")
+        return self._data
+
+    def _save(self) -> None:
+        """
+        私有方法，将当前配置的快照以写入临时文件后原子替换的方式写入配置文件。
+        写入期间发生的新修改会保持已修改状态，由之后的写入保存。
+        """
+        with self._write_lock:
+            with self._lock:
+                if self._version == self._saved_version:
+                    return
+                version = self._version
+                snapshot = json.dumps(self._data, ensure_ascii=False)
+            temp_path = self.config_path + ".tmp"
+            try:
+                with open(temp_path, 'w', encoding='utf-8') as file:
+                    file.write(snapshot)
+                os.replace(temp_path, self.config_path)
+            except IOError as e:
+                print(f"保存配置文件 {self.config_path} 时出错: {str(e)}")
+                return
+            with self._lock:
+                self._saved_version = version
+
+
+# 整个应用共用的配置服务，进程退出时写入尚未保存的修改
+config_store = ConfigStore()
+atexit.register(config_store.flush)
\ No newline at end of file
@@ -0,0 +1,93 @@
+from kivy.clock import Clock
+from kivy.core.window import Window
+from kivy.graphics import Color, Rectangle
+from kivy.uix.label import Label
+from instrumentation import Instrumentation, instrumentation
+
+# 调试浮层的刷新间隔（秒）
+OVERLAY_REFRESH_INTERVAL = 1.0
+
+# 调试浮层最多显示的慢操作条数
+OVERLAY_MAX_ROWS = 10
+
+# 切换调试浮层显示的按键（F12）
+OVERLAY_TOGGLE_KEY = 293
+
+
+class DebugOverlay(Label):
+    """
+    DebugOverlay类是覆盖在窗口右上角的半透明调试浮层，显示埋点记录的最近若干条慢操作，
+    只在显示期间按OVERLAY_REFRESH_INTERVAL定时刷新，隐藏时不产生任何开销。
+    """
+    def __init__(self, source: Instrumentation = instrumentation, **kwargs):
+        """
+        初始化DebugOverlay对象，初始时不显示。
+
+        参数：
+        - source (Instrumentation)：提供慢操作记录的埋点对象，默认为整个应用共用的instrumentation。
+        - kwargs：其他关键字参数。
+        """
+        super().__init__(size_hint=(None, None), size=(420, 24 * OVERLAY_MAX_ROWS + 30), halign='left', valign='top',
+                         font_size=13, padding=(8, 8), **kwargs)
+        self.source = source
+        self.text_size = self.size
+        self._refresh_event = None
+        with self.canvas.before:
+            Color(0, 0, 0, 0.7)
+            self._background = Rectangle(pos=self.pos, size=self.size)
+        self.bind(pos=self._update_background, size=self._update_background)
+
+    def toggle(self) -> None:
+        """
+        显示或隐藏调试浮层。
+        """
+        if self.parent is None:
+            self.show()
+        else:
+            self.hide()
+
+    def show(self) -> None:
+        """
+        将调试浮层添加到窗口右上角并开始定时刷新。
+        """
+        if self.parent is not None:
+            return
+        self.pos = (Window.width - self.width, Window.height - self.height)
+        Window.add_widget(self)
+        self.refresh()
+        self._refresh_event = Clock.schedule_interval(lambda dt: self.refresh(), OVERLAY_REFRESH_INTERVAL)
+
+    def hide(self) -> None:
+        """
+        从窗口移除调试浮层并停止定时刷新。
+        """
+        if self._refresh_event is not None:
+            self._refresh_event.cancel()
+            self._refresh_event = None
+        if self.parent is not None:
+            Window.remove_widget(self)
+
+    def refresh(self) -> None:
+        """
+        刷新显示的慢操作列表。
+        """
+        self.text = "慢操作\n" + self.source.format_slow_operations(OVERLAY_MAX_ROWS)
+
+    def on_key_down(self, window, key: int, *args) -> bool:
+        """
+        窗口按键回调，按下OVERLAY_TOGGLE_KEY时切换调试浮层的显示。
+
+        返回：
+        - bool：按键被处理时返回True。
+        """
+        if key == OVERLAY_TOGGLE_KEY:
+            self.toggle()
+            return True
+        return False
+
+    def _update_background(self, instance, value) -> None:
+        """
+        私有方法，部件位置或尺寸变化时同步背景矩形。
+        """
+        self._background.pos = self.pos
+        self._background.size = self.size
\ No newline at end of file
@@ -0,0 +1,337 @@
+"""
+任务描述的行外存储：较长的描述不写在任务文件中，而是追加到任务文件旁的描述文件，由任务文件的description_ref列记录其位置。
+加载任务时只为这些描述创建很小的DescriptionRef引用，读取Task.description时才从描述文件中读取，读取结果保存在有上限的LRU缓存中，
+因此加载耗时和内存占用只与名称、进度、类别等元数据的大小相关。
+
+描述文件只追加、不改写：已保存的描述在之后的保存中直接沿用原来的位置，描述文件的内容在任务文件替换之前写入（并按fsync策略刷盘），
+任务文件引用的内容因此总是完整的。不再被引用的内容超过一定比例时，下一次保存把仍在使用的描述复制到新一代描述文件（.desc.<代数>），
+任务文件替换完成后才将引用改为指向新的位置；旧的描述文件在连续两次保存都不再引用后删除。
+同一描述文件可能被多个进程（如图形界面和命令行工具）同时追加，追加时持有文件锁，并以文件的实际大小作为偏移。
+"""
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows没有fcntl，追加时不加文件锁
+    fcntl = None
+
+# 超过该长度（字符数）的描述存放在描述文件中，较短的描述仍直接写在任务文件里
+DESCRIPTION_INLINE_LIMIT = 64
+
+# 描述缓存中最多保留的字符总数
+DESCRIPTION_CACHE_CHARS = 1024 * 1024
+
+# 描述文件中不再被引用的字节数超过COMPACT_MIN_BYTES且超过总大小的该比例时，下一次保存改写到新一代描述文件
+COMPACT_DEAD_RATIO = 0.5
+COMPACT_MIN_BYTES = 1024 * 1024
+
+
+class DescriptionRef:
+    """
+    DescriptionRef类记录一条描述在描述文件中的位置（代数、偏移、字节数和CRC32），由DescriptionStore创建。
+    描述被复制到新一代描述文件时，DescriptionStore在任务文件替换完成后原地更新引用中的位置，持有该引用的任务对象无需改变。
+    """
+    __slots__ = ("store", "generation", "offset", "length", "crc32")
+
+    def __init__(self, store: 'DescriptionStore', generation: int, offset: int, length: int, crc32: int):
+        """
+        初始化DescriptionRef对象。
+
+        参数：
+        - store (DescriptionStore)：描述所在的描述存储。
+        - generation (int)：描述文件的代数。
+        - offset (int)：描述在描述文件中的字节偏移。
+        - length (int)：描述的UTF-8字节数。
+        - crc32 (int)：描述的CRC32校验值。
+        """
+        self.store = store
+        self.generation = generation
+        self.offset = offset
+        self.length = length
+        self.crc32 = crc32
+
+    def load(self) -> str:
+        """
+        读取描述，优先从描述存储的缓存中获取。
+
+        返回：
+        - str：描述文本，描述文件缺失或已损坏时为空字符串。
+        """
+        return self.store.load(self)
+
+    def __str__(self) -> str:
+        return f"{self.generation}:{self.offset}:{self.length}:{self.crc32:08x}"
+
+
+class DescriptionStore:
+    """
+    DescriptionStore类管理一个任务文件的描述文件：解析和生成description_ref列中的引用，带LRU缓存地按需读取描述，
+    在保存任务时追加新的长描述并在需要时压缩到新一代描述文件。读取可以在其他线程（如边输入边搜索的查询线程）中进行。
+    """
+    def __init__(self, csv_file_path: str, cache_chars: int = DESCRIPTION_CACHE_CHARS):
+        """
+        初始化DescriptionStore对象，不会创建任何文件。
+
+        参数：
+        - csv_file_path (str)：任务文件路径，描述文件位于其旁边。
+        - cache_chars (int)：描述缓存中最多保留的字符总数，默认为DESCRIPTION_CACHE_CHARS。
+        """
+        self.csv_file_path = csv_file_path
+        self.cache_chars = cache_chars
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[Tuple[int, int], str]" = OrderedDict()
+        self._cached_chars = 0
+        self._readers: Dict[int, object] = {}
+        self._writer = None
+        self._writer_created = False
+        existing = self._generations()
+        self._generation = max(existing, default=1)
+        self._previous: Set[int] = set(existing)
+        self._referenced: Set[int] = set()
+        self._live_bytes = 0
+        self._compacting = False
+        self._relocated: Dict[int, Tuple[DescriptionRef, int, int]] = {}
+
+    def path(self, generation: int) -> str:
+        """
+        获取指定代数的描述文件路径。
+
+        参数：
+        - generation (int)：描述文件的代数。
+
+        返回：
+        - str：描述文件路径。
+        """
+        return f"{self.csv_file_path}.desc.{generation}"
+
+    def parse_ref(self, text: str) -> DescriptionRef:
+        """
+        解析description_ref列中的引用。
+
+        参数：
+        - text (str)：形如"代数:偏移:字节数:校验值"的引用文本。
+
+        返回：
+        - DescriptionRef：描述引用。
+
+        抛出异常：
+        - ValueError：如果引用格式不正确，抛出此异常。
+        """
+        try:
+            generation, offset, length, crc32 = text.split(":")
+            return DescriptionRef(self, int(generation), int(offset), int(length), int(crc32, 16))
+        except ValueError:
+            raise ValueError(f"描述引用格式不正确: {text}")
+
+    def load(self, ref: DescriptionRef) -> str:
+        """
+        读取引用指向的描述：命中缓存时直接返回，否则从描述文件读取并放入缓存，缓存超过上限时淘汰最久未使用的描述。
+        描述文件缺失或内容与校验值不符（如不刷盘时断电）时输出警告并返回空字符串。
+
+        参数：
+        - ref (DescriptionRef)：描述引用。
+
+        返回：
+        - str：描述文本。
+        """
+        with self._lock:
+            key = (ref.generation, ref.offset)
+            text = self._cache.get(key)
+            if text is not None:
+                self._cache.move_to_end(key)
+                return text
+            text = self._read(ref)
+            if text and len(text) <= self.cache_chars:
+                self._cache[key] = text
+                self._cached_chars += len(text)
+                while self._cached_chars > self.cache_chars:
+                    _, evicted = self._cache.popitem(last=False)
+                    self._cached_chars -= len(evicted)
+            return text
+
+    def begin_save(self) -> None:
+        """
+        开始一次保存，需要压缩时切换到新一代描述文件。由TaskPersistence在写入任务文件之前调用。
+        """
+        self._referenced = set()
+        self._live_bytes = 0
+        self._relocated = {}
+        if self._compacting:
+            with self._lock:
+                self._close_writer()
+                self._generation = max(self._generations() + [self._generation]) + 1
+
+    def store(self, description: Union[str, DescriptionRef]) -> Tuple[str, str]:
+        """
+        为一个任务的描述生成任务文件中description列和description_ref列的值：短描述直接写在任务文件中；
+        本存储中已保存的描述沿用原来的位置（压缩时复制到新一代描述文件，引用在commit时才更新，保存失败时仍指向原位置）；
+        其余长描述追加到当前描述文件。
+
+        参数：
+        - description (Union[str, DescriptionRef])：任务描述的存储形式（见Task.stored_description）。
+
+        返回：
+        - Tuple[str, str]：description列和description_ref列的值。
+
+        抛出异常：
+        - IOError：如果写入描述文件时出现IO错误，抛出此异常。
+        """
+        if isinstance(description, DescriptionRef) and description.store is self:
+            with self._lock:
+                ref = description
+                if self._compacting and description.generation != self._generation:
+                    relocated = self._relocated.get(id(description))
+                    if relocated is None:
+                        data = self._read_bytes(description)
+                        if data is not None:
+                            relocated = self._relocated[id(description)] = (description, self._generation, self._append(data))
+                    if relocated is not None:
+                        ref = DescriptionRef(self, relocated[1], relocated[2], description.length, description.crc32)
+                self._referenced.add(ref.generation)
+                self._live_bytes += ref.length
+            return "", str(ref)
+        text = description if isinstance(description, str) else description.load()
+        if len(text) <= DESCRIPTION_INLINE_LIMIT:
+            return text, ""
+        data = text.encode('utf-8')
+        with self._lock:
+            offset = self._append(data)
+            self._referenced.add(self._generation)
+            self._live_bytes += len(data)
+        return "", str(DescriptionRef(self, self._generation, offset, len(data), zlib.crc32(data)))
+
+    def end_save(self, sync: bool) -> bool:
+        """
+        写完任务文件的临时文件后调用：将本次追加的描述写入操作系统，sync为True时刷盘。
+
+        参数：
+        - sync (bool)：是否刷盘。
+
+        返回：
+        - bool：本次保存是否创建了新的描述文件（需要刷盘时调用者应同步其所在目录）。
+        """
+        with self._lock:
+            if self._writer is None:
+                return False
+            self._writer.flush()
+            if sync:
+                os.fsync(self._writer.fileno())
+            return self._writer_created
+
+    def commit(self) -> None:
+        """
+        任务文件替换完成后调用：将压缩时复制到新一代描述文件的引用改为指向新的位置，
+        删除连续两次保存都不再引用的旧描述文件，并判断下一次保存是否需要压缩。
+        """
+        keep = self._referenced | self._previous | {self._generation}
+        with self._lock:
+            for ref, generation, offset in self._relocated.values():
+                ref.generation, ref.offset = generation, offset
+            self._relocated = {}
+            for generation in self._generations():
+                if generation not in keep:
+                    reader = self._readers.pop(generation, None)
+                    if reader is not None:
+                        reader.close()
+                    try:
+                        os.remove(self.path(generation))
+                    except OSError as e:
+                        print(f"删除旧的描述文件 {self.path(generation)} 时出错: {str(e)}")
+            self._writer_created = False
+        self._previous = self._referenced
+        total = sum(os.path.getsize(self.path(generation)) for generation in self._referenced
+                    if os.path.exists(self.path(generation)))
+        dead = total - self._live_bytes
+        self._compacting = dead > COMPACT_MIN_BYTES and dead > total * COMPACT_DEAD_RATIO
+
+    def sync(self) -> None:
+        """
+        将当前描述文件中尚未刷盘的内容写入磁盘。
+        """
+        with self._lock:
+            if self._writer is not None:
+                self._writer.flush()
+                os.fsync(self._writer.fileno())
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        获取描述存储的统计数据。
+
+        返回：
+        - Dict[str, int]：当前代数、缓存中的描述数量和字符数，以及描述文件的总字节数。
+        """
+        with self._lock:
+            return {"generation": self._generation, "cached": len(self._cache), "cached_chars": self._cached_chars,
+                    "file_bytes": sum(os.path.getsize(self.path(generation)) for generation in self._generations())}
+
+    def _generations(self) -> List[int]:
+        """
+        私有方法，列出磁盘上已有的描述文件的代数。
+        """
+        directory = os.path.dirname(os.path.abspath(self.csv_file_path))
+        prefix = os.path.basename(self.csv_file_path) + ".desc."
+        if not os.path.isdir(directory):
+            return []
+        return sorted(int(name[len(prefix):]) for name in os.listdir(directory)
+                      if name.startswith(prefix) and name[len(prefix):].isdigit())
+
+    def _append(self, data: bytes) -> int:
+        """
+        私有方法，将描述追加到当前描述文件，返回其偏移；调用者需持有锁。
+        追加期间持有文件锁，偏移取文件的实际大小（其他进程可能也在追加，写入句柄的tell()不反映其写入），
+        写入后立即交给操作系统，使其他进程随后取得的文件大小包含本次写入。
+        """
+        if self._writer is None:
+            path = self.path(self._generation)
+            self._writer_created = not os.path.exists(path)
+            self._writer = open(path, 'ab')
+        if fcntl is not None:
+            fcntl.flock(self._writer.fileno(), fcntl.LOCK_EX)
+        try:
+            offset = os.fstat(self._writer.fileno()).st_size
+            self._writer.write(data)
+            self._writer.flush()
+        finally:
+            if fcntl is not None:
+                fcntl.flock(self._writer.fileno(), fcntl.LOCK_UN)
+        return offset
+
+    def _close_writer(self) -> None:
+        """
+        私有方法，关闭当前描述文件的写入句柄；调用者需持有锁。
+        """
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def _read_bytes(self, ref: DescriptionRef) -> Optional[bytes]:
+        """
+        私有方法，从描述文件读取引用指向的字节，文件缺失或校验不符时输出警告并返回None；调用者需持有锁。
+        """
+        path = self.path(ref.generation)
+        try:
+            if ref.generation == self._generation and self._writer is not None:
+                self._writer.flush()
+            reader = self._readers.get(ref.generation)
+            if reader is None:
+                reader = self._readers[ref.generation] = open(path, 'rb')
+            reader.seek(ref.offset)
+            data = reader.read(ref.length)
+        except IOError as e:
+            print(f"读取描述文件 {path} 时出错，任务描述显示为空: {str(e)}")
+            return None
+        if len(data) != ref.length or zlib.crc32(data) != ref.crc32:
+            print(f"描述文件 {path} 中偏移 {ref.offset} 处的任务描述已损坏，任务描述显示为空")
+            return None
+        return data
+
+    def _read(self, ref: DescriptionRef) -> str:
+        """
+        私有方法，读取引用指向的描述文本，无法读取时为空字符串；调用者需持有锁。
+        """
+        data = self._read_bytes(ref)
+        return data.decode('utf-8') if data is not None else ""
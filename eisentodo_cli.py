@@ -0,0 +1,458 @@
+"""
+EisenTodo 命令行工具：不启动图形界面、不导入Kivy，直接在任务文件上执行导入、导出、查询、统计、批量修改和整理操作，
+便于脚本和定时任务批量处理。所有子命令都以流式方式逐条读写任务，内存占用与任务数量无关；
+修改任务文件的子命令先写入临时文件再原子替换，中途出错时任务文件保持不变。
+输入和输出默认为标准输入和标准输出，格式可选CSV（与任务文件相同的列）或JSON Lines（每行一个Task.to_dict()对象）。
+
+用法示例：
+    python -m eisentodo_cli --store tasks.csv export --format jsonl > tasks.jsonl
+    python -m eisentodo_cli --store tasks.csv import --format jsonl < tasks.jsonl
+    python -m eisentodo_cli query --category 紧急重要 --max-progress 99 --limit 20
+    python -m eisentodo_cli stats
+    python -m eisentodo_cli bulk-update --keyword 周报 --set-progress 100
+    python -m eisentodo_cli compact --archive-completed
+    python -m eisentodo_cli history restore --at "2025-06-01 09:00"
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+from datetime import datetime
+from itertools import chain, islice
+from typing import Callable, Iterable, Iterator, List, Optional
+from task_model import Task, TASK_CATEGORIES, parse_due_date
+from task_persistence import TaskPersistence, CSV_FIELDS, read_csv_tasks, write_csv_tasks
+from task_statistics import TaskStatistics
+from task_history import TaskHistory
+
+# 支持的输入输出格式
+FORMATS = ("csv", "jsonl")
+
+# 默认的任务文件路径，与图形界面使用的任务文件一致
+DEFAULT_STORE = "tasks.csv"
+
+# 整理任务文件时每累积这么多个已完成任务就写入一次归档
+ARCHIVE_BATCH_SIZE = 1000
+
+# 整理任务文件时暂存待归档任务的文件后缀（加在任务文件路径之后），任务文件重写成功后才从中写入归档
+ARCHIVE_PENDING_SUFFIX = ".archive-pending.csv"
+
+
+def read_tasks(stream, fmt: str) -> Iterator[Task]:
+    """
+    从文本流中逐条读取任务。
+
+    参数：
+    - stream：以文本读取模式打开的文件对象或标准输入。
+    - fmt (str)：输入格式，"csv"或"jsonl"。
+
+    返回：
+    - Iterator[Task]：依次产生任务对象的迭代器。
+
+    抛出异常：
+    - csv.Error：如果CSV输入不符合CSV规范，抛出此异常。
+    - ValueError：如果某条记录不是合法的JSON或不符合Task类的属性合法性要求，抛出此异常并指出所在行号。
+    """
+    if fmt == "csv":
+        yield from read_csv_tasks(stream)
+        return
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            yield Task.from_dict(json.loads(line))
+        except (ValueError, TypeError, AttributeError) as e:
+            raise ValueError(f"第 {line_number} 行的任务数据不合法: {str(e)}")
+
+
+def write_tasks(stream, tasks: Iterable[Task], fmt: str) -> int:
+    """
+    将任务逐条写入文本流。
+
+    参数：
+    - stream：以文本写入模式打开的文件对象或标准输出。
+    - tasks (Iterable[Task])：要写入的任务对象，可以是迭代器。
+    - fmt (str)：输出格式，"csv"或"jsonl"。
+
+    返回：
+    - int：写入的任务数量。
+    """
+    if fmt == "csv":
+        return write_csv_tasks(stream, tasks)
+    count = 0
+    for task in tasks:
+        stream.write(json.dumps(task.to_dict(), ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+def build_filter(args: argparse.Namespace) -> Callable[[Task], bool]:
+    """
+    根据命令行筛选参数构造任务筛选条件，各条件之间为"且"的关系，未指定任何条件时匹配全部任务。
+
+    参数：
+    - args (argparse.Namespace)：包含keyword、category、min_progress、max_progress、due_before、overdue的命令行参数。
+
+    返回：
+    - Callable[[Task], bool]：任务满足全部条件时返回True的函数。
+    """
+    due_before = parse_due_date(args.due_before) if args.due_before else None
+    now = datetime.now()
+
+    def matches(task: Task) -> bool:
+        if args.keyword and args.keyword not in task.name and args.keyword not in task.description:
+            return False
+        if args.category and task.category != args.category:
+            return False
+        if not args.min_progress <= task.progress <= args.max_progress:
+            return False
+        if due_before is not None and (task.due_date is None or task.due_date >= due_before):
+            return False
+        if args.overdue and (task.due_date is None or task.due_date >= now or task.progress == 100):
+            return False
+        return True
+    return matches
+
+
+def _open_store(path: str, create: bool = False) -> TaskPersistence:
+    """
+    私有函数，打开任务文件，create为True时在文件不存在时创建空文件。
+    """
+    if create and not os.path.exists(path):
+        open(path, 'w').close()
+    return TaskPersistence(path)
+
+
+def _report(message: str) -> None:
+    """
+    私有函数，将操作结果输出到标准错误，标准输出只用于任务数据。
+    """
+    print(message, file=sys.stderr)
+
+
+def cmd_import(args: argparse.Namespace, stdin, stdout) -> int:
+    """
+    将输入中的任务追加到任务文件末尾（--replace时替换全部任务）。
+    """
+    store = _open_store(args.store, create=True)
+    imported = 0
+
+    def incoming_tasks() -> Iterator[Task]:
+        nonlocal imported
+        for task in read_tasks(stdin, args.format):
+            imported += 1
+            yield task.replace(task_id=None) if args.new_ids else task
+    existing = () if args.replace else store.iter_tasks()
+    total = store.rewrite_tasks(chain(existing, incoming_tasks()))
+    _report(f"已导入 {imported} 个任务，任务文件共 {total} 个任务")
+    return 0
+
+
+def cmd_export(args: argparse.Namespace, stdin, stdout) -> int:
+    """
+    将任务文件中的全部任务写到输出。
+    """
+    write_tasks(stdout, _open_store(args.store).iter_tasks(), args.format)
+    return 0
+
+
+def cmd_query(args: argparse.Namespace, stdin, stdout) -> int:
+    """
+    将满足筛选条件的任务写到输出，--count时只输出匹配数量。
+    """
+    matches = filter(build_filter(args), _open_store(args.store).iter_tasks())
+    if args.limit is not None:
+        matches = islice(matches, args.limit)
+    if args.count:
+        print(sum(1 for _ in matches), file=stdout)
+    else:
+        write_tasks(stdout, matches, args.format)
+    return 0
+
+
+def cmd_stats(args: argparse.Namespace, stdin, stdout) -> int:
+    """
+    以JSON格式输出各类别的任务数量、完成数量、平均进度、完成率以及逾期任务数量。
+    """
+    statistics = TaskStatistics()
+    now = datetime.now()
+    overdue = 0
+    for task in _open_store(args.store).iter_tasks():
+        statistics.on_task_added(0, task)
+        if task.due_date is not None and task.due_date < now and task.progress < 100:
+            overdue += 1
+    summary = statistics.to_dict()
+    summary["全部"]["overdue"] = overdue
+    json.dump(summary, stdout, ensure_ascii=False, indent=2)
+    stdout.write("\n")
+    return 0
+
+
+def cmd_bulk_update(args: argparse.Namespace, stdin, stdout) -> int:
+    """
+    修改满足筛选条件的全部任务的进度、类别或截止时间，任务保留原有的唯一标识。
+    """
+    changes = {}
+    if args.set_progress is not None:
+        changes["progress"] = args.set_progress
+    if args.set_category is not None:
+        changes["category"] = args.set_category
+    if args.set_due_date is not None:
+        changes["due_date"] = parse_due_date(args.set_due_date) if args.set_due_date else None
+    matches = build_filter(args)
+    store = _open_store(args.store)
+    updated = 0
+
+    def updated_tasks() -> Iterator[Task]:
+        nonlocal updated
+        for task in store.iter_tasks():
+            if matches(task):
+                updated += 1
+                task = task.replace(**changes)
+            yield task
+    total = store.rewrite_tasks(updated_tasks())
+    _report(f"已更新 {updated} 个任务，任务文件共 {total} 个任务")
+    return 0
+
+
+def _archive_pending(archive, pending_path: str) -> int:
+    """
+    私有函数，将暂存文件中的待归档任务分批写入归档，完成后删除暂存文件；暂存文件不存在时不做任何处理。
+
+    返回：
+    - int：写入归档的任务数量。
+    """
+    if not os.path.exists(pending_path):
+        return 0
+    archived = 0
+    with open(pending_path, 'r', newline='', encoding='utf-8') as file:
+        tasks = iter(read_csv_tasks(file))
+        for batch in iter(lambda: list(islice(tasks, ARCHIVE_BATCH_SIZE)), []):
+            archived += len(archive.append(batch))
+    os.remove(pending_path)
+    return archived
+
+
+def cmd_compact(args: argparse.Namespace, stdin, stdout) -> int:
+    """
+    整理任务文件：以当前的列格式重写任务文件，去除唯一标识重复的任务（保留第一个），
+    --archive-completed时将已完成任务移入归档文件，并压缩整理归档文件。
+    已完成任务在重写时先暂存到任务文件旁的暂存文件（刷入磁盘），任务文件重写成功后才分批写入归档：
+    重写失败时任务仍在原文件中，归档保持不变；写入归档前中断时，下次整理会先归档上次留下的暂存文件。
+    """
+    store = _open_store(args.store)
+    archive = None
+    pending_path = args.store + ARCHIVE_PENDING_SUFFIX
+    archived = 0
+    if args.archive_completed:
+        from task_archive import TaskArchive
+        archive = TaskArchive(args.archive or os.path.splitext(args.store)[0] + "_archive.jsonl.gz")
+        archived += _archive_pending(archive, pending_path)
+    seen = set()
+    duplicates = 0
+
+    def compacted_tasks(pending_file) -> Iterator[Task]:
+        nonlocal duplicates
+        pending_writer = csv.writer(pending_file) if pending_file is not None else None
+        if pending_writer is not None:
+            pending_writer.writerow(CSV_FIELDS)
+        for task in store.iter_tasks():
+            if task.task_id in seen:
+                duplicates += 1
+                continue
+            seen.add(task.task_id)
+            if pending_writer is not None and task.progress == 100:
+                task_dict = task.to_dict()
+                pending_writer.writerow([task_dict[field] for field in CSV_FIELDS])
+                continue
+            yield task
+        if pending_file is not None:
+            pending_file.flush()
+            os.fsync(pending_file.fileno())
+
+    if archive is None:
+        total = store.rewrite_tasks(compacted_tasks(None))
+    else:
+        try:
+            with open(pending_path, 'w', newline='', encoding='utf-8') as pending_file:
+                total = store.rewrite_tasks(compacted_tasks(pending_file))
+        except BaseException:
+            if os.path.exists(pending_path):
+                os.remove(pending_path)
+            raise
+        archived += _archive_pending(archive, pending_path)
+    removed = archive.compact() if archive is not None else 0
+    _report(f"任务文件共 {total} 个任务，去除重复任务 {duplicates} 个，归档已完成任务 {archived} 个，"
+            f"从归档文件中清理已恢复记录 {removed} 条")
+    return 0
+
+
+def cmd_history(args: argparse.Namespace, stdin, stdout) -> int:
+    """
+    管理任务文件的版本历史：记录快照、列出版本、比较两个版本、恢复到某个版本或时间点以及清理旧版本。
+    恢复前会先为当前任务记录一个快照，恢复操作本身也可以撤销。
+    """
+    history = TaskHistory.for_store(args.store)
+    action = args.history_command
+    if action == "snapshot":
+        version = history.snapshot(_open_store(args.store).iter_tasks(), args.label)
+        _report(f"已记录版本 {version}" if version is not None else "任务与最新版本相同，未记录新版本")
+    elif action == "list":
+        for record in history.list_versions():
+            stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+        statistics = history.get_statistics()
+        _report(f"共 {statistics['versions']} 个版本，{statistics['objects']} 个块，占用 {statistics['bytes']} 字节")
+    elif action == "diff":
+        changes = history.diff(args.old, args.new)
+        for kind in ("added", "removed"):
+            for task in changes[kind]:
+                stdout.write(json.dumps({"change": kind, "task": task.to_dict()}, ensure_ascii=False) + "\n")
+        for old_task, new_task in changes["changed"]:
+            stdout.write(json.dumps({"change": "changed", "old": old_task.to_dict(), "task": new_task.to_dict()},
+                                    ensure_ascii=False) + "\n")
+        _report(f"新增 {len(changes['added'])} 个任务，删除 {len(changes['removed'])} 个任务，"
+                f"修改 {len(changes['changed'])} 个任务")
+    elif action == "restore":
+        if args.version is None and not args.at:
+            raise ValueError("history restore 需要指定 --version 或 --at")
+        version = args.version if args.version is not None else history.find_version(parse_due_date(args.at))
+        store = _open_store(args.store)
+        tasks = history.load_version(version)
+        backup = history.snapshot(store.iter_tasks(), f"恢复到版本 {version} 之前")
+        total = store.rewrite_tasks(tasks)
+        _report(f"已恢复到版本 {version}，共 {total} 个任务；恢复前的任务记录为版本 {backup}")
+    else:
+        before = parse_due_date(args.before) if args.before else None
+        result = history.gc(args.keep, before)
+        _report(f"删除版本 {result['versions']} 个，清理块 {result['objects']} 个，释放 {result['bytes']} 字节")
+    return 0
+
+
+def _add_filter_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    私有函数，为子命令添加任务筛选参数。
+    """
+    parser.add_argument("--keyword", default="", help="名称或描述中包含的关键字")
+    parser.add_argument("--category", choices=TASK_CATEGORIES, help="任务类别")
+    parser.add_argument("--min-progress", type=int, default=0, help="最小进度（含）")
+    parser.add_argument("--max-progress", type=int, default=100, help="最大进度（含）")
+    parser.add_argument("--due-before", help="截止时间早于该时间，格式为 YYYY-MM-DD HH:MM")
+    parser.add_argument("--overdue", action="store_true", help="只选择已逾期且未完成的任务")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    构造命令行参数解析器。
+    """
+    parser = argparse.ArgumentParser(prog="eisentodo_cli", description="EisenTodo 命令行工具（无需图形界面）")
+    parser.add_argument("--store", default=DEFAULT_STORE, help="任务文件路径，默认为 tasks.csv")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import", help="从标准输入导入任务")
+    import_parser.add_argument("--format", choices=FORMATS, default="csv")
+    import_parser.add_argument("--input", default="-", help="输入文件，默认为标准输入")
+    import_parser.add_argument("--replace", action="store_true", help="替换任务文件中的全部任务，而不是追加")
+    import_parser.add_argument("--new-ids", action="store_true", help="为导入的任务生成新的唯一标识")
+    import_parser.set_defaults(handler=cmd_import)
+
+    export_parser = subparsers.add_parser("export", help="将全部任务输出到标准输出")
+    export_parser.add_argument("--format", choices=FORMATS, default="csv")
+    export_parser.add_argument("--output", default="-", help="输出文件，默认为标准输出")
+    export_parser.set_defaults(handler=cmd_export)
+
+    query_parser = subparsers.add_parser("query", help="输出满足筛选条件的任务")
+    _add_filter_arguments(query_parser)
+    query_parser.add_argument("--limit", type=int, help="最多输出的任务数量")
+    query_parser.add_argument("--count", action="store_true", help="只输出匹配的任务数量")
+    query_parser.add_argument("--format", choices=FORMATS, default="csv")
+    query_parser.add_argument("--output", default="-", help="输出文件，默认为标准输出")
+    query_parser.set_defaults(handler=cmd_query)
+
+    stats_parser = subparsers.add_parser("stats", help="以JSON格式输出任务统计数据")
+    stats_parser.add_argument("--output", default="-", help="输出文件，默认为标准输出")
+    stats_parser.set_defaults(handler=cmd_stats)
+
+    update_parser = subparsers.add_parser("bulk-update", help="批量修改满足筛选条件的任务")
+    _add_filter_arguments(update_parser)
+    update_parser.add_argument("--set-progress", type=int, help="新的进度")
+    update_parser.add_argument("--set-category", choices=TASK_CATEGORIES, help="新的类别")
+    update_parser.add_argument("--set-due-date", help="新的截止时间，格式为 YYYY-MM-DD HH:MM，空字符串表示清除")
+    update_parser.set_defaults(handler=cmd_bulk_update)
+
+    compact_parser = subparsers.add_parser("compact", help="整理任务文件并去除重复任务")
+    compact_parser.add_argument("--archive-completed", action="store_true", help="将已完成任务移入归档文件")
+    compact_parser.add_argument("--archive", help="归档文件路径，默认在任务文件旁")
+    compact_parser.set_defaults(handler=cmd_compact)
+
+    history_parser = subparsers.add_parser("history", help="管理任务文件的版本历史")
+    history_parser.set_defaults(handler=cmd_history)
+    history_subparsers = history_parser.add_subparsers(dest="history_command", required=True)
+    snapshot_parser = history_subparsers.add_parser("snapshot", help="为当前任务记录一个版本")
+    snapshot_parser.add_argument("--label", default="", help="版本标签")
+    list_parser = history_subparsers.add_parser("list", help="以JSON Lines格式输出全部版本")
+    list_parser.add_argument("--output", default="-", help="输出文件，默认为标准输出")
+    diff_parser = history_subparsers.add_parser("diff", help="以JSON Lines格式输出两个版本之间变化的任务")
+    diff_parser.add_argument("old", type=int, help="旧版本编号")
+    diff_parser.add_argument("new", type=int, help="新版本编号")
+    diff_parser.add_argument("--output", default="-", help="输出文件，默认为标准输出")
+    restore_parser = history_subparsers.add_parser("restore", help="将任务文件恢复到某个版本或时间点")
+    restore_parser.add_argument("--version", type=int, help="版本编号")
+    restore_parser.add_argument("--at", help="时间点，格式为 YYYY-MM-DD HH:MM，恢复到该时间点之前的最新版本")
+    gc_parser = history_subparsers.add_parser("gc", help="删除旧版本并清理不再使用的块")
+    gc_parser.add_argument("--keep", type=int, help="只保留最新的若干个版本")
+    gc_parser.add_argument("--before", help="删除该时间点之前的版本，格式为 YYYY-MM-DD HH:MM")
+    return parser
+
+
+def _open_stream(path: Optional[str], mode: str, standard):
+    """
+    私有函数，打开子命令的输入或输出文件：路径为"-"时以UTF-8包装标准输入或标准输出，子命令没有该参数（路径为None）时返回None。
+    """
+    if path is None:
+        return None
+    if path == "-":
+        return io.TextIOWrapper(standard.buffer, encoding='utf-8', newline='')
+    return open(path, mode, encoding='utf-8', newline='')
+
+
+def _close_stream(stream, path: Optional[str]) -> None:
+    """
+    私有函数，关闭_open_stream打开的文件；标准输入输出只解除包装，不关闭。
+    """
+    if stream is None:
+        return
+    if path == "-":
+        if stream.writable():
+            stream.flush()
+        stream.detach()
+    else:
+        stream.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令行入口。
+
+    返回：
+    - int：进程退出状态，成功时为0，出错时为1，参数错误时为2。
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "bulk-update" and args.set_progress is None and args.set_category is None and args.set_due_date is None:
+        parser.error("bulk-update 需要至少指定 --set-progress、--set-category、--set-due-date 中的一项")
+    input_path, output_path = getattr(args, "input", None), getattr(args, "output", None)
+    stdin = _open_stream(input_path, 'r', sys.stdin)
+    stdout = _open_stream(output_path, 'w', sys.stdout)
+    try:
+        return args.handler(args, stdin, stdout)
+    except (ValueError, IOError, csv.Error) as e:
+        _report(f"错误: {str(e)}")
+        return 1
+    finally:
+        _close_stream(stdin, input_path)
+        _close_stream(stdout, output_path)
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,196 @@
+import heapq
+import math
+from typing import Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+from task_model import Task
+from task_events import TaskListener
+
+_EMPTY: FrozenSet[int] = frozenset()
+
+
+def _ngrams(text: str, n: int) -> Set[str]:
+    """
+    将文本规范化（转为小写并去除首尾空白）后切分为字符n-gram集合，首尾各补一个空格，
+    使较短的查询（如单个汉字）也能产生可用于匹配的n-gram。
+
+    参数：
+    - text (str)：要切分的文本。
+    - n (int)：n-gram的长度。
+
+    返回：
+    - Set[str]：文本对应的n-gram集合，文本为空时返回空集合。
+    """
+    text = text.lower().strip()
+    if not text:
+        return set()
+    padded = f" {text} "
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+class FuzzySearchIndex(TaskListener):
+    """
+    FuzzySearchIndex类基于字符n-gram倒排索引实现任务名称与描述的模糊搜索，
+    按查询n-gram被任务覆盖的比例为任务打分，并通过前缀过滤（prefix filtering）剪枝候选任务：
+    只需遍历查询中最稀有的若干n-gram的倒排列表即可得到全部可能达到分数阈值的候选，
+    无需对每个任务计算相似度。索引在首次搜索（或调用build）时才构建，之后随任务增删改增量维护，
+    任务列表整体替换时随即重建，因此构建之后的搜索不会修改索引，可以由多个线程同时进行。
+    """
+    def __init__(self, n: int = 2):
+        """
+        初始化FuzzySearchIndex对象。
+
+        参数：
+        - n (int)：n-gram的长度，默认为2，适合中文等单字信息量较大的文本。
+        """
+        self.n = n
+        self._source: List[Task] = []
+        self._built = False
+        self._tasks: List[Optional[Task]] = []
+        self._free_slots: List[int] = []
+        self._slots_by_task: Dict[int, List[int]] = {}
+        self._postings: Dict[str, Set[int]] = {}
+
+    @property
+    def built(self) -> bool:
+        """
+        索引是否已经构建。
+        """
+        return self._built
+
+    def build(self) -> None:
+        """
+        根据当前任务列表完整构建倒排索引，已构建时不做任何操作。索引全部建好之后才标记为已构建。
+        """
+        if self._built:
+            return
+        for task in self._source:
+            self._index_task(task)
+        self._built = True
+
+    def on_tasks_reset(self, tasks: List[Task]) -> None:
+        rebuild = self._built
+        self._source = tasks
+        self._built = False
+        self._tasks = []
+        self._free_slots = []
+        self._slots_by_task = {}
+        self._postings = {}
+        if rebuild:
+            self.build()
+
+    def on_task_added(self, index: int, task: Task) -> None:
+        if self._built:
+            self._index_task(task)
+
+    def on_task_updated(self, index: int, old_task: Task, new_task: Task) -> None:
+        if self._built:
+            self._unindex_task(old_task)
+            self._index_task(new_task)
+
+    def on_task_removed(self, index: int, task: Task) -> None:
+        if self._built:
+            self._unindex_task(task)
+
+    def search(self, query: str, k: int = 10, min_score: float = 0.5,
+               predicate: Optional[Callable[[Task], bool]] = None) -> List[Tuple[Task, float]]:
+        """
+        模糊搜索与查询文本相似的任务，返回得分最高的前k个任务及其得分。
+
+        参数：
+        - query (str)：查询文本，会与任务名称和描述进行匹配，允许存在错别字。
+        - k (int)：最多返回的结果数量，默认为10。
+        - min_score (float)：得分阈值（0 - 1之间），即查询n-gram中至少要有该比例出现在任务中，默认为0.5。
+        - predicate (Optional[Callable[[Task], bool]])：附加的筛选条件（如进度范围），在取前k个之前应用于候选任务，
+                                                      不满足条件的任务不占用结果名额，默认为None即不筛选。
+
+        返回：
+        - List[Tuple[Task, float]]：按得分从高到低排列的(任务, 得分)列表，查询为空时返回空列表。
+
+        抛出异常：
+        - ValueError：如果k不是正整数或min_score不在(0, 1]范围内，抛出此异常。
+        """
+        if k < 1:
+            raise ValueError("返回结果数量需为正整数")
+        if not (0 < min_score <= 1):
+            raise ValueError("得分阈值需在0到1之间")
+        query_grams = _ngrams(query, self.n)
+        if not query_grams:
+            return []
+        if not self._built:
+            self.build()
+
+        min_overlap = max(1, math.ceil(min_score * len(query_grams)))
+        postings = [self._postings.get(gram, _EMPTY) for gram in query_grams]
+        postings.sort(key=len)
+
+        # 包含全部查询n-gram的任务得分最高，直接求倒排列表交集即可，足够k个时无需逐个打分
+        full_matches = postings[0].intersection(*postings[1:])
+        if predicate is not None:
+            full_matches = {slot for slot in full_matches if predicate(self._tasks[slot])}
+        if len(full_matches) >= k:
+            return [(self._tasks[slot], 1.0) for slot in heapq.nsmallest(k, full_matches)]
+
+        # 逐步放宽重合数阈值threshold：重合数不低于threshold的任务必然出现在最稀有的
+        # len(postings) - threshold + 1个倒排列表中。由于重合数更高的任务在之前的轮次中已全部找到，
+        # 本轮新出现的结果得分都恰好相同，凑满k个即可停止，无需为其余候选逐个打分
+        overlaps: Dict[int, int] = {}
+        found = 0
+        threshold = len(postings)
+        for position, posting in enumerate(postings):
+            threshold = len(postings) - position
+            if threshold < min_overlap:
+                threshold = min_overlap
+                break
+            found = sum(1 for overlap in overlaps.values() if overlap >= threshold)
+            for slot in posting.difference(overlaps):
+                if predicate is not None and not predicate(self._tasks[slot]):
+                    overlaps[slot] = 0
+                    continue
+                overlap = sum([slot in other for other in postings])
+                overlaps[slot] = overlap
+                if overlap >= threshold:
+                    found += 1
+                    if found >= k:
+                        break
+            if found >= k:
+                break
+
+        scored = [(overlap / len(query_grams), -slot) for slot, overlap in overlaps.items() if overlap >= threshold]
+        return [(self._tasks[-negated_slot], score) for score, negated_slot in heapq.nlargest(k, scored)]
+
+    def _task_grams(self, task: Task) -> Set[str]:
+        """
+        私有方法，计算任务名称与描述的n-gram并集。
+        """
+        return _ngrams(task.name, self.n) | _ngrams(task.description, self.n)
+
+    def _index_task(self, task: Task) -> None:
+        """
+        私有方法，为任务分配索引槽位并将其n-gram加入倒排列表。
+        """
+        slot = self._free_slots.pop() if self._free_slots else len(self._tasks)
+        if slot == len(self._tasks):
+            self._tasks.append(task)
+        else:
+            self._tasks[slot] = task
+        self._slots_by_task.setdefault(id(task), []).append(slot)
+        for gram in self._task_grams(task):
+            self._postings.setdefault(gram, set()).add(slot)
+
+    def _unindex_task(self, task: Task) -> None:
+        """
+        私有方法，将任务的n-gram从倒排列表中移除并回收其索引槽位。
+        """
+        slots = self._slots_by_task.get(id(task))
+        if not slots:
+            return
+        slot = slots.pop()
+        if not slots:
+            del self._slots_by_task[id(task)]
+        for gram in self._task_grams(task):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(slot)
+                if not posting:
+                    del self._postings[gram]
+        self._tasks[slot] = None
+        self._free_slots.append(slot)
@@ -2,6 +2,7 @@ import re
 import os
 import pathlib
 from typing import Union
+from task_model import parse_due_date
 
 def validate_task_name(name: str) -> bool:
     """
@@ -52,6 +53,19 @@ def validate_task_category(category: str) -> bool:
         raise ValueError("任务类别输入不合法，请输入紧急重要、重要不紧急、紧急不重要、不紧急不重要之一")
     return True
 
+def validate_task_due_date(due_date: str) -> bool:
+    """
+    验证任务截止时间的合法性，允许留空，否则需为"YYYY-MM-DD"或"YYYY-MM-DD HH:MM"格式。
+
+    参数：
+    - due_date (str)：要验证的任务截止时间字符串。
+
+    抛出异常：
+    - ValueError：如果截止时间格式不正确或不是有效的日期时间，抛出此异常，明确提示用户输入正确的格式。
+    """
+    parse_due_date(due_date)
+    return True
+
 def validate_file_path(file_path: str) -> bool:
     """
     验证文件路径的合法性，检查是否为空、是否存在以及当前进程对其是否有相应权限等。
@@ -0,0 +1,319 @@
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Tuple
+
+# 启用埋点的环境变量：设置为非空值时启用
+METRICS_ENV = "EISENTODO_METRICS"
+
+# 指定JSON Lines导出文件路径的环境变量
+METRICS_JSONL_ENV = "EISENTODO_METRICS_JSONL"
+
+# 指定Prometheus文本格式导出文件路径的环境变量
+METRICS_PROMETHEUS_ENV = "EISENTODO_METRICS_PROMETHEUS"
+
+# 耗时超过该值（秒）的操作被记为慢操作
+DEFAULT_SLOW_THRESHOLD = 0.05
+
+# 最多保留的慢操作记录数量
+DEFAULT_SLOW_CAPACITY = 50
+
+
+class MetricsExporter:
+    """
+    MetricsExporter类定义了埋点数据导出器的接口：record_span在每个计时区间结束时被调用，
+    flush在Instrumentation.flush时被调用，子类只需重写需要的方法。
+    """
+    def record_span(self, name: str, start: float, duration: float) -> None:
+        """
+        记录一个已结束的计时区间。
+
+        参数：
+        - name (str)：区间名称。
+        - start (float)：开始时间（time.time()时间戳）。
+        - duration (float)：耗时，单位为秒。
+        """
+
+    def flush(self, instrumentation: 'Instrumentation') -> None:
+        """
+        将尚未写出的数据写出。
+
+        参数：
+        - instrumentation (Instrumentation)：提供汇总数据的埋点对象。
+        """
+
+
+class JsonLinesExporter(MetricsExporter):
+    """
+    JsonLinesExporter类将每个计时区间以一行JSON追加写入文件，区间先缓存在内存中，flush时批量写出。
+    """
+    def __init__(self, file_path: str):
+        """
+        初始化JsonLinesExporter对象。
+
+        参数：
+        - file_path (str)：JSON Lines文件路径。
+        """
+        self.file_path = file_path
+        self._buffer: List[str] = []
+        self._lock = threading.Lock()
+
+    def record_span(self, name: str, start: float, duration: float) -> None:
+        line = json.dumps({"name": name, "start": round(start, 6), "duration_ms": round(duration * 1000, 3)})
+        with self._lock:
+            self._buffer.append(line)
+
+    def flush(self, instrumentation: 'Instrumentation') -> None:
+        with self._lock:
+            lines, self._buffer = self._buffer, []
+        if not lines:
+            return
+        try:
+            with open(self.file_path, 'a', encoding='utf-8') as file:
+                file.write("\n".join(lines) + "\n")
+        except IOError as e:
+            print(f"写入埋点文件 {self.file_path} 时出错: {str(e)}")
+
+
+class PrometheusExporter(MetricsExporter):
+    """
+    PrometheusExporter类在flush时将计数器和各区间的次数、总耗时以Prometheus文本格式写入文件，
+    文件以写入临时文件后原子替换的方式更新，可由node_exporter的textfile收集器读取。
+    """
+    def __init__(self, file_path: str, prefix: str = "eisentodo"):
+        """
+        初始化PrometheusExporter对象。
+
+        参数：
+        - file_path (str)：Prometheus文本格式文件路径。
+        - prefix (str)：指标名称前缀，默认为"eisentodo"。
+        """
+        self.file_path = file_path
+        self.prefix = prefix
+
+    def flush(self, instrumentation: 'Instrumentation') -> None:
+        spans, counters = instrumentation.snapshot()
+        lines = [f"# TYPE {self.prefix}_span_seconds summary"]
+        for name, (count, total, _) in sorted(spans.items()):
+            lines.append(f'{self.prefix}_span_seconds_count{{span="{name}"}} {count}')
+            lines.append(f'{self.prefix}_span_seconds_sum{{span="{name}"}} {total:.6f}')
+        lines.append(f"# TYPE {self.prefix}_span_max_seconds gauge")
+        for name, (_, _, maximum) in sorted(spans.items()):
+            lines.append(f'{self.prefix}_span_max_seconds{{span="{name}"}} {maximum:.6f}')
+        lines.append(f"# TYPE {self.prefix}_events_total counter")
+        for name, value in sorted(counters.items()):
+            lines.append(f'{self.prefix}_events_total{{event="{name}"}} {value}')
+        temp_path = self.file_path + ".tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                file.write("\n".join(lines) + "\n")
+            os.replace(temp_path, self.file_path)
+        except IOError as e:
+            print(f"写入埋点文件 {self.file_path} 时出错: {str(e)}")
+
+
+class _Span:
+    """
+    私有类，启用埋点时span返回的计时区间，退出时将耗时交给Instrumentation记录。
+    """
+    __slots__ = ("_instrumentation", "_name", "_start", "_wall")
+
+    def __init__(self, instrumentation: 'Instrumentation', name: str):
+        self._instrumentation = instrumentation
+        self._name = name
+
+    def __enter__(self):
+        self._wall = time.time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self._instrumentation.record(self._name, self._wall, time.perf_counter() - self._start)
+        return False
+
+
+class _NullSpan:
+    """
+    私有类，未启用埋点时span返回的空计时区间，进入和退出都不做任何处理。
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Instrumentation:
+    """
+    Instrumentation类为热点路径提供计时区间和计数器：
+    - 未启用时span返回共用的空区间，instrumented装饰的函数直接调用原函数，开销只有一次属性判断；
+    - 启用后记录每个区间名称的次数、总耗时和最大耗时，并把耗时超过slow_threshold的操作保存在定长的环形缓冲区中；
+    - 区间结束时依次交给已注册的导出器，flush时由导出器写出。
+    """
+    def __init__(self, slow_threshold: float = DEFAULT_SLOW_THRESHOLD, slow_capacity: int = DEFAULT_SLOW_CAPACITY):
+        """
+        初始化Instrumentation对象，初始时未启用。
+
+        参数：
+        - slow_threshold (float)：慢操作的耗时阈值（秒），默认为DEFAULT_SLOW_THRESHOLD。
+        - slow_capacity (int)：最多保留的慢操作记录数量，默认为DEFAULT_SLOW_CAPACITY。
+        """
+        self.enabled = False
+        self.slow_threshold = slow_threshold
+        self.exporters: List[MetricsExporter] = []
+        self._lock = threading.Lock()
+        self._spans: Dict[str, List[float]] = {}
+        self._counters: Dict[str, int] = {}
+        self._slow: Deque[Tuple[float, str, float]] = deque(maxlen=slow_capacity)
+
+    def span(self, name: str):
+        """
+        创建一个计时区间，用法为 with instrumentation.span("名称"): ...。
+
+        参数：
+        - name (str)：区间名称，如"persistence.save_tasks"。
+
+        返回：
+        - 上下文管理器，未启用埋点时为不做任何处理的空区间。
+        """
+        return _Span(self, name) if self.enabled else _NULL_SPAN
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """
+        增加计数器的值，未启用埋点时不做任何处理。
+
+        参数：
+        - name (str)：计数器名称。
+        - amount (int)：增加的数量，默认为1。
+        """
+        if self.enabled:
+            with self._lock:
+                self._counters[name] = self._counters.get(name, 0) + amount
+
+    def record(self, name: str, start: float, duration: float) -> None:
+        """
+        记录一个已结束的计时区间。
+
+        参数：
+        - name (str)：区间名称。
+        - start (float)：开始时间（time.time()时间戳）。
+        - duration (float)：耗时，单位为秒。
+        """
+        with self._lock:
+            stats = self._spans.get(name)
+            if stats is None:
+                self._spans[name] = [1, duration, duration]
+            else:
+                stats[0] += 1
+                stats[1] += duration
+                if duration > stats[2]:
+                    stats[2] = duration
+            if duration >= self.slow_threshold:
+                self._slow.append((start, name, duration))
+        for exporter in self.exporters:
+            exporter.record_span(name, start, duration)
+
+    def snapshot(self) -> Tuple[Dict[str, Tuple[int, float, float]], Dict[str, int]]:
+        """
+        获取当前汇总数据的快照。
+
+        返回：
+        - Tuple[Dict[str, Tuple[int, float, float]], Dict[str, int]]：(区间名称到(次数, 总耗时, 最大耗时)的映射, 计数器)。
+        """
+        with self._lock:
+            return {name: tuple(stats) for name, stats in self._spans.items()}, dict(self._counters)
+
+    def get_slow_operations(self) -> List[Tuple[float, str, float]]:
+        """
+        获取最近的慢操作，按发生时间从新到旧排列。
+
+        返回：
+        - List[Tuple[float, str, float]]：(开始时间戳, 区间名称, 耗时秒数)的列表。
+        """
+        with self._lock:
+            return list(reversed(self._slow))
+
+    def format_slow_operations(self, limit: int = 10) -> str:
+        """
+        将最近的慢操作格式化为每行一条的文本，供调试浮层显示。
+
+        参数：
+        - limit (int)：最多显示的条数，默认为10。
+
+        返回：
+        - str：格式化后的文本，没有慢操作时为提示文本。
+        """
+        operations = self.get_slow_operations()[:limit]
+        if not operations:
+            return f"暂无耗时超过 {self.slow_threshold * 1000:.0f} ms 的操作"
+        return "\n".join(f"{time.strftime('%H:%M:%S', time.localtime(start))}  {name}  {duration * 1000:.1f} ms"
+                         for start, name, duration in operations)
+
+    def flush(self) -> None:
+        """
+        让所有导出器写出尚未写出的数据。
+        """
+        for exporter in self.exporters:
+            exporter.flush(self)
+
+    def reset(self) -> None:
+        """
+        清空已记录的汇总数据、计数器和慢操作记录。
+        """
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+            self._slow.clear()
+
+    def configure_from_environment(self) -> None:
+        """
+        按环境变量启用埋点并注册导出器：设置METRICS_ENV时启用，设置METRICS_JSONL_ENV或METRICS_PROMETHEUS_ENV时
+        启用埋点并注册对应的导出器。
+        """
+        jsonl_path = os.environ.get(METRICS_JSONL_ENV)
+        prometheus_path = os.environ.get(METRICS_PROMETHEUS_ENV)
+        if jsonl_path:
+            self.exporters.append(JsonLinesExporter(jsonl_path))
+        if prometheus_path:
+            self.exporters.append(PrometheusExporter(prometheus_path))
+        self.enabled = bool(os.environ.get(METRICS_ENV) or jsonl_path or prometheus_path)
+
+
+def instrumented(name: str) -> Callable:
+    """
+    装饰器，为函数或方法的每次调用记录一个计时区间，未启用埋点时直接调用原函数。
+
+    参数：
+    - name (str)：区间名称。
+
+    返回：
+    - Callable：装饰器。
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not instrumentation.enabled:
+                return func(*args, **kwargs)
+            wall = time.time()
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                instrumentation.record(name, wall, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+# 整个应用共用的埋点对象，按环境变量决定是否启用，进程退出时写出尚未写出的数据
+instrumentation = Instrumentation()
+instrumentation.configure_from_environment()
+atexit.register(instrumentation.flush)
\ No newline at end of file
@@ -0,0 +1,123 @@
+import threading
+from typing import Callable, List, Optional, Tuple
+from task_model import Task
+from instrumentation import instrumented
+
+# 每扫描这么多个任务就交付一次部分结果，并检查查询是否已被新的输入取代
+LIVE_SEARCH_CHUNK_SIZE = 5000
+
+
+class LiveSearchWorker:
+    """
+    LiveSearchWorker类在后台线程中执行边输入边搜索的关键字查询：
+    - 每次提交查询都会使代数（generation）加一，正在执行的旧查询在下一个分块边界发现自己已被取代后立即放弃；
+    - 任务列表按分块扫描，每个分块的匹配结果连同所属代数交付给回调，界面可以边扫描边显示；
+    - 界面应只应用代数等于当前代数的结果（见is_current），旧输入的结果永远不会覆盖新输入的结果。
+    查询不在界面线程上执行，输入速度不受任务数量影响。
+    """
+    def __init__(self, get_tasks: Callable[[], List[Task]], on_results: Callable[[int, List[Task], bool], None],
+                 chunk_size: int = LIVE_SEARCH_CHUNK_SIZE):
+        """
+        初始化LiveSearchWorker对象并启动后台线程。
+
+        参数：
+        - get_tasks (Callable[[], List[Task]])：返回当前任务列表的函数，后台线程在每次查询开始时对其结果做一次浅拷贝。
+        - on_results (Callable[[int, List[Task], bool], None])：交付部分结果的回调，参数依次为查询代数、
+                                                             本分块中匹配的任务以及查询是否已完成，在后台线程中调用。
+        - chunk_size (int)：每个分块扫描的任务数量，默认为LIVE_SEARCH_CHUNK_SIZE。
+
+        抛出异常：
+        - ValueError：如果chunk_size不是正整数，抛出此异常。
+        """
+        if chunk_size <= 0:
+            raise ValueError("分块大小需为正整数")
+        self._get_tasks = get_tasks
+        self._on_results = on_results
+        self._chunk_size = chunk_size
+        self._condition = threading.Condition()
+        self._generation = 0
+        self._pending: Optional[Tuple[int, str]] = None
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="live-search", daemon=True)
+        self._thread.start()
+
+    def submit(self, keyword: str) -> int:
+        """
+        提交新的查询，取代尚未执行或正在执行的旧查询。
+
+        参数：
+        - keyword (str)：查询关键字，匹配名称或描述中包含该关键字的任务。
+
+        返回：
+        - int：本次查询的代数。
+        """
+        with self._condition:
+            self._generation += 1
+            self._pending = (self._generation, keyword)
+            self._condition.notify()
+            return self._generation
+
+    def cancel(self) -> None:
+        """
+        取消尚未执行或正在执行的查询，之后交付的旧结果都不再是当前结果。
+        """
+        with self._condition:
+            self._generation += 1
+            self._pending = None
+
+    def is_current(self, generation: int) -> bool:
+        """
+        判断指定代数的查询是否仍是最新的查询。
+
+        参数：
+        - generation (int)：查询代数。
+
+        返回：
+        - bool：是最新的查询时返回True。
+        """
+        return generation == self._generation
+
+    def stop(self) -> None:
+        """
+        取消当前查询并停止后台线程。
+        """
+        with self._condition:
+            self._generation += 1
+            self._pending = None
+            self._stopped = True
+            self._condition.notify()
+        self._thread.join()
+
+    def _run(self) -> None:
+        """
+        私有方法，后台线程的主循环：等待最新的查询并执行，排队期间被取代的查询直接丢弃。
+        """
+        while True:
+            with self._condition:
+                while self._pending is None and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                generation, keyword = self._pending
+                self._pending = None
+            self._search(generation, keyword)
+
+    @instrumented("live_search.query")
+    def _search(self, generation: int, keyword: str) -> None:
+        """
+        私有方法，分块扫描任务列表并交付各分块的匹配结果，发现查询已被取代时立即放弃。
+        第一个分块的结果即使为空也会交付，使界面尽快清除上一次查询的结果。
+        """
+        tasks = list(self._get_tasks())
+        start = 0
+        while True:
+            if not self.is_current(generation):
+                return
+            chunk = tasks[start:start + self._chunk_size]
+            matches = [task for task in chunk if keyword in task.name or keyword in task.description]
+            done = start + self._chunk_size >= len(tasks)
+            if matches or done or start == 0:
+                self._on_results(generation, matches, done)
+            if done:
+                return
+            start += self._chunk_size
\ No newline at end of file
@@ -1,6 +1,50 @@
+from startup_timing import startup_timer  # 最先导入，以导入本模块的时刻作为启动计时的起点
+import os
+from concurrent.futures import Future
 from kivy.app import App
+from kivy.core.window import Window
+from kivy.clock import Clock
 from kivy.uix.screenmanager import ScreenManager
 from task_list_screen import TaskListScreen
+from quadrant_screen import QuadrantScreen
+from config_store import config_store
+from instrumentation import instrumentation
+from task_history import TaskHistory
+from workspace_registry import WorkspaceRegistry, WorkspaceStores
+
+startup_timer.mark("import")
+
+# 启用埋点时导出器定时写出数据的间隔（秒）
+METRICS_FLUSH_INTERVAL = 10.0
+
+# 设置该环境变量时在应用内启动本地任务服务：值为端口号时监听本机该端口，否则视为Unix套接字路径
+SERVER_ENV = "EISENTODO_SERVER"
+
+# 定时为任务记录历史快照的间隔（秒），任务没有变化时不会记录新版本
+HISTORY_SNAPSHOT_INTERVAL = 600.0
+
+
+def run_on_main_thread(operation) -> Future:
+    """
+    在Kivy界面线程中执行操作，供其他线程（如本地任务服务的写入协程）调用。
+
+    参数：
+    - operation：无参函数。
+
+    返回：
+    - Future：操作完成后得到其返回值或异常。
+    """
+    future = Future()
+
+    def run(dt) -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(operation())
+        except Exception as e:
+            future.set_exception(e)
+    Clock.schedule_once(run)
+    return future
 
 class MainWindow(ScreenManager):
     """
@@ -8,14 +52,47 @@ class MainWindow(ScreenManager):
     """
     def __init__(self, **kwargs):
         """
-        初始化MainWindow对象，添加任务列表屏幕并设置为当前屏幕。
+        初始化MainWindow对象，添加任务列表屏幕和共用同一TaskManager的四象限屏幕，并将任务列表屏幕设置为当前屏幕。
+        两个屏幕显示工作区注册表中的当前工作区，该工作区以延迟加载模式打开，窗口先以占位文本显示，
+        任务在第一帧绘制完成后再逐帧分批加载。
 
         参数：
         - kwargs：其他关键字参数。
         """
         super().__init__(**kwargs)
-        task_list_screen = TaskListScreen(name='task_list')
+        self.workspace_registry = WorkspaceRegistry()
+        self.workspace_stores = WorkspaceStores(self.workspace_registry, thread_safe=True)
+        self.server_workspace = None
+        workspace = self.workspace_registry.current
+        self.workspace_stores.pinned.add(workspace)
+        task_manager = self.workspace_stores.get(workspace, lazy=True)
+        task_list_screen = TaskListScreen(lazy_load=True, task_manager=task_manager, name='task_list')
+        self.task_list_screen = task_list_screen
         self.add_widget(task_list_screen)
+        self.quadrant_screen = QuadrantScreen(task_manager, name='quadrants')
+        self.add_widget(self.quadrant_screen)
+        self.current = 'task_list'
+
+    def switch_workspace(self, name: str) -> None:
+        """
+        切换到指定的工作区：该工作区尚未打开时以延迟加载模式打开并在任务列表屏幕中逐帧分批加载，
+        原工作区留在已打开工作区的LRU中，超过上限时被刷盘并释放。
+
+        参数：
+        - name (str)：工作区名称。
+
+        抛出异常：
+        - ValueError：如果工作区不存在，抛出此异常。
+        - FileNotFoundError、IOError：如果任务文件不存在或无法读取，抛出此异常。
+        """
+        previous = self.workspace_registry.current
+        task_manager = self.workspace_stores.get(name, lazy=True)
+        self.workspace_stores.pinned.add(name)
+        if previous != name and previous != self.server_workspace:
+            self.workspace_stores.pinned.discard(previous)
+        self.workspace_registry.set_current(name)
+        self.task_list_screen.set_task_manager(task_manager)
+        self.quadrant_screen.set_task_manager(task_manager)
         self.current = 'task_list'
 
 class TaskManagerApp(App):
@@ -32,6 +109,74 @@ class TaskManagerApp(App):
         root = MainWindow()
         return root
 
+    def on_start(self):
+        """
+        应用启动后等待第一帧绘制完成，记录首帧耗时，然后开始加载任务。
+        启用埋点时定时写出埋点数据，并可按F12显示或隐藏慢操作调试浮层。任务历史按HISTORY_SNAPSHOT_INTERVAL定时记录快照。
+        """
+        Window.bind(on_flip=self._on_first_frame)
+        self.task_histories = {}
+        Clock.schedule_interval(lambda dt: self._snapshot_history(), HISTORY_SNAPSHOT_INTERVAL)
+        if instrumentation.enabled:
+            from debug_overlay import DebugOverlay
+            self.debug_overlay = DebugOverlay()
+            Window.bind(on_key_down=self.debug_overlay.on_key_down)
+            Clock.schedule_interval(lambda dt: instrumentation.flush(), METRICS_FLUSH_INTERVAL)
+        self._start_server()
+
+    def on_stop(self):
+        """
+        应用退出时立即写入尚未保存的配置和埋点数据，为当前工作区的任务记录一个历史快照，并关闭所有已打开的工作区。
+        """
+        config_store.flush()
+        instrumentation.flush()
+        self._snapshot_history()
+        try:
+            self.root.workspace_stores.close_all()
+        except IOError as e:
+            print(str(e))
+
+    def _snapshot_history(self) -> None:
+        """
+        私有方法，为当前工作区的任务记录历史快照；任务仍在分批加载时跳过，避免把未加载完的任务列表记为一个版本。
+        每个工作区的任务文件各有一份历史。
+        """
+        task_manager = self.root.task_list_screen.task_manager
+        if task_manager.loading:
+            return
+        csv_file_path = task_manager.persistence.csv_file_path
+        if csv_file_path not in self.task_histories:
+            self.task_histories[csv_file_path] = TaskHistory.for_store(csv_file_path)
+        try:
+            self.task_histories[csv_file_path].snapshot(task_manager.tasks)
+        except IOError as e:
+            print(str(e))
+
+    def _start_server(self) -> None:
+        """
+        私有方法，设置了SERVER_ENV环境变量时在后台线程中启动本地任务服务，服务的写操作在界面线程中执行，
+        与界面中的操作共用同一个TaskManager且不会交错。服务始终提供启动时的工作区的任务，该工作区因此不会被换出。
+        """
+        target = os.environ.get(SERVER_ENV)
+        if not target:
+            return
+        from task_server import TaskServer
+        server = TaskServer(self.root.task_list_screen.task_manager, run_write=run_on_main_thread)
+        self.root.server_workspace = self.root.workspace_registry.current
+        if target.isdigit():
+            server.start_in_thread(port=int(target))
+        else:
+            server.start_in_thread(unix_path=target)
+        self.task_server = server
+
+    def _on_first_frame(self, window) -> None:
+        """
+        私有方法，第一帧绘制完成（缓冲区交换）时调用一次。
+        """
+        Window.unbind(on_flip=self._on_first_frame)
+        startup_timer.mark("first_frame")
+        self.root.task_list_screen.start_loading()
+
 if __name__ == '__main__':
     # 运行应用程序
     TaskManagerApp().run()
\ No newline at end of file
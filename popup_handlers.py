@@ -1,40 +1,92 @@
 from functools import partial
+from typing import Tuple
 from kivy.uix.popup import Popup
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.textinput import TextInput
 from kivy.uix.label import Label
+from task_model import TASK_CATEGORIES
 from utils import COLOR_THEME, apply_color_theme, show_success_message, show_error_message
-from popup_utils import create_text_input, create_button
-from task_operations import add_task_from_popup, edit_task_from_popup, delete_task_from_popup, view_tasks_by_category, filter_tasks, sort_tasks, backup_tasks, restore_tasks
+from popup_utils import create_text_input, create_button, create_toggle_button, PooledDialog
+from task_operations import add_task_from_popup, edit_task_from_popup, delete_task_from_popup, view_tasks_by_category, view_next_tasks, save_scheduler_weights, filter_tasks, sort_tasks, search_archived_tasks, restore_archived_task, backup_tasks, restore_tasks, switch_workspace, create_workspace, search_workspaces
+
+# 各输入框的输入过滤器（删除与之匹配的字符），由create_text_input预编译
+NAME_FILTER = r'[^\w\s-]'
+DIGIT_FILTER = r'[^\d]'
+DECIMAL_FILTER = r'[^\d.]'
+WORD_FILTER = r'[^\w]'
+CATEGORY_FILTER = r'[^紧急重要|重要不紧急|紧急不重要|不紧急不重要]'
+DUE_DATE_FILTER = r'[^\d\s:-]'
+NO_FILTER = r''
+
+def _create_popup(title: str) -> Tuple[Popup, BoxLayout]:
+    """
+    私有函数，创建带有纵向布局的弹窗。
 
-def show_add_task_popup(screen) -> None:
+    参数：
+    - title (str)：弹窗标题。
+
+    返回：
+    - Tuple[Popup, BoxLayout]：弹窗对象及其内容布局。
     """
-    显示添加任务的弹窗。
+    popup = Popup(title=title, size_hint=(0.8, 0.8), background_color=COLOR_THEME["popup_bg_color"])
+    layout = BoxLayout(orientation='vertical', spacing=10, padding=10)
+    popup.content = layout
+    return popup, layout
+
+def _build_dialog(popup: Popup, layout: BoxLayout, widgets: list, inputs: list, refresh=None) -> PooledDialog:
+    """
+    私有函数，将部件依次加入弹窗布局并包装为可复用的弹窗。
+
+    参数：
+    - popup (Popup)：弹窗对象。
+    - layout (BoxLayout)：弹窗的内容布局。
+    - widgets (list)：按顺序加入布局的部件列表。
+    - inputs (list)：再次打开前需要清空的输入框列表。
+    - refresh：每次打开前调用的刷新函数，默认为None。
+
+    返回：
+    - PooledDialog：可复用的弹窗。
+    """
+    for widget in widgets:
+        layout.add_widget(widget)
+    apply_color_theme(layout)
+    return PooledDialog(popup, inputs, refresh)
+
+def _build_task_form_dialog(screen, title: str, button_text: str, action) -> PooledDialog:
+    """
+    私有函数，构建添加或编辑任务的表单弹窗。
 
     参数：
     - screen：当前屏幕对象。
+    - title (str)：弹窗标题。
+    - button_text (str)：确认按钮文本。
+    - action：确认时调用的操作函数，如add_task_from_popup或edit_task_from_popup。
+
+    返回：
+    - PooledDialog：可复用的弹窗。
     """
-    popup = Popup(title='添加任务', size_hint=(0.8, 0.8), background_color=COLOR_THEME["popup_bg_color"])
-    layout = BoxLayout(orientation='vertical', spacing=10, padding=10)
+    popup, layout = _create_popup(title)
 
-    name_input = create_text_input('任务名称（1-100个字符）', r'[^\w\s-]')
-    desc_input = create_text_input('任务描述', r'')
-    progress_input = create_text_input('任务进度（0-100之间的整数）', r'[^\d]')
-    category_input = create_text_input('任务类别（紧急重要、重要不紧急、紧急不重要、不紧急不重要）', r'[^紧急重要|重要不紧急|紧急不重要|不紧急不重要]')
+    name_input = create_text_input('任务名称（1-100个字符）', NAME_FILTER)
+    desc_input = create_text_input('任务描述', NO_FILTER)
+    progress_input = create_text_input('任务进度（0-100之间的整数）', DIGIT_FILTER)
+    category_input = create_text_input('任务类别（紧急重要、重要不紧急、紧急不重要、不紧急不重要）', CATEGORY_FILTER)
+    due_input = create_text_input('截止时间（可选，YYYY-MM-DD 或 YYYY-MM-DD HH:MM）', DUE_DATE_FILTER)
+    inputs = [name_input, desc_input, progress_input, category_input, due_input]
 
-    add_button = create_button('添加', partial(add_task_from_popup, screen, name_input, desc_input, progress_input, category_input, popup))
+    confirm_button = create_button(button_text, partial(action, screen, *inputs, popup))
     cancel_button = create_button('取消', popup.dismiss)
 
-    layout.add_widget(name_input)
-    layout.add_widget(desc_input)
-    layout.add_widget(progress_input)
-    layout.add_widget(category_input)
-    layout.add_widget(add_button)
-    layout.add_widget(cancel_button)
+    return _build_dialog(popup, layout, inputs + [confirm_button, cancel_button], inputs)
 
-    popup.content = layout
-    apply_color_theme(layout)
-    popup.open()
+def show_add_task_popup(screen) -> None:
+    """
+    显示添加任务的弹窗。
+
+    参数：
+    - screen：当前屏幕对象。
+    """
+    screen.popup_pool.open('add_task', partial(_build_task_form_dialog, screen, '添加任务', '添加', add_task_from_popup))
 
 def show_edit_task_popup(screen) -> None:
     """
@@ -43,27 +95,19 @@ def show_edit_task_popup(screen) -> None:
     参数：
     - screen：当前屏幕对象。
     """
-    popup = Popup(title='编辑任务', size_hint=(0.8, 0.8), background_color=COLOR_THEME["popup_bg_color"])
-    layout = BoxLayout(orientation='vertical', spacing=10, padding=10)
+    screen.popup_pool.open('edit_task', partial(_build_task_form_dialog, screen, '编辑任务', '编辑', edit_task_from_popup))
 
-    name_input = create_text_input('任务名称（1-100个字符）', r'[^\w\s-]')
-    desc_input = create_text_input('任务描述', r'')
-    progress_input = create_text_input('任务进度（0-100之间的整数）', r'[^\d]')
-    category_input = create_text_input('任务类别（紧急重要、重要不紧急、紧急不重要、不紧急不重要）', r'[^紧急重要|重要不紧急|紧急不重要|不紧急不重要]')
+def _build_delete_task_dialog(screen) -> PooledDialog:
+    """
+    私有函数，构建删除任务的弹窗。
+    """
+    popup, layout = _create_popup('删除任务')
 
-    edit_button = create_button('编辑', partial(edit_task_from_popup, screen, name_input, desc_input, progress_input, category_input, popup))
+    delete_button = create_button('删除', partial(delete_task_from_popup, screen, popup))
     cancel_button = create_button('取消', popup.dismiss)
 
-    layout.add_widget(name_input)
-    layout.add_widget(desc_input)
-    layout.add_widget(progress_input)
-    layout.add_widget(category_input)
-    layout.add_widget(edit_button)
-    layout.add_widget(cancel_button)
-
-    popup.content = layout
-    apply_color_theme(layout)
-    popup.open()
+    label = Label(text="确定要删除这个任务吗？", color=COLOR_THEME["text_color"])
+    return _build_dialog(popup, layout, [label, delete_button, cancel_button], [])
 
 def show_delete_task_popup(screen) -> None:
     """
@@ -72,19 +116,19 @@ def show_delete_task_popup(screen) -> None:
     参数：
     - screen：当前屏幕对象。
     """
-    popup = Popup(title='删除任务', size_hint=(0.8, 0.8), background_color=COLOR_THEME["popup_bg_color"])
-    layout = BoxLayout(orientation='vertical', spacing=10, padding=10)
+    screen.popup_pool.open('delete_task', partial(_build_delete_task_dialog, screen))
 
-    delete_button = create_button('删除', partial(delete_task_from_popup, screen, popup))
-    cancel_button = create_button('取消', popup.dismiss)
+def _build_tasks_by_category_dialog(screen) -> PooledDialog:
+    """
+    私有函数，构建按类别查看任务的弹窗。
+    """
+    popup, layout = _create_popup('按类别查看任务')
 
-    layout.add_widget(Label(text="确定要删除这个任务吗？", color=COLOR_THEME["text_color"]))
-    layout.add_widget(delete_button)
-    layout.add_widget(cancel_button)
+    category_input = create_text_input('任务类别（紧急重要、重要不紧急、紧急不重要、不紧急不重要）', CATEGORY_FILTER)
+    view_button = create_button('查看', partial(view_tasks_by_category, screen, category_input, popup))
+    cancel_button = create_button('取消', popup.dismiss)
 
-    popup.content = layout
-    apply_color_theme(layout)
-    popup.open()
+    return _build_dialog(popup, layout, [category_input, view_button, cancel_button], [category_input])
 
 def show_tasks_by_category_popup(screen) -> None:
     """
@@ -93,20 +137,55 @@ def show_tasks_by_category_popup(screen) -> None:
     参数：
     - screen：当前屏幕对象。
     """
-    popup = Popup(title='按类别查看任务', size_hint=(0.8, 0.8), background_color=COLOR_THEME["popup_bg_color"])
-    layout = BoxLayout(orientation='vertical', spacing=10, padding=10)
+    screen.popup_pool.open('tasks_by_category', partial(_build_tasks_by_category_dialog, screen))
 
-    category_input = create_text_input('任务类别（紧急重要、重要不紧急、紧急不重要、不紧急不重要）', r'[^紧急重要|重要不紧急|紧急不重要|不紧急不重要]')
-    view_button = create_button('查看', partial(view_tasks_by_category, screen, category_input, popup))
+def _build_next_tasks_dialog(screen) -> PooledDialog:
+    """
+    私有函数，构建查看下一步任务的弹窗，每次打开时在权重输入框的提示文本中显示当前权重。
+    """
+    popup, layout = _create_popup('下一步')
+
+    count_input = create_text_input('任务数量（默认5个）', DIGIT_FILTER)
+    view_button = create_button('查看', partial(view_next_tasks, screen, count_input, popup))
+    remaining_input = create_text_input('', DECIMAL_FILTER)
+    age_input = create_text_input('', DECIMAL_FILTER)
+    weights_button = create_button('保存权重', partial(save_scheduler_weights, screen, remaining_input, age_input, popup))
     cancel_button = create_button('取消', popup.dismiss)
 
-    layout.add_widget(category_input)
-    layout.add_widget(view_button)
-    layout.add_widget(cancel_button)
+    def refresh() -> None:
+        scheduler = screen.task_manager.scheduler
+        remaining_input.hint_text = f"剩余进度每1%的权重（当前 {scheduler.remaining_weight:g}）"
+        age_input.hint_text = f"任务每存在1天增加的得分（当前 {scheduler.age_weight:g}）"
 
-    popup.content = layout
-    apply_color_theme(layout)
-    popup.open()
+    inputs = [count_input, remaining_input, age_input]
+    widgets = [count_input, view_button, remaining_input, age_input, weights_button, cancel_button]
+    return _build_dialog(popup, layout, widgets, inputs, refresh)
+
+def show_next_tasks_popup(screen) -> None:
+    """
+    显示查看下一步任务的弹窗。
+
+    参数：
+    - screen：当前屏幕对象。
+    """
+    screen.popup_pool.open('next_tasks', partial(_build_next_tasks_dialog, screen))
+
+def _build_filter_tasks_dialog(screen) -> PooledDialog:
+    """
+    私有函数，构建筛选任务的弹窗。
+    """
+    popup, layout = _create_popup('筛选任务')
+
+    keyword_input = create_text_input('关键字', NO_FILTER)
+    progress_min_input = create_text_input('最小进度（0-100）', DIGIT_FILTER)
+    progress_max_input = create_text_input('最大进度（0-100）', DIGIT_FILTER)
+    fuzzy_toggle = create_toggle_button('模糊匹配（容许错别字，按匹配度排序）')
+    inputs = [keyword_input, progress_min_input, progress_max_input]
+    filter_button = create_button('筛选', partial(filter_tasks, screen, *inputs, fuzzy_toggle, popup))
+    cancel_button = create_button('取消', popup.dismiss)
+
+    return _build_dialog(popup, layout, inputs + [fuzzy_toggle, filter_button, cancel_button], inputs,
+                         partial(setattr, fuzzy_toggle, 'state', 'normal'))
 
 def show_filter_tasks_popup(screen) -> None:
     """
@@ -115,24 +194,21 @@ def show_filter_tasks_popup(screen) -> None:
     参数：
     - screen：当前屏幕对象。
     """
-    popup = Popup(title='筛选任务', size_hint=(0.8, 0.8), background_color=COLOR_THEME["popup_bg_color"])
-    layout = BoxLayout(orientation='vertical', spacing=10, padding=10)
+    screen.popup_pool.open('filter_tasks', partial(_build_filter_tasks_dialog, screen))
 
-    keyword_input = create_text_input('关键字', r'')
-    progress_min_input = create_text_input('最小进度（0-100）', r'[^\d]')
-    progress_max_input = create_text_input('最大进度（0-100）', r'[^\d]')
-    filter_button = create_button('筛选', partial(filter_tasks, screen, keyword_input, progress_min_input, progress_max_input, popup))
-    cancel_button = create_button('取消', popup.dismiss)
+def _build_sort_tasks_dialog(screen) -> PooledDialog:
+    """
+    私有函数，构建排序任务的弹窗。
+    """
+    popup, layout = _create_popup('排序任务')
 
-    layout.add_widget(keyword_input)
-    layout.add_widget(progress_min_input)
-    layout.add_widget(progress_max_input)
-    layout.add_widget(filter_button)
-    layout.add_widget(cancel_button)
+    sort_key_input = create_text_input('排序键（name, progress, category）', WORD_FILTER)
+    ascending_input = create_text_input('升序（True/False）', WORD_FILTER)
+    inputs = [sort_key_input, ascending_input]
+    sort_button = create_button('排序', partial(sort_tasks, screen, *inputs, popup))
+    cancel_button = create_button('取消', popup.dismiss)
 
-    popup.content = layout
-    apply_color_theme(layout)
-    popup.open()
+    return _build_dialog(popup, layout, inputs + [sort_button, cancel_button], inputs)
 
 def show_sort_tasks_popup(screen) -> None:
     """
@@ -141,44 +217,99 @@ def show_sort_tasks_popup(screen) -> None:
     参数：
     - screen：当前屏幕对象。
     """
-    popup = Popup(title='排序任务', size_hint=(0.8, 0.8), background_color=COLOR_THEME["popup_bg_color"])
-    layout = BoxLayout(orientation='vertical', spacing=10, padding=10)
+    screen.popup_pool.open('sort_tasks', partial(_build_sort_tasks_dialog, screen))
 
-    sort_key_input = create_text_input('排序键（name, progress, category）', r'[^\w]')
-    ascending_input = create_text_input('升序（True/False）', r'[^\w]')
-    sort_button = create_button('排序', partial(sort_tasks, screen, sort_key_input, ascending_input, popup))
+def _build_archive_dialog(screen) -> PooledDialog:
+    """
+    私有函数，构建归档管理的弹窗，每次打开时刷新归档任务数量。
+    """
+    popup, layout = _create_popup('归档管理')
+
+    result_label = Label(color=COLOR_THEME["text_color"])
+    keyword_input = create_text_input('关键字（留空查询全部）', NO_FILTER)
+    search_button = create_button('查询', partial(search_archived_tasks, screen, keyword_input, result_label))
+    archive_id_input = create_text_input('归档编号', DIGIT_FILTER)
+    restore_button = create_button('恢复', partial(restore_archived_task, screen, archive_id_input, popup))
     cancel_button = create_button('取消', popup.dismiss)
 
-    layout.add_widget(sort_key_input)
-    layout.add_widget(ascending_input)
-    layout.add_widget(sort_button)
-    layout.add_widget(cancel_button)
+    def refresh() -> None:
+        result_label.text = f"已归档 {screen.task_manager.archive.get_count()} 个任务"
 
-    popup.content = layout
-    apply_color_theme(layout)
-    popup.open()
+    widgets = [result_label, keyword_input, search_button, archive_id_input, restore_button, cancel_button]
+    return _build_dialog(popup, layout, widgets, [keyword_input, archive_id_input], refresh)
 
-def show_backup_tasks_popup(screen) -> None:
+def show_archive_popup(screen) -> None:
     """
-    显示备份任务数据的弹窗。
+    显示归档管理的弹窗，可按关键字查询归档任务，并按归档编号恢复任务。
 
     参数：
     - screen：当前屏幕对象。
     """
-    popup = Popup(title='备份任务数据', size_hint=(0.8, 0.8), background_color=COLOR_THEME["popup_bg_color"])
-    layout = BoxLayout(orientation='vertical', spacing=10, padding=10)
+    screen.popup_pool.open('archive', partial(_build_archive_dialog, screen))
+
+def _build_workspace_dialog(screen) -> PooledDialog:
+    """
+    私有函数，构建工作区弹窗，每次打开时刷新工作区列表。
+    """
+    popup, layout = _create_popup('工作区')
+
+    result_label = Label(color=COLOR_THEME["text_color"])
+    name_input = create_text_input('工作区名称', NO_FILTER)
+    switch_button = create_button('切换', partial(switch_workspace, screen, name_input, popup))
+    create_workspace_button = create_button('新建', partial(create_workspace, screen, name_input, popup))
+    keyword_input = create_text_input('关键字', NO_FILTER)
+    search_button = create_button('跨工作区搜索', partial(search_workspaces, screen, keyword_input, result_label))
+    cancel_button = create_button('取消', popup.dismiss)
 
-    backup_path_input = create_text_input('备份路径', r'')
+    def refresh() -> None:
+        registry = screen.manager.workspace_registry
+        result_label.text = "工作区：" + "、".join(
+            f"{name}（当前）" if name == registry.current else name for name in registry.list_workspaces())
+
+    widgets = [result_label, name_input, switch_button, create_workspace_button, keyword_input, search_button, cancel_button]
+    return _build_dialog(popup, layout, widgets, [name_input, keyword_input], refresh)
+
+def show_workspace_popup(screen) -> None:
+    """
+    显示工作区弹窗，可切换到已有工作区、新建工作区，或在全部工作区中搜索任务。
+
+    参数：
+    - screen：当前屏幕对象。
+    """
+    screen.popup_pool.open('workspace', partial(_build_workspace_dialog, screen))
+
+def _build_backup_tasks_dialog(screen) -> PooledDialog:
+    """
+    私有函数，构建备份任务数据的弹窗。
+    """
+    popup, layout = _create_popup('备份任务数据')
+
+    backup_path_input = create_text_input('备份路径', NO_FILTER)
     backup_button = create_button('备份', partial(backup_tasks, screen, backup_path_input, popup))
     cancel_button = create_button('取消', popup.dismiss)
 
-    layout.add_widget(backup_path_input)
-    layout.add_widget(backup_button)
-    layout.add_widget(cancel_button)
+    return _build_dialog(popup, layout, [backup_path_input, backup_button, cancel_button], [backup_path_input])
 
-    popup.content = layout
-    apply_color_theme(layout)
-    popup.open()
+def show_backup_tasks_popup(screen) -> None:
+    """
+    显示备份任务数据的弹窗。
+
+    参数：
+    - screen：当前屏幕对象。
+    """
+    screen.popup_pool.open('backup_tasks', partial(_build_backup_tasks_dialog, screen))
+
+def _build_restore_tasks_dialog(screen) -> PooledDialog:
+    """
+    私有函数，构建恢复任务数据的弹窗。
+    """
+    popup, layout = _create_popup('恢复任务数据')
+
+    restore_path_input = create_text_input('恢复路径', NO_FILTER)
+    restore_button = create_button('恢复', partial(restore_tasks, screen, restore_path_input, popup))
+    cancel_button = create_button('取消', popup.dismiss)
+
+    return _build_dialog(popup, layout, [restore_path_input, restore_button, cancel_button], [restore_path_input])
 
 def show_restore_tasks_popup(screen) -> None:
     """
@@ -187,17 +318,51 @@ def show_restore_tasks_popup(screen) -> None:
     参数：
     - screen：当前屏幕对象。
     """
-    popup = Popup(title='恢复任务数据', size_hint=(0.8, 0.8), background_color=COLOR_THEME["popup_bg_color"])
-    layout = BoxLayout(orientation='vertical', spacing=10, padding=10)
+    screen.popup_pool.open('restore_tasks', partial(_build_restore_tasks_dialog, screen))
 
-    restore_path_input = create_text_input('恢复路径', r'')
-    restore_button = create_button('恢复', partial(restore_tasks, screen, restore_path_input, popup))
-    cancel_button = create_button('取消', popup.dismiss)
+def format_statistics(screen) -> str:
+    """
+    生成任务统计概览的标记文本，包括各象限任务数量、已完成数量、平均进度、完成率、整体进度分布以及归档数量。
 
-    layout.add_widget(restore_path_input)
-    layout.add_widget(restore_button)
-    layout.add_widget(cancel_button)
+    参数：
+    - screen：当前屏幕对象。
 
-    popup.content = layout
-    apply_color_theme(layout)
-    popup.open()
\ No newline at end of file
+    返回：
+    - str：统计概览的标记文本。
+    """
+    statistics = screen.task_manager.statistics
+    lines = []
+    for category in ("",) + tuple(TASK_CATEGORIES):
+        lines.append(f"[b]{category or '全部'}[/b]：{statistics.get_count(category)} 个任务，"
+                     f"已完成 {statistics.get_completed_count(category)} 个，"
+                     f"平均进度 {statistics.get_average_progress(category):.1f}%，"
+                     f"完成率 {statistics.get_completion_rate(category) * 100:.1f}%")
+    histogram = statistics.get_histogram(bucket_size=10)
+    buckets = [f"{index * 10}-{index * 10 + 9}%: {count}" for index, count in enumerate(histogram[:-1])]
+    buckets.append(f"100%: {histogram[-1]}")
+    lines.append("[b]进度分布[/b]：" + "，".join(buckets))
+    lines.append(f"[b]已归档[/b]：{screen.task_manager.archive.get_count()} 个任务")
+    return "\n".join(lines)
+
+def _build_statistics_dialog(screen) -> PooledDialog:
+    """
+    私有函数，构建任务统计概览的弹窗，每次打开时刷新统计数据。
+    """
+    popup, layout = _create_popup('统计概览')
+
+    statistics_label = Label(markup=True, color=COLOR_THEME["text_color"])
+    close_button = create_button('关闭', popup.dismiss)
+
+    def refresh() -> None:
+        statistics_label.text = format_statistics(screen)
+
+    return _build_dialog(popup, layout, [statistics_label, close_button], [], refresh)
+
+def show_statistics_popup(screen) -> None:
+    """
+    显示任务统计概览的弹窗，包括各象限任务数量、已完成数量、平均进度、完成率以及整体进度分布。
+
+    参数：
+    - screen：当前屏幕对象。
+    """
+    screen.popup_pool.open('statistics', partial(_build_statistics_dialog, screen))
\ No newline at end of file
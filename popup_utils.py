@@ -1,7 +1,32 @@
 import re
+from typing import Callable, Dict, List, Optional, Pattern
+from kivy.uix.popup import Popup
 from kivy.uix.textinput import TextInput
 from kivy.uix.button import Button
+from kivy.uix.togglebutton import ToggleButton
 from utils import COLOR_THEME
+from instrumentation import instrumentation
+
+# 已编译的输入过滤正则表达式，同一模式只编译一次，各输入框共用
+_compiled_filters: Dict[str, Pattern] = {}
+
+
+def compile_input_filter(input_filter: str) -> Optional[Callable[[str, bool], str]]:
+    """
+    将输入过滤器的正则表达式预编译为TextInput的input_filter函数，该函数删除输入文本中与正则表达式匹配的字符。
+
+    参数：
+    - input_filter (str)：输入过滤器的正则表达式，空字符串表示不过滤。
+
+    返回：
+    - Optional[Callable[[str, bool], str]]：过滤函数，不过滤时返回None。
+    """
+    if not input_filter:
+        return None
+    pattern = _compiled_filters.get(input_filter)
+    if pattern is None:
+        pattern = _compiled_filters[input_filter] = re.compile(input_filter)
+    return lambda text, from_undo: pattern.sub('', text)
 
 def create_text_input(hint_text: str, input_filter: str) -> TextInput:
     """
@@ -9,7 +34,7 @@ def create_text_input(hint_text: str, input_filter: str) -> TextInput:
 
     参数：
     - hint_text (str)：提示文本。
-    - input_filter (str)：输入过滤器的正则表达式。
+    - input_filter (str)：输入过滤器的正则表达式，在创建时预编译，空字符串表示不过滤。
 
     返回：
     - TextInput：创建的TextInput对象。
@@ -23,7 +48,7 @@ def create_text_input(hint_text: str, input_filter: str) -> TextInput:
         cursor_color=COLOR_THEME["text_color"],
         background_color=COLOR_THEME["popup_bg_color"],
         hint_text_color=COLOR_THEME["input_hint_color"],
-        input_filter=lambda text, from_undo: re.sub(input_filter, '', text)
+        input_filter=compile_input_filter(input_filter)
     )
 
 def create_button(text: str, callback) -> Button:
@@ -32,7 +57,7 @@ def create_button(text: str, callback) -> Button:
 
     参数：
     - text (str)：按钮文本。
-    - callback：按钮点击时的回调函数。
+    - callback：按钮点击时调用的无参数回调函数。
 
     返回：
     - Button：创建的Button对象。
@@ -41,5 +66,91 @@ def create_button(text: str, callback) -> Button:
         text=text,
         size_hint=(0.4, None),
         height=40,
-        on_release=callback
-    )
\ No newline at end of file
+        on_release=lambda instance: callback()
+    )
+
+def create_toggle_button(text: str) -> ToggleButton:
+    """
+    创建一个表示开关选项的ToggleButton，按下状态（state为'down'）表示开启。
+
+    参数：
+    - text (str)：按钮文本。
+
+    返回：
+    - ToggleButton：创建的ToggleButton对象。
+    """
+    return ToggleButton(
+        text=text,
+        size_hint=(1, None),
+        height=40
+    )
+
+
+class PooledDialog:
+    """
+    PooledDialog类保存一个可重复使用的弹窗及其输入框，再次打开前清空输入框，并可刷新弹窗中随数据变化的内容。
+    """
+    def __init__(self, popup: Popup, inputs: List[TextInput], refresh: Optional[Callable[[], None]] = None):
+        """
+        初始化PooledDialog对象。
+
+        参数：
+        - popup (Popup)：弹窗对象。
+        - inputs (List[TextInput])：再次打开前需要清空的输入框列表。
+        - refresh (Optional[Callable[[], None]])：每次打开前调用的刷新函数，用于更新弹窗中随数据变化的内容，默认为None。
+        """
+        self.popup = popup
+        self.inputs = inputs
+        self.refresh = refresh
+
+    def reset(self) -> None:
+        """
+        清空输入框并刷新弹窗内容。
+        """
+        for text_input in self.inputs:
+            text_input.text = ''
+        if self.refresh is not None:
+            self.refresh()
+
+
+class PopupPool:
+    """
+    PopupPool类按名称缓存弹窗：每种弹窗只在第一次打开时构建，之后打开时只重置并复用已构建的部件，
+    频繁录入数据时无需反复创建和回收大量部件。启用埋点时，首次构建打开记录为"popup.build.<名称>"区间，
+    复用打开记录为"popup.open.<名称>"区间，由调试浮层和导出器展示。
+    """
+    def __init__(self):
+        """
+        初始化PopupPool对象。
+        """
+        self._dialogs: Dict[str, PooledDialog] = {}
+
+    def open(self, name: str, build: Callable[[], PooledDialog]) -> Popup:
+        """
+        打开指定名称的弹窗，弹窗不存在时调用build构建并缓存，已存在时重置后复用。
+
+        参数：
+        - name (str)：弹窗名称。
+        - build (Callable[[], PooledDialog])：构建弹窗的函数。
+
+        返回：
+        - Popup：打开的弹窗对象。
+        """
+        dialog = self._dialogs.get(name)
+        if dialog is None:
+            with instrumentation.span(f"popup.build.{name}"):
+                dialog = self._dialogs[name] = build()
+                if dialog.refresh is not None:
+                    dialog.refresh()
+                dialog.popup.open()
+        else:
+            with instrumentation.span(f"popup.open.{name}"):
+                dialog.reset()
+                dialog.popup.open()
+        return dialog.popup
+
+    def clear(self) -> None:
+        """
+        丢弃所有已缓存的弹窗，之后打开时重新构建。
+        """
+        self._dialogs.clear()
\ No newline at end of file
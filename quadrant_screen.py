@@ -0,0 +1,151 @@
+from typing import Dict, List
+from kivy.uix.screenmanager import Screen
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.gridlayout import GridLayout
+from kivy.uix.button import Button
+from kivy.uix.label import Label
+from task_model import Task, TASK_CATEGORIES
+from task_events import TaskListener
+from task_list_view import TaskListView
+from utils import COLOR_THEME
+
+# 每个象限每次加载的任务数量
+QUADRANT_PAGE_SIZE = 50
+
+# 滚动到距底部不足该比例时加载下一页
+LOAD_MORE_THRESHOLD = 0.1
+
+
+class QuadrantPane(BoxLayout):
+    """
+    QuadrantPane类显示四象限中的一个象限：标题显示该类别的任务数量，下方是独立虚拟化的任务列表。
+    任务按页从TaskManager的按类别分页查询中获取，初始只加载第一页，滚动接近底部时再加载下一页。
+    """
+    def __init__(self, task_manager, category: str, **kwargs):
+        """
+        初始化QuadrantPane对象，任务在调用reload后才开始加载。
+
+        参数：
+        - task_manager：提供get_category_page和get_category_count方法的TaskManager对象。
+        - category (str)：该象限对应的任务类别。
+        - kwargs：其他关键字参数。
+        """
+        super().__init__(orientation='vertical', spacing=5, **kwargs)
+        self.task_manager = task_manager
+        self.category = category
+        self.loaded = 0
+        self.title = Label(size_hint_y=None, height=30, color=COLOR_THEME["text_color"])
+        self.list_view = TaskListView()
+        self.list_view.bind(scroll_y=self._on_scroll)
+        self.add_widget(self.title)
+        self.add_widget(self.list_view)
+
+    def load_more(self) -> int:
+        """
+        加载该象限的下一页任务并追加到列表末尾。
+
+        返回：
+        - int：本次加载的任务数量，已全部加载时为0。
+        """
+        page = self.task_manager.get_category_page(self.category, self.loaded, QUADRANT_PAGE_SIZE)
+        self.list_view.append_tasks(page)
+        self.loaded += len(page)
+        return len(page)
+
+    def reload(self) -> None:
+        """
+        该类别的任务发生变化后重新加载已加载过的范围（至少一页），滚动位置之外的任务仍不加载。
+        """
+        count = max(self.loaded, QUADRANT_PAGE_SIZE)
+        tasks: List[Task] = self.task_manager.get_category_page(self.category, 0, count)
+        self.list_view.set_tasks(tasks)
+        self.loaded = len(tasks)
+        self.title.text = f"{self.category}（{self.task_manager.get_category_count(self.category)}）"
+
+    def _on_scroll(self, instance, scroll_y: float) -> None:
+        """
+        私有方法，列表滚动到接近底部时加载下一页。
+        """
+        if scroll_y <= LOAD_MORE_THRESHOLD and self.loaded < self.task_manager.get_category_count(self.category):
+            self.load_more()
+
+
+class QuadrantBinding(TaskListener):
+    """
+    QuadrantBinding类作为TaskManager的监听者，任务增删改时只重新加载受影响类别的象限。
+    """
+    def __init__(self, panes: Dict[str, QuadrantPane]):
+        """
+        初始化QuadrantBinding对象。
+
+        参数：
+        - panes (Dict[str, QuadrantPane])：任务类别到象限的映射。
+        """
+        self.panes = panes
+
+    def on_tasks_reset(self, tasks: List[Task]) -> None:
+        for pane in self.panes.values():
+            pane.reload()
+
+    def on_task_added(self, index: int, task: Task) -> None:
+        self.panes[task.category].reload()
+
+    def on_task_updated(self, index: int, old_task: Task, new_task: Task) -> None:
+        self.panes[old_task.category].reload()
+        if new_task.category != old_task.category:
+            self.panes[new_task.category].reload()
+
+    def on_task_removed(self, index: int, task: Task) -> None:
+        self.panes[task.category].reload()
+
+
+class QuadrantScreen(Screen):
+    """
+    QuadrantScreen类以2×2网格同时显示艾森豪威尔矩阵的四个象限，每个象限是独立虚拟化、按页加载的任务列表，
+    任务数量很大时也只会获取和渲染各象限已滚动到的部分。
+    """
+    def __init__(self, task_manager, **kwargs):
+        """
+        初始化QuadrantScreen对象，创建四个象限并注册为TaskManager的监听者，注册时各象限加载第一页任务。
+
+        参数：
+        - task_manager：与任务列表屏幕共用的TaskManager对象。
+        - kwargs：其他关键字参数。
+        """
+        super().__init__(**kwargs)
+        self.task_manager = task_manager
+        self.panes = {category: QuadrantPane(task_manager, category) for category in TASK_CATEGORIES}
+        grid = GridLayout(cols=2, spacing=10)
+        for category in TASK_CATEGORIES:
+            grid.add_widget(self.panes[category])
+        layout = BoxLayout(orientation='vertical', spacing=10, padding=10)
+        back_button = Button(text="返回任务列表", size_hint=(0.4, None), height=40, on_release=lambda instance: self.show_task_list())
+        layout.add_widget(back_button)
+        layout.add_widget(grid)
+        self.add_widget(layout)
+        self.binding = QuadrantBinding(self.panes)
+        self.task_manager.add_listener(self.binding)
+
+    def set_task_manager(self, task_manager) -> None:
+        """
+        改为显示另一个TaskManager（如切换工作区时），各象限改为从新TaskManager分页获取任务并重新加载第一页。
+
+        参数：
+        - task_manager：新的TaskManager对象。
+        """
+        if task_manager is self.task_manager:
+            return
+        self.task_manager.remove_listener(self.binding)
+        self.task_manager = task_manager
+        for pane in self.panes.values():
+            pane.task_manager = task_manager
+            pane.loaded = 0
+        self.task_manager.add_listener(self.binding)
+        for pane in self.panes.values():
+            pane.reload()
+
+    def show_task_list(self) -> None:
+        """
+        切换回任务列表屏幕。
+        """
+        self.manager.current = 'task_list'
\ No newline at end of file
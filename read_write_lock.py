@@ -0,0 +1,117 @@
+"""
+读写锁：多个读者可以同时持有读锁，写者独占写锁。写者优先，已有写者等待时新的读者需要等待，避免持续的查询使修改一直无法进行。
+同一线程可以重复获取写锁，持有写锁的线程也可以获取读锁（如修改过程中由监听者发起的查询）；
+持有读锁的线程不能再获取写锁，否则两个这样的线程会互相等待。
+"""
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+
+class ReadWriteLock:
+    """
+    ReadWriteLock类实现写者优先、可重入的读写锁，通过read_locked和write_locked上下文管理器使用。
+    """
+    def __init__(self):
+        """
+        初始化ReadWriteLock对象。
+        """
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._waiting_writers = 0
+        self._writer: Optional[int] = None
+        self._writer_depth = 0
+        self._local = threading.local()
+
+    def acquire_read(self) -> None:
+        """
+        获取读锁，有写者持有或等待写锁时阻塞；当前线程已持有读锁或写锁时直接重入。
+        """
+        depth = getattr(self._local, "depth", 0)
+        if depth or self._writer == threading.get_ident():
+            self._local.depth = depth + 1
+            return
+        with self._condition:
+            while self._writer is not None or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        self._local.depth = 1
+        self._local.counted = True
+
+    def release_read(self) -> None:
+        """
+        释放读锁，最外层的读锁释放后唤醒等待的写者。
+
+        抛出异常：
+        - RuntimeError：如果当前线程没有持有读锁，抛出此异常。
+        """
+        depth = getattr(self._local, "depth", 0)
+        if not depth:
+            raise RuntimeError("当前线程没有持有读锁")
+        self._local.depth = depth - 1
+        if depth == 1 and getattr(self._local, "counted", False):
+            self._local.counted = False
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    def acquire_write(self) -> None:
+        """
+        获取写锁，等待其他线程的读锁和写锁全部释放；当前线程已持有写锁时直接重入。
+
+        抛出异常：
+        - RuntimeError：如果当前线程持有读锁而没有持有写锁，抛出此异常。
+        """
+        me = threading.get_ident()
+        if self._writer == me:
+            self._writer_depth += 1
+            return
+        if getattr(self._local, "depth", 0):
+            raise RuntimeError("持有读锁的线程不能再获取写锁")
+        with self._condition:
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            self._writer_depth = 1
+
+    def release_write(self) -> None:
+        """
+        释放写锁，最外层的写锁释放后唤醒等待的读者和写者。
+
+        抛出异常：
+        - RuntimeError：如果当前线程没有持有写锁，抛出此异常。
+        """
+        if self._writer != threading.get_ident():
+            raise RuntimeError("当前线程没有持有写锁")
+        self._writer_depth -= 1
+        if not self._writer_depth:
+            with self._condition:
+                self._writer = None
+                self._condition.notify_all()
+
+    @contextmanager
+    def read_locked(self):
+        """
+        上下文管理器，在with块内持有读锁。
+        """
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self):
+        """
+        上下文管理器，在with块内持有写锁。
+        """
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
@@ -0,0 +1,211 @@
+import bisect
+import heapq
+import itertools
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from task_model import Task
+from task_events import TaskListener
+
+# 堆中失效条目占比超过该比例时重建堆，避免失效条目无限堆积
+_STALE_RATIO_LIMIT = 0.5
+
+
+class ReminderScheduler(TaskListener):
+    """
+    ReminderScheduler类维护带截止时间的未完成任务，提供两种数据结构：
+    - 以截止时间为键的最小堆，保存尚未触发的到期提醒，界面只需在堆顶截止时间到达时唤醒一次，无需轮询所有任务；
+    - 按截止时间排序的有序索引，以O(log n + k)的代价回答"哪些任务已逾期"之类的范围查询。
+    作为TaskManager的监听者，任务增删改时堆采用惰性失效更新（堆顶的失效条目随即出堆，堆顶总是有效的），
+    有序索引通过二分查找定位插入或删除位置，在十万级带截止时间的任务下仍能保持较低的开销。
+    next_deadline和各查询方法不修改任何数据结构；pop_due会取出提醒，需与任务增删改一样串行调用。
+    """
+    def __init__(self, clock: Callable[[], float] = time.time):
+        """
+        初始化ReminderScheduler对象。
+
+        参数：
+        - clock (Callable[[], float])：获取当前时间戳的函数，默认为time.time。
+        """
+        self._clock = clock
+        self._counter = itertools.count()
+        self._heap: List[list] = []
+        self._heap_entries: Dict[int, List[list]] = {}
+        self._stale = 0
+        self._index: List[Tuple[float, int, Task]] = []
+        self._index_keys: Dict[int, List[Tuple[float, int, Task]]] = {}
+        self._tasks: List[Task] = []
+        self.on_schedule_changed: Optional[Callable[[], None]] = None
+
+    def next_deadline(self) -> Optional[float]:
+        """
+        获取最近一个尚未触发的提醒的截止时间戳。
+
+        返回：
+        - Optional[float]：最近的截止时间戳，没有待触发的提醒时返回None。
+        """
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: Optional[float] = None) -> List[Task]:
+        """
+        取出截止时间已到达的全部待触发提醒，每个提醒只会被取出一次。
+
+        参数：
+        - now (Optional[float])：当前时间戳，默认为clock()的返回值。
+
+        返回：
+        - List[Task]：截止时间已到达的任务列表，按截止时间从早到晚排列。
+        """
+        now = self._clock() if now is None else now
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            if entry[2] is None:
+                self._stale -= 1
+                continue
+            entries = self._heap_entries[id(entry[2])]
+            entries.remove(entry)
+            if not entries:
+                del self._heap_entries[id(entry[2])]
+            due.append(entry[2])
+        self._drop_stale_top()
+        return due
+
+    def get_overdue_tasks(self, now: Optional[float] = None) -> List[Task]:
+        """
+        获取截止时间早于当前时间的全部未完成任务。
+
+        参数：
+        - now (Optional[float])：当前时间戳，默认为clock()的返回值。
+
+        返回：
+        - List[Task]：已逾期的未完成任务列表，按截止时间从早到晚排列。
+        """
+        now = self._clock() if now is None else now
+        return [task for _, _, task in self._index[:bisect.bisect_left(self._index, (now,))]]
+
+    def get_tasks_due_between(self, start: float, end: float) -> List[Task]:
+        """
+        获取截止时间位于[start, end)区间内的全部未完成任务。
+
+        参数：
+        - start (float)：区间起始时间戳。
+        - end (float)：区间结束时间戳。
+
+        返回：
+        - List[Task]：符合条件的未完成任务列表，按截止时间从早到晚排列。
+        """
+        low = bisect.bisect_left(self._index, (start,))
+        high = bisect.bisect_left(self._index, (end,))
+        return [task for _, _, task in self._index[low:high]]
+
+    def on_tasks_reset(self, tasks: List[Task]) -> None:
+        self._tasks = tasks
+        self._rebuild()
+        self._schedule_changed()
+
+    def on_task_added(self, index: int, task: Task) -> None:
+        if self._track(task):
+            self._schedule_changed()
+
+    def on_task_updated(self, index: int, old_task: Task, new_task: Task) -> None:
+        changed = self._untrack(old_task)
+        changed = self._track(new_task) or changed
+        self._compact_if_needed()
+        if changed:
+            self._schedule_changed()
+
+    def on_task_removed(self, index: int, task: Task) -> None:
+        if self._untrack(task):
+            self._compact_if_needed()
+            self._schedule_changed()
+
+    @staticmethod
+    def _is_tracked(task: Task) -> bool:
+        """
+        私有方法，判断任务是否需要跟踪，即有截止时间且尚未完成。
+        """
+        return task.due_date is not None and task.progress < 100
+
+    def _track(self, task: Task) -> bool:
+        """
+        私有方法，将任务加入有序索引，截止时间晚于当前时间时同时加入提醒堆。
+
+        返回：
+        - bool：任务是否被跟踪。
+        """
+        if not self._is_tracked(task):
+            return False
+        key = (task.due_date.timestamp(), next(self._counter), task)
+        bisect.insort(self._index, key)
+        self._index_keys.setdefault(id(task), []).append(key)
+        if key[0] > self._clock():
+            entry = list(key)
+            self._heap_entries.setdefault(id(task), []).append(entry)
+            heapq.heappush(self._heap, entry)
+        return True
+
+    def _untrack(self, task: Task) -> bool:
+        """
+        私有方法，将任务从有序索引中删除，并将其在提醒堆中的条目标记为失效。
+
+        返回：
+        - bool：任务此前是否被跟踪。
+        """
+        keys = self._index_keys.get(id(task))
+        if not keys:
+            return False
+        key = keys.pop()
+        if not keys:
+            del self._index_keys[id(task)]
+        del self._index[bisect.bisect_left(self._index, key[:2])]
+        entries = self._heap_entries.get(id(task))
+        if entries:
+            entries.pop()[2] = None
+            self._stale += 1
+            if not entries:
+                del self._heap_entries[id(task)]
+            self._drop_stale_top()
+        return True
+
+    def _drop_stale_top(self) -> None:
+        """
+        私有方法，弹出堆顶的失效条目，使堆顶总是有效的提醒。
+        """
+        while self._heap and self._heap[0][2] is None:
+            heapq.heappop(self._heap)
+            self._stale -= 1
+
+    def _compact_if_needed(self) -> None:
+        """
+        私有方法，失效条目占比过高时重建提醒堆。
+        """
+        if self._stale > _STALE_RATIO_LIMIT * len(self._heap):
+            self._heap = [entry for entry in self._heap if entry[2] is not None]
+            heapq.heapify(self._heap)
+            self._stale = 0
+
+    def _rebuild(self) -> None:
+        """
+        私有方法，根据当前任务列表重建有序索引与提醒堆。
+        """
+        now = self._clock()
+        self._index = sorted((task.due_date.timestamp(), next(self._counter), task)
+                             for task in self._tasks if self._is_tracked(task))
+        self._index_keys = {}
+        self._heap = []
+        self._heap_entries = {}
+        self._stale = 0
+        for key in self._index:
+            self._index_keys.setdefault(id(key[2]), []).append(key)
+            if key[0] > now:
+                entry = list(key)
+                self._heap_entries.setdefault(id(key[2]), []).append(entry)
+                self._heap.append(entry)
+        heapq.heapify(self._heap)
+
+    def _schedule_changed(self) -> None:
+        """
+        私有方法，提醒安排发生变化时通知界面重新安排唤醒时间。
+        """
+        if self.on_schedule_changed is not None:
+            self.on_schedule_changed()
@@ -0,0 +1,96 @@
+import json
+import os
+import time
+from typing import Dict, List, Tuple
+
+# 启动计时的输出方式：设置为"print"时打印到控制台，设置为其他非空值时视为JSON文件路径并写入该文件
+STARTUP_TIMING_ENV = "EISENTODO_STARTUP_TIMING"
+
+# 进程开始启动的时间点，以本模块被导入的时刻为准，main.py应最先导入本模块
+_PROCESS_START = time.perf_counter()
+
+
+class StartupTimer:
+    """
+    StartupTimer类记录应用启动各阶段（导入、加载配置、加载任务、首帧渲染等）的耗时，
+    每个阶段以调用mark的时刻为结束点，以上一个阶段的结束点为起点。
+    """
+    def __init__(self, start: float = _PROCESS_START):
+        """
+        初始化StartupTimer对象。
+
+        参数：
+        - start (float)：启动开始的time.perf_counter()时间点，默认为本模块被导入的时刻。
+        """
+        self._start = start
+        self._last = start
+        self._phases: List[Tuple[str, float]] = []
+        self.reported = False
+
+    def mark(self, phase: str) -> float:
+        """
+        结束一个启动阶段并记录其耗时。
+
+        参数：
+        - phase (str)：阶段名称，如"import"、"config_load"、"task_load"、"first_frame"。
+
+        返回：
+        - float：该阶段的耗时，单位为秒。
+        """
+        now = time.perf_counter()
+        elapsed = now - self._last
+        self._last = now
+        self._phases.append((phase, elapsed))
+        return elapsed
+
+    def get_timings(self) -> Dict[str, float]:
+        """
+        获取已记录的各阶段耗时以及从启动开始到最后一个阶段结束的总耗时（键为"total"），单位为秒。
+        """
+        timings = dict(self._phases)
+        timings["total"] = self._last - self._start
+        return timings
+
+    def format_report(self) -> str:
+        """
+        生成各阶段耗时的文本报告，单位为毫秒。
+        """
+        lines = [f"{phase}: {elapsed * 1000:.1f} ms" for phase, elapsed in self._phases]
+        lines.append(f"total: {(self._last - self._start) * 1000:.1f} ms")
+        return "\n".join(lines)
+
+    def write(self, file_path: str) -> None:
+        """
+        将各阶段耗时以JSON格式写入文件。
+
+        参数：
+        - file_path (str)：目标文件路径。
+
+        抛出异常：
+        - IOError：如果写入文件时出现IO错误，抛出此异常并说明具体的IO问题所在。
+        """
+        try:
+            with open(file_path, 'w', encoding='utf-8') as file:
+                json.dump(self.get_timings(), file, indent=2)
+        except IOError as e:
+            raise IOError(f"写入启动计时文件 {file_path} 时出错: {str(e)}")
+
+    def report(self) -> None:
+        """
+        按STARTUP_TIMING_ENV环境变量输出启动计时，未设置该环境变量时不输出。每个计时器只输出一次。
+        """
+        if self.reported:
+            return
+        self.reported = True
+        target = os.environ.get(STARTUP_TIMING_ENV, "")
+        if target == "print":
+            print(self.format_report())
+        elif target:
+            try:
+                self.write(target)
+            except IOError as e:
+                print(str(e))
+
+
+# 应用启动过程共用的计时器
+startup_timer = StartupTimer()
\ No newline at end of file
@@ -0,0 +1,285 @@
+import gzip
+import json
+import os
+import time
+import zlib
+from typing import Dict, Iterator, List, Tuple
+from task_model import Task, TASK_CATEGORIES
+from file_path_utils import create_directory_for_path
+
+# 检查归档文件末尾是否有残缺gzip成员时每次读取的字节数
+SCAN_CHUNK_SIZE = 64 * 1024
+
+
+class TaskArchive:
+    """
+    TaskArchive类实现已完成任务的冷归档层：已完成任务以gzip压缩的JSON Lines格式追加写入独立的归档文件，
+    不再参与任务列表的加载、保存、筛选、排序与显示。归档文件只追加不改写，查询时以流式方式逐条读取，
+    无需整体加载到内存；各类别的归档数量保存在旁路的元数据文件中，统计时无需读取归档文件。
+    """
+    def __init__(self, archive_path: str = "tasks_archive.jsonl.gz"):
+        """
+        初始化TaskArchive对象，只读取体积很小的元数据文件，不读取归档文件本身。
+
+        参数：
+        - archive_path (str)：归档文件路径，默认为"tasks_archive.jsonl.gz"，元数据保存在同名的".meta.json"文件中。
+        """
+        self.archive_path = archive_path
+        self.meta_path = archive_path + ".meta.json"
+        self._meta = self._load_meta()
+
+    def append(self, tasks: List[Task]) -> List[int]:
+        """
+        将任务追加写入归档文件，每次追加写入一个新的gzip成员，已有内容不会被改写。
+        写入前先截断上次写入中断留下的残缺gzip成员，否则之后追加的记录在读取时都会被忽略。
+        上一次追加的任务（按唯一标识判断，已恢复的除外）不会被重复写入，而是沿用原归档编号，
+        因此追加后保存任务列表之前中断时，再次归档同一批任务不会产生重复的归档记录。
+
+        参数：
+        - tasks (List[Task])：要归档的任务对象列表。
+
+        返回：
+        - List[int]：为每个任务分配的归档编号，可用于恢复任务。
+
+        抛出异常：
+        - IOError：如果写入归档文件或元数据文件时出现IO错误，抛出此异常并说明具体的IO问题所在。
+        """
+        if not tasks:
+            return []
+        create_directory_for_path(self.archive_path)
+        self._truncate_torn_tail()
+        archived_at = time.strftime("%Y-%m-%d %H:%M:%S")
+        restored = set(self._meta["restored"])
+        last_batch = self._meta.get("last_batch", {})
+        batch = {task_id: entry for task_id, entry in last_batch.items() if entry[0] not in restored}
+        pending = [task for task in tasks if task.task_id not in batch]
+        try:
+            if pending:
+                with gzip.open(self.archive_path, 'at', encoding='utf-8') as file:
+                    for task in pending:
+                        archive_id = self._meta["next_id"]
+                        self._meta["next_id"] += 1
+                        record = dict(task.to_dict(), archive_id=archive_id, archived_at=archived_at)
+                        file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                        self._meta["counts"][task.category] += 1
+                        batch[task.task_id] = [archive_id, task.category]
+        except IOError as e:
+            self._meta = self._load_meta()
+            raise IOError(f"写入归档文件 {self.archive_path} 时出错: {str(e)}")
+        self._meta["last_batch"] = {task.task_id: batch[task.task_id] for task in tasks}
+        self._meta["size"] = os.path.getsize(self.archive_path) if os.path.exists(self.archive_path) else 0
+        self._save_meta()
+        return [batch[task.task_id][0] for task in tasks]
+
+    def undo_append(self) -> None:
+        """
+        撤销最近一次append：将其归档的任务全部标记为已移除（与已恢复的记录一样在压缩整理时才被移除），
+        用于归档后保存任务列表失败、任务仍留在任务列表中的情况。
+
+        抛出异常：
+        - IOError：如果写入元数据文件时出现IO错误，抛出此异常。
+        """
+        for archive_id, category in self._meta.pop("last_batch", {}).values():
+            if archive_id not in self._meta["restored"]:
+                self._meta["restored"].append(archive_id)
+                self._meta["counts"][category] -= 1
+        self._save_meta()
+
+    def iter_tasks(self, category: str = "", keyword: str = "") -> Iterator[Tuple[int, Task]]:
+        """
+        以流式方式逐条读取归档中的任务，已恢复的任务会被跳过。
+
+        参数：
+        - category (str)：只返回该类别的任务，空字符串表示不限类别。
+        - keyword (str)：只返回名称或描述中包含该关键字的任务，空字符串表示不限关键字。
+
+        返回：
+        - Iterator[Tuple[int, Task]]：依次产生(归档编号, 任务对象)的迭代器。
+        """
+        restored = set(self._meta["restored"])
+        for record in self._iter_records():
+            if record["archive_id"] in restored:
+                continue
+            if category and record["category"] != category:
+                continue
+            if keyword and keyword not in record["name"] and keyword not in record["description"]:
+                continue
+            yield record["archive_id"], Task.from_dict(record)
+
+    def get_task(self, archive_id: int) -> Task:
+        """
+        读取指定编号的归档任务，不将其标记为已恢复。
+
+        参数：
+        - archive_id (int)：归档编号。
+
+        返回：
+        - Task：归档的任务对象。
+
+        抛出异常：
+        - KeyError：如果归档中不存在该编号的任务或该任务已被恢复，抛出此异常。
+        """
+        if archive_id not in self._meta["restored"]:
+            for record in self._iter_records():
+                if record["archive_id"] == archive_id:
+                    return Task.from_dict(record)
+        raise KeyError(f"归档中不存在编号为 {archive_id} 的任务")
+
+    def mark_restored(self, archive_id: int, task: Task) -> None:
+        """
+        将指定编号的任务标记为已恢复，归档文件本身不会被改写，已恢复的记录在压缩整理时才被移除。已标记的编号会被忽略。
+
+        参数：
+        - archive_id (int)：归档编号。
+        - task (Task)：该编号对应的任务对象（由get_task返回），用于更新各类别的归档数量。
+
+        抛出异常：
+        - IOError：如果写入元数据文件时出现IO错误，抛出此异常。
+        """
+        if archive_id not in self._meta["restored"]:
+            self._meta["restored"].append(archive_id)
+            self._meta["counts"][task.category] -= 1
+            self._save_meta()
+
+    def restore(self, archive_id: int) -> Task:
+        """
+        将指定编号的任务标记为已恢复并返回该任务，归档文件本身不会被改写，已恢复的记录在压缩整理时才被移除。
+
+        参数：
+        - archive_id (int)：要恢复的任务的归档编号。
+
+        返回：
+        - Task：被恢复的任务对象。
+
+        抛出异常：
+        - KeyError：如果归档中不存在该编号的任务或该任务已被恢复，抛出此异常。
+        """
+        task = self.get_task(archive_id)
+        self.mark_restored(archive_id, task)
+        return task
+
+    def get_count(self, category: str = "") -> int:
+        """
+        获取归档中指定类别（空字符串表示全部类别）的任务数量，不读取归档文件。
+        """
+        if category == "":
+            return sum(self._meta["counts"].values())
+        return self._meta["counts"].get(category, 0)
+
+    def compact(self) -> int:
+        """
+        压缩整理归档文件：将未恢复的记录重写到新的归档文件中，并以原子替换的方式覆盖旧文件。
+
+        返回：
+        - int：被移除的已恢复记录数量。
+
+        抛出异常：
+        - IOError：如果写入归档文件时出现IO错误，抛出此异常并说明具体的IO问题所在。
+        """
+        restored = set(self._meta["restored"])
+        if not os.path.exists(self.archive_path):
+            return 0
+        self._truncate_torn_tail()
+        temp_path = self.archive_path + ".tmp"
+        counts = {category: 0 for category in TASK_CATEGORIES}
+        try:
+            with gzip.open(temp_path, 'wt', encoding='utf-8') as file:
+                for record in self._iter_records():
+                    if record["archive_id"] in restored:
+                        continue
+                    file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    counts[record["category"]] += 1
+            os.replace(temp_path, self.archive_path)
+        except IOError as e:
+            raise IOError(f"整理归档文件 {self.archive_path} 时出错: {str(e)}")
+        self._meta["restored"] = []
+        self._meta["counts"] = counts
+        self._meta["last_batch"] = {}
+        self._meta["size"] = os.path.getsize(self.archive_path)
+        self._save_meta()
+        return len(restored)
+
+    def _iter_records(self) -> Iterator[Dict[str, object]]:
+        """
+        私有方法，逐条读取归档文件中的原始记录。写入中断导致的末尾残缺记录会被忽略。
+        """
+        if not os.path.exists(self.archive_path):
+            return
+        try:
+            with gzip.open(self.archive_path, 'rt', encoding='utf-8') as file:
+                for line in file:
+                    if not line.endswith("\n"):
+                        break  # 末尾残缺的记录
+                    yield json.loads(line)
+        except (EOFError, zlib.error, gzip.BadGzipFile):
+            return  # 末尾残缺的gzip成员
+
+    def _truncate_torn_tail(self) -> None:
+        """
+        私有方法，归档文件大小与元数据中记录的不一致时（上次写入中断），扫描找到最后一个完整gzip成员的结尾，
+        并截断其后残缺的内容。文件大小一致时无需读取归档文件。
+        """
+        if not os.path.exists(self.archive_path):
+            return
+        size = os.path.getsize(self.archive_path)
+        if size == self._meta.get("size"):
+            return
+        valid_end = self._scan_valid_end()
+        if valid_end < size:
+            print(f"归档文件 {self.archive_path} 末尾有写入中断留下的残缺内容，已截断 {size - valid_end} 字节")
+            try:
+                with open(self.archive_path, 'r+b') as file:
+                    file.truncate(valid_end)
+            except IOError as e:
+                raise IOError(f"截断归档文件 {self.archive_path} 时出错: {str(e)}")
+        self._meta["size"] = valid_end
+
+    def _scan_valid_end(self) -> int:
+        """
+        私有方法，逐个解压归档文件中的gzip成员，返回最后一个完整成员结尾处的字节偏移。
+        """
+        valid_end = offset = 0
+        decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        with open(self.archive_path, 'rb') as file:
+            for chunk in iter(lambda: file.read(SCAN_CHUNK_SIZE), b""):
+                while chunk:
+                    try:
+                        decompressor.decompress(chunk)
+                    except zlib.error:
+                        return valid_end
+                    if not decompressor.eof:
+                        offset += len(chunk)
+                        break
+                    offset += len(chunk) - len(decompressor.unused_data)
+                    valid_end = offset
+                    chunk = decompressor.unused_data
+                    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        return valid_end
+
+    def _load_meta(self) -> Dict[str, object]:
+        """
+        私有方法，加载归档元数据，元数据文件不存在或已损坏时通过流式扫描归档文件重新计算。
+        """
+        if os.path.exists(self.meta_path):
+            try:
+                with open(self.meta_path, 'r', encoding='utf-8') as file:
+                    return json.load(file)
+            except (IOError, json.JSONDecodeError) as e:
+                print(f"加载归档元数据 {self.meta_path} 时出错，将重新统计: {str(e)}")
+        meta = {"next_id": 0, "counts": {category: 0 for category in TASK_CATEGORIES}, "restored": []}
+        for record in self._iter_records():
+            meta["next_id"] = max(meta["next_id"], record["archive_id"] + 1)
+            meta["counts"][record["category"]] += 1
+        return meta
+
+    def _save_meta(self) -> None:
+        """
+        私有方法，以写入临时文件后原子替换的方式保存归档元数据。
+        """
+        temp_path = self.meta_path + ".tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                json.dump(self._meta, file, ensure_ascii=False)
+            os.replace(temp_path, self.meta_path)
+        except IOError as e:
+            raise IOError(f"保存归档元数据 {self.meta_path} 时出错: {str(e)}")
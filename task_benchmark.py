@@ -0,0 +1,656 @@
+"""
+任务管理核心的无界面基准测试：生成指定规模的合成任务数据，测量TaskPersistence与TaskManager各项操作的
+吞吐量、延迟分位数和峰值内存，以JSON格式输出结果，并可与保存的基线结果比较，超过回归阈值时以非零状态退出。
+
+用法示例：
+    python task_benchmark.py --sizes 1000,10000,100000 --output result.json
+    python task_benchmark.py --sizes 1000,10000 --baseline baseline.json --threshold 0.2
+    python task_benchmark.py --sizes 10000 --persist-repeat 20 --baseline baseline.json --metric min_ms
+    python task_benchmark.py --crash-test 200 --crash-size 10000 --fsync never
+    python task_benchmark.py --stress-test 16 --stress-ops 200 --fsync never
+"""
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+from task_model import Task, TASK_CATEGORIES
+import task_persistence
+from task_persistence import TaskPersistence, CSV_FIELDS, DEFAULT_FSYNC_POLICY, FSYNC_POLICIES, write_csv_tasks
+from task_logic import TaskManager
+from task_scheduler import NextActionScheduler
+from fuzzy_search import FuzzySearchIndex
+from description_store import DescriptionStore
+
+# 默认测试的任务规模
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+# 每种单任务操作（添加、编辑、删除等）默认执行的次数
+DEFAULT_OPS = 20
+
+# 每种整体持久化操作（保存、加载、导入、导出）默认计时执行的次数，计时前另有一次不计时的预热执行
+DEFAULT_PERSIST_REPEAT = 10
+
+# 回归比较可选的延迟指标：中位延迟，或受偶发干扰最小的最小延迟
+COMPARE_METRICS = ("p50_ms", "min_ms")
+
+# 默认的回归阈值：当前结果的中位延迟比基线慢20%以上视为回归
+DEFAULT_THRESHOLD = 0.2
+
+# 崩溃测试默认的任务规模
+DEFAULT_CRASH_SIZE = 10000
+
+# 崩溃测试中写入进程在注入的崩溃点退出时使用的状态码
+CRASH_EXIT_CODE = 75
+
+# 压力测试默认的任务规模和每个线程执行的操作次数
+DEFAULT_STRESS_SIZE = 2000
+DEFAULT_STRESS_OPS = 200
+
+# 写完临时文件之后的崩溃点：写日志记录前、日志记录写到一半、替换原文件前、替换原文件后
+_CRASH_PHASES = 4
+
+_WORDS = ["报告", "会议", "邮件", "review", "deploy", "预算", "设计", "测试", "文档", "客户", "计划", "update"]
+
+
+def generate_tasks(count: int, seed: int = 0) -> List[Task]:
+    """
+    生成合成任务，任务均匀分布在四个类别中，约三分之一的任务带有截止时间。
+
+    参数：
+    - count (int)：任务数量。
+    - seed (int)：随机数种子，默认为0，相同种子生成相同的任务。
+
+    返回：
+    - List[Task]：生成的任务对象列表。
+    """
+    rng = random.Random(seed)
+    base = datetime(2025, 1, 1)
+    tasks = []
+    for index in range(count):
+        name = f"{rng.choice(_WORDS)} {rng.choice(_WORDS)} {index}"
+        description = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(0, 8)))
+        due_date = base + timedelta(minutes=rng.randint(0, 525600)) if rng.random() < 0.33 else None
+        tasks.append(Task(name, description, rng.randint(0, 100), TASK_CATEGORIES[index % 4], due_date))
+    return tasks
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    """
+    私有函数，计算已排序数据的分位数（最近秩法）。
+    """
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(latencies: List[float], items: int, peak_bytes: int) -> Dict[str, float]:
+    """
+    汇总一组操作的测量结果。
+
+    参数：
+    - latencies (List[float])：每次操作的耗时，单位为秒。
+    - items (int)：每次操作处理的任务数量，用于计算每秒处理的任务数。
+    - peak_bytes (int)：执行一次该操作期间的峰值内存（字节）。
+
+    返回：
+    - Dict[str, float]：包含次数、每秒操作数、每秒处理任务数、平均、最小与p50/p95/p99延迟（毫秒）以及峰值内存的字典。
+    """
+    ordered = sorted(latencies)
+    total = sum(ordered)
+    return {
+        "count": len(ordered),
+        "ops_per_sec": len(ordered) / total if total else 0.0,
+        "items_per_sec": len(ordered) * items / total if total else 0.0,
+        "mean_ms": total / len(ordered) * 1000 if ordered else 0.0,
+        "min_ms": ordered[0] * 1000 if ordered else 0.0,
+        "p50_ms": _percentile(ordered, 0.50) * 1000,
+        "p95_ms": _percentile(ordered, 0.95) * 1000,
+        "p99_ms": _percentile(ordered, 0.99) * 1000,
+        "peak_memory_kb": peak_bytes / 1024,
+    }
+
+
+def measure(operation: Callable[[int], object], repeat: int, items: int = 1, warmup: int = 0) -> Dict[str, float]:
+    """
+    测量一项操作：先不计时地预热执行warmup次（使文件缓存、导入和惰性初始化不影响第一次计时），
+    再在不开启tracemalloc的情况下执行repeat次并记录每次的耗时，最后在tracemalloc下额外执行一次记录峰值内存，
+    内存跟踪的开销不会计入耗时。
+
+    参数：
+    - operation (Callable[[int], object])：要测量的操作，参数为第几次执行（从0开始，预热执行也计入）。
+    - repeat (int)：计时执行的次数。
+    - items (int)：每次操作处理的任务数量，默认为1。
+    - warmup (int)：预热执行的次数，默认为0。
+
+    返回：
+    - Dict[str, float]：summarize的汇总结果。
+    """
+    for iteration in range(warmup):
+        operation(iteration)
+    latencies = []
+    for iteration in range(warmup, warmup + repeat):
+        start = time.perf_counter()
+        operation(iteration)
+        latencies.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        operation(warmup + repeat)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return summarize(latencies, items, peak)
+
+
+def run_size(size: int, ops: int, seed: int, workdir: str, fsync_policy: str = DEFAULT_FSYNC_POLICY,
+             persist_repeat: int = DEFAULT_PERSIST_REPEAT) -> Dict[str, Dict[str, float]]:
+    """
+    在指定规模的合成数据上测量全部操作。
+
+    参数：
+    - size (int)：任务数量。
+    - ops (int)：每种单任务操作的执行次数。
+    - seed (int)：随机数种子。
+    - workdir (str)：存放临时文件的目录。
+    - fsync_policy (str)：任务文件的fsync策略，默认为DEFAULT_FSYNC_POLICY。
+    - persist_repeat (int)：每种整体持久化操作计时执行的次数，默认为DEFAULT_PERSIST_REPEAT。
+
+    返回：
+    - Dict[str, Dict[str, float]]：操作名称到测量结果的映射。
+    """
+    rng = random.Random(seed)
+    tasks = generate_tasks(size, seed)
+    csv_path = os.path.join(workdir, f"tasks_{size}.csv")
+    export_path = os.path.join(workdir, f"export_{size}.csv")
+    for path in (csv_path, export_path):
+        open(path, 'w').close()  # TaskPersistence要求文件已存在
+    persistence = TaskPersistence(csv_path, fsync_policy)
+    results = {}
+    results["save_tasks"] = measure(lambda i: persistence.save_tasks(tasks), persist_repeat, size, warmup=1)
+    results["load_tasks"] = measure(lambda i: persistence.load_tasks(), persist_repeat, size, warmup=1)
+    results["import_tasks"] = measure(lambda i: persistence.import_tasks(csv_path), persist_repeat, size, warmup=1)
+    results["export_tasks"] = measure(lambda i: persistence.export_tasks(export_path), persist_repeat, size, warmup=1)
+
+    manager = TaskManager(persistence)
+    results["add_task"] = measure(lambda i: manager.add_task(Task(f"新任务 {i}", "", 0, TASK_CATEGORIES[i % 4])), ops)
+    results["edit_task"] = measure(
+        lambda i: manager.edit_task(rng.randrange(len(manager.tasks)), Task(f"编辑 {i}", "", 50, TASK_CATEGORIES[i % 4])), ops)
+    results["delete_task"] = measure(lambda i: manager.delete_task(rng.randrange(len(manager.tasks))), ops)
+    results["get_tasks_by_category"] = measure(lambda i: manager.get_tasks_by_category(TASK_CATEGORIES[i % 4]), ops, size // 4)
+    results["filter_tasks"] = measure(lambda i: manager.filter_tasks(_WORDS[i % len(_WORDS)], {"progress": (20, 80)}), ops, size)
+    results["sort_tasks"] = measure(lambda i: manager.sort_tasks(("name", "progress", "category")[i % 3], i % 2 == 0), ops, size)
+    return results
+
+
+def run_benchmark(sizes: List[int], ops: int = DEFAULT_OPS, seed: int = 0, fsync_policy: str = DEFAULT_FSYNC_POLICY,
+                  persist_repeat: int = DEFAULT_PERSIST_REPEAT) -> Dict[str, object]:
+    """
+    依次在各规模上运行基准测试。
+
+    参数：
+    - sizes (List[int])：要测试的任务规模列表。
+    - ops (int)：每种单任务操作的执行次数，默认为DEFAULT_OPS。
+    - seed (int)：随机数种子，默认为0。
+    - fsync_policy (str)：任务文件的fsync策略，默认为DEFAULT_FSYNC_POLICY。
+    - persist_repeat (int)：每种整体持久化操作计时执行的次数，默认为DEFAULT_PERSIST_REPEAT。
+
+    返回：
+    - Dict[str, object]：包含运行环境信息（"meta"）和各规模测量结果（"results"，键为规模的字符串形式）的字典。
+    """
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="eisentodo_bench_") as workdir:
+        for size in sizes:
+            results[str(size)] = run_size(size, ops, seed, workdir, fsync_policy, persist_repeat)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "ops": ops,
+            "persist_repeat": persist_repeat,
+            "seed": seed,
+            "fsync_policy": fsync_policy,
+        },
+        "results": results,
+    }
+
+
+def _task_keys(tasks: List[Task]) -> List[tuple]:
+    """
+    私有函数，取任务除唯一标识和创建时间外的各列，用于比较不同进程生成的同一批合成任务（唯一标识和创建时间每次生成时不同）。
+    """
+    fields = [field for field in CSV_FIELDS if field not in ("id", "created_at")]
+    return [tuple(task.to_dict()[field] for field in fields) for task in tasks]
+
+
+def _csv_size(tasks: List[Task], descriptions: DescriptionStore) -> int:
+    """
+    私有函数，计算任务写入任务文件后的字节数；合成任务的描述都较短，直接写在任务文件中，不会写入描述文件。
+    """
+    buffer = io.StringIO(newline='')
+    write_csv_tasks(buffer, tasks, descriptions)
+    return len(buffer.getvalue().encode('utf-8'))
+
+
+def _exit_at_crash_point() -> None:
+    """
+    私有函数，模拟写入进程在崩溃点被杀死：不执行任何清理直接退出。
+    """
+    os._exit(CRASH_EXIT_CODE)
+
+
+def _crash_writer(csv_path: str, size: int, seed: int, offset: int, fsync_policy: str) -> None:
+    """
+    私有函数，崩溃测试的写入进程：保存一批新的合成任务，在offset指定的崩溃点退出。
+    offset小于临时文件大小时为写到该字节处，已写出的字节落盘后退出；之后的_CRASH_PHASES个值依次对应写完临时文件之后的各个崩溃点。
+    """
+    persistence = TaskPersistence(csv_path, fsync_policy)
+    tasks = generate_tasks(size, seed)
+    phase = offset - _csv_size(tasks, persistence.descriptions)
+    if phase < 0:
+        def write_until_offset(file, rows, descriptions) -> int:
+            data = io.StringIO(newline='')
+            write_csv_tasks(data, rows, descriptions)
+            file.buffer.write(data.getvalue().encode('utf-8')[:offset])
+            file.buffer.flush()
+            _exit_at_crash_point()
+
+        task_persistence.write_csv_tasks = write_until_offset
+    elif phase == 0:
+        persistence._append_record = lambda record, sync: _exit_at_crash_point()
+    elif phase == 1:
+        def append_half(record, sync):
+            line = task_persistence._format_record(record)
+            with open(persistence.wal_path, 'ab') as file:
+                file.write(line[:len(line) // 2])
+            _exit_at_crash_point()
+
+        persistence._append_record = append_half
+    elif phase == 2:
+        task_persistence.os.replace = lambda source, target: _exit_at_crash_point()
+    else:
+        persistence._sync_directory = lambda sync: _exit_at_crash_point()
+    persistence.save_tasks(tasks)
+
+
+def run_crash_test(rounds: int, size: int = DEFAULT_CRASH_SIZE, seed: int = 0,
+                   fsync_policy: str = DEFAULT_FSYNC_POLICY) -> Dict[str, object]:
+    """
+    崩溃测试：每一轮由子进程保存一批新任务，并在随机选取的字节位置或写入步骤处（各占一半）退出，随后测量恢复耗时，
+    检查恢复后加载的任务恰好是保存前或保存后的那一批。每轮之后还有四分之一的概率将任务文件截断到随机位置，
+    模拟不刷盘时断电写坏的文件，检查恢复能识别损坏并保留完整的行。
+
+    参数：
+    - rounds (int)：测试轮数。
+    - size (int)：每批任务的数量，默认为DEFAULT_CRASH_SIZE。
+    - seed (int)：随机数种子，默认为0。
+    - fsync_policy (str)：任务文件的fsync策略，默认为DEFAULT_FSYNC_POLICY。
+
+    返回：
+    - Dict[str, object]：包含轮数、各类结果的次数、失败说明（"failures"）和恢复耗时汇总（"recovery"）的字典。
+    """
+    rng = random.Random(seed)
+    outcomes = {"old": 0, "new": 0, "salvaged": 0}
+    failures = []
+    latencies = []
+    with tempfile.TemporaryDirectory(prefix="eisentodo_crash_") as workdir:
+        csv_path = os.path.join(workdir, "tasks.csv")
+        open(csv_path, 'w').close()
+        current = generate_tasks(size, seed)
+        TaskPersistence(csv_path, fsync_policy).save_tasks(current)
+        for round_index in range(rounds):
+            generation_seed = seed + round_index + 1
+            incoming = generate_tasks(size, generation_seed)
+            data_size = _csv_size(incoming, DescriptionStore(csv_path))
+            offset = rng.randrange(data_size) if rng.random() < 0.5 else data_size + rng.randrange(_CRASH_PHASES)
+            writer = multiprocessing.Process(target=_crash_writer,
+                                             args=(csv_path, size, generation_seed, offset, fsync_policy))
+            writer.start()
+            writer.join()
+            if writer.exitcode != CRASH_EXIT_CODE:
+                failures.append(f"第{round_index}轮：写入进程退出状态为{writer.exitcode}")
+                continue
+
+            start = time.perf_counter()
+            persistence = TaskPersistence(csv_path, fsync_policy)
+            latencies.append(time.perf_counter() - start)
+            loaded = _task_keys(persistence.load_tasks())
+            if loaded == _task_keys(current):
+                outcomes["old"] += 1
+            elif loaded == _task_keys(incoming):
+                outcomes["new"] += 1
+                current = incoming
+            else:
+                failures.append(f"第{round_index}轮：崩溃点{offset}处中断后加载的任务既不是保存前也不是保存后的内容")
+                persistence.save_tasks(current)
+                continue
+
+            if rng.random() < 0.25:
+                with open(csv_path, 'r+b') as file:
+                    file.truncate(rng.randrange(1, os.path.getsize(csv_path)))
+                persistence = TaskPersistence(csv_path, fsync_policy)
+                salvaged = _task_keys(persistence.load_tasks())
+                if not persistence.recovery_actions or salvaged != _task_keys(current)[:len(salvaged)]:
+                    failures.append(f"第{round_index}轮：截断的任务文件未被识别或恢复后的任务不是原任务的前缀")
+                else:
+                    outcomes["salvaged"] += 1
+                persistence.save_tasks(current)
+    return {"rounds": rounds, "size": size, "fsync_policy": fsync_policy, "outcomes": outcomes,
+            "failures": failures, "recovery": summarize(latencies, size, 0)}
+
+
+def _check_consistency(manager: TaskManager) -> Optional[str]:
+    """
+    私有函数，在同一个读锁内取得任务列表快照、各类别的任务和统计数据，检查它们彼此一致，返回不一致之处的说明，一致时返回None。
+    """
+    with manager.reading():
+        snapshot = manager.snapshot()
+        statistics = manager.get_statistics()
+        by_category = {category: manager.get_tasks_by_category(category) for category in TASK_CATEGORIES}
+    task_ids = [task.task_id for task in snapshot]
+    if len(set(task_ids)) != len(task_ids):
+        return "快照中存在重复的任务"
+    if statistics["全部"]["count"] != len(snapshot):
+        return f"统计的任务数量{statistics['全部']['count']}与快照中的{len(snapshot)}个不一致"
+    for category, tasks in by_category.items():
+        if [task.task_id for task in tasks] != [task.task_id for task in snapshot if task.category == category]:
+            return f"类别 {category} 的索引与快照不一致"
+        if statistics[category]["count"] != len(tasks):
+            return f"类别 {category} 的统计数量与索引不一致"
+    return None
+
+
+def _stress_write(manager: TaskManager, rng: random.Random, serial: int) -> Dict[str, int]:
+    """
+    私有函数，执行一次随机的修改（添加、编辑、删除，或在deferred_save中合并的一批修改），
+    选取位置和修改在同一个writing块内进行，返回添加和删除的任务数量。
+    """
+    counts = {"added": 0, "deleted": 0}
+    with manager.writing():
+        choice = rng.random()
+        if choice < 0.8:
+            operations = [choice]
+        else:
+            operations = [rng.random() * 0.8 for _ in range(rng.randint(2, 5))]
+        with manager.deferred_save():
+            for operation in operations:
+                if operation < 0.3 or not manager.tasks:
+                    manager.add_task(Task(f"压力 {serial}", "", rng.randint(0, 100), rng.choice(TASK_CATEGORIES)))
+                    counts["added"] += 1
+                elif operation < 0.6:
+                    index = rng.randrange(len(manager.tasks))
+                    manager.edit_task(index, manager.tasks[index].replace(progress=rng.randint(0, 100),
+                                                                          category=rng.choice(TASK_CATEGORIES)))
+                else:
+                    manager.delete_task(rng.randrange(len(manager.tasks)))
+                    counts["deleted"] += 1
+    return counts
+
+
+def _matches_reference(result: List[tuple], expected: List[tuple], tasks) -> bool:
+    """
+    私有函数，判断(任务, 得分)形式的查询结果与单线程重新计算的参考结果是否一致：得分序列完全相同，
+    结果中的任务互不相同且都属于同一时刻的任务列表，参考结果中得分高于最低得分的任务都在结果中
+    （得分相同的任务之间的先后以及最低得分处取哪几个任务与索引的构建历史有关，可以不同）。
+    """
+    if [score for _, score in result] != [score for _, score in expected]:
+        return False
+    returned = {id(task) for task, _ in result}
+    if len(returned) != len(result) or not returned <= {id(task) for task in tasks}:
+        return False
+    lowest = result[-1][1] if result else None
+    return all(id(task) in returned for task, score in expected if score != lowest)
+
+
+def _check_queries_against_reference(manager: TaskManager, query: str) -> Optional[str]:
+    """
+    私有函数，在同一个读锁内取得任务列表快照、下一步任务和模糊搜索结果，与根据快照在单线程中重新构建的调度器和索引
+    得到的结果比较，返回不一致之处的说明，一致时返回None。
+    """
+    with manager.reading():
+        tasks = manager.snapshot()
+        next_tasks = manager.next_tasks(10)
+        matches = manager.fuzzy_search(query, 5)
+    scheduler = manager.scheduler
+    reference_scheduler = NextActionScheduler(scheduler.quadrant_weights, scheduler.remaining_weight, scheduler.age_weight,
+                                              clock=lambda: 0.0)
+    reference_scheduler.on_tasks_reset(list(tasks))
+    result = [(task, reference_scheduler.score(task)) for task in next_tasks]
+    expected = [(task, reference_scheduler.score(task)) for task in reference_scheduler.next_tasks(10)]
+    if not _matches_reference(result, expected, tasks):
+        return "下一步任务与单线程重新计算的结果不一致"
+    reference_index = FuzzySearchIndex()
+    reference_index.on_tasks_reset(list(tasks))
+    if not _matches_reference(matches, reference_index.search(query, 5), tasks):
+        return f"模糊搜索“{query}”的结果与单线程重新计算的结果不一致"
+    return None
+
+
+def _stress_read(manager: TaskManager, rng: random.Random) -> Optional[str]:
+    """
+    私有函数，执行一次随机的查询并检查结果自身满足的条件，下一步任务和模糊搜索的结果还与单线程重新计算的结果比较，
+    返回不满足之处的说明，满足时返回None。
+    """
+    choice = rng.randrange(5)
+    if choice == 0:
+        return _check_consistency(manager)
+    if choice == 1:
+        tasks = manager.get_tasks_by_category("")
+        before = [task.task_id for task in tasks]
+        time.sleep(0)
+        if [task.task_id for task in tasks] != before:
+            return "遍历过程中任务列表发生了变化"
+    elif choice == 2:
+        if any(not 20 <= task.progress <= 80 for task in manager.filter_tasks("", {"progress": (20, 80)})):
+            return "筛选结果中存在进度超出范围的任务"
+    elif choice == 3:
+        progress = [task.progress for task in manager.sort_tasks("progress", True)]
+        if progress != sorted(progress):
+            return "排序结果不是有序的"
+    else:
+        return _check_queries_against_reference(manager, rng.choice(_WORDS))
+    return None
+
+
+def run_stress_test(threads: int, ops: int = DEFAULT_STRESS_OPS, size: int = DEFAULT_STRESS_SIZE, seed: int = 0,
+                    fsync_policy: str = DEFAULT_FSYNC_POLICY, thread_safe: bool = True) -> Dict[str, object]:
+    """
+    并发压力测试：四分之一的线程（至少一个）不断执行随机修改，其余线程同时执行各种查询，
+    检查每次查询的结果（下一步任务和模糊搜索与根据同一时刻的快照在单线程中重新计算的结果比较）、
+    同一时刻的快照与类别索引和统计数据之间的一致性、遍历过程中结果不被修改，
+    并在全部线程结束后检查任务数量、增量统计和重新加载的任务文件与内存中的任务列表一致。
+
+    参数：
+    - threads (int)：线程总数。
+    - ops (int)：每个线程执行的操作次数，默认为DEFAULT_STRESS_OPS。
+    - size (int)：初始任务数量，默认为DEFAULT_STRESS_SIZE。
+    - seed (int)：随机数种子，默认为0。
+    - fsync_policy (str)：任务文件的fsync策略，默认为DEFAULT_FSYNC_POLICY。
+    - thread_safe (bool)：是否以线程安全模式创建TaskManager，为False时可用于对比，默认为True。
+
+    返回：
+    - Dict[str, object]：包含线程数、各线程第一次失败的说明（"failures"）、失败次数和读写延迟汇总（"reads"、"writes"）的字典。
+
+    抛出异常：
+    - ValueError：如果threads小于2，抛出此异常。
+    """
+    if threads < 2:
+        raise ValueError("压力测试至少需要2个线程")
+    writers = max(1, threads // 4)
+    failures: List[str] = []
+    failure_count = [0]
+    read_latencies: List[float] = []
+    write_latencies: List[float] = []
+    changes = {"added": 0, "deleted": 0}
+    lock = threading.Lock()
+
+    def run(thread_index: int) -> None:
+        rng = random.Random(seed * 1000 + thread_index)
+        latencies = []
+        first_failure = None
+        for serial in range(ops):
+            start = time.perf_counter()
+            try:
+                if thread_index < writers:
+                    counts = _stress_write(manager, rng, serial)
+                    with lock:
+                        changes["added"] += counts["added"]
+                        changes["deleted"] += counts["deleted"]
+                    problem = None
+                else:
+                    problem = _stress_read(manager, rng)
+            except Exception as e:
+                problem = f"{type(e).__name__}: {e}"
+            latencies.append(time.perf_counter() - start)
+            if problem is not None:
+                with lock:
+                    failure_count[0] += 1
+                first_failure = first_failure or problem
+        with lock:
+            (write_latencies if thread_index < writers else read_latencies).extend(latencies)
+            if first_failure is not None:
+                failures.append(f"线程{thread_index}：{first_failure}")
+
+    with tempfile.TemporaryDirectory(prefix="eisentodo_stress_") as workdir:
+        csv_path = os.path.join(workdir, "tasks.csv")
+        open(csv_path, 'w').close()
+        TaskPersistence(csv_path, fsync_policy).save_tasks(generate_tasks(size, seed))
+        manager = TaskManager(TaskPersistence(csv_path, fsync_policy), thread_safe=thread_safe)
+        manager.fuzzy_search(_WORDS[0])  # 预先构建模糊搜索索引：第一次搜索需要写锁，不能在_stress_read的读锁内进行
+        workers = [threading.Thread(target=run, args=(index,), name=f"stress-{index}") for index in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        problem = _check_consistency(manager)
+        if problem is not None:
+            failures.append(f"结束后：{problem}")
+        if not manager.statistics.verify(manager.tasks):
+            failures.append("结束后：增量统计与重新计算的结果不一致")
+        if len(manager.tasks) != size + changes["added"] - changes["deleted"]:
+            failures.append(f"结束后：任务数量{len(manager.tasks)}与初始数量和增删次数不符")
+        manager.persistence.flush()
+        if _task_keys(TaskPersistence(csv_path, fsync_policy).load_tasks()) != _task_keys(manager.tasks):
+            failures.append("结束后：重新加载的任务文件与内存中的任务列表不一致")
+    return {"threads": threads, "writers": writers, "ops": ops, "size": size, "thread_safe": thread_safe,
+            "changes": changes, "failures": failures, "failed_operations": failure_count[0],
+            "reads": summarize(read_latencies, 1, 0), "writes": summarize(write_latencies, 1, 0)}
+
+
+def compare_with_baseline(current: Dict[str, object], baseline: Dict[str, object],
+                          threshold: float = DEFAULT_THRESHOLD, metric: str = "p50_ms") -> List[str]:
+    """
+    将当前结果与基线结果比较，找出比基线慢超过阈值的操作，只比较两份结果中都存在的规模与操作。
+
+    参数：
+    - current (Dict[str, object])：当前的run_benchmark结果。
+    - baseline (Dict[str, object])：基线的run_benchmark结果。
+    - threshold (float)：回归阈值，0.2表示比基线慢20%以上视为回归，默认为DEFAULT_THRESHOLD。
+    - metric (str)：用于比较的延迟指标，COMPARE_METRICS之一，默认为"p50_ms"；基线中没有该指标的操作不比较。
+
+    返回：
+    - List[str]：每个回归操作的说明，没有回归时为空列表。
+    """
+    regressions = []
+    for size, operations in current["results"].items():
+        baseline_operations = baseline.get("results", {}).get(size, {})
+        for name, stats in operations.items():
+            base_stats = baseline_operations.get(name)
+            if not base_stats or not base_stats.get(metric):
+                continue
+            ratio = stats[metric] / base_stats[metric]
+            if ratio > 1 + threshold:
+                regressions.append(f"{name} @ {size}: {metric} {base_stats[metric]:.3f} -> {stats[metric]:.3f} (+{(ratio - 1) * 100:.0f}%)")
+    return regressions
+
+
+def format_table(report: Dict[str, object]) -> str:
+    """
+    将run_benchmark结果格式化为便于阅读的文本表格。
+    """
+    lines = [f"{'size':>8} {'operation':<22} {'ops/s':>10} {'items/s':>12} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'peak KB':>10}"]
+    for size, operations in report["results"].items():
+        for name, stats in operations.items():
+            lines.append(f"{size:>8} {name:<22} {stats['ops_per_sec']:>10.1f} {stats['items_per_sec']:>12.0f} "
+                         f"{stats['p50_ms']:>9.3f} {stats['p95_ms']:>9.3f} {stats['p99_ms']:>9.3f} {stats['peak_memory_kb']:>10.0f}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令行入口。
+
+    返回：
+    - int：进程退出状态，发现回归时为1，否则为0。
+    """
+    parser = argparse.ArgumentParser(description="EisenTodo 核心基准测试（无需图形界面）")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="逗号分隔的任务规模，例如 1000,10000,1000000")
+    parser.add_argument("--ops", type=int, default=DEFAULT_OPS, help="每种单任务操作的执行次数")
+    parser.add_argument("--persist-repeat", type=int, default=DEFAULT_PERSIST_REPEAT,
+                        help=f"每种整体持久化操作在预热后计时执行的次数，默认为{DEFAULT_PERSIST_REPEAT}")
+    parser.add_argument("--seed", type=int, default=0, help="随机数种子")
+    parser.add_argument("--output", help="将JSON结果写入该文件，默认输出到标准输出")
+    parser.add_argument("--baseline", help="与该JSON基线结果比较")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="回归阈值，默认0.2即慢20%%")
+    parser.add_argument("--metric", choices=COMPARE_METRICS, default="p50_ms",
+                        help="与基线比较的延迟指标，噪声较大的机器上可用min_ms")
+    parser.add_argument("--fsync", choices=FSYNC_POLICIES, default=DEFAULT_FSYNC_POLICY, help="任务文件的fsync策略")
+    parser.add_argument("--crash-test", type=int, metavar="ROUNDS",
+                        help="运行指定轮数的崩溃测试（随机位置杀死写入进程后检查恢复结果），代替基准测试")
+    parser.add_argument("--crash-size", type=int, default=DEFAULT_CRASH_SIZE, help="崩溃测试中每批任务的数量")
+    parser.add_argument("--stress-test", type=int, metavar="THREADS",
+                        help="以指定数量的线程同时查询和修改同一个线程安全的TaskManager并检查一致性，代替基准测试")
+    parser.add_argument("--stress-ops", type=int, default=DEFAULT_STRESS_OPS, help="压力测试中每个线程的操作次数")
+    parser.add_argument("--stress-size", type=int, default=DEFAULT_STRESS_SIZE, help="压力测试的初始任务数量")
+    args = parser.parse_args(argv)
+
+    if args.crash_test is not None:
+        crash_report = run_crash_test(args.crash_test, args.crash_size, args.seed, args.fsync)
+        for failure in crash_report["failures"]:
+            print(f"失败: {failure}", file=sys.stderr)
+        print(json.dumps(crash_report, indent=2, ensure_ascii=False))
+        return 1 if crash_report["failures"] else 0
+
+    if args.stress_test is not None:
+        stress_report = run_stress_test(args.stress_test, args.stress_ops, args.stress_size, args.seed, args.fsync)
+        for failure in stress_report["failures"]:
+            print(f"失败: {failure}", file=sys.stderr)
+        print(json.dumps(stress_report, indent=2, ensure_ascii=False))
+        return 1 if stress_report["failures"] else 0
+
+    if args.persist_repeat <= 0:
+        parser.error("--persist-repeat 需为正整数")
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    report = run_benchmark(sizes, args.ops, args.seed, args.fsync, args.persist_repeat)
+    print(format_table(report), file=sys.stderr)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+        regressions = compare_with_baseline(report, baseline, args.threshold, args.metric)
+        for regression in regressions:
+            print(f"回归: {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,44 @@
+from typing import List
+from task_model import Task
+
+
+class TaskListener:
+    """
+    TaskListener类定义了任务列表变更事件的监听接口，TaskManager在任务列表发生变化时
+    会依次通知已注册的监听者，监听者只需重写关心的事件方法即可，其余方法默认不做任何处理。
+    """
+    def on_tasks_reset(self, tasks: List[Task]) -> None:
+        """
+        任务列表被整体替换（如加载、恢复数据）时触发。
+
+        参数：
+        - tasks (List[Task])：替换后的完整任务列表。
+        """
+
+    def on_task_added(self, index: int, task: Task) -> None:
+        """
+        新任务被添加到任务列表时触发。
+
+        参数：
+        - index (int)：新任务在任务列表中的索引位置。
+        - task (Task)：新添加的任务对象。
+        """
+
+    def on_task_updated(self, index: int, old_task: Task, new_task: Task) -> None:
+        """
+        任务被编辑时触发。
+
+        参数：
+        - index (int)：被编辑任务在任务列表中的索引位置。
+        - old_task (Task)：编辑前的任务对象。
+        - new_task (Task)：编辑后的任务对象。
+        """
+
+    def on_task_removed(self, index: int, task: Task) -> None:
+        """
+        任务被删除时触发。
+
+        参数：
+        - index (int)：被删除任务删除前在任务列表中的索引位置。
+        - task (Task)：被删除的任务对象。
+        """
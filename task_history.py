@@ -0,0 +1,432 @@
+"""
+任务历史：在任务文件旁的"_history"目录中保存任务列表的时间点快照，支持恢复到任意时间点、比较两个版本和清理旧版本。
+任务按唯一标识的哈希值切分成数据块（平均CHUNK_TARGET个任务），数据块以内容的SHA-256为名压缩保存，相同的数据块只保存一份；
+块边界只取决于任务本身，编辑、插入或删除任务只影响其所在的块，各版本共享其余的块。
+每个版本记录数据块哈希列表（同样按内容切分成索引块保存），每次快照新增的块追加为一个包文件，
+保留大量变化缓慢的版本只比保存一份副本多占用很少的空间。
+
+用法示例：
+    python -m eisentodo_cli history snapshot --label 周报前
+    python -m eisentodo_cli history list
+    python -m eisentodo_cli history restore --at "2025-06-01 09:00"
+    python -m eisentodo_cli history gc --keep 100
+"""
+import csv
+import hashlib
+import io
+import json
+import os
+import time
+import weakref
+import zlib
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from task_model import Task
+from task_persistence import CSV_FIELDS, read_csv_tasks
+
+# 数据块的平均任务数：任务唯一标识的CRC32能被该数整除时在该任务之后切分。块越小，每个版本因少量修改而新增的数据越少
+CHUNK_TARGET = 32
+
+# 数据块的最大任务数，避免哈希分布不均时出现过大的块
+CHUNK_MAX = CHUNK_TARGET * 4
+
+# 索引块的平均与最大哈希数
+INDEX_TARGET = 32
+INDEX_MAX = INDEX_TARGET * 4
+
+# 版本记录中时间的格式
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _split(items: List, boundary, target: int, limit: int) -> List[List]:
+    """
+    私有函数，按内容切分列表：boundary(item)能被target整除或块已达到limit个元素时，在该元素之后切分。
+    """
+    chunks = []
+    current = []
+    for item in items:
+        current.append(item)
+        if boundary(item) % target == 0 or len(current) >= limit:
+            chunks.append(current)
+            current = []
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _task_boundary(task: Task) -> int:
+    """
+    私有函数，数据块的切分依据：任务唯一标识的CRC32。
+    """
+    return zlib.crc32(task.task_id.encode('utf-8'))
+
+
+def _hash_boundary(digest: str) -> int:
+    """
+    私有函数，索引块的切分依据：数据块哈希的前8位。
+    """
+    return int(digest[:8], 16)
+
+
+def _task_content(task: Task) -> Dict[str, object]:
+    """
+    私有函数，比较版本时使用的任务内容：创建时间不可修改，且加入创建时间列之前记录的版本中没有该列，不参与比较。
+    """
+    content = task.to_dict()
+    del content["created_at"]
+    return content
+
+
+def _write_atomically(path: str, data: bytes) -> None:
+    """
+    私有函数，先写入临时文件并刷盘，再原子替换目标文件，不会留下写了一半的文件。
+    """
+    temp_path = path + ".tmp"
+    with open(temp_path, 'wb') as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+
+class TaskHistory:
+    """
+    TaskHistory类管理一个任务文件的版本历史：块保存在packs目录的包文件中（每个包配有记录各块位置的.idx文件），
+    版本记录逐行追加在versions.jsonl中。快照时已序列化过的任务会被缓存，任务列表变化很少时快照主要是哈希计算。
+    """
+    def __init__(self, history_dir: str):
+        """
+        初始化TaskHistory对象，读取版本记录和各包文件的索引，目录不存在时在第一次快照时创建。
+
+        参数：
+        - history_dir (str)：历史目录路径。
+        """
+        self.history_dir = history_dir
+        self.packs_dir = os.path.join(history_dir, "packs")
+        self.versions_path = os.path.join(history_dir, "versions.jsonl")
+        self._versions = self._load_versions()
+        self._locations: Dict[str, Tuple[str, int, int]] = self._load_locations()
+        self._rows = weakref.WeakKeyDictionary()
+        self._row_buffer = io.StringIO(newline='')
+        self._row_writer = csv.writer(self._row_buffer)
+
+    @classmethod
+    def for_store(cls, csv_file_path: str) -> 'TaskHistory':
+        """
+        打开任务文件对应的历史，历史目录与任务文件同名，后缀为"_history"。
+
+        参数：
+        - csv_file_path (str)：任务文件路径。
+
+        返回：
+        - TaskHistory：该任务文件的历史对象。
+        """
+        return cls(os.path.splitext(csv_file_path)[0] + "_history")
+
+    def snapshot(self, tasks: Iterable[Task], label: str = "") -> Optional[int]:
+        """
+        记录任务列表的一个快照，只保存尚未保存过的数据块和索引块。任务与最新版本完全相同且未指定标签时不记录新版本。
+
+        参数：
+        - tasks (Iterable[Task])：要记录的任务。
+        - label (str)：版本标签，默认为空字符串。
+
+        返回：
+        - Optional[int]：新版本的编号，未记录新版本时为None。
+
+        抛出异常：
+        - IOError：如果写入历史目录时出现IO错误，抛出此异常并说明具体的IO问题所在。
+        """
+        tasks = list(tasks)
+        pending: Dict[str, bytes] = {}
+        chunks = [self._put("".join(self._row(task) for task in chunk), pending)
+                  for chunk in _split(tasks, _task_boundary, CHUNK_TARGET, CHUNK_MAX)]
+        index = [self._put("\n".join(group), pending) for group in _split(chunks, _hash_boundary, INDEX_TARGET, INDEX_MAX)]
+        if self._versions and self._versions[-1]["index"] == index and not label:
+            return None
+        now = time.time()
+        record = {
+            "version": self._versions[-1]["version"] + 1 if self._versions else 1,
+            "time": datetime.fromtimestamp(now).strftime(TIME_FORMAT),
+            "timestamp": now,
+            "count": len(tasks),
+            "label": label,
+            "index": index,
+        }
+        try:
+            os.makedirs(self.packs_dir, exist_ok=True)
+            if pending:
+                self._write_pack(pending)
+            with open(self.versions_path, 'a', encoding='utf-8') as file:
+                file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                file.flush()
+                os.fsync(file.fileno())
+        except IOError as e:
+            raise IOError(f"写入任务历史 {self.history_dir} 时出错: {str(e)}")
+        self._versions.append(record)
+        return record["version"]
+
+    def list_versions(self) -> List[Dict[str, object]]:
+        """
+        获取全部版本的编号、时间、任务数量和标签，按版本编号升序排列。
+
+        返回：
+        - List[Dict[str, object]]：每个版本一项，包含"version"、"time"、"count"、"label"。
+        """
+        return [{key: record[key] for key in ("version", "time", "count", "label")} for record in self._versions]
+
+    def find_version(self, when: datetime) -> int:
+        """
+        查找在指定时间点有效的版本，即该时间点之前（含）记录的最新版本。
+
+        参数：
+        - when (datetime)：时间点。
+
+        返回：
+        - int：版本编号。
+
+        抛出异常：
+        - ValueError：如果该时间点之前没有任何版本，抛出此异常。
+        """
+        timestamp = when.timestamp()
+        candidates = [record["version"] for record in self._versions if record["timestamp"] <= timestamp]
+        if not candidates:
+            raise ValueError(f"{when.strftime(TIME_FORMAT)} 之前没有任务历史版本")
+        return max(candidates)
+
+    def load_version(self, version: int) -> List[Task]:
+        """
+        读取指定版本的全部任务，任务保持快照时的顺序和唯一标识。
+
+        参数：
+        - version (int)：版本编号。
+
+        返回：
+        - List[Task]：该版本的任务对象列表。
+
+        抛出异常：
+        - ValueError：如果版本不存在或块已损坏，抛出此异常。
+        """
+        return self._read_tasks(self._chunks(version))
+
+    def diff(self, old_version: int, new_version: int) -> Dict[str, List]:
+        """
+        比较两个版本的任务，只读取两个版本不共享的数据块。
+
+        参数：
+        - old_version (int)：旧版本编号。
+        - new_version (int)：新版本编号。
+
+        返回：
+        - Dict[str, List]：包含"added"（新版本中新增的任务）、"removed"（新版本中删除的任务）
+                           和"changed"（(旧任务, 新任务)元组，唯一标识相同而内容不同）的字典。
+
+        抛出异常：
+        - ValueError：如果版本不存在或块已损坏，抛出此异常。
+        """
+        old_chunks, new_chunks = self._chunks(old_version), self._chunks(new_version)
+        shared = set(old_chunks) & set(new_chunks)
+        old_tasks = {task.task_id: task for task in self._read_tasks([digest for digest in old_chunks if digest not in shared])}
+        new_tasks = {task.task_id: task for task in self._read_tasks([digest for digest in new_chunks if digest not in shared])}
+        changed = [(old_tasks[task_id], task) for task_id, task in new_tasks.items()
+                   if task_id in old_tasks and _task_content(old_tasks[task_id]) != _task_content(task)]
+        return {
+            "added": [task for task_id, task in new_tasks.items() if task_id not in old_tasks],
+            "removed": [task for task_id, task in old_tasks.items() if task_id not in new_tasks],
+            "changed": changed,
+        }
+
+    def gc(self, keep_last: Optional[int] = None, before: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        删除旧版本并清理不再被任何版本引用的块，最新版本总是保留。只含无用块的包文件直接删除，
+        同时含有有用块和无用块的包文件中的有用块合并写入一个新的包文件后再删除原包文件。
+
+        参数：
+        - keep_last (Optional[int])：只保留最新的keep_last个版本，None表示不按数量删除。
+        - before (Optional[datetime])：删除该时间点之前记录的版本，None表示不按时间删除。
+
+        返回：
+        - Dict[str, int]：包含"versions"（删除的版本数）、"objects"（删除的块数）和"bytes"（释放的字节数）的字典。
+
+        抛出异常：
+        - ValueError：如果keep_last小于1或块已损坏，抛出此异常。
+        - IOError：如果改写版本记录或包文件时出现IO错误，抛出此异常并说明具体的IO问题所在。
+        """
+        if keep_last is not None and keep_last < 1:
+            raise ValueError("保留的版本数需为正整数")
+        kept = self._versions
+        if keep_last is not None:
+            kept = kept[-keep_last:]
+        if before is not None:
+            kept = [record for record in kept[:-1] if record["timestamp"] >= before.timestamp()] + kept[-1:]
+        index_digests = sorted({digest for record in kept for digest in record["index"]})
+        referenced = set(index_digests)
+        for text in self._read(index_digests):
+            referenced.update(text.split("\n"))
+        packs: Dict[str, List[str]] = {}
+        for digest, (pack, _, _) in self._locations.items():
+            packs.setdefault(pack, []).append(digest)
+        removed_versions = len(self._versions) - len(kept)
+        removed_objects = sum(1 for digest in self._locations if digest not in referenced)
+        size_before = self.get_statistics()["bytes"]
+        try:
+            if removed_versions:
+                _write_atomically(self.versions_path,
+                                  "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in kept).encode('utf-8'))
+                self._versions = kept
+            obsolete = [pack for pack, digests in packs.items() if not all(digest in referenced for digest in digests)]
+            survivors = [digest for pack in obsolete for digest in packs[pack] if digest in referenced]
+            if survivors:
+                self._write_pack({digest: self._read_raw(digest) for digest in survivors})
+            for pack in obsolete:
+                for digest in packs[pack]:
+                    if self._locations.get(digest, ("",))[0] == pack:
+                        del self._locations[digest]
+                for suffix in (".idx", ".pack"):
+                    os.remove(os.path.join(self.packs_dir, pack + suffix))
+            if os.path.isdir(self.packs_dir):
+                for name in os.listdir(self.packs_dir):
+                    stem = name.split(".")[0]
+                    if name.endswith(".tmp") or (name.endswith(".pack") and stem not in packs and stem not in self._packs()):
+                        os.remove(os.path.join(self.packs_dir, name))  # 中途崩溃留下的临时文件和没有索引的包文件
+        except IOError as e:
+            raise IOError(f"清理任务历史 {self.history_dir} 时出错: {str(e)}")
+        return {"versions": removed_versions, "objects": removed_objects,
+                "bytes": size_before - self.get_statistics()["bytes"]}
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        获取历史占用的空间。
+
+        返回：
+        - Dict[str, int]：包含"versions"（版本数）、"objects"（块数）和"bytes"（包文件、索引与版本记录占用的字节数）的字典。
+        """
+        size = os.path.getsize(self.versions_path) if os.path.exists(self.versions_path) else 0
+        if os.path.isdir(self.packs_dir):
+            size += sum(os.path.getsize(os.path.join(self.packs_dir, name)) for name in os.listdir(self.packs_dir))
+        return {"versions": len(self._versions), "objects": len(self._locations), "bytes": size}
+
+    def _row(self, task: Task) -> str:
+        """
+        私有方法，将任务序列化为一行CSV，结果按任务对象缓存（任务对象不可变）。
+        """
+        row = self._rows.get(task)
+        if row is None:
+            task_dict = task.to_dict()
+            self._row_writer.writerow([task_dict[field] for field in CSV_FIELDS])
+            row = self._row_buffer.getvalue()
+            self._row_buffer.seek(0)
+            self._row_buffer.truncate(0)
+            self._rows[task] = row
+        return row
+
+    def _put(self, text: str, pending: Dict[str, bytes]) -> str:
+        """
+        私有方法，计算块的哈希；尚未保存过的块压缩后放入pending，由快照统一写入一个包文件。
+        """
+        data = text.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        if digest not in self._locations and digest not in pending:
+            pending[digest] = zlib.compress(data)
+        return digest
+
+    def _packs(self) -> List[str]:
+        """
+        私有方法，列出已写完索引的包文件名称（不含后缀）。
+        """
+        if not os.path.isdir(self.packs_dir):
+            return []
+        return [name[:-len(".idx")] for name in os.listdir(self.packs_dir) if name.endswith(".idx")]
+
+    def _write_pack(self, objects: Dict[str, bytes]) -> None:
+        """
+        私有方法，将若干压缩后的块写入一个新的包文件，再写入记录各块位置的索引文件；
+        索引文件写完前包文件不会被读取，中途崩溃只会留下之后被gc清理掉的无用文件。
+        """
+        pack = str(max((int(name) for name in self._packs()), default=0) + 1)
+        offsets = {}
+        position = 0
+        for digest, data in objects.items():
+            offsets[digest] = [position, len(data)]
+            position += len(data)
+        _write_atomically(os.path.join(self.packs_dir, pack + ".pack"), b"".join(objects.values()))
+        _write_atomically(os.path.join(self.packs_dir, pack + ".idx"), json.dumps(offsets).encode('utf-8'))
+        for digest, (offset, length) in offsets.items():
+            self._locations[digest] = (pack, offset, length)
+
+    def _read_raw(self, digest: str) -> bytes:
+        """
+        私有方法，读取一个块压缩后的原始字节。
+        """
+        pack, offset, length = self._locations[digest]
+        with open(os.path.join(self.packs_dir, pack + ".pack"), 'rb') as file:
+            file.seek(offset)
+            return file.read(length)
+
+    def _read(self, digests: List[str]) -> List[str]:
+        """
+        私有方法，按顺序读取若干块的内容并校验哈希，每个包文件只打开一次。
+        """
+        files = {}
+        texts = []
+        try:
+            for digest in digests:
+                if digest not in self._locations:
+                    raise ValueError(f"任务历史中缺少块 {digest}")
+                pack, offset, length = self._locations[digest]
+                if pack not in files:
+                    files[pack] = open(os.path.join(self.packs_dir, pack + ".pack"), 'rb')
+                files[pack].seek(offset)
+                try:
+                    data = zlib.decompress(files[pack].read(length))
+                except zlib.error as e:
+                    raise ValueError(f"任务历史中的块 {digest} 已损坏: {str(e)}")
+                if hashlib.sha256(data).hexdigest() != digest:
+                    raise ValueError(f"任务历史中的块 {digest} 内容校验失败")
+                texts.append(data.decode('utf-8'))
+        finally:
+            for file in files.values():
+                file.close()
+        return texts
+
+    def _chunks(self, version: int) -> List[str]:
+        """
+        私有方法，获取指定版本的数据块哈希列表。
+        """
+        for record in self._versions:
+            if record["version"] == version:
+                return [digest for text in self._read(record["index"]) for digest in text.split("\n")]
+        raise ValueError(f"任务历史中不存在版本 {version}")
+
+    def _read_tasks(self, digests: List[str]) -> List[Task]:
+        """
+        私有方法，按顺序读取若干数据块中的任务。
+        """
+        text = ",".join(CSV_FIELDS) + "\r\n" + "".join(self._read(digests))
+        return list(read_csv_tasks(io.StringIO(text, newline='')))
+
+    def _load_versions(self) -> List[Dict[str, object]]:
+        """
+        私有方法，读取版本记录，忽略写到一半的末行。
+        """
+        versions = []
+        if not os.path.exists(self.versions_path):
+            return versions
+        with open(self.versions_path, 'r', encoding='utf-8') as file:
+            for line in file:
+                try:
+                    versions.append(json.loads(line))
+                except ValueError:
+                    break
+        return versions
+
+    def _load_locations(self) -> Dict[str, Tuple[str, int, int]]:
+        """
+        私有方法，读取全部包文件的索引，得到块哈希到(包名, 偏移, 长度)的映射。
+        """
+        locations = {}
+        for pack in self._packs():
+            with open(os.path.join(self.packs_dir, pack + ".idx"), 'r', encoding='utf-8') as file:
+                for digest, (offset, length) in json.load(file).items():
+                    locations[digest] = (pack, offset, length)
+        return locations
@@ -1,21 +1,32 @@
-import json
-import os
-from typing import List
+import time
+from typing import List, Optional
 from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.button import Button
-from kivy.uix.label import Label
-from kivy.uix.popup import Popup
 from kivy.uix.textinput import TextInput
-from kivy.animation import Animation
+from kivy.clock import Clock
 from kivy.properties import ListProperty
 from task_logic import TaskManager
 from task_persistence import TaskPersistence
-from input_validation import validate_task_name, validate_task_progress, validate_task_category
-from popup_handlers import show_add_task_popup, show_edit_task_popup, show_delete_task_popup, show_tasks_by_category_popup, show_filter_tasks_popup, show_sort_tasks_popup, show_backup_tasks_popup, show_restore_tasks_popup
-from utils import COLOR_THEME, CONFIG_PATH, apply_color_theme, save_last_path, show_success_message, show_error_message
-from animation_effects import task_list_item_animation  # 导入 task_list_item_animation 函数
+from utils import show_error_message, load_color_theme
 from task_model import Task  # 导入 Task 类
+from task_list_view import TaskListView, TaskListViewBinding
+from live_search import LiveSearchWorker
+from startup_timing import startup_timer
+from config_store import ConfigStore, config_store
+from task_scheduler import load_weights
+from task_sync import attach_tracker
+from instrumentation import instrumented
+# 弹窗、任务操作和动画相关模块在第一次使用时才导入，以缩短启动时间
+
+# 输入停顿超过该时长（秒）后才发起边输入边搜索的查询
+LIVE_SEARCH_DELAY = 0.25
+
+# 延迟加载模式下每一帧加载的任务数量
+LOAD_BATCH_SIZE = 2000
+
+# 延迟加载模式下任务加载完成前显示的占位文本
+LOADING_TEXT = "正在加载任务…"
 
 class TaskListScreen(Screen):
     """
@@ -23,70 +34,262 @@ class TaskListScreen(Screen):
     """
     task_list = ListProperty([])
 
-    def __init__(self, **kwargs):
+    def __init__(self, lazy_load: bool = False, task_manager: Optional[TaskManager] = None, **kwargs):
         """
         初始化TaskListScreen对象，加载任务列表和配置数据，并设置界面布局。
 
         参数：
+        - lazy_load (bool)：为True时初始化时不加载任务，先显示占位文本，调用start_loading后再逐帧分批加载，
+                            加载完成前按钮不可用；默认为False，即在初始化时同步加载全部任务。
+        - task_manager (Optional[TaskManager])：要显示的TaskManager（如工作区的TaskManager），其lazy参数需与lazy_load一致；
+                                                默认为None，即为默认任务文件创建TaskManager并挂载同步跟踪。
         - kwargs：其他关键字参数。
         """
         super().__init__(**kwargs)
-        self.task_manager = TaskManager(TaskPersistence())
-        self.config_data = self.load_config()
-        self.task_list_label = Label(text="", markup=True, size_hint_y=None)
-        self.update_task_list()
+        self._popup_pool = None
+        self._buttons: List[Button] = []
+        self._load_batches = None
+        self._startup_reported = not lazy_load
+        self.config = self.load_config()
+        startup_timer.mark("config_load")
+        if task_manager is None:
+            task_manager = TaskManager(TaskPersistence(), lazy=lazy_load, thread_safe=True)
+            self.sync_tracker = attach_tracker(task_manager)
+        self.task_manager = task_manager
+        self.task_manager.set_scheduler_weights(**load_weights(self.config))
+        self._reminder_event = None
+        self.task_manager.reminders.on_schedule_changed = self.schedule_next_reminder
+        if not lazy_load:
+            startup_timer.mark("task_load")
+            self.on_tasks_loaded()
+        self.task_list_view = TaskListView()
+        self.task_list_binding = TaskListViewBinding(self.task_list_view)
+        self.task_manager.add_listener(self.task_list_binding)
+        self._live_search_event = None
+        self._live_search_shown = 0
+        self.live_search = LiveSearchWorker(lambda: self.task_manager.snapshot(), self._deliver_live_search_results)
+        self.search_input = TextInput(hint_text='搜索任务（名称或描述）', multiline=False, size_hint_y=None, height=40)
+        self.search_input.bind(text=self.on_search_text)
         layout = BoxLayout(orientation='vertical', spacing=10, padding=10)
         self.add_buttons(layout)
-        layout.add_widget(self.task_list_label)
+        layout.add_widget(self.search_input)
+        layout.add_widget(self.task_list_view)
         self.add_widget(layout)
+        if lazy_load:
+            self.task_list_view.set_placeholder(LOADING_TEXT)
+            self._set_buttons_enabled(False)
+
+    @property
+    def popup_pool(self):
+        """
+        获取弹窗池，第一次打开弹窗时才导入弹窗模块并创建弹窗池。
+
+        返回：
+        - PopupPool：弹窗池对象。
+        """
+        if self._popup_pool is None:
+            from popup_utils import PopupPool
+            self._popup_pool = PopupPool()
+        return self._popup_pool
+
+    def start_loading(self) -> None:
+        """
+        延迟加载模式下开始逐帧分批加载任务，每一帧加载LOAD_BATCH_SIZE个任务并追加显示，
+        全部加载完成后任务列表切换为完整显示，按钮恢复可用。
+        """
+        if self._load_batches is None and self.task_manager.loading:
+            self._load_batches = self.task_manager.load_tasks_in_batches(LOAD_BATCH_SIZE)
+            Clock.schedule_interval(self._load_next_batch, 0)
+
+    def _load_next_batch(self, dt: float) -> bool:
+        """
+        私有方法，加载并显示下一批任务，全部加载完成后返回False以停止逐帧调用。
+        """
+        try:
+            batch = next(self._load_batches)
+        except StopIteration:
+            self._load_batches = None
+            if not self._startup_reported:
+                self._startup_reported = True
+                startup_timer.mark("task_load")
+                Clock.schedule_once(lambda dt: startup_timer.report())
+            self.on_tasks_loaded()
+            self._set_buttons_enabled(True)
+            return False
+        except (ValueError, IOError) as e:
+            self._load_batches = None
+            show_error_message(str(e))
+            return False
+        self.task_list_view.append_tasks(batch)
+        return True
+
+    def set_task_manager(self, task_manager: TaskManager) -> None:
+        """
+        改为显示另一个TaskManager（如切换工作区时）：停止原TaskManager尚未完成的分批加载、提醒唤醒和边输入边搜索，
+        列表改为显示新TaskManager的任务；新TaskManager仍在延迟加载时显示占位文本并开始逐帧分批加载。
+
+        参数：
+        - task_manager (TaskManager)：新的TaskManager对象。
+        """
+        if task_manager is self.task_manager:
+            return
+        if self._load_batches is not None:
+            Clock.unschedule(self._load_next_batch)
+            self._load_batches.close()
+            self._load_batches = None
+        if self._reminder_event is not None:
+            self._reminder_event.cancel()
+            self._reminder_event = None
+        if self._live_search_event is not None:
+            self._live_search_event.cancel()
+            self._live_search_event = None
+        self.live_search.cancel()
+        self.task_manager.remove_listener(self.task_list_binding)
+        self.task_manager.reminders.on_schedule_changed = None
+        self.task_manager = task_manager
+        self.task_manager.set_scheduler_weights(**load_weights(self.config))
+        self.task_manager.reminders.on_schedule_changed = self.schedule_next_reminder
+        self.search_input.unbind(text=self.on_search_text)
+        self.search_input.text = ""
+        self.search_input.bind(text=self.on_search_text)
+        self.task_manager.add_listener(self.task_list_binding)
+        if self.task_manager.loading:
+            self.task_list_view.set_placeholder(LOADING_TEXT)
+            self._set_buttons_enabled(False)
+            self.start_loading()
+        else:
+            self._set_buttons_enabled(True)
+            self.schedule_next_reminder()
+            self.update_task_list()
 
-    def load_config(self) -> dict:
+    def on_tasks_loaded(self) -> None:
+        """
+        任务加载完成后安排截止时间提醒，并按配置自动归档已完成的任务。
+        """
+        self.schedule_next_reminder()
+        if self.config.get("auto_archive"):
+            self.task_manager.archive_completed()
+
+    def _set_buttons_enabled(self, enabled: bool) -> None:
+        """
+        私有方法，设置任务管理按钮和搜索框是否可用。
         """
-        加载配置文件中的数据。
+        for button in self._buttons:
+            button.disabled = not enabled
+        self.search_input.disabled = not enabled
+
+    def load_config(self) -> ConfigStore:
+        """
+        加载共用的配置服务，配置文件在整个应用中只读取一次，各模块读写的是同一份内存中的配置；同时应用配置中保存的颜色主题。
 
         返回：
-        - dict：配置数据字典。
+        - ConfigStore：共用的配置服务。
+        """
+        config_store.load()
+        load_color_theme()
+        return config_store
+
+    def schedule_next_reminder(self) -> None:
         """
-        if os.path.exists(CONFIG_PATH):
-            try:
-                with open(CONFIG_PATH, 'r') as file:
-                    return json.load(file)
-            except (IOError, json.JSONDecodeError) as e:
-                print(f"加载配置文件时出错: {str(e)}")
-        return {}
+        按最近一个待触发提醒的截止时间安排一次性的Clock唤醒，提醒安排发生变化时重新安排，
+        界面只在截止时间到达时才被唤醒，无需定时轮询所有任务。
+        """
+        if self._reminder_event is not None:
+            self._reminder_event.cancel()
+            self._reminder_event = None
+        next_deadline = self.task_manager.next_reminder_deadline()
+        if next_deadline is not None:
+            self._reminder_event = Clock.schedule_once(self.fire_due_reminders, max(0, next_deadline - time.time()))
+
+    def fire_due_reminders(self, dt: float) -> None:
+        """
+        触发截止时间已到达的任务提醒，并安排下一次唤醒。
 
+        参数：
+        - dt (float)：Clock回调传入的时间间隔。
+        """
+        self._reminder_event = None
+        due_tasks = self.task_manager.pop_due_reminders()
+        if due_tasks:
+            show_error_message("任务已到截止时间：" + "、".join(task.name for task in due_tasks))
+        self.schedule_next_reminder()
+
+    @instrumented("ui.update_task_list")
     def update_task_list(self) -> None:
         """
-        更新任务列表，应用动画效果并显示任务。
+        更新任务列表，显示全部任务。任务的增删改无需调用本方法，TaskListViewBinding会局部更新对应的行。
         """
-        all_tasks = self.task_manager.get_tasks_by_category("")
-        anim = Animation(opacity=0, duration=0.2, t='out_cubic')
-        anim &= Animation(text="", duration=0.2, t='out_cubic')
-        anim.bind(on_complete=lambda *args: self.display_tasks(all_tasks))
-        anim.start(self.task_list_label)
+        from animation_effects import task_list_item_animation
+        from animation_scheduler import animation_scheduler
+        self.task_list_binding.show_all()
+        animation_scheduler.schedule_batch(self.task_list_view.get_visible_rows(), task_list_item_animation,
+                                           len(self.task_manager.tasks))
 
-    def display_tasks(self, tasks: List[Task]) -> None:
+    @instrumented("ui.display_tasks")
+    def display_tasks(self, tasks: List[Task], scores: Optional[List[float]] = None) -> None:
         """
-        显示任务列表中的任务，应用颜色主题和动画效果。
+        显示筛选、排序等派生的任务列表，并通过动画调度器为可见的行应用动画效果，任务数量超过降级阈值时不播放动画。
+        任务列表以虚拟化方式渲染，只有可见区域内的任务会生成行部件和标记文本。
 
         参数：
         - tasks (List[Task])：任务对象列表。
+        - scores (Optional[List[float]])：与tasks一一对应的模糊匹配得分，显示在各行末尾，默认为None即不显示。
+        """
+        from animation_effects import task_list_item_animation
+        from animation_scheduler import animation_scheduler
+        self.task_list_binding.show_tasks(tasks, scores)
+        animation_scheduler.schedule_batch(self.task_list_view.get_visible_rows(), task_list_item_animation, len(tasks))
+
+    def on_search_text(self, instance: TextInput, text: str) -> None:
+        """
+        搜索框内容变化时重新计时，输入停顿LIVE_SEARCH_DELAY秒后才发起查询；搜索框清空时立即显示全部任务。
+
+        参数：
+        - instance (TextInput)：搜索框。
+        - text (str)：搜索框中的文本。
+        """
+        if self._live_search_event is not None:
+            self._live_search_event.cancel()
+            self._live_search_event = None
+        if not text:
+            self.live_search.cancel()
+            self.update_task_list()
+            return
+        self._live_search_event = Clock.schedule_once(self.run_live_search, LIVE_SEARCH_DELAY)
+
+    def run_live_search(self, dt: float) -> None:
+        """
+        将搜索框中的文本提交给后台查询线程，取代尚未完成的旧查询。
+
+        参数：
+        - dt (float)：Clock回调传入的时间间隔。
+        """
+        self._live_search_event = None
+        self.live_search.submit(self.search_input.text)
+
+    def _deliver_live_search_results(self, generation: int, tasks: List[Task], done: bool) -> None:
         """
-        task_text = ""
-        for task in tasks:
-            progress_text = f"<b>进度:</b> {task.progress}%<br><b>类别:</b> {task.category}<br><br>"
-            if task.category == "紧急重要":
-                task_text += task.name + " " + progress_text[:-4] + f' <font color="{COLOR_THEME["urgent_important"]}">[紧急重要]</font><br><br>'
-            elif task.category == "重要不紧急":
-                task_text += task.name + " " + progress_text[:-4] + f' <font color="{COLOR_THEME["important_not_urgent"]}">[重要不紧急]</font><br><br>'
-            elif task.category == "紧急不重要":
-                task_text += task.name + " " + progress_text[:-4] + f' <font color="{COLOR_THEME["urgent_not_important"]}">[紧急不重要]</font><br><br>'
-            elif task.category == "不紧急不重要":
-                task_text += task.name + " " + progress_text[:-4] + f' <font color="{COLOR_THEME["not_important_not_urgent"]}">[不紧急不重要]</font><br><br>'
-        self.task_list_label.text = task_text if task_text else "暂无任务，请添加任务。"
-        self.task_list_label.markup = True
-        for child in self.task_list_label.children:
-            task_list_item_animation(child)
+        私有方法，在后台查询线程中被调用，将部分结果转交到界面线程显示。
+        """
+        Clock.schedule_once(lambda dt: self.show_live_search_results(generation, tasks))
+
+    @instrumented("ui.show_live_search_results")
+    def show_live_search_results(self, generation: int, tasks: List[Task]) -> None:
+        """
+        在界面线程中显示一批查询结果：已被新输入取代的查询的结果直接丢弃，
+        新查询的第一批结果替换列表内容，之后的各批结果追加到列表末尾。
+
+        参数：
+        - generation (int)：结果所属的查询代数。
+        - tasks (List[Task])：本批匹配的任务对象列表。
+        """
+        if not self.live_search.is_current(generation):
+            return
+        if generation != self._live_search_shown:
+            self._live_search_shown = generation
+            self.task_list_binding.show_tasks(tasks)
+        else:
+            self.task_list_view.append_tasks(tasks)
 
     def add_buttons(self, layout: BoxLayout) -> None:
         """
@@ -96,63 +299,127 @@ class TaskListScreen(Screen):
         - layout (BoxLayout)：布局对象。
         """
         buttons = [
+            ("四象限视图", self.show_quadrants),
             ("添加任务", self.show_add_task_popup),
             ("编辑任务", self.show_edit_task_popup),
             ("删除任务", self.show_delete_task_popup),
             ("按类别查看任务", self.show_tasks_by_category_popup),
+            ("下一步", self.show_next_tasks_popup),
+            ("逾期任务", self.show_overdue_tasks),
             ("筛选任务", self.show_filter_tasks_popup),
             ("排序任务", self.show_sort_tasks_popup),
             ("备份任务数据", self.show_backup_tasks_popup),
-            ("恢复任务数据", self.show_restore_tasks_popup)
+            ("恢复任务数据", self.show_restore_tasks_popup),
+            ("统计概览", self.show_statistics_popup),
+            ("归档已完成任务", self.archive_completed_tasks),
+            ("归档管理", self.show_archive_popup),
+            ("切换工作区", self.show_workspace_popup)
         ]
         for text, callback in buttons:
-            button = Button(text=text, size_hint=(0.4, None), height=40, on_release=callback)
+            button = Button(text=text, size_hint=(0.4, None), height=40, on_release=lambda instance, callback=callback: callback())
+            self._buttons.append(button)
             layout.add_widget(button)
 
+    def show_quadrants(self) -> None:
+        """
+        切换到四象限屏幕。
+        """
+        self.manager.current = 'quadrants'
+
     def show_add_task_popup(self) -> None:
         """
         显示添加任务的弹窗。
         """
+        from popup_handlers import show_add_task_popup
         show_add_task_popup(self)
 
     def show_edit_task_popup(self) -> None:
         """
         显示编辑任务的弹窗。
         """
+        from popup_handlers import show_edit_task_popup
         show_edit_task_popup(self)
 
     def show_delete_task_popup(self) -> None:
         """
         显示删除任务的弹窗。
         """
+        from popup_handlers import show_delete_task_popup
         show_delete_task_popup(self)
 
     def show_tasks_by_category_popup(self) -> None:
         """
         显示按类别查看任务的弹窗。
         """
+        from popup_handlers import show_tasks_by_category_popup
         show_tasks_by_category_popup(self)
 
+    def show_next_tasks_popup(self) -> None:
+        """
+        显示查看下一步任务的弹窗。
+        """
+        from popup_handlers import show_next_tasks_popup
+        show_next_tasks_popup(self)
+
+    def show_overdue_tasks(self) -> None:
+        """
+        显示已逾期的未完成任务。
+        """
+        from task_operations import view_overdue_tasks
+        view_overdue_tasks(self)
+
     def show_filter_tasks_popup(self) -> None:
         """
         显示筛选任务的弹窗。
         """
+        from popup_handlers import show_filter_tasks_popup
         show_filter_tasks_popup(self)
 
     def show_sort_tasks_popup(self) -> None:
         """
         显示排序任务的弹窗。
         """
+        from popup_handlers import show_sort_tasks_popup
         show_sort_tasks_popup(self)
 
     def show_backup_tasks_popup(self) -> None:
         """
         显示备份任务数据的弹窗。
         """
+        from popup_handlers import show_backup_tasks_popup
         show_backup_tasks_popup(self)
 
     def show_restore_tasks_popup(self) -> None:
         """
         显示恢复任务数据的弹窗。
         """
-        show_restore_tasks_popup(self)
\ No newline at end of file
+        from popup_handlers import show_restore_tasks_popup
+        show_restore_tasks_popup(self)
+
+    def archive_completed_tasks(self) -> None:
+        """
+        将已完成的任务移入归档。
+        """
+        from task_operations import archive_completed_tasks
+        archive_completed_tasks(self)
+
+    def show_archive_popup(self) -> None:
+        """
+        显示归档管理的弹窗。
+        """
+        from popup_handlers import show_archive_popup
+        show_archive_popup(self)
+
+    def show_statistics_popup(self) -> None:
+        """
+        显示任务统计概览的弹窗。
+        """
+        from popup_handlers import show_statistics_popup
+        show_statistics_popup(self)
+
+    def show_workspace_popup(self) -> None:
+        """
+        显示切换、新建工作区和跨工作区搜索的弹窗。
+        """
+        from popup_handlers import show_workspace_popup
+        show_workspace_popup(self)
\ No newline at end of file
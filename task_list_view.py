@@ -0,0 +1,232 @@
+from typing import List, Optional
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.uix.label import Label
+from kivy.properties import ObjectProperty
+from utils import COLOR_THEME
+from task_model import Task
+from task_events import TaskListener
+from task_markup import TaskMarkupRenderer, default_renderer
+from instrumentation import instrumentation
+
+# 任务列表中每一行的高度
+ROW_HEIGHT = 60
+
+# 任务列表为空时显示的提示文本
+EMPTY_TEXT = "暂无任务，请添加任务。"
+
+
+class TaskRow(RecycleDataViewBehavior, Label):
+    """
+    TaskRow类是任务列表中单行的视图部件，由TaskListView回收复用：
+    只有在被绑定到可见位置的任务时才向渲染器获取该任务的标记文本，未变化的任务直接取用缓存。
+    """
+    task = ObjectProperty(None, allownone=True)
+
+    def __init__(self, **kwargs):
+        """
+        初始化TaskRow对象，文本左对齐并随部件宽度自动换行。
+
+        参数：
+        - kwargs：其他关键字参数。
+        """
+        super().__init__(markup=True, halign='left', valign='middle', color=COLOR_THEME["text_color"], **kwargs)
+        self.bind(size=self._update_text_size)
+
+    def refresh_view_attrs(self, rv, index: int, data: dict):
+        """
+        将部件绑定到数据列表中指定位置的任务，并生成对应的标记文本。
+        数据中带有'animate'标记时播放一次动画，标记随即被清除，滚动复用时不会重复播放。
+
+        参数：
+        - rv：所属的RecycleView对象。
+        - index (int)：任务在数据列表中的位置。
+        - data (dict)：该位置的数据，包含'task'键，可选包含'animate'键和模糊匹配得分'score'键；
+                       'task'为None时显示'text'键的占位文本。
+        """
+        self.index = index
+        instrumentation.count("ui.row_render")
+        task = data.get('task')
+        self.text = rv.renderer.render(task) if task is not None else data.get('text', EMPTY_TEXT)
+        if data.get('score') is not None:
+            self.text += f"  （匹配度 {data['score']:.0%}）"
+        if data.pop('animate', False):
+            from animation_effects import task_list_item_animation
+            from animation_scheduler import animation_scheduler
+            animation_scheduler.schedule(self, task_list_item_animation)
+        return super().refresh_view_attrs(rv, index, data)
+
+    def _update_text_size(self, instance, size) -> None:
+        """
+        私有方法，部件尺寸变化时同步文本区域大小，使对齐与换行生效。
+        """
+        self.text_size = size
+
+
+class TaskListView(RecycleView):
+    """
+    TaskListView类以虚拟化方式显示任务列表：只为可见区域内的任务创建行部件，滚动时回收并复用这些部件，
+    渲染开销与可见区域大小成正比，而与任务总数无关。
+    """
+    def __init__(self, renderer: TaskMarkupRenderer = default_renderer, **kwargs):
+        """
+        初始化TaskListView对象，设置纵向排列的回收布局。
+
+        参数：
+        - renderer (TaskMarkupRenderer)：生成并缓存行标记文本的渲染器，默认为各视图共用的default_renderer。
+        - kwargs：其他关键字参数。
+        """
+        super().__init__(**kwargs)
+        self.renderer = renderer
+        layout = RecycleBoxLayout(orientation='vertical', default_size=(None, ROW_HEIGHT),
+                                  default_size_hint=(1, None), size_hint_y=None)
+        layout.bind(minimum_height=layout.setter('height'))
+        self.add_widget(layout)
+        self.viewclass = TaskRow
+        self.set_tasks([])
+
+    def set_tasks(self, tasks: List[Task], scores: Optional[List[float]] = None) -> None:
+        """
+        设置要显示的任务列表，任务为空时显示提示文本。
+
+        参数：
+        - tasks (List[Task])：要显示的任务对象列表。
+        - scores (Optional[List[float]])：与tasks一一对应的模糊匹配得分，显示在各行末尾，默认为None即不显示。
+        """
+        if scores is None:
+            self.data = [{'task': task} for task in tasks] or [{'task': None}]
+        else:
+            self.data = [{'task': task, 'score': score} for task, score in zip(tasks, scores)] or [{'task': None}]
+
+    def set_placeholder(self, text: str) -> None:
+        """
+        清空列表并显示占位文本，如任务加载完成前的提示。
+
+        参数：
+        - text (str)：占位文本。
+        """
+        self.data = [{'task': None, 'text': text}]
+
+    def append_tasks(self, tasks: List[Task]) -> None:
+        """
+        在列表末尾追加若干行任务，用于逐批显示分块到达的查询结果。
+
+        参数：
+        - tasks (List[Task])：要追加的任务对象列表。
+        """
+        if not tasks:
+            return
+        if self._is_empty():
+            self.set_tasks(tasks)
+        else:
+            self.data.extend({'task': task} for task in tasks)
+
+    def insert_task(self, index: int, task: Task) -> None:
+        """
+        在指定位置插入一行任务，只有新插入的行会播放动画。
+
+        参数：
+        - index (int)：插入的位置。
+        - task (Task)：要插入的任务对象。
+        """
+        if self._is_empty():
+            self.data = [{'task': task, 'animate': True}]
+        else:
+            self.data.insert(index, {'task': task, 'animate': True})
+
+    def update_task(self, index: int, task: Task) -> None:
+        """
+        替换指定位置的一行任务，只有该行会重新生成标记文本并播放动画。
+
+        参数：
+        - index (int)：要替换的位置。
+        - task (Task)：替换后的任务对象。
+        """
+        self.data[index] = {'task': task, 'animate': True}
+
+    def remove_task(self, index: int) -> None:
+        """
+        删除指定位置的一行任务，删除最后一个任务后显示提示文本。
+
+        参数：
+        - index (int)：要删除的位置。
+        """
+        if len(self.data) <= 1:
+            self.set_tasks([])
+        else:
+            del self.data[index]
+
+    def get_visible_rows(self) -> List[TaskRow]:
+        """
+        获取当前已创建的行部件，即可见区域内的行。
+
+        返回：
+        - List[TaskRow]：可见的行部件列表。
+        """
+        layout: Optional[RecycleBoxLayout] = self.layout_manager
+        return list(layout.children) if layout is not None else []
+
+    def _is_empty(self) -> bool:
+        """
+        私有方法，判断列表当前是否只显示了空列表的提示文本。
+        """
+        return len(self.data) == 1 and self.data[0].get('task') is None
+
+
+class TaskListViewBinding(TaskListener):
+    """
+    TaskListViewBinding类作为TaskManager的监听者，将任务的增删改事件转换为对TaskListView的局部修改：
+    显示全部任务时，每次变更只插入、替换或删除对应位置的一行，并只为该行播放动画，代价与任务总数无关；
+    显示的是筛选、排序等派生结果时，行的位置与任务列表中的位置不对应，此时在变更后切换回全部任务的完整显示。
+    """
+    def __init__(self, view: TaskListView):
+        """
+        初始化TaskListViewBinding对象。
+
+        参数：
+        - view (TaskListView)：要同步更新的任务列表视图。
+        """
+        self.view = view
+        self.showing_all = True
+        self._tasks: List[Task] = []
+
+    def show_all(self) -> None:
+        """
+        完整显示全部任务，之后的变更以局部修改的方式同步到视图。
+        """
+        self.showing_all = True
+        self.view.set_tasks(self._tasks)
+
+    def show_tasks(self, tasks: List[Task], scores: Optional[List[float]] = None) -> None:
+        """
+        显示筛选、排序等派生的任务列表，之后的第一次变更会切换回全部任务的完整显示。
+
+        参数：
+        - tasks (List[Task])：要显示的任务对象列表。
+        - scores (Optional[List[float]])：与tasks一一对应的模糊匹配得分，默认为None。
+        """
+        self.showing_all = False
+        self.view.set_tasks(tasks, scores)
+
+    def on_tasks_reset(self, tasks: List[Task]) -> None:
+        self._tasks = tasks
+        self.show_all()
+
+    def on_task_added(self, index: int, task: Task) -> None:
+        if self.showing_all:
+            self.view.insert_task(index, task)
+        else:
+            self.show_all()
+
+    def on_task_updated(self, index: int, old_task: Task, new_task: Task) -> None:
+        if self.showing_all:
+            self.view.update_task(index, new_task)
+        else:
+            self.show_all()
+
+    def on_task_removed(self, index: int, task: Task) -> None:
+        if self.showing_all:
+            self.view.remove_task(index)
+        else:
+            self.show_all()
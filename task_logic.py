@@ -1,6 +1,42 @@
-from typing import List, Optional, Dict
-from task_model import Task
+import functools
+import os
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Iterator, List, Optional, Dict, Sequence, Tuple
+from task_model import Task, TASK_CATEGORIES
 from task_persistence import TaskPersistence
+from task_events import TaskListener
+from task_statistics import TaskStatistics
+from fuzzy_search import FuzzySearchIndex
+from task_scheduler import NextActionScheduler
+from reminder_scheduler import ReminderScheduler
+from task_archive import TaskArchive
+from category_index import CategoryIndex
+from instrumentation import instrumented
+from read_write_lock import ReadWriteLock
+
+
+def _reads(method: Callable) -> Callable:
+    """
+    私有装饰器，线程安全模式下在持有读锁时执行TaskManager基于索引的查询方法。
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._lock is None:
+            return method(self, *args, **kwargs)
+        with self._lock.read_locked():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _writes(method: Callable) -> Callable:
+    """
+    私有装饰器，在TaskManager.writing块内执行修改任务列表的方法。
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.writing():
+            return method(self, *args, **kwargs)
+    return wrapper
 
 
 class TaskManager:
@@ -8,17 +44,145 @@ class TaskManager:
     TaskManager类作为任务管理的核心逻辑类，整合任务数据模型与持久化操作，
     提供了一系列用于操作任务的方法，涵盖添加、编辑、删除、查询、筛选、排序等常见任务管理功能，
     并充分考虑了各种边界情况与异常处理，确保业务逻辑的健壮性与可靠性。
+
+    线程安全模式下，修改方法（包括其保存和事件分发）在写锁内串行执行，基于索引的查询在读锁内并发执行；
+    tasks属性只应由执行修改的线程直接访问，其他线程通过snapshot获取不可变快照，
+    get_tasks_by_category("")和filter_tasks也返回基于快照的结果，遍历过程中不会受到并发修改的影响。
     """
-    def __init__(self, persistence: TaskPersistence):
+    def __init__(self, persistence: TaskPersistence, archive: Optional[TaskArchive] = None, lazy: bool = False,
+                 thread_safe: bool = False):
         """
         初始化TaskManager对象，依赖TaskPersistence对象来实现与数据存储的交互。
 
         参数：
         - persistence (TaskPersistence)：负责任务数据持久化的对象，用于执行保存、加载等数据操作。
+        - archive (Optional[TaskArchive])：已完成任务的归档对象，默认在任务CSV文件旁创建同名的"_archive.jsonl.gz"归档文件。
+        - lazy (bool)：为True时不在初始化时加载任务，任务列表先为空，随后通过load_tasks_in_batches分批加载，默认为False。
+        - thread_safe (bool)：为True时以读写锁保护任务列表及各索引，允许多个线程同时查询和修改，默认为False。
         """
         self.persistence = persistence
-        self.tasks = self.persistence.load_tasks()
+        if archive is None:
+            archive = TaskArchive(os.path.splitext(persistence.csv_file_path)[0] + "_archive.jsonl.gz")
+        self.archive = archive
+        self.tasks = [] if lazy else self.persistence.load_tasks()
+        self.loading = lazy
+        # 任务列表的版本号，每次修改后加一
+        self.version = 0
+        self._snapshot: Tuple[int, Tuple[Task, ...]] = (-1, ())
+        self._lock = ReadWriteLock() if thread_safe else None
+        self._listeners: List[TaskListener] = []
+        self.statistics = TaskStatistics()
+        self.add_listener(self.statistics)
+        self.search_index = FuzzySearchIndex()
+        self.add_listener(self.search_index)
+        self.scheduler = NextActionScheduler()
+        self.add_listener(self.scheduler)
+        self.reminders = ReminderScheduler()
+        self.add_listener(self.reminders)
+        self.category_index = CategoryIndex()
+        self.add_listener(self.category_index)
+        self._save_deferred = 0
+        self._save_pending = False
+        # 每次任务列表保存到文件之后调用的钩子（如发布共享内存快照），默认为None
+        self.on_saved: Optional[Callable[[], None]] = None
+
+    @property
+    def thread_safe(self) -> bool:
+        """
+        是否处于线程安全模式。
+        """
+        return self._lock is not None
+
+    @contextmanager
+    def writing(self):
+        """
+        上下文管理器，with块内的查询和修改作为一个整体执行：线程安全模式下持有写锁（可以嵌套），
+        其他线程的查询要等块结束后才能进行。块结束时任务列表的版本号加一，之前的快照随之过期。
+        """
+        if self._lock is not None:
+            self._lock.acquire_write()
+        try:
+            yield self
+        finally:
+            self.version += 1
+            if self._lock is not None:
+                self._lock.release_write()
+
+    def reading(self):
+        """
+        返回上下文管理器，with块内的多次查询看到同一个状态：线程安全模式下持有读锁（可以嵌套），非线程安全模式下不做任何操作。
+        块内不能调用修改方法。
+        """
+        return self._lock.read_locked() if self._lock is not None else nullcontext()
+
+    @contextmanager
+    def deferred_save(self):
+        """
+        上下文管理器，with块内的多次修改不会各自保存，而是在块结束时合并为一次保存（可以嵌套，在最外层结束时保存）。
+        监听者仍会在每次修改后立即收到事件；块内抛出异常时，已完成的修改同样会被保存。
+        线程安全模式下整个块在写锁内执行，其他线程看不到块内的中间状态。
+        块结束时的保存失败时，块内的全部修改都会被撤销：任务列表、版本号和快照恢复为块开始时的状态，
+        监听者收到一次on_tasks_reset事件，与单个修改方法保存失败时的行为一致。
 
+        抛出异常：
+        - IOError：如果在块结束时保存任务列表出现IO错误，抛出此异常，此时块内的修改均未生效。
+        """
+        with self.writing():
+            if self._save_deferred == 0:
+                start = (list(self.tasks), self.version, self._snapshot)
+            self._save_deferred += 1
+            try:
+                yield self
+            finally:
+                self._save_deferred -= 1
+                if self._save_deferred == 0 and self._save_pending:
+                    self._save_pending = False
+                    try:
+                        self._save_tasks()
+                    except Exception:
+                        self._restore_state(*start)
+                        raise
+
+    def snapshot(self) -> Tuple[Task, ...]:
+        """
+        获取任务列表的不可变快照（任务对象本身不可变，快照只复制引用），可以在任意线程中遍历而不受之后的修改影响。
+        任务列表自上次获取后没有变化时直接返回同一份快照；正在进行的修改完成之前返回修改前的快照。
+
+        返回：
+        - Tuple[Task, ...]：任务对象元组。
+        """
+        version, snapshot = self._snapshot
+        if version != self.version:
+            with self.reading():
+                snapshot = tuple(self.tasks)
+                self._snapshot = (self.version, snapshot)
+        return snapshot
+
+    @_writes
+    def add_listener(self, listener: TaskListener) -> None:
+        """
+        注册任务列表变更事件的监听者，注册时会立即以当前任务列表触发一次on_tasks_reset，
+        使监听者与任务列表保持同步。
+
+        参数：
+        - listener (TaskListener)：要注册的监听者对象。
+        """
+        self._listeners.append(listener)
+        listener.on_tasks_reset(self.tasks)
+
+    @_writes
+    def remove_listener(self, listener: TaskListener) -> None:
+        """
+        注销已注册的任务列表变更事件监听者，未注册的监听者会被忽略。
+
+        参数：
+        - listener (TaskListener)：要注销的监听者对象。
+        """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    @instrumented("task_manager.add_task")
+    @_writes
     def add_task(self, task: Task) -> None:
         """
         添加任务到任务列表，并将更新后的任务列表持久化保存到存储介质（如CSV文件）中。
@@ -33,11 +197,19 @@ class TaskManager:
                     抛出此异常并详细说明具体的IO问题所在，方便排查文件写入故障。
         """
         self.tasks.append(task)
-        self._save_tasks()
+        try:
+            self._save_tasks()
+        except Exception:
+            self.tasks.pop()
+            raise
+        self._notify("on_task_added", len(self.tasks) - 1, task)
 
+    @instrumented("task_manager.edit_task")
+    @_writes
     def edit_task(self, index: int, updated_task: Task) -> None:
         """
         根据给定的索引编辑任务列表中的任务，更新任务对象后将变化持久化到存储介质中。
+        编辑后的任务沿用原任务的唯一标识和创建时间，监听者可据此识别这是同一任务的更新。
         对索引合法性以及更新后任务数据的合法性进行严格验证，确保编辑操作的正确性和数据一致性。
 
         参数：
@@ -51,9 +223,18 @@ class TaskManager:
         """
         if index < 0 or index >= len(self.tasks):
             raise IndexError("任务索引超出范围")
+        old_task = self.tasks[index]
+        updated_task = updated_task.replace(task_id=old_task.task_id, created_at=old_task.created_at)
         self.tasks[index] = updated_task
-        self._save_tasks()
+        try:
+            self._save_tasks()
+        except Exception:
+            self.tasks[index] = old_task
+            raise
+        self._notify("on_task_updated", index, old_task, updated_task)
 
+    @instrumented("task_manager.delete_task")
+    @_writes
     def delete_task(self, index: int) -> None:
         """
         根据索引删除任务列表中的指定任务，并将更新后的任务列表持久化保存，
@@ -69,26 +250,217 @@ class TaskManager:
         """
         if index < 0 or index >= len(self.tasks):
             raise IndexError("任务索引超出范围")
-        del self.tasks[index]
-        self._save_tasks()
+        task = self.tasks.pop(index)
+        try:
+            self._save_tasks()
+        except Exception:
+            self.tasks.insert(index, task)
+            raise
+        self._notify("on_task_removed", index, task)
+
+    @instrumented("task_manager.add_tasks")
+    @_writes
+    def add_tasks(self, tasks: List[Task]) -> None:
+        """
+        批量添加任务到任务列表，所有任务添加完成后只进行一次持久化保存，适用于批量导入等场景。
+
+        参数：
+        - tasks (List[Task])：要添加的任务对象列表，列表中的任务对象需符合Task类定义的合法性要求。
+
+        抛出异常：
+        - IOError：如果在将更新后的任务列表保存到文件时出现IO错误，抛出此异常并详细说明具体的IO问题所在。
+        """
+        start = len(self.tasks)
+        self.tasks.extend(tasks)
+        try:
+            self._save_tasks()
+        except Exception:
+            del self.tasks[start:]
+            raise
+        for offset, task in enumerate(tasks):
+            self._notify("on_task_added", start + offset, task)
+
+    def load_tasks_in_batches(self, batch_size: int) -> Iterator[List[Task]]:
+        """
+        以流式方式分批加载任务，每读取batch_size个任务产生一批，调用者可以在批与批之间处理界面事件并显示已加载的部分。
+        全部加载完成后任务列表被整体替换，所有监听者只收到一次on_tasks_reset事件，加载过程不写回文件。
+
+        参数：
+        - batch_size (int)：每批的任务数量。
 
-    def get_tasks_by_category(self, category: str) -> List[Task]:
+        返回：
+        - Iterator[List[Task]]：依次产生各批任务的迭代器。
+
+        抛出异常：
+        - ValueError：如果batch_size不是正整数，或读取的数据不合法，抛出此异常。
+        - FileNotFoundError、csv.Error：与TaskPersistence.load_tasks一致。
+        """
+        if batch_size <= 0:
+            raise ValueError("每批的任务数量需为正整数")
+        loaded = []
+        batch = []
+        for task in self.persistence.iter_tasks():
+            batch.append(task)
+            if len(batch) >= batch_size:
+                loaded.extend(batch)
+                yield batch
+                batch = []
+        if batch:
+            loaded.extend(batch)
+            yield batch
+        with self.writing():
+            self.tasks = loaded
+            self.loading = False
+            self._notify("on_tasks_reset", self.tasks)
+
+    @instrumented("task_manager.replace_tasks")
+    @_writes
+    def replace_tasks(self, tasks: List[Task]) -> None:
+        """
+        用给定的任务列表整体替换当前任务列表并持久化保存，所有监听者会收到on_tasks_reset事件。
+
+        参数：
+        - tasks (List[Task])：新的任务对象列表。
+
+        抛出异常：
+        - IOError：如果在将任务列表保存到文件时出现IO错误，抛出此异常并详细说明具体的IO问题所在。
+        """
+        previous = self.tasks
+        self.tasks = list(tasks)
+        try:
+            self._save_tasks()
+        except Exception:
+            self.tasks = previous
+            raise
+        self._notify("on_tasks_reset", self.tasks)
+
+    def restore_tasks(self, file_path: str) -> None:
+        """
+        从外部CSV文件恢复任务数据，用导入的任务整体替换当前任务列表并持久化保存。
+
+        参数：
+        - file_path (str)：要恢复任务数据的外部CSV文件路径。
+
+        抛出异常：
+        - FileNotFoundError、csv.Error、ValueError、PermissionError：与TaskPersistence.import_tasks一致。
+        - IOError：如果在将任务列表保存到文件时出现IO错误，抛出此异常。
+        """
+        self.replace_tasks(self.persistence.import_tasks(file_path))
+
+    @instrumented("task_manager.archive_completed")
+    @_writes
+    def archive_completed(self) -> int:
+        """
+        将进度为100的已完成任务移入归档文件，使任务列表只保留未完成的任务，
+        减少后续加载、保存、筛选、排序和显示的开销。先写入归档再保存任务列表：保存失败时撤销本次归档，
+        任务仍留在任务列表中；两步之间中断时任务同时留在两处，再次归档时归档按唯一标识跳过已写入的任务。
+
+        返回：
+        - int：被归档的任务数量。
+
+        抛出异常：
+        - IOError：如果写入归档文件或保存任务列表时出现IO错误，抛出此异常并详细说明具体的IO问题所在。
+        """
+        completed = [task for task in self.tasks if task.progress == 100]
+        if not completed:
+            return 0
+        self.archive.append(completed)
+        try:
+            self.replace_tasks([task for task in self.tasks if task.progress != 100])
+        except Exception:
+            self.archive.undo_append()
+            raise
+        return len(completed)
+
+    @_writes
+    def restore_archived(self, archive_id: int) -> Task:
+        """
+        将指定编号的归档任务恢复到任务列表中。先保存任务列表再将归档记录标记为已恢复，
+        两步之间中断时再次恢复不会重复添加任务列表中已有（唯一标识相同）的任务。
+
+        参数：
+        - archive_id (int)：要恢复的任务的归档编号。
+
+        返回：
+        - Task：被恢复的任务对象。
+
+        抛出异常：
+        - KeyError：如果归档中不存在该编号的任务或该任务已被恢复，抛出此异常。
+        - IOError：如果保存任务列表时出现IO错误，抛出此异常。
+        """
+        task = self.archive.get_task(archive_id)
+        if all(existing.task_id != task.task_id for existing in self.tasks):
+            self.add_task(task)
+        self.archive.mark_restored(archive_id, task)
+        return task
+
+    @_reads
+    def get_statistics(self) -> Dict[str, Dict[str, object]]:
+        """
+        获取任务统计数据汇总，统计数据在每次增删改任务时增量维护，调用本方法无需遍历任务列表。
+        归档任务的数量来自归档元数据，同样无需读取归档文件。
+
+        返回：
+        - Dict[str, Dict[str, object]]：各任务类别及"全部"对应的数量、完成数量、平均进度和完成率，
+                                       以及"已归档"对应的各类别归档数量。
+        """
+        summary = self.statistics.to_dict()
+        summary["已归档"] = {category or "全部": self.archive.get_count(category) for category in ("",) + tuple(TASK_CATEGORIES)}
+        return summary
+
+    @instrumented("task_manager.get_tasks_by_category")
+    @_reads
+    def get_tasks_by_category(self, category: str) -> Sequence[Task]:
         """
         根据给定的任务类别获取任务列表中匹配该类别的所有任务，返回符合条件的任务对象列表。
-        如果传入空字符串类别，则返回所有任务列表，方便实现不同的查询需求。
+        如果传入空字符串类别，则返回所有任务列表，方便实现不同的查询需求。按类别查询由CategoryIndex直接给出，无需扫描全部任务。
 
         参数：
         - category (str)：任务类别，取值应为"紧急重要"、"重要不紧急"、"紧急不重要"、"不紧急不重要"之一，
                           若传入空字符串则表示获取所有任务。
 
         返回：
-        - List[Task]：匹配给定类别（或所有任务，如果传入空字符串类别）的任务对象列表，列表中的任务对象均符合Task类规范。
+        - Sequence[Task]：匹配给定类别（或所有任务，如果传入空字符串类别）的任务对象列表，列表中的任务对象均符合Task类规范。
+                          线程安全模式下传入空字符串时返回任务列表的快照。
         """
         if category == "":
-            return self.tasks
-        return [task for task in self.tasks if task.category == category]
+            return self._current_tasks()
+        return self.category_index.get_tasks(category)
+
+    @instrumented("task_manager.get_category_page")
+    @_reads
+    def get_category_page(self, category: str, start: int, limit: int) -> List[Task]:
+        """
+        分页获取指定类别的任务，只切取所需的片段，供按象限分页显示任务时使用。
+
+        参数：
+        - category (str)：任务类别。
+        - start (int)：起始位置。
+        - limit (int)：最多返回的任务数量。
+
+        返回：
+        - List[Task]：该类别中从start开始的至多limit个任务，顺序与任务列表中的顺序一致。
+
+        抛出异常：
+        - ValueError：如果start或limit为负数，抛出此异常。
+        """
+        return self.category_index.get_page(category, start, limit)
 
-    def filter_tasks(self, keyword: str, filters: Dict[str, object]) -> List[Task]:
+    @_reads
+    def get_category_count(self, category: str) -> int:
+        """
+        获取指定类别的任务数量。
+
+        参数：
+        - category (str)：任务类别。
+
+        返回：
+        - int：该类别的任务数量。
+        """
+        return self.category_index.get_count(category)
+
+    @instrumented("task_manager.filter_tasks")
+    def filter_tasks(self, keyword: str, filters: Dict[str, object]) -> Sequence[Task]:
         """
         根据给定的关键字以及其他筛选条件（如进度范围等）对任务列表进行筛选，返回满足筛选条件的任务对象列表。
         对关键字和筛选条件进行合理的处理与判断，高效准确地筛选出符合要求的任务，同时确保返回结果的合法性与准确性。
@@ -99,9 +471,10 @@ class TaskManager:
                                        当前可扩展支持更多筛选条件，若字典为空则表示无其他额外筛选条件。
 
         返回：
-        - List[Task]：经过筛选后满足条件的任务对象列表，列表中的任务对象均符合Task类的各项属性合法性要求。
+        - Sequence[Task]：经过筛选后满足条件的任务对象列表，列表中的任务对象均符合Task类的各项属性合法性要求。
+                          线程安全模式下在任务列表的快照上筛选，不持有锁。
         """
-        filtered_tasks = self.tasks
+        filtered_tasks = self._current_tasks()
         if keyword:
             filtered_tasks = [task for task in filtered_tasks if keyword in task.name or keyword in task.description]
         if "progress" in filters:
@@ -109,6 +482,98 @@ class TaskManager:
             filtered_tasks = [task for task in filtered_tasks if progress_min <= task.progress <= progress_max]
         return filtered_tasks
 
+    @instrumented("task_manager.fuzzy_search")
+    def fuzzy_search(self, query: str, k: int = 10, min_score: float = 0.5,
+                     filters: Optional[Dict[str, object]] = None) -> List[Tuple[Task, float]]:
+        """
+        根据查询文本对任务名称和描述进行模糊搜索，允许查询中存在错别字，按相似度从高到低返回前k个任务及其得分。
+        搜索基于增量维护的n-gram倒排索引，只对可能达到得分阈值的候选任务打分，无需遍历全部任务。
+        索引在第一次搜索时构建，线程安全模式下构建在写锁内进行（因此不能在reading块内进行第一次搜索），之后的搜索在读锁内并发执行。
+
+        参数：
+        - query (str)：查询文本。
+        - k (int)：最多返回的结果数量，默认为10。
+        - min_score (float)：得分阈值（0 - 1之间），默认为0.5。
+        - filters (Optional[Dict[str, object]])：与filter_tasks相同的其他筛选条件（如'progress'进度范围），
+                                                在取前k个之前应用，默认为None即不筛选。
+
+        返回：
+        - List[Tuple[Task, float]]：按得分从高到低排列的(任务, 得分)列表。
+
+        抛出异常：
+        - ValueError：如果k不是正整数或min_score不在(0, 1]范围内，抛出此异常。
+        """
+        if not self.search_index.built:
+            with self._lock.write_locked() if self._lock is not None else nullcontext():
+                self.search_index.build()
+        predicate = None
+        if filters and "progress" in filters:
+            progress_min, progress_max = filters["progress"]
+            predicate = lambda task: progress_min <= task.progress <= progress_max
+        with self.reading():
+            return self.search_index.search(query, k, min_score, predicate)
+
+    @instrumented("task_manager.next_tasks")
+    @_reads
+    def next_tasks(self, n: int) -> List[Task]:
+        """
+        获取下一步最应处理的前n个未完成任务，按象限权重、剩余进度和任务存在时长综合得分从高到低排列。
+        得分由NextActionScheduler以堆的形式增量维护，获取前n个任务的代价为O(n log N)。
+
+        参数：
+        - n (int)：要获取的任务数量。
+
+        返回：
+        - List[Task]：按优先级得分从高到低排列的任务列表。
+
+        抛出异常：
+        - ValueError：如果n为负数，抛出此异常。
+        """
+        return self.scheduler.next_tasks(n)
+
+    @_writes
+    def set_scheduler_weights(self, quadrant_weights: Dict[str, float], remaining_weight: float, age_weight: float) -> None:
+        """
+        设置下一步任务的打分权重，已有任务按新权重重新排序。
+
+        参数：
+        - quadrant_weights (Dict[str, float])：各任务类别的权重。
+        - remaining_weight (float)：剩余进度每1%的权重。
+        - age_weight (float)：任务每存在1天增加的得分。
+        """
+        self.scheduler.set_weights(quadrant_weights, remaining_weight, age_weight)
+
+    @_reads
+    def get_overdue_tasks(self) -> List[Task]:
+        """
+        获取截止时间已过但尚未完成的全部任务，基于按截止时间排序的索引查询，无需遍历任务列表。
+
+        返回：
+        - List[Task]：已逾期的未完成任务列表，按截止时间从早到晚排列。
+        """
+        return self.reminders.get_overdue_tasks()
+
+    @_reads
+    def next_reminder_deadline(self) -> Optional[float]:
+        """
+        获取最近一个尚未触发的提醒的截止时间戳。
+
+        返回：
+        - Optional[float]：最近的截止时间戳，没有待触发的提醒时返回None。
+        """
+        return self.reminders.next_deadline()
+
+    @_writes
+    def pop_due_reminders(self) -> List[Task]:
+        """
+        取出截止时间已到达的全部待触发提醒，每个提醒只会被取出一次；取出会修改提醒堆，因此在写锁内执行。
+
+        返回：
+        - List[Task]：截止时间已到达的任务列表，按截止时间从早到晚排列。
+        """
+        return self.reminders.pop_due()
+
+    @instrumented("task_manager.sort_tasks")
     def sort_tasks(self, sort_key: str, ascending: bool) -> List[Task]:
         """
         根据指定的排序键（如任务名称、进度等任务属性）以及排序顺序（升序或降序）对任务列表进行排序，
@@ -129,16 +594,53 @@ class TaskManager:
         if not hasattr(Task, sort_key):
             raise ValueError(f"排序键 {sort_key} 不是任务对象的合法属性名称")
 
-        sorted_tasks = sorted(self.tasks, key=lambda task: getattr(task, sort_key), reverse=not ascending)
+        sorted_tasks = sorted(self._current_tasks(), key=lambda task: getattr(task, sort_key), reverse=not ascending)
         return sorted_tasks
 
     def _save_tasks(self) -> None:
         """
         私有方法，用于将当前任务列表持久化保存到存储介质（通过关联的TaskPersistence对象实现），
         集中处理任务列表保存操作，便于统一管理持久化相关的异常处理以及逻辑更新等情况。
+        在deferred_save块内只记录需要保存，由块结束时统一保存。
 
         抛出异常：
         - IOError：如果在保存任务列表到文件时出现IO错误（如磁盘空间不足、文件被其他程序占用等情况），
                     抛出此异常并详细说明具体的IO问题所在，方便排查文件写入故障。
+                    修改方法捕获到异常时会撤销对任务列表的修改，监听者不会收到该修改的事件，任务列表与各索引保持一致。
+        """
+        if self._save_deferred:
+            self._save_pending = True
+            return
+        self.persistence.save_tasks(self.tasks)
+        if self.on_saved is not None:
+            try:
+                self.on_saved()
+            except Exception as e:
+                print(f"任务列表保存后的处理出错: {str(e)}")
+
+    def _restore_state(self, tasks: List[Task], version: int, snapshot: Tuple[int, Tuple[Task, ...]]) -> None:
+        """
+        私有方法，在写锁内将任务列表恢复为之前记录的状态并通知监听者，版本号和快照一并恢复。
+        外层writing块结束时版本号还会加一，因此这里先减一，使块结束后的版本号与恢复的快照一致。
+        """
+        self.tasks = tasks
+        self._snapshot = snapshot
+        self.version = version - 1
+        self._notify("on_tasks_reset", self.tasks)
+
+    def _current_tasks(self) -> Sequence[Task]:
+        """
+        私有方法，返回供查询遍历的任务序列：线程安全模式下为任务列表的快照，否则为任务列表本身。
+        """
+        return self.snapshot() if self._lock is not None else self.tasks
+
+    def _notify(self, event: str, *args) -> None:
+        """
+        私有方法，将任务列表变更事件依次分发给所有已注册的监听者。
+
+        参数：
+        - event (str)：事件方法名称，如"on_task_added"。
+        - args：传递给事件方法的参数。
         """
-        self.persistence.save_tasks(self.tasks)
\ No newline at end of file
+        for listener in self._listeners:
+            getattr(listener, event)(*args)
\ No newline at end of file
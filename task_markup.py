@@ -0,0 +1,93 @@
+import weakref
+from typing import Dict, List
+from kivy.utils import escape_markup, get_hex_from_color
+from utils import COLOR_THEME, add_theme_listener
+from task_model import Task, TASK_CATEGORIES, format_due_date
+
+# 任务类别与颜色主题中对应颜色键的映射
+CATEGORY_COLOR_KEYS = {
+    "紧急重要": "urgent_important",
+    "重要不紧急": "important_not_urgent",
+    "紧急不重要": "urgent_not_important",
+    "不紧急不重要": "not_important_not_urgent",
+}
+
+
+class TaskMarkupRenderer:
+    """
+    TaskMarkupRenderer类负责生成任务列表中每一行的Kivy标记文本，并缓存生成结果：
+    - 加载颜色主题时为每个类别预编译一个行模板，类别颜色和类别标签只在此时插值一次；
+    - 每个任务的标记文本按任务对象缓存，任务对象不可变，编辑任务会产生新的对象，旧对象的缓存随之失效，
+      被丢弃的任务对象的缓存条目会被自动回收；
+    - 更换颜色主题时整体清空缓存，共用的default_renderer通过utils.set_color_theme接收主题变化。
+    因此对未发生变化的任务重新显示（如切换筛选或排序结果）时只需查表，无需重新格式化。
+    """
+    def __init__(self, theme: Dict[str, List[float]] = COLOR_THEME):
+        """
+        初始化TaskMarkupRenderer对象并按颜色主题预编译行模板。
+
+        参数：
+        - theme (Dict[str, List[float]])：颜色主题，默认为COLOR_THEME。
+        """
+        self._cache: "weakref.WeakKeyDictionary[Task, str]" = weakref.WeakKeyDictionary()
+        self.hits = 0
+        self.misses = 0
+        self.load_theme(theme)
+
+    def load_theme(self, theme: Dict[str, List[float]]) -> None:
+        """
+        加载颜色主题，为每个任务类别预编译行模板，并清空已缓存的标记文本。
+
+        参数：
+        - theme (Dict[str, List[float]])：颜色主题，需包含CATEGORY_COLOR_KEYS中的各颜色键。
+
+        抛出异常：
+        - KeyError：如果颜色主题缺少某个类别的颜色，抛出此异常。
+        """
+        templates = {}
+        for category in TASK_CATEGORIES:
+            color = get_hex_from_color(theme[CATEGORY_COLOR_KEYS[category]])
+            tag = escape_markup('[' + category + ']')
+            templates[category] = "{name}  [b]进度:[/b] {progress}%{due}  [color=" + color + "]" + tag + "[/color]"
+        self._templates = templates
+        self._cache.clear()
+
+    def render(self, task: Task) -> str:
+        """
+        获取任务对应的一行标记文本，任务名称等用户输入的内容会被转义，类别标签按颜色主题着色。
+
+        参数：
+        - task (Task)：要渲染的任务对象。
+
+        返回：
+        - str：该任务对应的标记文本。
+        """
+        markup = self._cache.get(task)
+        if markup is not None:
+            self.hits += 1
+            return markup
+        self.misses += 1
+        due = f"  [b]截止:[/b] {format_due_date(task.due_date)}" if task.due_date is not None else ""
+        markup = self._templates[task.category].format(name=escape_markup(task.name), progress=task.progress, due=due)
+        self._cache[task] = markup
+        return markup
+
+    def invalidate(self, task: Task) -> None:
+        """
+        丢弃指定任务已缓存的标记文本。
+
+        参数：
+        - task (Task)：要丢弃缓存的任务对象。
+        """
+        self._cache.pop(task, None)
+
+    def get_cache_size(self) -> int:
+        """
+        获取当前缓存的标记文本数量。
+        """
+        return len(self._cache)
+
+
+# 全部任务列表视图共用的渲染器，颜色主题变化时重新加载
+default_renderer = TaskMarkupRenderer()
+add_theme_listener(default_renderer.load_theme)
\ No newline at end of file
@@ -1,4 +1,88 @@
-from typing import Dict
+import uuid
+from datetime import datetime
+from typing import Dict, Optional
+
+# 任务的四个合法类别，对应艾森豪威尔矩阵的四个象限
+TASK_CATEGORIES = ["紧急重要", "重要不紧急", "紧急不重要", "不紧急不重要"]
+
+# 截止时间的存储格式，以及输入时可接受的格式（只给出日期时视为当天23:59截止）
+DUE_DATE_FORMAT = "%Y-%m-%d %H:%M"
+DATE_ONLY_FORMAT = "%Y-%m-%d"
+
+
+def parse_due_date(text: str) -> Optional[datetime]:
+    """
+    将截止时间字符串解析为datetime对象，支持"YYYY-MM-DD HH:MM"和"YYYY-MM-DD"两种格式，
+    只给出日期时视为当天23:59截止，空字符串表示没有截止时间。
+
+    参数：
+    - text (str)：截止时间字符串。
+
+    返回：
+    - Optional[datetime]：解析得到的截止时间，空字符串时返回None。
+
+    抛出异常：
+    - ValueError：如果字符串不符合上述任一格式，抛出此异常并提示正确的格式。
+    """
+    text = text.strip()
+    if not text:
+        return None
+    try:
+        return datetime.strptime(text, DUE_DATE_FORMAT)
+    except ValueError:
+        pass
+    try:
+        return datetime.strptime(text, DATE_ONLY_FORMAT).replace(hour=23, minute=59)
+    except ValueError:
+        raise ValueError("截止时间格式不正确，请输入YYYY-MM-DD或YYYY-MM-DD HH:MM")
+
+
+def parse_created_at(text: str) -> Optional[datetime]:
+    """
+    将创建时间字符串（"YYYY-MM-DD HH:MM:SS"）解析为datetime对象，空字符串表示创建时间未知。
+
+    参数：
+    - text (str)：创建时间字符串。
+
+    返回：
+    - Optional[datetime]：解析得到的创建时间，空字符串时返回None。
+
+    抛出异常：
+    - ValueError：如果字符串不是合法的日期时间，抛出此异常。
+    """
+    text = text.strip()
+    if not text:
+        return None
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        raise ValueError(f"创建时间格式不正确: {text}")
+
+
+def format_created_at(created_at: datetime) -> str:
+    """
+    将创建时间格式化为存储用的字符串（"YYYY-MM-DD HH:MM:SS"）。
+
+    参数：
+    - created_at (datetime)：创建时间。
+
+    返回：
+    - str：创建时间字符串。
+    """
+    return created_at.isoformat(sep=" ", timespec="seconds")
+
+
+def format_due_date(due_date: Optional[datetime]) -> str:
+    """
+    将截止时间格式化为存储用的字符串，没有截止时间时返回空字符串。
+
+    参数：
+    - due_date (Optional[datetime])：截止时间。
+
+    返回：
+    - str：格式为"YYYY-MM-DD HH:MM"的字符串或空字符串。
+    """
+    return due_date.strftime(DUE_DATE_FORMAT) if due_date is not None else ""
 
 
 class Task:
@@ -6,15 +90,20 @@ class Task:
     Task类用于表示任务对象，封装了任务的各项属性及相关操作方法，
     严格把控任务数据的合法性与完整性，为整个任务管理系统提供标准的数据模型基础。
     """
-    def __init__(self, name: str, description: str, progress: int, category: str):
+    def __init__(self, name: str, description: str, progress: int, category: str, due_date: Optional[datetime] = None,
+                 task_id: Optional[str] = None, created_at: Optional[datetime] = None):
         """
         初始化Task对象。
 
         参数：
         - name (str)：任务名称，长度需在1 - 100个字符之间。
-        - description (str)：任务描述，可为任意长度字符串。
+        - description (str)：任务描述，可为任意长度字符串；从任务文件加载的较长描述为尚未读取的描述引用
+                             （见description_store.DescriptionRef），第一次读取description时才从描述文件中读取。
         - progress (int)：任务进度，取值范围是0 - 100的整数。
         - category (str)：任务类别，取值应为"紧急重要"、"重要不紧急"、"紧急不重要"、"不紧急不重要"之一。
+        - due_date (Optional[datetime])：可选的截止时间，默认为None，表示没有截止时间。
+        - task_id (Optional[str])：任务的唯一标识，默认为None，表示生成一个新的标识。
+        - created_at (Optional[datetime])：任务的创建时间，默认为None，表示当前时间（精确到秒）。
 
         抛出异常：
         - ValueError：如果传入的参数不符合上述要求，抛出此异常并明确提示相应的错误信息，
@@ -23,10 +112,15 @@ class Task:
         self._validate_name(name)
         self._validate_progress(progress)
         self._validate_category(category)
+        self._validate_due_date(due_date)
+        self._validate_created_at(created_at)
         self._name = name
         self._description = description
         self._progress = progress
         self._category = category
+        self._due_date = due_date
+        self._task_id = task_id or uuid.uuid4().hex
+        self._created_at = created_at or datetime.now().replace(microsecond=0)
 
     @property
     def name(self) -> str:
@@ -41,11 +135,22 @@ class Task:
     @property
     def description(self) -> str:
         """
-        获取任务描述。
+        获取任务描述，描述存放在描述文件中时按需读取（读取结果有缓存）。
 
         返回：
         - str：任务描述。
         """
+        description = self._description
+        return description if isinstance(description, str) else description.load()
+
+    @property
+    def stored_description(self):
+        """
+        获取任务描述的存储形式，不会读取描述文件，供持久化时沿用描述在描述文件中的位置。
+
+        返回：
+        - Union[str, DescriptionRef]：描述字符串，或尚未读取的描述引用。
+        """
         return self._description
 
     @property
@@ -68,6 +173,55 @@ class Task:
         """
         return self._category
 
+    @property
+    def due_date(self) -> Optional[datetime]:
+        """
+        获取任务截止时间。
+
+        返回：
+        - Optional[datetime]：任务截止时间，没有截止时间时为None。
+        """
+        return self._due_date
+
+    @property
+    def task_id(self) -> str:
+        """
+        获取任务的唯一标识。任务编辑后标识保持不变，可用于在任务列表变化时定位同一任务。
+
+        返回：
+        - str：任务的唯一标识。
+        """
+        return self._task_id
+
+    @property
+    def created_at(self) -> datetime:
+        """
+        获取任务的创建时间。任务编辑后创建时间保持不变，用于计算任务的存在时长。
+
+        返回：
+        - datetime：任务的创建时间。
+        """
+        return self._created_at
+
+    def replace(self, **changes) -> 'Task':
+        """
+        创建一个修改了部分属性的新任务对象，未指定的属性（包括唯一标识和创建时间）沿用当前任务的值。
+
+        参数：
+        - changes：要修改的属性，键为Task构造函数的参数名。
+
+        返回：
+        - Task：新的任务对象。
+
+        抛出异常：
+        - ValueError：如果修改后的属性不符合任务属性要求，抛出此异常。
+        """
+        attributes = {"name": self.name, "description": self.stored_description, "progress": self.progress,
+                      "category": self.category, "due_date": self.due_date, "task_id": self.task_id,
+                      "created_at": self.created_at}
+        attributes.update(changes)
+        return Task(**attributes)
+
     @staticmethod
     def _validate_name(name: str):
         """
@@ -107,23 +261,54 @@ class Task:
         抛出异常：
         - ValueError：如果任务类别输入不合法，抛出此异常，明确提示用户输入合法的类别选项。
         """
-        valid_categories = ["紧急重要", "重要不紧急", "紧急不重要", "不紧急不重要"]
-        if category not in valid_categories:
-            raise ValueError(f"任务类别输入不合法，有效类别为：{', '.join(valid_categories)}")
+        if category not in TASK_CATEGORIES:
+            raise ValueError(f"任务类别输入不合法，有效类别为：{', '.join(TASK_CATEGORIES)}")
+
+    @staticmethod
+    def _validate_due_date(due_date: Optional[datetime]):
+        """
+        私有方法，用于验证任务截止时间的合法性，要求为datetime对象或None。
+
+        参数：
+        - due_date (Optional[datetime])：要验证的任务截止时间。
+
+        抛出异常：
+        - ValueError：如果截止时间既不是datetime对象也不是None，抛出此异常。
+        """
+        if due_date is not None and not isinstance(due_date, datetime):
+            raise ValueError("任务截止时间需为日期时间或留空")
+
+    @staticmethod
+    def _validate_created_at(created_at: Optional[datetime]):
+        """
+        私有方法，用于验证任务创建时间的合法性，要求为datetime对象或None。
+
+        参数：
+        - created_at (Optional[datetime])：要验证的任务创建时间。
+
+        抛出异常：
+        - ValueError：如果创建时间既不是datetime对象也不是None，抛出此异常。
+        """
+        if created_at is not None and not isinstance(created_at, datetime):
+            raise ValueError("任务创建时间需为日期时间")
 
     def to_dict(self) -> Dict[str, object]:
         """
         将任务对象转换为字典形式，方便进行数据持久化等操作，如存储到文件或与其他数据格式进行转换。
 
         返回：
-        - Dict[str, object]：包含任务各属性的字典，键分别为'name'、'description'、'progress'、'category'，
-                            对应的值为任务对象相应的属性值。
+        - Dict[str, object]：包含任务各属性的字典，键分别为'name'、'description'、'progress'、'category'、'due_date'、'id'、'created_at'，
+                            对应的值为任务对象相应的属性值，其中截止时间以"YYYY-MM-DD HH:MM"字符串表示，没有截止时间时为空字符串，
+                            创建时间以"YYYY-MM-DD HH:MM:SS"字符串表示。
         """
         return {
             "name": self.name,
             "description": self.description,
             "progress": self.progress,
-            "category": self.category
+            "category": self.category,
+            "due_date": format_due_date(self.due_date),
+            "id": self.task_id,
+            "created_at": format_created_at(self.created_at)
         }
 
     @classmethod
@@ -133,7 +318,9 @@ class Task:
 
         参数：
         - task_dict (Dict[str, object])：包含任务各属性的字典，需包含'name'、'description'、'progress'、'category'键，
-                                        且对应的值需符合任务属性的合法性要求。
+                                        且对应的值需符合任务属性的合法性要求；'due_date'键可选，值可以是datetime对象、
+                                        截止时间字符串或空字符串；'id'键可选，缺少时为任务生成新的唯一标识；
+                                        'created_at'键可选，值可以是datetime对象或创建时间字符串，缺少时为当前时间。
 
         返回：
         - Task：根据字典数据创建的Task对象。
@@ -147,4 +334,10 @@ class Task:
         category = task_dict.get("category")
         if None in (name, description, progress, category):
             raise ValueError("任务字典数据不完整，缺少必要的任务属性信息")
-        return cls(name, description, progress, category)
\ No newline at end of file
+        due_date = task_dict.get("due_date") or None
+        if isinstance(due_date, str):
+            due_date = parse_due_date(due_date)
+        created_at = task_dict.get("created_at") or None
+        if isinstance(created_at, str):
+            created_at = parse_created_at(created_at)
+        return cls(name, description, progress, category, due_date, task_dict.get("id") or None, created_at)
\ No newline at end of file
@@ -1,10 +1,21 @@
 from kivy.uix.textinput import TextInput
 from kivy.uix.popup import Popup
-from input_validation import validate_task_name, validate_task_progress, validate_task_category
+from kivy.uix.togglebutton import ToggleButton
+from input_validation import validate_task_name, validate_task_progress, validate_task_category, validate_task_due_date
 from utils import show_success_message, show_error_message, save_last_path
-from task_model import Task
+from task_model import Task, parse_due_date
+from task_scheduler import load_weights, save_weights
 
-def add_task_from_popup(screen, name_input: TextInput, desc_input: TextInput, progress_input: TextInput, category_input: TextInput, popup: Popup) -> None:
+# 模糊匹配筛选时最多显示的任务数量
+FUZZY_SEARCH_LIMIT = 50
+# 查看下一步任务时默认显示的任务数量
+NEXT_TASKS_DEFAULT_COUNT = 5
+# 查询归档任务时最多显示的任务数量
+ARCHIVE_SEARCH_LIMIT = 20
+# 跨工作区搜索时最多显示的任务数量
+WORKSPACE_SEARCH_LIMIT = 20
+
+def add_task_from_popup(screen, name_input: TextInput, desc_input: TextInput, progress_input: TextInput, category_input: TextInput, due_input: TextInput, popup: Popup) -> None:
     """
     从弹窗中添加任务。
 
@@ -14,6 +25,7 @@ def add_task_from_popup(screen, name_input: TextInput, desc_input: TextInput, pr
     - desc_input (TextInput)：任务描述输入框。
     - progress_input (TextInput)：任务进度输入框。
     - category_input (TextInput)：任务类别输入框。
+    - due_input (TextInput)：任务截止时间输入框。
     - popup (Popup)：弹窗对象。
     """
     try:
@@ -21,19 +33,19 @@ def add_task_from_popup(screen, name_input: TextInput, desc_input: TextInput, pr
         desc = desc_input.text
         progress = progress_input.text
         category = category_input.text
+        due = due_input.text
         validate_task_name(name)
         validate_task_progress(progress)
         validate_task_category(category)
-        task = Task(name, desc, int(progress), category)
+        validate_task_due_date(due)
+        task = Task(name, desc, int(progress), category, parse_due_date(due))
         screen.task_manager.add_task(task)
         show_success_message("任务添加成功！")
         popup.dismiss()
-        screen.update_task_list()
-        save_last_path("backup_path", name_input.text)
     except ValueError as e:
         show_error_message(str(e))
 
-def edit_task_from_popup(screen, name_input: TextInput, desc_input: TextInput, progress_input: TextInput, category_input: TextInput, popup: Popup) -> None:
+def edit_task_from_popup(screen, name_input: TextInput, desc_input: TextInput, progress_input: TextInput, category_input: TextInput, due_input: TextInput, popup: Popup) -> None:
     """
     从弹窗中编辑任务。
 
@@ -43,6 +55,7 @@ def edit_task_from_popup(screen, name_input: TextInput, desc_input: TextInput, p
     - desc_input (TextInput)：任务描述输入框。
     - progress_input (TextInput)：任务进度输入框。
     - category_input (TextInput)：任务类别输入框。
+    - due_input (TextInput)：任务截止时间输入框。
     - popup (Popup)：弹窗对象。
     """
     try:
@@ -50,14 +63,15 @@ def edit_task_from_popup(screen, name_input: TextInput, desc_input: TextInput, p
         desc = desc_input.text
         progress = progress_input.text
         category = category_input.text
+        due = due_input.text
         validate_task_name(name)
         validate_task_progress(progress)
         validate_task_category(category)
-        task = Task(name, desc, int(progress), category)
+        validate_task_due_date(due)
+        task = Task(name, desc, int(progress), category, parse_due_date(due))
         screen.task_manager.edit_task(screen.selected_task_index, task)
         show_success_message("任务编辑成功！")
         popup.dismiss()
-        screen.update_task_list()
     except ValueError as e:
         show_error_message(str(e))
 
@@ -73,7 +87,6 @@ def delete_task_from_popup(screen, popup: Popup) -> None:
         screen.task_manager.delete_task(screen.selected_task_index)
         show_success_message("任务删除成功！")
         popup.dismiss()
-        screen.update_task_list()
     except IndexError as e:
         show_error_message(str(e))
 
@@ -94,15 +107,64 @@ def view_tasks_by_category(screen, category_input: TextInput, popup: Popup) -> N
     except ValueError as e:
         show_error_message(str(e))
 
-def filter_tasks(screen, keyword_input: TextInput, progress_min_input: TextInput, progress_max_input: TextInput, popup: Popup) -> None:
+def view_next_tasks(screen, count_input: TextInput, popup: Popup) -> None:
+    """
+    查看下一步最应处理的任务。
+
+    参数：
+    - screen：当前屏幕对象。
+    - count_input (TextInput)：任务数量输入框，为空时使用默认数量。
+    - popup (Popup)：弹窗对象。
+    """
+    try:
+        count = int(count_input.text) if count_input.text else NEXT_TASKS_DEFAULT_COUNT
+        screen.display_tasks(screen.task_manager.next_tasks(count))
+        popup.dismiss()
+    except ValueError as e:
+        show_error_message(str(e))
+
+def save_scheduler_weights(screen, remaining_input: TextInput, age_input: TextInput, popup: Popup) -> None:
     """
-    筛选任务。
+    保存下一步任务的打分权重到配置中，并立即应用到当前任务列表，留空的输入框保持原权重不变。
+
+    参数：
+    - screen：当前屏幕对象。
+    - remaining_input (TextInput)：剩余进度每1%的权重输入框。
+    - age_input (TextInput)：任务每存在1天增加的得分输入框。
+    - popup (Popup)：弹窗对象。
+    """
+    try:
+        weights = load_weights(screen.config)
+        if remaining_input.text:
+            weights["remaining_weight"] = float(remaining_input.text)
+        if age_input.text:
+            weights["age_weight"] = float(age_input.text)
+        save_weights(screen.config, **weights)
+        screen.task_manager.set_scheduler_weights(**weights)
+        show_success_message("权重已保存")
+        popup.dismiss()
+    except ValueError:
+        show_error_message("权重必须是数字")
+
+def view_overdue_tasks(screen) -> None:
+    """
+    查看已逾期的未完成任务。
+
+    参数：
+    - screen：当前屏幕对象。
+    """
+    screen.display_tasks(screen.task_manager.get_overdue_tasks())
+
+def filter_tasks(screen, keyword_input: TextInput, progress_min_input: TextInput, progress_max_input: TextInput, fuzzy_toggle: ToggleButton, popup: Popup) -> None:
+    """
+    筛选任务，模糊匹配开启时按相似度从高到低显示进度范围内与关键字最接近的任务及其匹配度。
 
     参数：
     - screen：当前屏幕对象。
     - keyword_input (TextInput)：关键字输入框。
     - progress_min_input (TextInput)：最小进度输入框。
     - progress_max_input (TextInput)：最大进度输入框。
+    - fuzzy_toggle (ToggleButton)：模糊匹配开关。
     - popup (Popup)：弹窗对象。
     """
     try:
@@ -110,7 +172,11 @@ def filter_tasks(screen, keyword_input: TextInput, progress_min_input: TextInput
         progress_min = int(progress_min_input.text) if progress_min_input.text else 0
         progress_max = int(progress_max_input.text) if progress_max_input.text else 100
         filters = {"progress": (progress_min, progress_max)}
-        screen.display_tasks(screen.task_manager.filter_tasks(keyword, filters))
+        if fuzzy_toggle.state == 'down' and keyword:
+            hits = screen.task_manager.fuzzy_search(keyword, k=FUZZY_SEARCH_LIMIT, filters=filters)
+            screen.display_tasks([task for task, _ in hits], [score for _, score in hits])
+        else:
+            screen.display_tasks(screen.task_manager.filter_tasks(keyword, filters))
         popup.dismiss()
     except ValueError as e:
         show_error_message(str(e))
@@ -133,6 +199,104 @@ def sort_tasks(screen, sort_key_input: TextInput, ascending_input: TextInput, po
     except ValueError as e:
         show_error_message(str(e))
 
+def archive_completed_tasks(screen) -> None:
+    """
+    将已完成的任务移入归档。
+
+    参数：
+    - screen：当前屏幕对象。
+    """
+    try:
+        count = screen.task_manager.archive_completed()
+        show_success_message(f"已归档 {count} 个已完成任务！")
+    except IOError as e:
+        show_error_message(str(e))
+
+def search_archived_tasks(screen, keyword_input: TextInput, result_label) -> None:
+    """
+    以流式方式查询归档任务，并在弹窗中显示前若干条结果。
+
+    参数：
+    - screen：当前屏幕对象。
+    - keyword_input (TextInput)：关键字输入框。
+    - result_label：显示查询结果的Label对象。
+    """
+    lines = []
+    for archive_id, task in screen.task_manager.archive.iter_tasks(keyword=keyword_input.text):
+        lines.append(f"#{archive_id} {task.name}（{task.category}）")
+        if len(lines) >= ARCHIVE_SEARCH_LIMIT:
+            break
+    result_label.text = "\n".join(lines) if lines else "没有匹配的归档任务。"
+
+def restore_archived_task(screen, archive_id_input: TextInput, popup: Popup) -> None:
+    """
+    将指定编号的归档任务恢复到任务列表中。
+
+    参数：
+    - screen：当前屏幕对象。
+    - archive_id_input (TextInput)：归档编号输入框。
+    - popup (Popup)：弹窗对象。
+    """
+    try:
+        task = screen.task_manager.restore_archived(int(archive_id_input.text))
+        show_success_message(f"任务 {task.name} 已恢复！")
+        popup.dismiss()
+    except (ValueError, KeyError, IOError) as e:
+        show_error_message(str(e))
+
+def switch_workspace(screen, name_input: TextInput, popup: Popup) -> None:
+    """
+    切换到指定名称的工作区，该工作区的任务在第一次切换到它时才加载。
+
+    参数：
+    - screen：当前屏幕对象，其manager为MainWindow。
+    - name_input (TextInput)：工作区名称输入框。
+    - popup (Popup)：弹窗对象。
+    """
+    try:
+        screen.manager.switch_workspace(name_input.text.strip())
+        popup.dismiss()
+    except (ValueError, FileNotFoundError, IOError) as e:
+        show_error_message(str(e))
+
+def create_workspace(screen, name_input: TextInput, popup: Popup) -> None:
+    """
+    新建工作区并切换到该工作区。
+
+    参数：
+    - screen：当前屏幕对象，其manager为MainWindow。
+    - name_input (TextInput)：工作区名称输入框。
+    - popup (Popup)：弹窗对象。
+    """
+    try:
+        name = name_input.text.strip()
+        screen.manager.workspace_registry.add_workspace(name)
+        screen.manager.switch_workspace(name)
+        show_success_message(f"工作区 {name} 已创建！")
+        popup.dismiss()
+    except (ValueError, IOError) as e:
+        show_error_message(str(e))
+
+def search_workspaces(screen, keyword_input: TextInput, result_label) -> None:
+    """
+    在全部工作区中以流式方式查找任务，并在弹窗中显示前若干条结果，未打开的工作区不会被加载。
+
+    参数：
+    - screen：当前屏幕对象，其manager为MainWindow。
+    - keyword_input (TextInput)：关键字输入框。
+    - result_label：显示查询结果的Label对象。
+    """
+    lines = []
+    try:
+        for workspace, task in screen.manager.workspace_stores.search(keyword_input.text):
+            lines.append(f"[{workspace}] {task.name}（{task.category}）")
+            if len(lines) >= WORKSPACE_SEARCH_LIMIT:
+                break
+    except (ValueError, IOError) as e:
+        show_error_message(str(e))
+        return
+    result_label.text = "\n".join(lines) if lines else "没有匹配的任务。"
+
 def backup_tasks(screen, backup_path_input: TextInput, popup: Popup) -> None:
     """
     备份任务数据。
@@ -162,10 +326,9 @@ def restore_tasks(screen, restore_path_input: TextInput, popup: Popup) -> None:
     """
     try:
         restore_path = restore_path_input.text
-        screen.task_manager.persistence.import_tasks(restore_path)
+        screen.task_manager.restore_tasks(restore_path)
         show_success_message("任务数据恢复成功！")
         popup.dismiss()
-        screen.update_task_list()
         save_last_path("restore_path", restore_path)
     except (ValueError, IOError, PermissionError) as e:
         show_error_message(str(e))
\ No newline at end of file
@@ -1,8 +1,156 @@
 import csv
+import json
 import os
-from typing import List
-from task_model import Task
-from EisenTodo.file_path_utils import validate_file_path, create_directory_for_path
+import shutil
+import sys
+import time
+import zlib
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from task_model import Task, format_due_date, format_created_at
+from description_store import DescriptionStore
+from file_path_utils import validate_file_path, create_directory_for_path
+from instrumentation import instrumented
+
+# CSV文件的列名，其中截止时间列（due_date）、唯一标识列（id）和创建时间列（created_at）为可选列，缺少这些列的旧版文件仍可正常加载，
+# 缺少创建时间的任务以加载时刻为创建时间，并在下一次保存时写入文件
+CSV_FIELDS = ["name", "description", "progress", "category", "due_date", "id", "created_at"]
+REQUIRED_CSV_FIELDS = CSV_FIELDS[:4]
+
+# 任务文件自身的列名：在CSV_FIELDS之后增加描述引用列（description_ref），较长的描述存放在描述文件中（见description_store），
+# 该列记录其位置，此时description列为空。导出、备份和标准输出仍使用CSV_FIELDS，描述直接写在文件中
+STORE_CSV_FIELDS = CSV_FIELDS + ["description_ref"]
+
+# fsync策略："always"每次保存都将数据、日志和目录项刷到磁盘；"batched"两次刷盘之间至少间隔FSYNC_BATCH_INTERVAL秒，
+# 其间的保存交给操作系统回写；"never"从不主动刷盘。三种策略下进程崩溃都不会损坏任务文件，后两种在断电时可能丢失最近的保存
+FSYNC_POLICIES = ("always", "batched", "never")
+DEFAULT_FSYNC_POLICY = "always"
+FSYNC_BATCH_INTERVAL = 1.0
+
+# 预写日志超过该记录数时压缩为只含最新一条记录，恢复时读取的日志大小因此有上限
+WAL_COMPACT_RECORDS = 256
+
+# 启动时校验任务文件末尾的字节数，恢复耗时与任务文件大小无关
+RECOVERY_TAIL_BYTES = 64 * 1024
+
+
+def read_csv_tasks(file, descriptions: Optional[DescriptionStore] = None) -> Iterator[Task]:
+    """
+    从已打开的CSV文本流中逐条读取任务，各列按标题行中的列名定位；标题行不可识别时按默认列顺序解析，
+    列数不符的数据行被跳过。任务文件、导入文件和标准输入均使用同一套解析规则。
+    描述引用列不为空的任务，其描述为尚未读取的描述引用，读取Task.description时才从描述文件中读取。
+
+    参数：
+    - file：以文本读取模式打开的文件对象或标准输入。
+    - descriptions (Optional[DescriptionStore])：文件旁的描述存储，默认为None，此时文件中不能含有描述引用。
+
+    返回：
+    - Iterator[Task]：依次产生任务对象的迭代器，空输入时不产生任何任务。
+
+    抛出异常：
+    - csv.Error：如果内容不符合CSV规范，抛出此异常。
+    - ValueError：如果某一行的数据不符合Task类的属性合法性要求，或含有描述引用但没有提供描述存储，抛出此异常。
+    """
+    reader = csv.reader(file)
+    header = next(reader, None)
+    if header is None:
+        return  # 空文件
+    if not all(field in header for field in REQUIRED_CSV_FIELDS):
+        header = CSV_FIELDS[:len(header)] if len(header) > len(REQUIRED_CSV_FIELDS) else REQUIRED_CSV_FIELDS  # 标题行不可识别时按默认列顺序解析
+    columns = {field: position for position, field in enumerate(header)}
+    ref_column = columns.get("description_ref")
+    for row in reader:
+        if len(row) != len(header):
+            continue  # 跳过不符合格式的数据行
+        description = row[columns["description"]]
+        if ref_column is not None and row[ref_column]:
+            if descriptions is None:
+                raise ValueError("任务描述存放在描述文件中，请通过任务文件读取")
+            description = descriptions.parse_ref(row[ref_column])
+        yield Task.from_dict({
+            "name": row[columns["name"]],
+            "description": description,
+            "progress": int(row[columns["progress"]]),
+            "category": row[columns["category"]],
+            "due_date": row[columns["due_date"]] if "due_date" in columns else "",
+            "id": row[columns["id"]] if "id" in columns else "",
+            "created_at": row[columns["created_at"]] if "created_at" in columns else ""
+        })
+
+
+def write_csv_tasks(file, tasks: Iterable[Task], descriptions: Optional[DescriptionStore] = None) -> int:
+    """
+    将标题行和任务按CSV_FIELDS的列顺序写入已打开的文本流，任务逐条写出，不会整体驻留内存。
+    提供描述存储时按STORE_CSV_FIELDS写出，较长的描述存放在描述文件中，已存放的描述不会被读取。
+
+    参数：
+    - file：以文本写入模式打开的文件对象或标准输出。
+    - tasks (Iterable[Task])：要写入的任务对象，可以是迭代器。
+    - descriptions (Optional[DescriptionStore])：文件旁的描述存储，默认为None，即所有描述直接写在文件中。
+
+    返回：
+    - int：写入的任务数量。
+
+    抛出异常：
+    - IOError：如果写入描述文件时出现IO错误，抛出此异常。
+    """
+    writer = csv.writer(file)
+    writer.writerow(CSV_FIELDS if descriptions is None else STORE_CSV_FIELDS)
+    count = 0
+    for task in tasks:
+        if descriptions is None:
+            task_dict = task.to_dict()
+            writer.writerow([task_dict[field] for field in CSV_FIELDS])
+        else:
+            description, description_ref = descriptions.store(task.stored_description)
+            writer.writerow([task.name, description, task.progress, task.category, format_due_date(task.due_date),
+                             task.task_id, format_created_at(task.created_at), description_ref])
+        count += 1
+    return count
+
+
+def _file_crc32(file_path: str) -> int:
+    """
+    私有函数，分块计算整个文件的CRC32校验值。
+    """
+    crc32 = 0
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(64 * 1024), b""):
+            crc32 = zlib.crc32(chunk, crc32)
+    return crc32
+
+
+def _tail_crc32(file_path: str, size: int) -> int:
+    """
+    私有函数，计算文件最后RECOVERY_TAIL_BYTES字节（文件较小时为整个文件）的CRC32校验值。
+    """
+    with open(file_path, 'rb') as file:
+        file.seek(max(0, size - RECOVERY_TAIL_BYTES))
+        return zlib.crc32(file.read())
+
+
+def _format_record(record: Dict[str, int]) -> bytes:
+    """
+    私有函数，将一条预写日志记录编码为一行：JSON正文、制表符和正文的CRC32，写到一半中断的记录因校验不符而被识别。
+    """
+    body = json.dumps(record, sort_keys=True)
+    return f"{body}\t{zlib.crc32(body.encode('utf-8')):08x}\n".encode('utf-8')
+
+
+def _parse_record(line: bytes) -> Optional[Dict[str, int]]:
+    """
+    私有函数，解析_format_record编码的一行，格式或校验不符时返回None。
+    """
+    if not line.endswith(b"\n"):
+        return None
+    body, _, checksum = line[:-1].rpartition(b"\t")
+    try:
+        if int(checksum, 16) != zlib.crc32(body):
+            return None
+        record = json.loads(body)
+    except ValueError:
+        return None
+    return record if isinstance(record, dict) else None
+
 
 class TaskPersistence:
     """
@@ -10,26 +158,43 @@ class TaskPersistence:
     包括任务数据的保存、加载、导入及导出操作，严谨处理各类文件操作相关的异常情况，
     保障数据在存储和读取过程中的准确性、完整性及稳定性。
     """
-    def __init__(self, csv_file_path: str = "tasks.csv"):
+    def __init__(self, csv_file_path: str = "tasks.csv", fsync_policy: str = DEFAULT_FSYNC_POLICY):
         """
         初始化TaskPersistence对象，设置默认的CSV文件路径，可根据实际需求传入不同路径。
+        初始化时执行一次恢复（见recover），修复上次运行中断的保存，恢复时采取的操作记录在recovery_actions中并输出到标准错误。
 
         参数：
         - csv_file_path (str)：任务数据存储的CSV文件路径，默认为"tasks.csv"，
                               传入的路径需是合法可访问且具有相应读写权限的路径。
+        - fsync_policy (str)：fsync策略，取值见FSYNC_POLICIES，默认为DEFAULT_FSYNC_POLICY。
 
         抛出异常：
-        - ValueError：如果传入的文件路径不符合要求（如为空等情况），抛出此异常并提示用户提供有效路径。
+        - ValueError：如果传入的文件路径不符合要求（如为空等情况），或fsync策略不受支持，抛出此异常并提示用户提供有效路径。
         - FileNotFoundError：如果文件路径对应的文件不存在且无法创建目录等情况，抛出此异常告知用户检查路径。
         - PermissionError：如果没有对文件或其所在目录的相应读写权限，抛出此异常提示用户检查权限设置。
         """
         validate_file_path(csv_file_path)
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"不支持的fsync策略: {fsync_policy}")
         self.csv_file_path = csv_file_path
+        self.fsync_policy = fsync_policy
+        self.temp_path = csv_file_path + ".tmp"
+        self.wal_path = csv_file_path + ".wal"
+        self.descriptions = DescriptionStore(csv_file_path)
+        self._sequence = 0
+        self._wal_records = 0
+        self._last_sync = float("-inf")
+        self._unsynced = False
+        self.recovery_actions = self.recover()
+        for action in self.recovery_actions:
+            print(f"恢复任务文件 {csv_file_path}：{action}", file=sys.stderr)
 
+    @instrumented("persistence.save_tasks")
     def save_tasks(self, tasks: List[Task]) -> None:
         """
         将任务列表保存到CSV文件中，调用独立的文件路径处理函数进行严谨的路径验证和必要的目录创建操作，
         采用严谨且高效的文件写入逻辑，妥善处理可能出现的各类IO相关错误，保障数据能准确无误地持久化存储。
+        任务先写入临时文件，在预写日志中记录其大小和校验值后原子替换原文件，写入中途崩溃时原文件保持不变。
 
         参数：
         - tasks (List[Task])：要保存的任务对象列表，列表中的每个任务对象需符合Task类定义的合法性要求。
@@ -38,15 +203,251 @@ class TaskPersistence:
         - IOError：如果保存任务数据到文件时出现IO错误（如磁盘空间不足、文件被其他程序占用等情况），
                     抛出此异常并详细说明具体的IO问题所在，方便调用者排查文件写入故障。
         """
+        self._commit(tasks)
+
+    @instrumented("persistence.rewrite_tasks")
+    def rewrite_tasks(self, tasks: Iterable[Task]) -> int:
+        """
+        以流式方式重写任务文件：任务逐条写入同目录下的临时文件，全部写完后原子替换原文件（与save_tasks的写入过程相同）。
+        tasks可以是正在读取本文件的迭代器（如iter_tasks经过过滤或修改后的结果），读写互不影响，
+        内存占用与任务数量无关；写入中途出错时原文件保持不变。
+
+        参数：
+        - tasks (Iterable[Task])：要写入的任务对象，可以是迭代器。
+
+        返回：
+        - int：写入的任务数量。
+
+        抛出异常：
+        - IOError：如果写入临时文件或替换原文件时出现IO错误，抛出此异常并说明具体的IO问题所在。
+        - ValueError、csv.Error：tasks在迭代过程中抛出的异常会原样抛出，此时原文件保持不变。
+        """
+        return self._commit(tasks)
+
+    def recover(self) -> List[str]:
+        """
+        检查并修复上次运行中断的保存，初始化时自动调用。只读取预写日志和任务文件的末尾，耗时与任务数量无关：
+        - 预写日志末尾写到一半的记录被截掉；
+        - 临时文件与日志最后一条记录的大小和校验值一致时，说明中断发生在替换原文件之前，补做替换；否则删除临时文件；
+        - 任务文件与日志最后两条记录（最后一条可能是未完成的保存）都不符时：文件不以换行结尾视为写坏的文件
+          （如旧版本原地写入时崩溃，或不刷盘时断电），原文件复制为.corrupt后截断到最后一个完整的行；
+          以换行结尾则视为在程序之外修改过的文件，为其追加日志记录后照常使用。
+
+        返回：
+        - List[str]：采取的恢复操作说明，无需恢复时为空列表。
+
+        抛出异常：
+        - IOError：如果读取或修复文件时出现IO错误，抛出此异常并说明具体的IO问题所在。
+        """
+        actions = []
+        try:
+            records = self._read_records(actions)
+            last = records[-1] if records else None
+            if os.path.exists(self.temp_path):
+                if last is not None and self._matches(self.temp_path, last, True):
+                    os.replace(self.temp_path, self.csv_file_path)
+                    self._sync_directory(True)
+                    actions.append("补做了中断前已写完的保存")
+                else:
+                    os.remove(self.temp_path)
+                    actions.append("删除了中断时未写完的临时文件")
+            if os.path.exists(self.csv_file_path) and not any(self._matches(self.csv_file_path, record) for record in records[-2:]):
+                if not self._ends_with_newline(self.csv_file_path):
+                    self._salvage()
+                    actions.append(f"任务文件已损坏，原文件保存为{self.csv_file_path}.corrupt，保留了其中完整的行")
+                elif records:
+                    self._record_current()
+        except IOError as e:
+            raise IOError(f"恢复任务文件 {self.csv_file_path} 时出错: {str(e)}")
+        return actions
+
+    def _commit(self, tasks: Iterable[Task]) -> int:
+        """
+        私有方法，持久的写入过程：写临时文件，追加预写日志记录，原子替换原文件，再按fsync策略刷盘。
+
+        参数：
+        - tasks (Iterable[Task])：要写入的任务对象，可以是迭代器。
+
+        返回：
+        - int：写入的任务数量。
+        """
         create_directory_for_path(self.csv_file_path)
+        sync = self._should_sync()
         try:
-            with open(self.csv_file_path, 'w', encoding='utf-8', newline='') as file:
-                writer = csv.writer(file)
-                writer.writerow(["name", "description", "progress", "category"])
-                for task in tasks:
-                    writer.writerow([task.name, task.description, task.progress, task.category])
+            try:
+                count, record = self._write_temp(tasks, sync)
+                self._append_record(record, sync)
+                os.replace(self.temp_path, self.csv_file_path)
+            finally:
+                if os.path.exists(self.temp_path):
+                    os.remove(self.temp_path)
+            self._sync_directory(sync)
+            self.descriptions.commit()
+            if self._wal_records > WAL_COMPACT_RECORDS:
+                self._compact_records(record, sync)
         except IOError as e:
             raise IOError(f"保存任务数据到文件 {self.csv_file_path} 时出错: {str(e)}")
+        if sync:
+            self._last_sync = time.monotonic()
+        self._unsynced = not sync
+        return count
+
+    def flush(self) -> None:
+        """
+        将按fsync策略尚未刷盘的最近一次保存写入磁盘，用于应用退出或关闭任务文件之前；没有未刷盘的保存时不做任何操作。
+
+        抛出异常：
+        - IOError：如果刷盘时出现IO错误，抛出此异常并说明具体的IO问题所在。
+        """
+        if not self._unsynced:
+            return
+        try:
+            for path in (self.csv_file_path, self.wal_path):
+                with open(path, 'r+b') as file:
+                    os.fsync(file.fileno())
+            self.descriptions.sync()
+            self._sync_directory(True)
+        except IOError as e:
+            raise IOError(f"将任务文件 {self.csv_file_path} 写入磁盘时出错: {str(e)}")
+        self._unsynced = False
+        self._last_sync = time.monotonic()
+
+    def _should_sync(self) -> bool:
+        """
+        私有方法，按fsync策略判断本次保存是否刷盘。
+        """
+        if self.fsync_policy == "always":
+            return True
+        if self.fsync_policy == "batched":
+            return time.monotonic() - self._last_sync >= FSYNC_BATCH_INTERVAL
+        return False
+
+    def _write_temp(self, tasks: Iterable[Task], sync: bool) -> Tuple[int, Dict[str, int]]:
+        """
+        私有方法，将任务写入临时文件，返回任务数量和描述该文件的日志记录。校验值在写完后从页缓存中读回计算，
+        比逐行编码累计更快。较长的描述在写入临时文件的同时追加到描述文件，并先于临时文件刷盘。
+        """
+        self.descriptions.begin_save()
+        with open(self.temp_path, 'w', encoding='utf-8', newline='') as file:
+            count = write_csv_tasks(file, tasks, self.descriptions)
+            self._sync_directory(sync and self.descriptions.end_save(sync))
+            file.flush()
+            if sync:
+                os.fsync(file.fileno())
+        size = os.path.getsize(self.temp_path)
+        self._sequence += 1
+        return count, {"seq": self._sequence, "size": size, "crc32": _file_crc32(self.temp_path),
+                       "tail_crc32": _tail_crc32(self.temp_path, size)}
+
+    def _append_record(self, record: Dict[str, int], sync: bool) -> None:
+        """
+        私有方法，向预写日志追加一条记录。
+        """
+        with open(self.wal_path, 'ab') as file:
+            file.write(_format_record(record))
+            file.flush()
+            if sync:
+                os.fsync(file.fileno())
+        self._wal_records += 1
+
+    def _compact_records(self, record: Dict[str, int], sync: bool) -> None:
+        """
+        私有方法，将预写日志原子替换为只含最新一条记录。
+        """
+        temp_path = self.wal_path + ".tmp"
+        with open(temp_path, 'wb') as file:
+            file.write(_format_record(record))
+            file.flush()
+            if sync:
+                os.fsync(file.fileno())
+        os.replace(temp_path, self.wal_path)
+        self._sync_directory(sync)
+        self._wal_records = 1
+
+    def _read_records(self, actions: List[str]) -> List[Dict[str, int]]:
+        """
+        私有方法，读取预写日志中的有效记录，截掉末尾不完整的记录，并恢复记录序号和记录数。
+        """
+        if not os.path.exists(self.wal_path):
+            return []
+        with open(self.wal_path, 'rb') as file:
+            lines = file.readlines()
+        records = []
+        valid_size = 0
+        for line in lines:
+            record = _parse_record(line)
+            if record is None:
+                break
+            records.append(record)
+            valid_size += len(line)
+        if len(records) < len(lines):
+            with open(self.wal_path, 'r+b') as file:
+                file.truncate(valid_size)
+            actions.append("丢弃了预写日志末尾不完整的记录")
+        self._sequence = records[-1]["seq"] if records else 0
+        self._wal_records = len(records)
+        return records
+
+    def _matches(self, file_path: str, record: Dict[str, int], full: bool = False) -> bool:
+        """
+        私有方法，判断文件是否与日志记录一致：比较大小和末尾的校验值，full为True时还比较整个文件的校验值。
+        """
+        size = os.path.getsize(file_path)
+        if size != record["size"] or _tail_crc32(file_path, size) != record["tail_crc32"]:
+            return False
+        return not full or _file_crc32(file_path) == record["crc32"]
+
+    def _ends_with_newline(self, file_path: str) -> bool:
+        """
+        私有方法，判断文件是否为空或以换行结尾；write_csv_tasks写出的文件总是以换行结尾。
+        """
+        with open(file_path, 'rb') as file:
+            file.seek(0, os.SEEK_END)
+            if file.tell() == 0:
+                return True
+            file.seek(-1, os.SEEK_END)
+            return file.read(1) == b"\n"
+
+    def _salvage(self) -> None:
+        """
+        私有方法，将写坏的任务文件复制为.corrupt，再截断到最后一个换行处，并为截断后的文件追加日志记录。
+        """
+        shutil.copyfile(self.csv_file_path, self.csv_file_path + ".corrupt")
+        with open(self.csv_file_path, 'r+b') as file:
+            end = file.seek(0, os.SEEK_END)
+            while end > 0:
+                start = max(0, end - RECOVERY_TAIL_BYTES)
+                file.seek(start)
+                position = file.read(end - start).rfind(b"\n")
+                if position >= 0:
+                    end = start + position + 1
+                    break
+                end = start
+            file.truncate(end)
+            file.flush()
+            os.fsync(file.fileno())
+        self._record_current()
+
+    def _record_current(self) -> None:
+        """
+        私有方法，为任务文件的当前内容追加一条日志记录并刷盘。
+        """
+        size = os.path.getsize(self.csv_file_path)
+        self._sequence += 1
+        self._append_record({"seq": self._sequence, "size": size, "crc32": _file_crc32(self.csv_file_path),
+                             "tail_crc32": _tail_crc32(self.csv_file_path, size)}, True)
+
+    def _sync_directory(self, sync: bool) -> None:
+        """
+        私有方法，刷盘时将任务文件所在目录的目录项（替换操作）写入磁盘；Windows不支持对目录调用fsync，直接跳过。
+        """
+        if not sync or os.name == "nt":
+            return
+        descriptor = os.open(os.path.dirname(os.path.abspath(self.csv_file_path)), os.O_RDONLY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
 
     def load_tasks(self) -> List[Task]:
         """
@@ -66,6 +467,18 @@ class TaskPersistence:
         """
         return self._load_tasks_from_file(self.csv_file_path)
 
+    def iter_tasks(self) -> Iterator[Task]:
+        """
+        以流式方式逐条读取CSV文件中的任务，读取一条解析一条，调用者可以边读取边处理，无需等待整个文件加载完毕。
+
+        返回：
+        - Iterator[Task]：依次产生任务对象的迭代器。
+
+        抛出异常：
+        - FileNotFoundError、csv.Error、ValueError：与load_tasks一致，在迭代到出错的位置时抛出。
+        """
+        return self._iter_tasks_from_file(self.csv_file_path)
+
     def import_tasks(self, file_path: str) -> List[Task]:
         """
         从外部指定的CSV文件导入任务数据，同样进行全面的文件路径验证、文件格式检查以及数据合法性校验，
@@ -88,6 +501,7 @@ class TaskPersistence:
         validate_file_path(file_path)
         return self._load_tasks_from_file(file_path)
 
+    @instrumented("persistence.export_tasks")
     def export_tasks(self, file_path: str) -> bool:
         """
         将任务数据导出到指定的CSV文件，进行严谨到极致的文件路径验证和文件写入操作，确保导出的准确性、稳定性以及完整性，
@@ -114,20 +528,18 @@ class TaskPersistence:
 
         try:
             with open(file_path, 'w', encoding='utf-8', newline='') as file:
-                writer = csv.writer(file)
-                writer.writerow(["name", "description", "progress", "category"])
-                tasks = self.load_tasks()
-                for task in tasks:
-                    writer.writerow([task.name, task.description, task.progress, task.category])
+                write_csv_tasks(file, self.load_tasks())
             return True
         except IOError as e:
             raise IOError(f"导出任务数据到文件 {file_path} 时出错: {str(e)}")
 
+    @instrumented("persistence.load_tasks")
     def _load_tasks_from_file(self, file_path: str) -> List[Task]:
         """
         从指定的CSV文件加载任务数据，进行文件存在性、格式正确性以及数据合法性等多方面的验证，
         若文件不存在或数据格式不符合要求等情况，会进行相应的错误处理并返回空列表，
         确保加载过程的稳定性，最终返回符合Task类规范的任务对象列表。
+        各列按标题行中的列名定位，缺少截止时间列的旧版文件中的任务没有截止时间，缺少唯一标识列时为任务生成新的标识。
 
         参数：
         - file_path (str)：要加载任务数据的CSV文件路径。
@@ -142,28 +554,28 @@ class TaskPersistence:
         - ValueError：如果从文件中读取的数据创建任务对象时不符合Task类的属性合法性要求（如进度值超出范围等），
                       抛出此异常并明确指出具体的属性问题所在，便于定位数据错误。
         """
+        return list(self._iter_tasks_from_file(file_path))
+
+    def _iter_tasks_from_file(self, file_path: str) -> Iterator[Task]:
+        """
+        私有方法，以流式方式逐条读取指定CSV文件中的任务，文件不存在时不产生任何任务。
+        解析规则与抛出的异常与_load_tasks_from_file一致。
+
+        参数：
+        - file_path (str)：要读取任务数据的CSV文件路径。
+
+        返回：
+        - Iterator[Task]：依次产生任务对象的迭代器。
+        """
         if not os.path.exists(file_path):
-            return []
-        tasks = []
+            return
+        descriptions = self.descriptions if file_path == self.csv_file_path else DescriptionStore(file_path)
         try:
             with open(file_path, 'r', encoding='utf-8') as file:
-                reader = csv.reader(file)
-                next(reader)  # 跳过标题行
-                for row in reader:
-                    if len(row) != 4:
-                        continue  # 跳过不符合格式的数据行
-                    name, description, progress, category = row
-                    task = Task.from_dict({
-                        "name": name,
-                        "description": description,
-                        "progress": int(progress),
-                        "category": category
-                    })
-                    tasks.append(task)
+                yield from read_csv_tasks(file, descriptions)
         except FileNotFoundError:
             raise FileNotFoundError(f"文件 {file_path} 不存在，请检查文件路径")
         except csv.Error as e:
             raise csv.Error(f"读取文件 {file_path} 时出现CSV格式错误: {str(e)}")
         except ValueError as e:
-            raise ValueError(f"从文件 {file_path} 读取的数据创建任务对象时出错: {str(e)}")
-        return tasks
\ No newline at end of file
+            raise ValueError(f"从文件 {file_path} 读取的数据创建任务对象时出错: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,223 @@
+import heapq
+import itertools
+import time
+from typing import Callable, Dict, List, Optional
+from task_model import Task
+from task_events import TaskListener
+
+# 各象限的默认权重，权重越高的象限越优先处理
+DEFAULT_QUADRANT_WEIGHTS = {
+    "紧急重要": 400,
+    "重要不紧急": 300,
+    "紧急不重要": 200,
+    "不紧急不重要": 100,
+}
+
+# 剩余进度每1%的默认权重
+DEFAULT_REMAINING_WEIGHT = 1.0
+
+# 任务每存在1天增加的默认得分：搁置约20天的任务相当于提升一个象限
+DEFAULT_AGE_WEIGHT = 5.0
+
+# 配置服务（见config_store）中保存打分权重的配置项名称，值为含quadrant_weights、remaining_weight、age_weight的字典
+WEIGHTS_CONFIG_KEY = "next_action_weights"
+
+# 一天的秒数，任务存在时长以天为单位计入得分
+_SECONDS_PER_DAY = 86400.0
+
+# 堆中失效条目占比超过该比例时重建堆，避免失效条目无限堆积
+_STALE_RATIO_LIMIT = 0.5
+
+
+def load_weights(config) -> Dict[str, object]:
+    """
+    从配置服务读取打分权重，缺少或不合法的项使用默认值。
+
+    参数：
+    - config：配置服务（见config_store.ConfigStore）。
+
+    返回：
+    - Dict[str, object]：含quadrant_weights、remaining_weight、age_weight的字典，可直接作为set_weights的关键字参数。
+    """
+    stored = config.get(WEIGHTS_CONFIG_KEY)
+    stored = stored if isinstance(stored, dict) else {}
+    quadrant_weights = dict(DEFAULT_QUADRANT_WEIGHTS)
+    if isinstance(stored.get("quadrant_weights"), dict):
+        quadrant_weights.update({category: float(weight) for category, weight in stored["quadrant_weights"].items()
+                                 if category in quadrant_weights and _is_number(weight)})
+    return {
+        "quadrant_weights": quadrant_weights,
+        "remaining_weight": float(stored["remaining_weight"]) if _is_number(stored.get("remaining_weight")) else DEFAULT_REMAINING_WEIGHT,
+        "age_weight": float(stored["age_weight"]) if _is_number(stored.get("age_weight")) else DEFAULT_AGE_WEIGHT,
+    }
+
+
+def save_weights(config, quadrant_weights: Dict[str, float], remaining_weight: float, age_weight: float) -> None:
+    """
+    将打分权重保存到配置服务。
+
+    参数：
+    - config：配置服务（见config_store.ConfigStore）。
+    - quadrant_weights (Dict[str, float])：各任务类别的权重。
+    - remaining_weight (float)：剩余进度每1%的权重。
+    - age_weight (float)：任务每存在1天增加的得分。
+    """
+    config.set(WEIGHTS_CONFIG_KEY, {"quadrant_weights": dict(quadrant_weights), "remaining_weight": remaining_weight,
+                                    "age_weight": age_weight})
+
+
+def _is_number(value: object) -> bool:
+    """
+    私有函数，判断配置值是否为数字（布尔值除外）。
+    """
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class NextActionScheduler(TaskListener):
+    """
+    NextActionScheduler类回答"下一步该做什么"，以最大堆维护所有未完成任务的优先级得分，
+    得分由象限权重、剩余进度和任务存在时长（自任务的创建时间起）加权组成。作为TaskManager的监听者，
+    任务增删改时只向堆中追加新条目并将旧条目标记为失效（惰性失效），失效条目在出堆时才被丢弃，
+    因此每次变更的代价为O(log n)，获取前k个任务的代价为O(k log n)。
+    """
+    def __init__(self, quadrant_weights: Optional[Dict[str, float]] = None, remaining_weight: float = DEFAULT_REMAINING_WEIGHT,
+                 age_weight: float = DEFAULT_AGE_WEIGHT, clock: Callable[[], float] = time.time):
+        """
+        初始化NextActionScheduler对象。
+
+        参数：
+        - quadrant_weights (Dict[str, float])：各任务类别的权重，默认为DEFAULT_QUADRANT_WEIGHTS。
+        - remaining_weight (float)：剩余进度（100减去当前进度）每1%的权重，默认为DEFAULT_REMAINING_WEIGHT。
+        - age_weight (float)：任务每存在1天增加的得分，默认为DEFAULT_AGE_WEIGHT，为0时不考虑时长。
+        - clock (Callable[[], float])：获取当前时间戳的函数，默认为time.time。
+        """
+        self._clock = clock
+        self._counter = itertools.count()
+        self._heap: List[list] = []
+        self._entries: Dict[int, List[list]] = {}
+        self._stale = 0
+        self._tasks: List[Task] = []
+        self.set_weights(quadrant_weights or DEFAULT_QUADRANT_WEIGHTS, remaining_weight, age_weight)
+
+    def set_weights(self, quadrant_weights: Dict[str, float], remaining_weight: float, age_weight: float) -> None:
+        """
+        设置打分权重并按新权重重建堆。
+
+        参数：
+        - quadrant_weights (Dict[str, float])：各任务类别的权重。
+        - remaining_weight (float)：剩余进度每1%的权重。
+        - age_weight (float)：任务每存在1天增加的得分。
+        """
+        self.quadrant_weights = dict(quadrant_weights)
+        self.remaining_weight = remaining_weight
+        self.age_weight = age_weight
+        self._rebuild()
+
+    def score(self, task: Task) -> float:
+        """
+        计算任务在当前时刻的优先级得分，得分越高越应优先处理。
+
+        参数：
+        - task (Task)：要计算得分的任务对象。
+
+        返回：
+        - float：任务的优先级得分。
+        """
+        return self._static_key(task) + self.age_weight * self._clock() / _SECONDS_PER_DAY
+
+    def next_tasks(self, n: int) -> List[Task]:
+        """
+        获取当前优先级得分最高的前n个未完成任务（进度为100的任务不参与排序）。
+        不修改堆：从堆顶开始按得分从高到低逐层展开子节点（以一个小的候选堆记录待展开的节点），跳过失效条目，
+        代价为O(n log n)加上途经的失效条目数，多个线程可以同时查询。
+
+        参数：
+        - n (int)：要获取的任务数量。
+
+        返回：
+        - List[Task]：按优先级得分从高到低排列的任务列表，未完成任务不足n个时返回全部未完成任务。
+
+        抛出异常：
+        - ValueError：如果n为负数，抛出此异常。
+        """
+        if n < 0:
+            raise ValueError("任务数量不能为负数")
+        heap = self._heap
+        taken = []
+        frontier = [(heap[0], 0)] if heap else []
+        while frontier and len(taken) < n:
+            entry, position = heapq.heappop(frontier)
+            if entry[2] is not None:
+                taken.append(entry[2])
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+        return taken
+
+    def on_tasks_reset(self, tasks: List[Task]) -> None:
+        self._tasks = tasks
+        self._rebuild()
+
+    def on_task_added(self, index: int, task: Task) -> None:
+        self._push(task)
+
+    def on_task_updated(self, index: int, old_task: Task, new_task: Task) -> None:
+        self._invalidate(old_task)
+        self._push(new_task)
+        self._compact_if_needed()
+
+    def on_task_removed(self, index: int, task: Task) -> None:
+        self._invalidate(task)
+        self._compact_if_needed()
+
+    def _static_key(self, task: Task) -> float:
+        """
+        私有方法，计算与当前时刻无关的排序键。时长项age_weight * (now - created_at)中的now对所有任务相同，
+        不影响相对顺序，因此堆中只需保存 -age_weight * created_at，条目无需随时间推移而更新。
+        """
+        return (self.quadrant_weights.get(task.category, 0)
+                + self.remaining_weight * (100 - task.progress)
+                - self.age_weight * task.created_at.timestamp() / _SECONDS_PER_DAY)
+
+    def _push(self, task: Task) -> None:
+        """
+        私有方法，为未完成任务向堆中追加一个条目。
+        """
+        if task.progress >= 100:
+            return
+        entry = [-self._static_key(task), next(self._counter), task]
+        self._entries.setdefault(id(task), []).append(entry)
+        heapq.heappush(self._heap, entry)
+
+    def _invalidate(self, task: Task) -> None:
+        """
+        私有方法，将任务在堆中的条目标记为失效，条目本身留在堆中，等到出堆或重建堆时才被丢弃。
+        """
+        entries = self._entries.get(id(task))
+        if entries:
+            entries.pop()[2] = None
+            self._stale += 1
+            if not entries:
+                del self._entries[id(task)]
+
+    def _compact_if_needed(self) -> None:
+        """
+        私有方法，失效条目占比过高时重建堆。
+        """
+        if self._stale > _STALE_RATIO_LIMIT * len(self._heap):
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        """
+        私有方法，根据当前任务列表重建堆，丢弃全部失效条目。
+        """
+        self._heap = []
+        self._entries = {}
+        self._stale = 0
+        for task in self._tasks:
+            if task.progress >= 100:
+                continue
+            entry = [-self._static_key(task), next(self._counter), task]
+            self._entries.setdefault(id(task), []).append(entry)
+            self._heap.append(entry)
+        heapq.heapify(self._heap)
@@ -0,0 +1,639 @@
+"""
+EisenTodo 本地任务服务：基于asyncio的轻量HTTP/JSON接口，只监听本机地址或Unix套接字，
+供同一台机器上的看板和脚本在图形界面运行期间查询、修改任务和获取统计数据。不依赖第三方库，也不导入Kivy。
+
+接口：
+    GET    /health              服务状态与任务数量
+    GET    /stats               各类别的任务统计数据
+    GET    /tasks               以JSON Lines流式返回任务，可选参数 keyword、category、min_progress、max_progress、offset、limit
+    GET    /tasks/<id>          按唯一标识获取单个任务
+    POST   /tasks               添加任务，请求体为一个任务对象或任务对象数组
+    PATCH  /tasks/<id>          修改任务，请求体为要修改的字段
+    DELETE /tasks/<id>          删除任务
+
+用法示例：
+    python -m task_server serve --store tasks.csv --port 8765
+    python -m task_server serve --store tasks.csv --unix /tmp/eisentodo.sock
+    python -m task_server serve --store tasks.csv --snapshot eisentodo_snapshot   # 同时发布共享内存快照（见task_snapshot）
+    python -m task_server loadtest --clients 200 --requests 50 --size 10000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, quote, urlsplit
+from task_model import Task, TASK_CATEGORIES
+from task_statistics import TaskStatistics
+from instrumentation import instrumentation
+
+# 默认监听地址，只接受本机连接
+DEFAULT_HOST = "127.0.0.1"
+
+# 默认监听端口
+DEFAULT_PORT = 8765
+
+# 流式返回任务时每个分块包含的任务数量，每个分块写出后等待客户端接收，避免大结果集占满内存
+STREAM_CHUNK_SIZE = 500
+
+# 写入协程一次最多合并执行的写操作数量
+WRITE_BATCH_SIZE = 256
+
+# 请求体的最大字节数
+MAX_BODY_SIZE = 10 * 1024 * 1024
+
+_REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HttpError(Exception):
+    """
+    HttpError异常表示应以指定状态码回复客户端的请求错误。
+    """
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class TaskServer:
+    """
+    TaskServer类将TaskManager以本地HTTP/JSON接口提供给多个客户端：
+    - 所有写请求进入同一个队列，由唯一的写入协程按顺序交给run_write执行，写操作之间不会交错，
+      积压的写操作合并为一次保存；
+    - 读请求在事件循环中并发处理，读取的是TaskManager.snapshot给出的不可变快照，
+      同一版本的所有读请求共用同一份快照和统计结果；TaskManager应处于线程安全模式，
+      使事件循环线程中的读取与写入线程（或界面线程）中的修改互不干扰；
+    - 大结果集按STREAM_CHUNK_SIZE分块以分块传输编码写出，每块写出后等待客户端接收；每个任务的JSON文本只生成一次。
+    """
+    def __init__(self, task_manager, run_write: Optional[Callable[[Callable[[], object]], Future]] = None):
+        """
+        初始化TaskServer对象。
+
+        参数：
+        - task_manager：要对外提供的TaskManager对象，应以thread_safe=True创建。
+        - run_write (Optional[Callable])：执行写操作的函数，接收一个无参函数并返回concurrent.futures.Future。
+                                         默认在一个专用的后台线程中执行；嵌入图形界面时应传入在界面线程中执行的函数，
+                                         使服务的写入与界面的操作在同一线程中进行。
+        """
+        self.task_manager = task_manager
+        if run_write is None:
+            run_write = ThreadPoolExecutor(max_workers=1, thread_name_prefix="task-server-writer").submit
+        self._run_write = run_write
+        self._stats_snapshot: Optional[Tuple[Task, ...]] = None
+        self._stats: Optional[Dict[str, Dict[str, object]]] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self._lines: "weakref.WeakKeyDictionary[Task, str]" = weakref.WeakKeyDictionary()
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, unix_path: Optional[str] = None) -> None:
+        """
+        开始监听并启动写入协程。
+
+        参数：
+        - host (str)：监听地址，默认为DEFAULT_HOST。
+        - port (int)：监听端口，默认为DEFAULT_PORT，传入0时由系统分配。
+        - unix_path (Optional[str])：Unix套接字路径，指定时监听该套接字而不是TCP端口。
+        """
+        self._queue = asyncio.Queue()
+        self._writer_task = asyncio.ensure_future(self._writer_loop())
+        if unix_path:
+            if os.path.exists(unix_path):
+                os.remove(unix_path)
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=unix_path)
+        else:
+            self._server = await asyncio.start_server(self._handle_connection, host, port)
+
+    def get_port(self) -> int:
+        """
+        获取实际监听的TCP端口，监听Unix套接字时返回0。
+        """
+        address = self._server.sockets[0].getsockname()
+        return address[1] if isinstance(address, tuple) else 0
+
+    async def stop(self) -> None:
+        """
+        停止监听、关闭仍然打开的连接并结束写入协程，已进入队列的写请求会先执行完毕。
+        """
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._connections.values()):
+                writer.close()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+        if self._writer_task is not None:
+            await self._queue.join()
+            self._writer_task.cancel()
+            self._writer_task = None
+
+    def start_in_thread(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                        unix_path: Optional[str] = None) -> threading.Thread:
+        """
+        在后台守护线程中运行独立的事件循环并开始服务，用于在图形界面进程中嵌入本服务。
+
+        参数：
+        - host (str)：监听地址，默认为DEFAULT_HOST。
+        - port (int)：监听端口，默认为DEFAULT_PORT。
+        - unix_path (Optional[str])：Unix套接字路径。
+
+        返回：
+        - threading.Thread：运行服务的线程。
+        """
+        def run() -> None:
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(self.start(host, port, unix_path))
+            loop.run_forever()
+        thread = threading.Thread(target=run, name="task-server", daemon=True)
+        thread.start()
+        return thread
+
+    def get_snapshot(self) -> Tuple[Task, ...]:
+        """
+        获取任务列表的不可变快照，任务列表自上次获取后没有变化时直接返回同一份快照。
+
+        返回：
+        - Tuple[Task, ...]：任务对象元组。
+        """
+        return self.task_manager.snapshot()
+
+    def get_statistics(self) -> Dict[str, Dict[str, object]]:
+        """
+        获取与当前快照一致的统计数据，同一版本只计算一次。
+
+        返回：
+        - Dict[str, Dict[str, object]]：TaskStatistics.to_dict()的结果。
+        """
+        snapshot = self.get_snapshot()
+        if snapshot is not self._stats_snapshot:
+            self._stats = TaskStatistics(snapshot).to_dict()
+            self._stats_snapshot = snapshot
+        return self._stats
+
+    async def submit_write(self, operation: Callable[[], object]) -> object:
+        """
+        将写操作加入写入队列并等待其执行完毕。
+
+        参数：
+        - operation (Callable[[], object])：在写入线程中执行的无参函数。
+
+        返回：
+        - object：operation的返回值。
+
+        抛出异常：
+        - operation抛出的异常会原样抛出。
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((operation, future))
+        return await future
+
+    async def _writer_loop(self) -> None:
+        """
+        私有方法，唯一的写入协程：每次取出队列中已积压的全部写操作（最多WRITE_BATCH_SIZE个），
+        按入队顺序在一次run_write调用中执行，并通过TaskManager.deferred_save合并为一次保存（组提交），
+        保存完成后才把各操作的结果或异常交回等待的请求。
+        """
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < WRITE_BATCH_SIZE and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            operations = [operation for operation, _ in batch]
+            try:
+                outcomes = await asyncio.wrap_future(self._run_write(lambda: self._apply_batch(operations)))
+            except Exception as e:
+                outcomes = [(False, e)] * len(batch)
+            for (_, future), (succeeded, value) in zip(batch, outcomes):
+                if not future.done():
+                    if succeeded:
+                        future.set_result(value)
+                    else:
+                        future.set_exception(value)
+                self._queue.task_done()
+
+    def _apply_batch(self, operations: List[Callable[[], object]]) -> List[Tuple[bool, object]]:
+        """
+        私有方法，在写入线程中依次执行一批写操作并只保存一次，单个操作失败不影响同批的其他操作。
+        保存失败时整批修改都被撤销（见TaskManager.deferred_save），同批的请求都得到错误响应。
+
+        返回：
+        - List[Tuple[bool, object]]：每个操作的(是否成功, 返回值或异常)。
+        """
+        outcomes = []
+        with self.task_manager.deferred_save():
+            for operation in operations:
+                try:
+                    outcomes.append((True, operation()))
+                except Exception as e:
+                    outcomes.append((False, e))
+        return outcomes
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        私有方法，处理一个客户端连接，支持HTTP/1.1长连接上的多个连续请求。
+        """
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body, keep_alive = request
+                instrumentation.count("server.requests")
+                try:
+                    await self._dispatch(method, target, body, writer, keep_alive)
+                except HttpError as e:
+                    _write_json(writer, e.status, {"error": str(e)}, keep_alive)
+                except (ValueError, KeyError, TypeError) as e:
+                    _write_json(writer, 400, {"error": str(e)}, keep_alive)
+                except Exception as e:
+                    _write_json(writer, 500, {"error": str(e)}, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except HttpError as e:
+            _write_json(writer, e.status, {"error": str(e)}, False)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            del self._connections[task]
+            try:
+                writer.close()
+            except ConnectionError:
+                pass
+
+    async def _dispatch(self, method: str, target: str, body: bytes, writer: asyncio.StreamWriter, keep_alive: bool) -> None:
+        """
+        私有方法，按请求方法和路径分发请求。
+        """
+        url = urlsplit(target)
+        parts = [part for part in url.path.split("/") if part]
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if parts == ["health"] and method == "GET":
+            _write_json(writer, 200, {"status": "ok", "tasks": len(self.get_snapshot())}, keep_alive)
+        elif parts == ["stats"] and method == "GET":
+            _write_json(writer, 200, self.get_statistics(), keep_alive)
+        elif parts == ["tasks"] and method == "GET":
+            await self._stream_tasks(query, writer, keep_alive)
+        elif parts == ["tasks"] and method == "POST":
+            ids = await self.submit_write(lambda: self._add(_parse_json(body)))
+            _write_json(writer, 201, {"ids": ids}, keep_alive)
+        elif len(parts) == 2 and parts[0] == "tasks":
+            task_id = parts[1]
+            if method == "GET":
+                task = next((task for task in self.get_snapshot() if task.task_id == task_id), None)
+                if task is None:
+                    raise HttpError(404, f"任务 {task_id} 不存在")
+                _write_json(writer, 200, task.to_dict(), keep_alive)
+            elif method == "PATCH":
+                task = await self.submit_write(lambda: self._edit(task_id, _parse_json(body)))
+                _write_json(writer, 200, task.to_dict(), keep_alive)
+            elif method == "DELETE":
+                await self.submit_write(lambda: self._delete(task_id))
+                _write_json(writer, 200, {"deleted": task_id}, keep_alive)
+            else:
+                raise HttpError(405, f"不支持的请求方法 {method}")
+        elif parts in (["health"], ["stats"], ["tasks"]):
+            raise HttpError(405, f"不支持的请求方法 {method}")
+        else:
+            raise HttpError(404, f"路径 {url.path} 不存在")
+
+    async def _stream_tasks(self, query: Dict[str, str], writer: asyncio.StreamWriter, keep_alive: bool) -> None:
+        """
+        私有方法，以分块传输编码逐块写出满足条件的任务，每行一个任务对象。
+        """
+        keyword = query.get("keyword", "")
+        category = query.get("category", "")
+        min_progress = int(query.get("min_progress", 0))
+        max_progress = int(query.get("max_progress", 100))
+        offset = int(query.get("offset", 0))
+        limit = int(query["limit"]) if "limit" in query else None
+        if category and category not in TASK_CATEGORIES:
+            raise HttpError(400, f"任务类别输入不合法，有效类别为：{', '.join(TASK_CATEGORIES)}")
+        writer.write(_response_head(200, "application/x-ndjson", keep_alive, chunked=True))
+        skipped = sent = 0
+        lines: List[str] = []
+        for task in self.get_snapshot():
+            if limit is not None and sent >= limit:
+                break
+            if category and task.category != category:
+                continue
+            if not min_progress <= task.progress <= max_progress:
+                continue
+            if keyword and keyword not in task.name and keyword not in task.description:
+                continue
+            if skipped < offset:
+                skipped += 1
+                continue
+            lines.append(self._encode(task))
+            sent += 1
+            if len(lines) >= STREAM_CHUNK_SIZE:
+                _write_chunk(writer, lines)
+                lines = []
+                await writer.drain()
+        if lines:
+            _write_chunk(writer, lines)
+        writer.write(b"0\r\n\r\n")
+
+    def _encode(self, task: Task) -> str:
+        """
+        私有方法，获取任务的JSON文本；任务对象不可变，同一任务只序列化一次，任务对象被回收时缓存随之清除。
+        """
+        line = self._lines.get(task)
+        if line is None:
+            line = self._lines[task] = json.dumps(task.to_dict(), ensure_ascii=False)
+        return line
+
+    def _add(self, payload: object) -> List[str]:
+        """
+        私有方法，在写入线程中添加一个或一组任务，一组任务只保存一次。
+        """
+        records = payload if isinstance(payload, list) else [payload]
+        tasks = [Task.from_dict(record) for record in records]
+        if len(tasks) == 1:
+            self.task_manager.add_task(tasks[0])
+        else:
+            self.task_manager.add_tasks(tasks)
+        return [task.task_id for task in tasks]
+
+    def _edit(self, task_id: str, changes: Dict[str, object]) -> Task:
+        """
+        私有方法，在写入线程中按唯一标识修改任务，未提供的字段沿用原值。
+        """
+        index = self._find_index(task_id)
+        record = self.task_manager.tasks[index].to_dict()
+        record.update(changes)
+        record["id"] = task_id
+        self.task_manager.edit_task(index, Task.from_dict(record))
+        return self.task_manager.tasks[index]
+
+    def _delete(self, task_id: str) -> None:
+        """
+        私有方法，在写入线程中按唯一标识删除任务。
+        """
+        self.task_manager.delete_task(self._find_index(task_id))
+
+    def _find_index(self, task_id: str) -> int:
+        """
+        私有方法，在任务列表中查找指定唯一标识的任务位置。
+
+        抛出异常：
+        - HttpError：如果任务不存在，抛出状态码为404的此异常。
+        """
+        for index, task in enumerate(self.task_manager.tasks):
+            if task.task_id == task_id:
+                return index
+        raise HttpError(404, f"任务 {task_id} 不存在")
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes, bool]]:
+    """
+    私有函数，读取一个HTTP请求，连接已关闭时返回None。
+
+    返回：
+    - Optional[Tuple]：(请求方法, 请求目标, 请求头, 请求体, 是否保持连接)。
+
+    抛出异常：
+    - HttpError：如果请求格式不正确或请求体过大，抛出此异常。
+    """
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None
+    try:
+        method, target, version = request_line.decode('latin-1').split()
+    except ValueError:
+        raise HttpError(400, "请求行格式不正确")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode('latin-1').partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0) or 0)
+    if length > MAX_BODY_SIZE:
+        raise HttpError(413, "请求体过大")
+    body = await reader.readexactly(length) if length else b""
+    connection = headers.get("connection", "").lower()
+    keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+    return method.upper(), target, headers, body, keep_alive
+
+
+def _parse_json(body: bytes) -> object:
+    """
+    私有函数，解析JSON请求体。
+
+    抛出异常：
+    - HttpError：如果请求体不是合法的JSON，抛出状态码为400的此异常。
+    """
+    try:
+        return json.loads(body.decode('utf-8'))
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise HttpError(400, f"请求体不是合法的JSON: {str(e)}")
+
+
+def _response_head(status: int, content_type: str, keep_alive: bool, length: Optional[int] = None,
+                   chunked: bool = False) -> bytes:
+    """
+    私有函数，生成响应的状态行和响应头。
+    """
+    lines = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}", f"Content-Type: {content_type}",
+             f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+    if chunked:
+        lines.append("Transfer-Encoding: chunked")
+    else:
+        lines.append(f"Content-Length: {length}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1')
+
+
+def _write_json(writer: asyncio.StreamWriter, status: int, payload: object, keep_alive: bool) -> None:
+    """
+    私有函数，写出一个JSON响应。
+    """
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    writer.write(_response_head(status, "application/json; charset=utf-8", keep_alive, len(body)) + body)
+
+
+def _write_chunk(writer: asyncio.StreamWriter, lines: List[str]) -> None:
+    """
+    私有函数，以分块传输编码写出若干行。
+    """
+    data = ("\n".join(lines) + "\n").encode('utf-8')
+    writer.write(f"{len(data):X}\r\n".encode('latin-1') + data + b"\r\n")
+
+
+async def http_request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, method: str, path: str,
+                       payload: object = None) -> Tuple[int, bytes]:
+    """
+    在已建立的长连接上发送一个请求并读取完整的响应，供负载测试和脚本使用。
+
+    参数：
+    - reader (asyncio.StreamReader)：连接的读取端。
+    - writer (asyncio.StreamWriter)：连接的写入端。
+    - method (str)：请求方法。
+    - path (str)：请求路径，可包含查询参数。
+    - payload (object)：请求体对象，将被序列化为JSON，默认为None即没有请求体。
+
+    返回：
+    - Tuple[int, bytes]：(状态码, 响应体)。
+    """
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8') if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n".encode('utf-8') + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode('latin-1').partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if headers.get("transfer-encoding") == "chunked":
+        chunks = []
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            if size == 0:
+                await reader.readline()
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+        return status, b"".join(chunks)
+    return status, await reader.readexactly(int(headers.get("content-length", 0)))
+
+
+async def _loadtest_client(port: int, requests: int, write_ratio: float, rng: random.Random,
+                           latencies: Dict[str, List[float]]) -> int:
+    """
+    私有函数，一个负载测试客户端：在一条长连接上依次发送读写混合的请求，返回失败的请求数量。
+    """
+    reader, writer = await asyncio.open_connection(DEFAULT_HOST, port)
+    failures = 0
+    try:
+        for index in range(requests):
+            if rng.random() < write_ratio:
+                kind = "add_task"
+                request = ("POST", "/tasks", {"name": f"负载 {index}", "description": "", "progress": rng.randint(0, 100),
+                                              "category": rng.choice(TASK_CATEGORIES)})
+            elif rng.random() < 0.2:
+                kind, request = "stats", ("GET", "/stats", None)
+            else:
+                kind = "query"
+                request = ("GET", f"/tasks?category={quote(rng.choice(TASK_CATEGORIES))}&min_progress={rng.randint(0, 50)}&limit=100", None)
+            start = time.perf_counter()
+            status, _ = await http_request(reader, writer, *request)
+            latencies.setdefault(kind, []).append(time.perf_counter() - start)
+            if status >= 400:
+                failures += 1
+    finally:
+        writer.close()
+    return failures
+
+
+async def run_loadtest(clients: int, requests: int, write_ratio: float, size: int, seed: int = 0) -> Dict[str, object]:
+    """
+    在临时任务文件上启动服务，并以大量并发客户端发送读写混合的请求，测量各类请求的延迟与总吞吐量。
+
+    参数：
+    - clients (int)：并发客户端数量。
+    - requests (int)：每个客户端发送的请求数量。
+    - write_ratio (float)：写请求（添加任务）所占的比例。
+    - size (int)：初始任务数量。
+    - seed (int)：随机数种子，默认为0。
+
+    返回：
+    - Dict[str, object]：包含总请求数、失败数、总耗时、每秒请求数以及各类请求延迟汇总（"latency"）的字典。
+    """
+    from task_benchmark import generate_tasks, summarize
+    from task_logic import TaskManager
+    from task_persistence import TaskPersistence
+    with tempfile.TemporaryDirectory(prefix="eisentodo_server_") as workdir:
+        csv_path = os.path.join(workdir, "tasks.csv")
+        open(csv_path, 'w').close()
+        persistence = TaskPersistence(csv_path)
+        persistence.save_tasks(generate_tasks(size, seed))
+        server = TaskServer(TaskManager(persistence, thread_safe=True))
+        await server.start(port=0)
+        latencies: Dict[str, List[float]] = {}
+        start = time.perf_counter()
+        failures = await asyncio.gather(*(_loadtest_client(server.get_port(), requests, write_ratio,
+                                                           random.Random(seed + client), latencies)
+                                          for client in range(clients)))
+        elapsed = time.perf_counter() - start
+        await server.stop()
+    total = clients * requests
+    return {
+        "clients": clients,
+        "requests": total,
+        "failures": sum(failures),
+        "elapsed_sec": elapsed,
+        "requests_per_sec": total / elapsed if elapsed else 0.0,
+        "latency": {kind: summarize(values, 1, 0) for kind, values in sorted(latencies.items())},
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令行入口。
+
+    返回：
+    - int：进程退出状态。
+    """
+    parser = argparse.ArgumentParser(prog="task_server", description="EisenTodo 本地任务服务")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serve_parser = subparsers.add_parser("serve", help="启动服务")
+    serve_parser.add_argument("--store", default="tasks.csv", help="任务文件路径，默认为 tasks.csv")
+    serve_parser.add_argument("--host", default=DEFAULT_HOST, help="监听地址，默认只接受本机连接")
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="监听端口")
+    serve_parser.add_argument("--unix", help="监听该Unix套接字而不是TCP端口")
+    serve_parser.add_argument("--snapshot", metavar="NAME", help="同时将任务列表发布为该名称的共享内存快照，供只读进程映射查询")
+    loadtest_parser = subparsers.add_parser("loadtest", help="在临时任务文件上进行本地负载测试")
+    loadtest_parser.add_argument("--clients", type=int, default=200, help="并发客户端数量")
+    loadtest_parser.add_argument("--requests", type=int, default=50, help="每个客户端发送的请求数量")
+    loadtest_parser.add_argument("--write-ratio", type=float, default=0.1, help="写请求所占的比例")
+    loadtest_parser.add_argument("--size", type=int, default=10000, help="初始任务数量")
+    loadtest_parser.add_argument("--seed", type=int, default=0, help="随机数种子")
+    args = parser.parse_args(argv)
+
+    if args.command == "loadtest":
+        report = asyncio.run(run_loadtest(args.clients, args.requests, args.write_ratio, args.size, args.seed))
+        print(json.dumps(report, indent=2))
+        return 1 if report["failures"] else 0
+
+    from task_logic import TaskManager
+    from task_persistence import TaskPersistence
+    if not os.path.exists(args.store):
+        open(args.store, 'w').close()
+    from task_sync import attach_tracker
+    task_manager = TaskManager(TaskPersistence(args.store), thread_safe=True)
+    attach_tracker(task_manager)
+    server = TaskServer(task_manager)
+    publisher = None
+    if args.snapshot:
+        from task_snapshot import SnapshotPublisher
+        publisher = SnapshotPublisher(task_manager, args.snapshot)
+
+    async def serve() -> None:
+        await server.start(args.host, args.port, args.unix)
+        print(f"任务服务已启动：{args.unix or f'http://{args.host}:{server.get_port()}'}", file=sys.stderr)
+        await asyncio.Event().wait()
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if publisher is not None:
+            publisher.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
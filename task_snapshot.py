@@ -0,0 +1,550 @@
+"""
+任务列表的共享内存快照：拥有任务文件的进程（如本地任务服务）把任务列表发布为不可变、带版本号的列式快照，
+放在multiprocessing.shared_memory中；报表等只读进程直接映射快照进行按类别、进度和关键字的查询，
+无需各自解析任务文件、各自保存一份任务列表。
+
+共享内存段：
+    <名称>              控制段，记录当前快照的版本号（以序号保护，读取时不会读到写了一半的版本号）
+    <名称>_<版本号>      快照段：头部、元数据（JSON）、进度列、类别列，以及名称、描述、描述引用、截止时间、唯一标识
+                         五个字符串列（每列为偏移数组加UTF-8数据）
+
+每次任务列表保存到文件后，发布者先写好新版本的快照段，再更新控制段中的版本号，读者调用refresh时切换到新版本；
+发布者只保留最近KEEP_VERSIONS个版本，已映射旧版本的读者在切换前仍可继续读取。
+存放在描述文件中的较长描述（见description_store）在快照中只记录其引用，读者按需从描述文件读取。
+
+用法示例：
+    python -m task_snapshot bench --size 100000 --workers 4
+"""
+import argparse
+import bisect
+import json
+import multiprocessing
+import os
+import re
+import struct
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from itertools import accumulate
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, List, Optional, Tuple
+from task_model import Task, TASK_CATEGORIES, format_due_date, format_created_at
+from task_events import TaskListener
+from description_store import DescriptionStore
+from instrumentation import instrumented
+
+# 默认的共享内存名称
+DEFAULT_SNAPSHOT_NAME = "eisentodo_snapshot"
+
+# 发布者保留的快照版本数量，更旧的版本在发布新版本后释放
+KEEP_VERSIONS = 2
+
+# 读者读取版本号或映射快照段失败（发布者恰好在切换版本）时的重试次数
+ATTACH_RETRIES = 100
+
+# 快照段的格式标识，以及控制段的布局（序号、版本号）
+SNAPSHOT_MAGIC = b"EISNAP02"
+_CONTROL = struct.Struct("<QQ")
+
+# 快照中的字符串列，按此顺序存放
+STRING_COLUMNS = ("name", "description", "description_ref", "due_date", "id", "created_at")
+
+# 头部：格式标识、版本号、任务数量，元数据、进度列、类别列的位置，以及每个字符串列的偏移数组位置、数据位置和数据长度
+_HEADER = struct.Struct("<8s" + "Q" * (6 + 3 * len(STRING_COLUMNS)))
+
+_CATEGORY_CODES = {category: code for code, category in enumerate(TASK_CATEGORIES)}
+
+_ATTACH_LOCK = threading.Lock()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    私有函数，映射已有的共享内存段，不登记到资源跟踪器：Python 3.13之前映射已有的段也会被登记，
+    读者进程（或与发布者共用资源跟踪器的子进程）退出时段会被删除或重复注销，共享内存段应只由发布者负责释放。
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13及以上
+    except TypeError:
+        pass
+    with _ATTACH_LOCK:
+        register = resource_tracker.register
+        resource_tracker.register = lambda resource_name, resource_type: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+def _create(name: str, size: int) -> shared_memory.SharedMemory:
+    """
+    私有函数，创建共享内存段；同名的段已存在时（如上次发布者异常退出后遗留的段）先将其删除。
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, create=True, size=size)
+    except FileExistsError:
+        stale = shared_memory.SharedMemory(name=name)
+        stale.close()
+        stale.unlink()
+        return shared_memory.SharedMemory(name=name, create=True, size=size)
+
+
+def _string_column(values: List[str]) -> Tuple[bytes, bytes]:
+    """
+    私有函数，将字符串列编码为偏移数组（uint32，n + 1项）和拼接后的UTF-8数据；全部为ASCII时直接按字符数计算偏移。
+    """
+    data = "".join(values).encode('utf-8')
+    lengths = map(len, values) if len(data) == sum(map(len, values)) else (len(value.encode('utf-8')) for value in values)
+    return array('I', accumulate(lengths, initial=0)).tobytes(), data
+
+
+def _align(position: int) -> int:
+    """
+    私有函数，将位置向上对齐到8字节。
+    """
+    return (position + 7) & ~7
+
+
+class SnapshotPublisher(TaskListener):
+    """
+    SnapshotPublisher类将TaskManager的任务列表发布为共享内存快照：创建时（任务加载完成后）发布第一个版本，
+    此后每次任务列表保存到文件后（TaskManager.on_saved）发布新版本。发布者所在进程退出前应调用close释放共享内存。
+    """
+    def __init__(self, task_manager, name: str = DEFAULT_SNAPSHOT_NAME):
+        """
+        初始化SnapshotPublisher对象，创建控制段并注册为TaskManager的监听者，任务已加载完成时立即发布第一个版本。
+
+        参数：
+        - task_manager：要发布的TaskManager对象。
+        - name (str)：共享内存名称，默认为DEFAULT_SNAPSHOT_NAME。
+
+        抛出异常：
+        - OSError：如果创建共享内存失败，抛出此异常。
+        """
+        self.task_manager = task_manager
+        self.name = name
+        self.version = 0
+        self._control = _create(name, _CONTROL.size)
+        _CONTROL.pack_into(self._control.buf, 0, 0, 0)
+        self._segments: List[shared_memory.SharedMemory] = []
+        self._published_tasks = None
+        task_manager.on_saved = self.publish
+        task_manager.add_listener(self)
+
+    def on_tasks_reset(self, tasks: List[Task]) -> None:
+        if not self.task_manager.loading and tasks is not self._published_tasks:
+            self.publish()
+
+    @instrumented("snapshot.publish")
+    def publish(self) -> int:
+        """
+        将当前任务列表写入新的快照段并切换控制段中的版本号，再释放超出KEEP_VERSIONS的旧版本。
+
+        返回：
+        - int：新快照的版本号。
+
+        抛出异常：
+        - OSError：如果创建共享内存失败，抛出此异常。
+        """
+        tasks = self.task_manager.tasks
+        csv_file_path = os.path.abspath(self.task_manager.persistence.csv_file_path)
+        descriptions = [self._split_description(task.stored_description, csv_file_path) for task in tasks]
+        values = {"name": [task.name for task in tasks],
+                  "description": [description for description, _ in descriptions],
+                  "description_ref": [description_ref for _, description_ref in descriptions],
+                  "due_date": [format_due_date(task.due_date) for task in tasks],
+                  "id": [task.task_id for task in tasks],
+                  "created_at": [format_created_at(task.created_at) for task in tasks]}
+        progress = bytes([task.progress for task in tasks])
+        category = bytes([_CATEGORY_CODES[task.category] for task in tasks])
+        counts = {name: category.count(code) for name, code in _CATEGORY_CODES.items()}
+        meta = json.dumps({"csv_file_path": csv_file_path, "published_at": time.time(), "counts": counts},
+                          ensure_ascii=False).encode('utf-8')
+
+        regions = [meta, progress, category]
+        for column in STRING_COLUMNS:
+            regions.extend(_string_column(values[column]))
+        positions = []
+        position = _HEADER.size
+        for region in regions:
+            position = _align(position)
+            positions.append(position)
+            position += len(region)
+        fields = [positions[0], len(meta), positions[1], positions[2]]
+        for index in range(len(STRING_COLUMNS)):
+            fields.extend((positions[3 + 2 * index], positions[4 + 2 * index], len(regions[4 + 2 * index])))
+
+        version = self.version + 1
+        segment = _create(f"{self.name}_{version}", max(position, 1))
+        _HEADER.pack_into(segment.buf, 0, SNAPSHOT_MAGIC, version, len(tasks), *fields)
+        for region, start in zip(regions, positions):
+            segment.buf[start:start + len(region)] = region
+        self._set_version(version)
+        self._segments.append(segment)
+        while len(self._segments) > KEEP_VERSIONS:
+            old = self._segments.pop(0)
+            old.close()
+            old.unlink()
+        self._published_tasks = tasks
+        return version
+
+    @staticmethod
+    def _split_description(description, csv_file_path: str) -> Tuple[str, str]:
+        """
+        私有方法，得到任务描述在快照描述列和描述引用列中的值：存放在本任务文件的描述文件中的描述只记录引用。
+        """
+        if isinstance(description, str):
+            return description, ""
+        if os.path.abspath(description.store.csv_file_path) == csv_file_path:
+            return "", str(description)
+        return description.load(), ""
+
+    def close(self) -> None:
+        """
+        停止发布并释放全部共享内存段，已映射快照的读者在释放前映射的内容仍可读取直到其关闭。
+        """
+        self.task_manager.remove_listener(self)
+        if self.task_manager.on_saved == self.publish:
+            self.task_manager.on_saved = None
+        for segment in self._segments + [self._control]:
+            segment.close()
+            segment.unlink()
+        self._segments = []
+
+    def _set_version(self, version: int) -> None:
+        """
+        私有方法，更新控制段中的版本号：序号先变为奇数，写入版本号后再变为偶数，读者读到奇数序号或前后序号不一致时重读。
+        """
+        sequence, _ = _CONTROL.unpack_from(self._control.buf)
+        struct.pack_into("<Q", self._control.buf, 0, sequence + 1)
+        struct.pack_into("<Q", self._control.buf, 8, version)
+        struct.pack_into("<Q", self._control.buf, 0, sequence + 2)
+        self.version = version
+
+
+class SnapshotReader:
+    """
+    SnapshotReader类以零拷贝方式映射发布者的共享内存快照并在其上查询：按类别、进度范围和关键字查询返回行号，
+    需要时再用get_task把行转换为Task对象。快照不可变，调用refresh切换到发布者的最新版本，之前得到的行号随之失效。
+    """
+    def __init__(self, name: str = DEFAULT_SNAPSHOT_NAME):
+        """
+        初始化SnapshotReader对象并映射最新版本的快照。
+
+        参数：
+        - name (str)：共享内存名称，默认为DEFAULT_SNAPSHOT_NAME。
+
+        抛出异常：
+        - FileNotFoundError：如果没有正在发布该名称的发布者，抛出此异常。
+        - IOError：如果多次重试后仍无法映射快照，或快照格式不正确，抛出此异常。
+        """
+        self.name = name
+        self.version = 0
+        self.count = 0
+        self.meta: Dict[str, object] = {}
+        self._control = _attach(name)
+        self._segment: Optional[shared_memory.SharedMemory] = None
+        self._views: List[memoryview] = []
+        self._strings: Dict[str, Tuple[memoryview, memoryview]] = {}
+        self._descriptions: Optional[DescriptionStore] = None
+        if not self.refresh():
+            raise IOError(f"共享内存快照 {name} 尚未发布")
+
+    def refresh(self) -> bool:
+        """
+        切换到发布者的最新版本，已是最新版本时不做任何操作。
+
+        返回：
+        - bool：是否切换到了新版本（发布者尚未发布任何版本时为False）。
+
+        抛出异常：
+        - IOError：如果多次重试后仍无法映射快照，或快照格式不正确，抛出此异常。
+        """
+        for _ in range(ATTACH_RETRIES):
+            version = self._read_version()
+            if version == self.version or version == 0:
+                return False
+            try:
+                segment = _attach(f"{self.name}_{version}")
+            except FileNotFoundError:
+                continue  # 发布者恰好释放了该版本，重新读取版本号
+            self._release()
+            self._segment = segment
+            self._map()
+            return True
+        raise IOError(f"映射共享内存快照 {self.name} 失败，请稍后重试")
+
+    def count_by_category(self) -> Dict[str, int]:
+        """
+        获取各类别的任务数量，数量在发布时统计，无需遍历快照。
+
+        返回：
+        - Dict[str, int]：各类别对应的任务数量。
+        """
+        return dict(self.meta["counts"])
+
+    @instrumented("snapshot.query")
+    def query(self, category: Optional[str] = None, min_progress: int = 0, max_progress: int = 100,
+              keyword: str = "") -> List[int]:
+        """
+        查询同时满足各条件的任务行号。类别和进度条件直接在共享内存中的列上以正则表达式扫描；
+        关键字在名称列和描述列中查找，存放在描述文件中的描述按需读取。
+
+        参数：
+        - category (Optional[str])：任务类别，默认为None，即不限类别。
+        - min_progress (int)：最小进度（含），默认为0。
+        - max_progress (int)：最大进度（含），默认为100。
+        - keyword (str)：名称或描述中包含的关键字，默认为空字符串，即不按关键字筛选。
+
+        返回：
+        - List[int]：按任务顺序排列的行号列表。
+
+        抛出异常：
+        - ValueError：如果类别不合法或进度范围不在0到100之间，抛出此异常。
+        """
+        if category is not None and category not in _CATEGORY_CODES:
+            raise ValueError(f"任务类别输入不合法，有效类别为：{', '.join(TASK_CATEGORIES)}")
+        if not 0 <= min_progress <= max_progress <= 100:
+            raise ValueError("进度范围需在0到100之间")
+        rows: Optional[set] = None
+        if category is not None:
+            rows = self._scan(self._category, b"\\x%02x" % _CATEGORY_CODES[category])
+        if (min_progress, max_progress) != (0, 100):
+            matched = self._scan(self._progress, b"[\\x%02x-\\x%02x]" % (min_progress, max_progress))
+            rows = matched if rows is None else rows & matched
+        if keyword:
+            matched = self._search(keyword, rows)
+            rows = matched if rows is None else rows & matched
+        return list(range(self.count)) if rows is None else sorted(rows)
+
+    def get_task(self, row: int) -> Task:
+        """
+        将快照中的一行转换为Task对象，存放在描述文件中的描述在读取时才加载。
+
+        参数：
+        - row (int)：行号。
+
+        返回：
+        - Task：任务对象。
+
+        抛出异常：
+        - IndexError：如果行号超出范围，抛出此异常。
+        """
+        if not 0 <= row < self.count:
+            raise IndexError(f"行号 {row} 超出快照范围")
+        value = {column: self._value(column, row) for column in STRING_COLUMNS}
+        description = value["description"]
+        if value["description_ref"]:
+            description = self._description_store().parse_ref(value["description_ref"])
+        return Task.from_dict({"name": value["name"], "description": description, "progress": self._progress[row],
+                               "category": TASK_CATEGORIES[self._category[row]], "due_date": value["due_date"],
+                               "id": value["id"], "created_at": value["created_at"]})
+
+    def close(self) -> None:
+        """
+        解除对快照和控制段的映射。
+        """
+        self._release()
+        self._control.close()
+
+    def _read_version(self) -> int:
+        """
+        私有方法，读取控制段中的版本号，序号为奇数（发布者正在写入）或前后不一致时重读。
+        """
+        while True:
+            sequence, version = _CONTROL.unpack_from(self._control.buf)
+            if sequence % 2 == 0 and struct.unpack_from("<Q", self._control.buf, 0)[0] == sequence:
+                return version
+
+    def _map(self) -> None:
+        """
+        私有方法，解析快照段的头部，为各列创建指向共享内存的视图。
+        """
+        fields = _HEADER.unpack_from(self._segment.buf)
+        if fields[0] != SNAPSHOT_MAGIC:
+            raise IOError(f"共享内存快照 {self.name} 的格式不正确")
+        self.version, self.count = fields[1], fields[2]
+        meta_position, meta_length, progress_position, category_position = fields[3:7]
+        self.meta = json.loads(bytes(self._segment.buf[meta_position:meta_position + meta_length]))
+        self._progress = self._view(progress_position, self.count)
+        self._category = self._view(category_position, self.count)
+        self._strings = {}
+        for index, column in enumerate(STRING_COLUMNS):
+            offsets_position, data_position, data_length = fields[7 + 3 * index:10 + 3 * index]
+            offsets = self._view(offsets_position, 4 * (self.count + 1)).cast('I')
+            self._views.append(offsets)
+            self._strings[column] = (offsets, self._view(data_position, data_length))
+
+    def _view(self, position: int, length: int) -> memoryview:
+        """
+        私有方法，创建指向快照段中一段区域的视图，视图在切换版本或关闭时统一释放。
+        """
+        view = self._segment.buf[position:position + length]
+        self._views.append(view)
+        return view
+
+    def _release(self) -> None:
+        """
+        私有方法，释放全部视图并解除对当前快照段的映射。
+        """
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._strings = {}
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+
+    def _value(self, column: str, row: int) -> str:
+        """
+        私有方法，读取字符串列中一行的值。
+        """
+        offsets, data = self._strings[column]
+        return str(data[offsets[row]:offsets[row + 1]], 'utf-8')
+
+    def _scan(self, column: memoryview, pattern: bytes) -> set:
+        """
+        私有方法，在单字节列上以正则表达式扫描，返回匹配的行号。
+        """
+        return {match.start() for match in re.finditer(pattern, column)}
+
+    def _search(self, keyword: str, rows: Optional[set]) -> set:
+        """
+        私有方法，在名称列和描述列的拼接数据上查找关键字（允许重叠的匹配），按偏移数组换算为行号，
+        跨越两行边界的匹配被忽略；描述存放在描述文件中的行再逐行读取描述查找，rows不为None时只检查其中的行。
+        """
+        pattern = re.compile(b"(?=" + re.escape(keyword.encode('utf-8')) + b")")
+        length = len(keyword.encode('utf-8'))
+        matched = set()
+        for column in ("name", "description"):
+            offsets, data = self._strings[column]
+            for match in pattern.finditer(data):
+                row = bisect.bisect_right(offsets, match.start()) - 1
+                if match.start() + length <= offsets[row + 1]:
+                    matched.add(row)
+        offsets, data = self._strings["description_ref"]
+        if len(data):
+            store = self._description_store()
+            for row in range(self.count) if rows is None else rows:
+                if row not in matched and offsets[row] != offsets[row + 1]:
+                    if keyword in store.parse_ref(self._value("description_ref", row)).load():
+                        matched.add(row)
+        return matched
+
+    def _description_store(self) -> DescriptionStore:
+        """
+        私有方法，获取快照所对应任务文件的描述存储，第一次使用时创建。
+        """
+        csv_file_path = self.meta["csv_file_path"]
+        if self._descriptions is None or self._descriptions.csv_file_path != csv_file_path:
+            self._descriptions = DescriptionStore(csv_file_path)
+        return self._descriptions
+
+
+def _run_queries(query_tasks) -> Dict[str, int]:
+    """
+    私有函数，基准测试中每个工作进程执行的一组查询：各类别数量、一个类别中未完成的任务、按关键字查找。
+    """
+    return {"counts": sum(query_tasks("counts")), "category": len(query_tasks("category")),
+            "keyword": len(query_tasks("keyword"))}
+
+
+def _bench_worker(mode: str, source: str, results) -> None:
+    """
+    私有函数，基准测试的工作进程：mode为"parse"时各自解析任务文件后在任务列表上查询，为"attach"时映射共享内存快照后查询，
+    将耗时（秒）和查询结果放入results队列。
+    """
+    start = time.perf_counter()
+    if mode == "parse":
+        from task_persistence import TaskPersistence
+        tasks = TaskPersistence(source).load_tasks()
+
+        def query_tasks(kind: str):
+            if kind == "counts":
+                return [sum(1 for task in tasks if task.category == category) for category in TASK_CATEGORIES]
+            if kind == "category":
+                return [task for task in tasks if task.category == TASK_CATEGORIES[0] and task.progress < 100]
+            return [task for task in tasks if "review" in task.name or "review" in task.description]
+    else:
+        reader = SnapshotReader(source)
+
+        def query_tasks(kind: str):
+            if kind == "counts":
+                return list(reader.count_by_category().values())
+            if kind == "category":
+                return reader.query(category=TASK_CATEGORIES[0], max_progress=99)
+            return reader.query(keyword="review")
+    answers = _run_queries(query_tasks)
+    if mode == "attach":
+        reader.close()
+    results.put((mode, time.perf_counter() - start, answers))
+
+
+def run_bench(size: int, workers: int, seed: int = 0) -> Dict[str, object]:
+    """
+    基准测试：在临时任务文件上发布快照，分别让workers个进程各自解析任务文件、或映射快照，执行相同的查询并比较耗时。
+
+    参数：
+    - size (int)：任务数量。
+    - workers (int)：工作进程数量。
+    - seed (int)：生成合成任务的随机数种子，默认为0。
+
+    返回：
+    - Dict[str, object]：发布耗时、快照大小，以及两种方式下各工作进程的耗时和查询结果是否一致。
+    """
+    from task_benchmark import generate_tasks, summarize
+    from task_logic import TaskManager
+    from task_persistence import TaskPersistence
+    with tempfile.TemporaryDirectory(prefix="eisentodo_snapshot_") as workdir:
+        csv_path = os.path.join(workdir, "tasks.csv")
+        open(csv_path, 'w').close()
+        task_manager = TaskManager(TaskPersistence(csv_path))
+        task_manager.replace_tasks(generate_tasks(size, seed))
+        name = f"{DEFAULT_SNAPSHOT_NAME}_bench_{os.getpid()}"
+        start = time.perf_counter()
+        publisher = SnapshotPublisher(task_manager, name)
+        publish_ms = (time.perf_counter() - start) * 1000
+        try:
+            report = {"size": size, "workers": workers, "publish_ms": publish_ms,
+                      "snapshot_bytes": publisher._segments[-1].size}
+            answers = {}
+            for mode, source in (("parse", csv_path), ("attach", name)):
+                results = multiprocessing.Queue()
+                processes = [multiprocessing.Process(target=_bench_worker, args=(mode, source, results))
+                             for _ in range(workers)]
+                for process in processes:
+                    process.start()
+                outcomes = [results.get() for _ in processes]
+                for process in processes:
+                    process.join()
+                report[mode] = summarize([elapsed for _, elapsed, _ in outcomes], 1, 0)
+                answers[mode] = outcomes[0][2]
+            report["answers"] = answers
+            report["consistent"] = answers["parse"] == answers["attach"]
+        finally:
+            publisher.close()
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令行入口。
+
+    返回：
+    - int：进程退出状态。
+    """
+    parser = argparse.ArgumentParser(prog="task_snapshot", description="EisenTodo 共享内存快照")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    bench_parser = subparsers.add_parser("bench", help="比较多个进程各自解析任务文件与映射共享内存快照的耗时")
+    bench_parser.add_argument("--size", type=int, default=100000, help="任务数量")
+    bench_parser.add_argument("--workers", type=int, default=4, help="工作进程数量")
+    bench_parser.add_argument("--seed", type=int, default=0, help="随机数种子")
+    args = parser.parse_args(argv)
+    report = run_bench(args.size, args.workers, args.seed)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return 0 if report["consistent"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
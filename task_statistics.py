@@ -0,0 +1,160 @@
+from typing import Dict, List, Iterable
+from task_model import Task, TASK_CATEGORIES
+from task_events import TaskListener
+
+
+class _CategoryStats:
+    """
+    单个任务类别的统计数据，包含任务数量、进度总和、已完成数量以及0 - 100的进度直方图。
+    """
+    __slots__ = ("count", "progress_sum", "completed", "histogram")
+
+    def __init__(self):
+        self.count = 0
+        self.progress_sum = 0
+        self.completed = 0
+        self.histogram = [0] * 101
+
+    def add(self, progress: int) -> None:
+        self.count += 1
+        self.progress_sum += progress
+        self.histogram[progress] += 1
+        if progress == 100:
+            self.completed += 1
+
+    def remove(self, progress: int) -> None:
+        self.count -= 1
+        self.progress_sum -= progress
+        self.histogram[progress] -= 1
+        if progress == 100:
+            self.completed -= 1
+
+
+class TaskStatistics(TaskListener):
+    """
+    TaskStatistics类以增量方式维护任务列表的统计数据（各象限任务数量、进度总和、进度直方图、完成数量），
+    作为TaskManager的监听者，每次增删改任务时以O(1)的代价更新统计结果，避免每次查询统计信息时遍历全部任务。
+    """
+    def __init__(self, tasks: Iterable[Task] = ()):
+        """
+        初始化TaskStatistics对象，并根据给定的任务集合计算初始统计数据。
+
+        参数：
+        - tasks (Iterable[Task])：初始任务集合，默认为空。
+        """
+        self._stats: Dict[str, _CategoryStats] = {}
+        self.on_tasks_reset(tasks)
+
+    def on_tasks_reset(self, tasks: Iterable[Task]) -> None:
+        self._stats = {category: _CategoryStats() for category in TASK_CATEGORIES}
+        for task in tasks:
+            self._stats[task.category].add(task.progress)
+
+    def on_task_added(self, index: int, task: Task) -> None:
+        self._stats[task.category].add(task.progress)
+
+    def on_task_updated(self, index: int, old_task: Task, new_task: Task) -> None:
+        self._stats[old_task.category].remove(old_task.progress)
+        self._stats[new_task.category].add(new_task.progress)
+
+    def on_task_removed(self, index: int, task: Task) -> None:
+        self._stats[task.category].remove(task.progress)
+
+    def _selected(self, category: str) -> List[_CategoryStats]:
+        """
+        私有方法，根据类别选出参与统计的类别数据，空字符串表示全部类别。
+
+        抛出异常：
+        - ValueError：如果传入的类别不合法，抛出此异常。
+        """
+        if category == "":
+            return list(self._stats.values())
+        if category not in self._stats:
+            raise ValueError(f"任务类别输入不合法，有效类别为：{', '.join(TASK_CATEGORIES)}")
+        return [self._stats[category]]
+
+    def get_count(self, category: str = "") -> int:
+        """
+        获取指定类别（空字符串表示全部类别）的任务数量。
+        """
+        return sum(stats.count for stats in self._selected(category))
+
+    def get_completed_count(self, category: str = "") -> int:
+        """
+        获取指定类别（空字符串表示全部类别）中进度为100的已完成任务数量。
+        """
+        return sum(stats.completed for stats in self._selected(category))
+
+    def get_average_progress(self, category: str = "") -> float:
+        """
+        获取指定类别（空字符串表示全部类别）的平均进度，没有任务时返回0。
+        """
+        selected = self._selected(category)
+        count = sum(stats.count for stats in selected)
+        if count == 0:
+            return 0.0
+        return sum(stats.progress_sum for stats in selected) / count
+
+    def get_completion_rate(self, category: str = "") -> float:
+        """
+        获取指定类别（空字符串表示全部类别）的完成率（0 - 1之间），没有任务时返回0。
+        """
+        count = self.get_count(category)
+        if count == 0:
+            return 0.0
+        return self.get_completed_count(category) / count
+
+    def get_histogram(self, category: str = "", bucket_size: int = 1) -> List[int]:
+        """
+        获取指定类别（空字符串表示全部类别）的进度直方图。
+
+        参数：
+        - category (str)：任务类别，空字符串表示全部类别。
+        - bucket_size (int)：每个桶覆盖的进度宽度，默认为1，即返回0 - 100共101个桶；
+                             例如传入10时，返回[0-9]、[10-19]……[90-99]、[100]共11个桶。
+
+        返回：
+        - List[int]：每个桶内的任务数量。
+        """
+        if bucket_size < 1:
+            raise ValueError("直方图桶宽度需为正整数")
+        buckets = [0] * (100 // bucket_size + 1)
+        for stats in self._selected(category):
+            for progress, count in enumerate(stats.histogram):
+                buckets[progress // bucket_size] += count
+        return buckets
+
+    def to_dict(self) -> Dict[str, Dict[str, object]]:
+        """
+        将统计数据汇总为字典形式，键为各任务类别以及表示全部任务的"全部"。
+
+        返回：
+        - Dict[str, Dict[str, object]]：每个键对应包含count、completed、average_progress、completion_rate的字典。
+        """
+        summary = {}
+        for category in ("",) + tuple(TASK_CATEGORIES):
+            summary[category or "全部"] = {
+                "count": self.get_count(category),
+                "completed": self.get_completed_count(category),
+                "average_progress": self.get_average_progress(category),
+                "completion_rate": self.get_completion_rate(category),
+            }
+        return summary
+
+    def verify(self, tasks: Iterable[Task]) -> bool:
+        """
+        将增量维护的统计数据与对给定任务集合的完整重新计算结果进行比对，用于校验统计数据的准确性。
+
+        参数：
+        - tasks (Iterable[Task])：作为基准的完整任务集合。
+
+        返回：
+        - bool：增量统计与完整重算结果完全一致时返回True，否则返回False。
+        """
+        expected = TaskStatistics(tasks)
+        for category in TASK_CATEGORIES:
+            actual, recomputed = self._stats[category], expected._stats[category]
+            if (actual.count, actual.progress_sum, actual.completed, actual.histogram) != \
+                    (recomputed.count, recomputed.progress_sum, recomputed.completed, recomputed.histogram):
+                return False
+        return True
@@ -0,0 +1,513 @@
+"""
+EisenTodo 离线同步：在两个任务文件（如笔记本和工作站上的任务目录）之间按字段合并修改，只交换自上次同步以来变化的记录。
+
+每个任务文件旁有一个同步状态文件（"<任务文件名>_sync.json"），记录：
+- 本副本的唯一标识与Lamport时钟；
+- 版本向量：已收到的各副本的最大时钟值；
+- 每个任务每个字段最近一次修改的戳记(时钟值, 副本标识)，以及已删除任务的删除戳记；
+- 每个任务每个字段最近一次记录时的内容摘要。
+修改经由挂载了SyncTracker的TaskManager（图形界面、本地任务服务）发生时即时记录戳记；
+未经跟踪的修改（命令行的导入、批量修改、压缩，直接编辑任务文件）在下次挂载跟踪或同步时
+通过与内容摘要比对发现，并为变化的字段补记新的本地戳记；
+同步时双方交换对方版本向量之后的变化，每个字段按冲突策略确定性地合并，删除优先于修改。
+
+用法示例：
+    python -m task_sync laptop_dir workstation_dir
+    python -m task_sync laptop_dir workstation_dir --policy progress=max
+"""
+import argparse
+import atexit
+import bisect
+import hashlib
+import json
+import os
+import sys
+import time
+import uuid
+from typing import Dict, Iterable, List, Optional, Tuple
+from task_model import Task, format_due_date
+from task_events import TaskListener
+
+# 参与同步的任务字段
+SYNC_FIELDS = ("name", "description", "progress", "category", "due_date")
+
+# 支持的字段冲突策略："lww"为戳记较新的修改胜出，"max"为取两侧的较大值（适用于进度）
+MERGE_POLICIES = ("lww", "max")
+
+# 开始记录戳记之前就已存在的字段的戳记，比任何真实戳记都旧
+BASE_STAMP = (0, "")
+
+Stamp = Tuple[int, str]
+
+
+class SyncState:
+    """
+    SyncState类保存一个副本的同步状态，并按来源副本维护按时钟值排序的变更日志，
+    计算发给对方的增量时只需对每个来源副本做一次二分查找，与任务总数无关。
+    """
+    def __init__(self, state_path: str):
+        """
+        初始化SyncState对象，状态文件不存在时创建新的副本标识。
+
+        参数：
+        - state_path (str)：同步状态文件路径。
+        """
+        self.state_path = state_path
+        data = {}
+        if os.path.exists(state_path):
+            try:
+                with open(state_path, 'r', encoding='utf-8') as file:
+                    data = json.load(file)
+            except (IOError, json.JSONDecodeError) as e:
+                print(f"加载同步状态 {state_path} 时出错，将作为新副本同步: {str(e)}")
+        self.replica_id: str = data.get("replica_id") or uuid.uuid4().hex
+        self.clock: int = data.get("clock", 1)  # 从1开始，使对方的版本向量能够记录已与本副本同步过
+        self.vector: Dict[str, int] = data.get("vector", {})
+        self.stamps: Dict[str, Dict[str, Stamp]] = {
+            task_id: {field: tuple(stamp) for field, stamp in fields.items()} for task_id, fields in data.get("stamps", {}).items()}
+        self.tombstones: Dict[str, Stamp] = {task_id: tuple(stamp) for task_id, stamp in data.get("tombstones", {}).items()}
+        self.digests: Optional[Dict[str, Dict[str, str]]] = data.get("digests")  # 为None表示尚未建立比对基线
+        self._log: Dict[str, List[Tuple[int, str]]] = {}
+        for task_id, fields in self.stamps.items():
+            for counter, replica in set(fields.values()):
+                self._log.setdefault(replica, []).append((counter, task_id))
+        for task_id, (counter, replica) in self.tombstones.items():
+            self._log.setdefault(replica, []).append((counter, task_id))
+        for entries in self._log.values():
+            entries.sort()
+
+    @classmethod
+    def for_store(cls, csv_file_path: str) -> 'SyncState':
+        """
+        获取任务文件对应的同步状态，状态文件位于任务文件旁，名为"<任务文件名>_sync.json"。
+        """
+        return cls(os.path.splitext(csv_file_path)[0] + "_sync.json")
+
+    def tick(self) -> Stamp:
+        """
+        推进本副本的时钟并返回一个新的本地戳记。
+        """
+        self.clock += 1
+        return self.clock, self.replica_id
+
+    def get_stamp(self, task_id: str, field: str) -> Stamp:
+        """
+        获取任务字段的戳记，未记录过修改的字段返回BASE_STAMP。
+        """
+        return self.stamps.get(task_id, {}).get(field, BASE_STAMP)
+
+    def set_stamp(self, task_id: str, field: str, stamp: Stamp) -> None:
+        """
+        记录任务字段的戳记并写入变更日志。
+        """
+        self.stamps.setdefault(task_id, {})[field] = stamp
+        self._append_log(stamp, task_id)
+
+    def set_tombstone(self, task_id: str, stamp: Stamp) -> None:
+        """
+        记录任务的删除戳记，并清除该任务的字段戳记。
+        """
+        self.tombstones[task_id] = stamp
+        self.stamps.pop(task_id, None)
+        if self.digests is not None:
+            self.digests.pop(task_id, None)
+        self._append_log(stamp, task_id)
+
+    def record_digests(self, task: Task) -> None:
+        """
+        记录任务各同步字段当前内容的摘要，尚未建立比对基线时不记录。
+        """
+        if self.digests is not None:
+            self.digests[task.task_id] = _field_digests(task)
+
+    def reconcile(self, tasks: Iterable[Task]) -> int:
+        """
+        将当前任务与记录的内容摘要比对，为未经跟踪而变化的字段、新出现的任务和消失的任务补记新的本地戳记，
+        之后以当前任务的摘要作为新的比对基线。首次调用（状态文件中没有摘要）时只建立基线，不记录戳记；
+        已有删除戳记的任务重新出现时仍以删除为准。需要遍历全部任务，只在挂载跟踪、同步前和任务列表整体替换时调用。
+
+        参数：
+        - tasks (Iterable[Task])：本副本的当前任务。
+
+        返回：
+        - int：补记了戳记的任务数量。
+        """
+        current = {task.task_id: _field_digests(task) for task in tasks}
+        if self.digests is None:
+            self.digests = current
+            return 0
+        count = 0
+        for task_id, digests in current.items():
+            if task_id in self.tombstones:
+                continue
+            known = self.digests.get(task_id, {})
+            fields = [field for field in SYNC_FIELDS if known.get(field) != digests[field]]
+            if fields:
+                stamp = self.tick()
+                for field in fields:
+                    self.set_stamp(task_id, field, stamp)
+                count += 1
+        for task_id in [task_id for task_id in self.digests if task_id not in current]:
+            self.set_tombstone(task_id, self.tick())
+            count += 1
+        self.digests = {task_id: digests for task_id, digests in current.items() if task_id not in self.tombstones}
+        return count
+
+    def get_vector(self) -> Dict[str, int]:
+        """
+        获取发给对方的版本向量，其中包含本副本自身的当前时钟值。
+        """
+        vector = dict(self.vector)
+        vector[self.replica_id] = self.clock
+        return vector
+
+    def merge_vector(self, vector: Dict[str, int]) -> None:
+        """
+        合并对方的版本向量，并按Lamport规则推进本副本的时钟。
+        """
+        for replica, counter in vector.items():
+            if replica != self.replica_id and counter > self.vector.get(replica, 0):
+                self.vector[replica] = counter
+        self.clock = max(self.clock, max(vector.values(), default=0))
+
+    def changed_since(self, vector: Dict[str, int]) -> Dict[str, List[str]]:
+        """
+        找出戳记比给定版本向量更新的任务字段和删除。
+
+        参数：
+        - vector (Dict[str, int])：对方的版本向量。
+
+        返回：
+        - Dict[str, List[str]]：任务唯一标识到变化字段列表的映射，已删除的任务对应空列表。
+        """
+        changed: Dict[str, List[str]] = {}
+        for replica, entries in self._log.items():
+            since = vector.get(replica, 0)
+            for counter, task_id in entries[bisect.bisect_right(entries, (since, "\uffff")):]:
+                stamp = (counter, replica)
+                if self.tombstones.get(task_id) == stamp:
+                    changed[task_id] = []
+                    continue
+                fields = [field for field, field_stamp in self.stamps.get(task_id, {}).items() if field_stamp == stamp]
+                if fields and task_id not in self.tombstones:
+                    entry = changed.setdefault(task_id, [])
+                    entry.extend(field for field in fields if field not in entry)
+        return changed
+
+    def save(self) -> None:
+        """
+        以写入临时文件后原子替换的方式保存同步状态。
+
+        抛出异常：
+        - IOError：如果写入状态文件时出现IO错误，抛出此异常并说明具体的IO问题所在。
+        """
+        data = {"replica_id": self.replica_id, "clock": self.clock, "vector": self.vector,
+                "stamps": self.stamps, "tombstones": self.tombstones, "digests": self.digests}
+        temp_path = self.state_path + ".tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                json.dump(data, file)
+            os.replace(temp_path, self.state_path)
+        except IOError as e:
+            raise IOError(f"保存同步状态 {self.state_path} 时出错: {str(e)}")
+
+    def _append_log(self, stamp: Stamp, task_id: str) -> None:
+        """
+        私有方法，按时钟值有序地写入变更日志，本地戳记总是追加在末尾。
+        """
+        counter, replica = stamp
+        entries = self._log.setdefault(replica, [])
+        if entries and entries[-1] == (counter, task_id):
+            return  # 同一次修改涉及多个字段时只记录一次
+        if not entries or entries[-1] < (counter, task_id):
+            entries.append((counter, task_id))
+        else:
+            bisect.insort(entries, (counter, task_id))
+
+
+class SyncTracker(TaskListener):
+    """
+    SyncTracker类作为TaskManager的监听者，在任务被添加、修改或删除时为变化的字段记录新的本地戳记和内容摘要。
+    注册时和on_tasks_reset（加载、恢复备份、保存失败后回滚）经SyncState.reconcile与记录的摘要比对，只为实际变化的字段记录戳记；
+    应用同步结果期间（applying为True）只更新摘要，不记录戳记，由同步过程直接写入对方的戳记。
+    """
+    def __init__(self, state: SyncState):
+        """
+        初始化SyncTracker对象。
+
+        参数：
+        - state (SyncState)：记录戳记的同步状态。
+        """
+        self.state = state
+        self.applying = False
+
+    def on_tasks_reset(self, tasks: List[Task]) -> None:
+        if not self.applying:
+            self.state.reconcile(tasks)
+
+    def on_task_added(self, index: int, task: Task) -> None:
+        self.state.record_digests(task)
+        if self.applying:
+            return
+        stamp = self.state.tick()
+        for field in SYNC_FIELDS:
+            self.state.set_stamp(task.task_id, field, stamp)
+
+    def on_task_updated(self, index: int, old_task: Task, new_task: Task) -> None:
+        self.state.record_digests(new_task)
+        if self.applying:
+            return
+        old_values, new_values = _field_values(old_task), _field_values(new_task)
+        changed = [field for field in SYNC_FIELDS if old_values[field] != new_values[field]]
+        if changed:
+            stamp = self.state.tick()
+            for field in changed:
+                self.state.set_stamp(new_task.task_id, field, stamp)
+
+    def on_task_removed(self, index: int, task: Task) -> None:
+        if not self.applying:
+            self.state.set_tombstone(task.task_id, self.state.tick())
+
+
+def attach_tracker(task_manager) -> SyncTracker:
+    """
+    为TaskManager挂载SyncTracker，同步状态文件位于任务文件旁，进程退出时保存同步状态。
+    注册时为任务文件自上次跟踪以来未经跟踪的修改补记戳记；延迟加载的TaskManager注册时任务尚未加载，在加载完成的on_tasks_reset中补记。
+
+    参数：
+    - task_manager：要跟踪修改的TaskManager对象。
+
+    返回：
+    - SyncTracker：已注册的监听者。
+    """
+    tracker = SyncTracker(SyncState.for_store(task_manager.persistence.csv_file_path))
+    tracker.applying = task_manager.loading
+    try:
+        task_manager.add_listener(tracker)
+    finally:
+        tracker.applying = False
+    atexit.register(tracker.state.save)
+    return tracker
+
+
+def detach_tracker(task_manager, tracker: SyncTracker) -> None:
+    """
+    注销attach_tracker挂载的SyncTracker并立即保存同步状态，用于关闭任务文件之前。
+
+    参数：
+    - task_manager：挂载了tracker的TaskManager对象。
+    - tracker (SyncTracker)：attach_tracker返回的监听者。
+
+    抛出异常：
+    - IOError：与SyncState.save一致。
+    """
+    task_manager.remove_listener(tracker)
+    atexit.unregister(tracker.state.save)
+    tracker.state.save()
+
+
+def _field_values(task: Task) -> Dict[str, object]:
+    """
+    私有函数，获取任务各同步字段的可序列化值，截止时间以字符串表示。
+    """
+    return {"name": task.name, "description": task.description, "progress": task.progress,
+            "category": task.category, "due_date": format_due_date(task.due_date)}
+
+
+def _field_digests(task: Task) -> Dict[str, str]:
+    """
+    私有函数，计算任务各同步字段当前值的摘要，用于发现未经跟踪的修改。
+    """
+    return {field: hashlib.blake2b(json.dumps(value, ensure_ascii=False).encode('utf-8'), digest_size=8).hexdigest()
+            for field, value in _field_values(task).items()}
+
+
+def collect_delta(tasks: Iterable[Task], state: SyncState, peer_vector: Dict[str, int]) -> Dict[str, object]:
+    """
+    收集发给对方的增量：对方从未与本副本同步过时，发送全部任务（开始记录戳记前的字段使用BASE_STAMP）；
+    否则只发送戳记比对方版本向量更新的字段和删除。只有存在变化字段时才遍历一次任务列表以读取当前值。
+
+    参数：
+    - tasks (Iterable[Task])：本副本的当前任务。
+    - state (SyncState)：本副本的同步状态。
+    - peer_vector (Dict[str, int])：对方的版本向量。
+
+    返回：
+    - Dict[str, object]：可序列化为JSON的增量，包含"vector"和"tasks"（任务唯一标识到{"fields": {字段: [值, 时钟值, 副本标识]}}
+                         或{"deleted": [时钟值, 副本标识]}的映射）。
+    """
+    full = peer_vector.get(state.replica_id, 0) == 0
+    changed = state.changed_since(peer_vector)
+    records: Dict[str, Dict[str, object]] = {}
+    for task_id, fields in changed.items():
+        if not fields:
+            records[task_id] = {"deleted": list(state.tombstones[task_id])}
+    if full or any(changed.values()):
+        for task in tasks:
+            fields = SYNC_FIELDS if full else changed.get(task.task_id)
+            if not fields:
+                continue
+            values = _field_values(task)
+            records[task.task_id] = {"fields": {field: [values[field], *state.get_stamp(task.task_id, field)] for field in fields}}
+    return {"vector": state.get_vector(), "tasks": records}
+
+
+def _wins(policy: str, local_value: object, local_stamp: Stamp, value: object, stamp: Stamp) -> Tuple[object, Stamp]:
+    """
+    私有函数，按冲突策略合并一个字段，返回合并后的值与戳记；两侧以相同的输入得到相同的结果。
+    戳记相同（如双方开始记录前的初始值不同）时按值的字符串比较决定，保证结果确定。
+    """
+    if policy == "max":
+        return max(local_value, value), max(local_stamp, stamp)
+    if (stamp, str(value)) > (local_stamp, str(local_value)):
+        return value, stamp
+    return local_value, local_stamp
+
+
+def apply_delta(task_manager, tracker: SyncTracker, delta: Dict[str, object],
+                policies: Optional[Dict[str, str]] = None) -> Dict[str, int]:
+    """
+    将对方的增量合并到本副本：删除优先；存在的任务逐字段按策略合并，不存在的任务在字段完整时新建。
+    所有修改在TaskManager.deferred_save中进行，只保存一次。合并结果与对方发来的值不同（如"max"策略保留了本地的较大值）时
+    以新的本地戳记记录，使该值在下一次交换中传回对方。
+
+    参数：
+    - task_manager：本副本的TaskManager对象，需已挂载tracker。
+    - tracker (SyncTracker)：本副本的SyncTracker。
+    - delta (Dict[str, object])：对方collect_delta的结果。
+    - policies (Optional[Dict[str, str]])：字段到冲突策略的映射，未指定的字段使用"lww"。
+
+    返回：
+    - Dict[str, int]：包含"added"、"updated"、"deleted"数量的字典。
+    """
+    policies = policies or {}
+    state = tracker.state
+    state.clock = max(state.clock, max(delta["vector"].values(), default=0))  # 之后产生的本地戳记晚于对方已有的全部戳记
+    records: Dict[str, Dict[str, object]] = delta["tasks"]
+    wanted = {task_id for task_id in records if task_id not in state.tombstones}
+    positions = {task.task_id: index for index, task in enumerate(task_manager.tasks) if task.task_id in wanted} if wanted else {}
+    report = {"added": 0, "updated": 0, "deleted": 0}
+    updates: Dict[int, Task] = {}
+    deletions: List[int] = []
+    additions: List[Task] = []
+    for task_id, record in records.items():
+        if task_id in state.tombstones:
+            continue
+        if "deleted" in record:
+            state.set_tombstone(task_id, tuple(record["deleted"]))
+            if task_id in positions:
+                deletions.append(positions[task_id])
+            continue
+        index = positions.get(task_id)
+        local_values = _field_values(task_manager.tasks[index]) if index is not None else {}
+        changes = {}
+        for field, (value, counter, replica) in record["fields"].items():
+            stamp = (counter, replica)
+            if field not in local_values:
+                merged_value, merged_stamp = value, stamp
+            else:
+                merged_value, merged_stamp = _wins(policies.get(field, "lww"), local_values[field], state.get_stamp(task_id, field),
+                                                   value, stamp)
+            if merged_value != value and merged_stamp == stamp:
+                merged_stamp = state.tick()
+            if merged_stamp != state.get_stamp(task_id, field):
+                state.set_stamp(task_id, field, merged_stamp)
+            if field not in local_values or merged_value != local_values[field]:
+                changes[field] = merged_value
+        if index is not None:
+            if changes:
+                updates[index] = Task.from_dict({**local_values, **changes, "id": task_id})
+        elif all(field in changes for field in SYNC_FIELDS):
+            additions.append(Task.from_dict({**changes, "id": task_id}))
+    tracker.applying = True
+    try:
+        with task_manager.deferred_save():
+            for index, task in updates.items():
+                task_manager.edit_task(index, task)
+            for index in sorted(deletions, reverse=True):
+                task_manager.delete_task(index)
+            if additions:
+                task_manager.add_tasks(additions)
+    finally:
+        tracker.applying = False
+    state.merge_vector(delta["vector"])
+    report["added"], report["updated"], report["deleted"] = len(additions), len(updates), len(deletions)
+    return report
+
+
+def sync_stores(manager_a, tracker_a: SyncTracker, manager_b, tracker_b: SyncTracker,
+                policies: Optional[Dict[str, str]] = None) -> Dict[str, Dict[str, int]]:
+    """
+    在两个副本之间双向同步：先将A的增量合并到B，再将B的增量（包含B刚合并产生的新戳记）合并到A；
+    若A在合并时产生了新的本地戳记（冲突策略保留了A的值），再将其传给B一次，同步结束后两侧一致。
+
+    返回：
+    - Dict[str, Dict[str, int]]：键为"a"和"b"，值为各自apply_delta的统计。
+    """
+    report_b = apply_delta(manager_b, tracker_b, collect_delta(manager_a.tasks, tracker_a.state,
+                                                               tracker_b.state.get_vector()), policies)
+    clock_a = tracker_a.state.clock
+    report_a = apply_delta(manager_a, tracker_a, collect_delta(manager_b.tasks, tracker_b.state, tracker_a.state.get_vector()),
+                           policies)
+    if tracker_a.state.changed_since({tracker_a.state.replica_id: clock_a}):
+        extra = apply_delta(manager_b, tracker_b, collect_delta(manager_a.tasks, tracker_a.state, tracker_b.state.get_vector()),
+                            policies)
+        report_b = {key: report_b[key] + extra[key] for key in report_b}
+    return {"a": report_a, "b": report_b}
+
+
+def _open_replica(directory: str, store_name: str):
+    """
+    私有函数，打开目录中的任务文件并挂载SyncTracker，任务文件不存在时创建空文件；
+    注册时为上次同步以来未经跟踪的修改补记戳记。
+    """
+    from task_logic import TaskManager
+    from task_persistence import TaskPersistence
+    csv_path = os.path.join(directory, store_name)
+    if not os.path.exists(csv_path):
+        open(csv_path, 'w').close()
+    manager = TaskManager(TaskPersistence(csv_path))
+    tracker = SyncTracker(SyncState.for_store(csv_path))
+    manager.add_listener(tracker)
+    return manager, tracker
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令行入口：同步两个目录中的任务文件。
+
+    返回：
+    - int：进程退出状态。
+    """
+    parser = argparse.ArgumentParser(prog="task_sync", description="在两个目录的任务文件之间离线同步")
+    parser.add_argument("dir_a", help="第一个任务目录")
+    parser.add_argument("dir_b", help="第二个任务目录")
+    parser.add_argument("--store-name", default="tasks.csv", help="目录中的任务文件名，默认为 tasks.csv")
+    parser.add_argument("--policy", action="append", default=[], help="字段冲突策略，如 progress=max，可重复指定")
+    args = parser.parse_args(argv)
+    policies = {}
+    for item in args.policy:
+        field, _, policy = item.partition("=")
+        if field not in SYNC_FIELDS or policy not in MERGE_POLICIES:
+            parser.error(f"无效的冲突策略 {item}，字段可选 {', '.join(SYNC_FIELDS)}，策略可选 {', '.join(MERGE_POLICIES)}")
+        policies[field] = policy
+
+    try:
+        manager_a, tracker_a = _open_replica(args.dir_a, args.store_name)
+        manager_b, tracker_b = _open_replica(args.dir_b, args.store_name)
+        with manager_a.deferred_save(), manager_b.deferred_save():
+            start = time.perf_counter()
+            report = sync_stores(manager_a, tracker_a, manager_b, tracker_b, policies)
+            merged = time.perf_counter()
+        saved = time.perf_counter()
+        tracker_a.state.save()
+        tracker_b.state.save()
+    except (ValueError, IOError) as e:
+        print(f"错误: {str(e)}", file=sys.stderr)
+        return 1
+    print(json.dumps({**report, "sync_ms": (merged - start) * 1000, "save_ms": (saved - merged) * 1000}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
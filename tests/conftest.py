@@ -0,0 +1,7 @@
+"""
+测试的公共配置：将仓库根目录加入模块搜索路径，使测试可以直接导入各个模块。
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""
+DescriptionStore的测试：多个描述存储交替追加同一描述文件时偏移正确，压缩时保存失败不会改动任务持有的描述引用。
+"""
+import pytest
+import task_persistence
+from description_store import DescriptionStore, DescriptionRef
+from task_model import Task
+from task_persistence import TaskPersistence
+
+
+def test_interleaved_appends_from_two_stores(tmp_path):
+    path = str(tmp_path / "tasks.csv")
+    first, second = DescriptionStore(path), DescriptionStore(path)
+    texts = ["甲" * 100, "乙" * 200, "丙" * 300]
+    refs = [store.store(text)[1] for store, text in zip([first, second, first], texts)]
+    first.end_save(False)
+    second.end_save(False)
+    reader = DescriptionStore(path)
+    assert [reader.load(reader.parse_ref(ref)) for ref in refs] == texts
+
+
+def test_failed_compacting_save_keeps_refs(tmp_path, monkeypatch):
+    path = str(tmp_path / "tasks.csv")
+    open(path, "w").close()
+    texts = [f"任务描述 {i} " * 20 for i in range(3)]
+    TaskPersistence(path, "never").save_tasks([Task(f"任务 {i}", text, 0, "紧急重要") for i, text in enumerate(texts)])
+    store = TaskPersistence(path, "never")
+    tasks = store.load_tasks()
+    refs = [task.stored_description for task in tasks]
+    assert all(isinstance(ref, DescriptionRef) for ref in refs)
+    positions = [str(ref) for ref in refs]
+    store.descriptions._compacting = True
+
+    def fail(source, destination):
+        raise IOError("磁盘已满")
+    monkeypatch.setattr(task_persistence.os, "replace", fail)
+    with pytest.raises(IOError):
+        store.save_tasks(tasks)
+    monkeypatch.undo()
+    assert [str(ref) for ref in refs] == positions
+    assert [task.description for task in tasks] == texts
+
+    store.save_tasks(tasks)
+    assert all(ref.generation > 1 for ref in refs)
+    assert [task.description for task in tasks] == texts
+    assert [task.description for task in TaskPersistence(path, "never").load_tasks()] == texts
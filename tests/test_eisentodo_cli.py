@@ -0,0 +1,51 @@
+"""
+命令行工具compact子命令的测试：已完成任务只在任务文件重写成功后才写入归档。
+"""
+import os
+from task_model import Task
+from task_persistence import TaskPersistence
+from task_archive import TaskArchive
+import eisentodo_cli
+
+
+def make_store(tmp_path):
+    path = str(tmp_path / "tasks.csv")
+    open(path, "w").close()
+    TaskPersistence(path, "never").save_tasks([Task("写报告", "", 100, "紧急重要"), Task("开会", "", 30, "重要不紧急"),
+                                               Task("回邮件", "", 100, "紧急不重要")])
+    return path, str(tmp_path / "archive.jsonl.gz")
+
+
+def test_compact_archives_completed_tasks(tmp_path):
+    store, archive = make_store(tmp_path)
+    assert eisentodo_cli.main(["--store", store, "compact", "--archive-completed", "--archive", archive]) == 0
+    assert [task.name for task in TaskPersistence(store, "never").load_tasks()] == ["开会"]
+    assert sorted(task.name for _, task in TaskArchive(archive).iter_tasks()) == ["写报告", "回邮件"]
+    assert not os.path.exists(store + eisentodo_cli.ARCHIVE_PENDING_SUFFIX)
+
+
+def test_failed_rewrite_leaves_archive_untouched(tmp_path, monkeypatch):
+    store, archive = make_store(tmp_path)
+
+    def fail(self, tasks):
+        for _ in tasks:
+            pass
+        raise IOError("磁盘已满")
+    monkeypatch.setattr(TaskPersistence, "rewrite_tasks", fail)
+    assert eisentodo_cli.main(["--store", store, "compact", "--archive-completed", "--archive", archive]) == 1
+    monkeypatch.undo()
+    assert len(TaskPersistence(store, "never").load_tasks()) == 3
+    assert TaskArchive(archive).get_count() == 0
+    assert not os.path.exists(store + eisentodo_cli.ARCHIVE_PENDING_SUFFIX)
+
+
+def test_pending_tasks_from_interrupted_compact_are_archived(tmp_path, monkeypatch):
+    store, archive = make_store(tmp_path)
+    monkeypatch.setattr(eisentodo_cli, "_archive_pending", lambda archive, path: 0)  # 任务文件已重写，写入归档前中断
+    eisentodo_cli.main(["--store", store, "compact", "--archive-completed", "--archive", archive])
+    monkeypatch.undo()
+    assert [task.name for task in TaskPersistence(store, "never").load_tasks()] == ["开会"]
+    assert os.path.exists(store + eisentodo_cli.ARCHIVE_PENDING_SUFFIX)
+    assert eisentodo_cli.main(["--store", store, "compact", "--archive-completed", "--archive", archive]) == 0
+    assert sorted(task.name for _, task in TaskArchive(archive).iter_tasks()) == ["写报告", "回邮件"]
+    assert not os.path.exists(store + eisentodo_cli.ARCHIVE_PENDING_SUFFIX)
@@ -0,0 +1,17 @@
+"""
+FuzzySearchIndex的测试：附加的筛选条件在取前k个之前应用。
+"""
+from task_model import Task
+from fuzzy_search import FuzzySearchIndex
+
+
+def test_predicate_applies_before_top_k():
+    tasks = [Task(f"季度报告 {i}", "", 100 if i < 30 else 50, "紧急重要") for i in range(40)]
+    index = FuzzySearchIndex()
+    index.on_tasks_reset(tasks)
+    hits = index.search("季度报告", k=10, predicate=lambda task: task.progress == 50)
+    assert len(hits) == 10
+    assert all(task.progress == 50 for task, _ in hits)
+    partial = index.search("季度报高", k=20, min_score=0.5, predicate=lambda task: task.progress == 50)
+    assert len(partial) == 10
+    assert all(task.progress == 50 and 0.5 <= score < 1 for task, score in partial)
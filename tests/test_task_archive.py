@@ -0,0 +1,73 @@
+"""
+TaskArchive的测试：写入中断留下的残缺gzip成员不影响之后追加的记录，归档与任务列表在保存失败或中断后不会丢失或重复任务。
+"""
+import gzip
+import pytest
+from task_model import Task
+from task_persistence import TaskPersistence
+from task_logic import TaskManager
+from task_archive import TaskArchive
+
+
+def make_manager(tmp_path, progresses):
+    path = tmp_path / "tasks.csv"
+    path.write_text("")
+    manager = TaskManager(TaskPersistence(str(path), "never"), TaskArchive(str(tmp_path / "archive.jsonl.gz")))
+    manager.add_tasks([Task(f"任务 {i}", "", progress, "紧急重要") for i, progress in enumerate(progresses)])
+    return manager
+
+
+def archived_names(archive):
+    return sorted(task.name for _, task in archive.iter_tasks())
+
+
+def test_append_after_torn_member_is_readable(tmp_path):
+    path = str(tmp_path / "archive.jsonl.gz")
+    TaskArchive(path).append([Task("甲", "", 100, "紧急重要")])
+    torn = gzip.compress(("x" * 1000 + "\n").encode())
+    with open(path, "ab") as file:
+        file.write(torn[:len(torn) // 2])
+    archive = TaskArchive(path)
+    archive.append([Task("乙", "", 100, "紧急重要")])
+    assert archived_names(TaskArchive(path)) == ["乙", "甲"]
+
+
+def test_failed_save_undoes_archive(tmp_path, monkeypatch):
+    manager = make_manager(tmp_path, [100, 50, 100])
+
+    def fail(tasks):
+        raise IOError("磁盘已满")
+    monkeypatch.setattr(manager.persistence, "save_tasks", fail)
+    with pytest.raises(IOError):
+        manager.archive_completed()
+    monkeypatch.undo()
+    assert len(manager.tasks) == 3
+    assert manager.archive.get_count() == 0
+    assert archived_names(manager.archive) == []
+    assert manager.archive_completed() == 2
+    assert archived_names(manager.archive) == ["任务 0", "任务 2"]
+
+
+def test_archive_again_after_interrupted_archive_does_not_duplicate(tmp_path):
+    manager = make_manager(tmp_path, [100, 50, 100])
+    manager.archive.append([task for task in manager.tasks if task.progress == 100])  # 保存任务列表前中断
+    assert manager.archive_completed() == 2
+    assert [task.name for task in manager.tasks] == ["任务 1"]
+    assert manager.archive.get_count() == 2
+    assert archived_names(manager.archive) == ["任务 0", "任务 2"]
+
+
+def test_restore_again_after_interrupted_restore_does_not_duplicate(tmp_path, monkeypatch):
+    manager = make_manager(tmp_path, [100])
+    manager.archive_completed()
+    archive_id = next(manager.archive.iter_tasks())[0]
+
+    def fail(archive_id, task):
+        raise IOError("磁盘已满")
+    monkeypatch.setattr(manager.archive, "mark_restored", fail)
+    with pytest.raises(IOError):
+        manager.restore_archived(archive_id)
+    monkeypatch.undo()
+    manager.restore_archived(archive_id)
+    assert [task.name for task in manager.tasks] == ["任务 0"]
+    assert manager.archive.get_count() == 0
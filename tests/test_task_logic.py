@@ -0,0 +1,83 @@
+"""
+TaskManager的测试：增量维护的统计数据和各索引在增删改、整体替换以及保存失败之后都与任务列表一致。
+"""
+import pytest
+from task_model import Task, TASK_CATEGORIES
+from task_persistence import TaskPersistence
+from task_logic import TaskManager
+
+
+def make_manager(tmp_path, count=0):
+    path = tmp_path / "tasks.csv"
+    path.write_text("")
+    manager = TaskManager(TaskPersistence(str(path), "never"))
+    if count:
+        manager.add_tasks([Task(f"任务 {i}", "", i * 10 % 101, TASK_CATEGORIES[i % 4]) for i in range(count)])
+    return manager
+
+
+def assert_consistent(manager):
+    assert manager.statistics.verify(manager.tasks)
+    for category in TASK_CATEGORIES:
+        assert manager.get_tasks_by_category(category) == [task for task in manager.tasks if task.category == category]
+    assert [task.task_id for task in manager.persistence.load_tasks()] == [task.task_id for task in manager.tasks]
+
+
+def test_statistics_match_recount_after_each_change(tmp_path):
+    manager = make_manager(tmp_path)
+    manager.add_task(Task("写报告", "", 30, "紧急重要"))
+    assert_consistent(manager)
+    manager.add_tasks([Task("开会", "", 100, "重要不紧急"), Task("回邮件", "", 0, "紧急不重要")])
+    assert_consistent(manager)
+    manager.edit_task(0, Task("写报告", "", 100, "不紧急不重要"))
+    assert_consistent(manager)
+    manager.delete_task(1)
+    assert_consistent(manager)
+    manager.replace_tasks([Task("新任务", "", 50, "紧急重要")])
+    assert_consistent(manager)
+    manager.replace_tasks([])
+    assert_consistent(manager)
+
+
+@pytest.mark.parametrize("operation", [
+    lambda manager: manager.add_task(Task("新任务", "", 10, "紧急重要")),
+    lambda manager: manager.add_tasks([Task("新任务", "", 10, "紧急重要")] * 2),
+    lambda manager: manager.edit_task(1, Task("改名", "", 100, "不紧急不重要")),
+    lambda manager: manager.delete_task(2),
+    lambda manager: manager.replace_tasks([]),
+])
+def test_failed_save_leaves_tasks_and_indexes_unchanged(tmp_path, monkeypatch, operation):
+    manager = make_manager(tmp_path, 4)
+    before = list(manager.tasks)
+
+    def fail(tasks):
+        raise IOError("磁盘已满")
+    monkeypatch.setattr(manager.persistence, "save_tasks", fail)
+    with pytest.raises(IOError):
+        operation(manager)
+    assert manager.tasks == before
+    monkeypatch.undo()
+    assert_consistent(manager)
+    manager.delete_task(2)
+    assert_consistent(manager)
+
+def test_failed_deferred_save_undoes_whole_block(tmp_path, monkeypatch):
+    manager = make_manager(tmp_path, 4)
+    before = list(manager.tasks)
+    snapshot = manager.snapshot()
+    version = manager.version
+
+    def fail(tasks):
+        raise IOError("磁盘已满")
+    monkeypatch.setattr(manager.persistence, "save_tasks", fail)
+    with pytest.raises(IOError):
+        with manager.deferred_save():
+            manager.add_task(Task("新任务", "", 10, "紧急重要"))
+            manager.edit_task(0, Task("改名", "", 100, "不紧急不重要"))
+            manager.delete_task(1)
+    assert manager.tasks == before
+    assert manager.version == version
+    assert manager.snapshot() is snapshot
+    monkeypatch.undo()
+    assert_consistent(manager)
+    assert "新任务" not in [task.name for task, _ in manager.fuzzy_search("新任务")]
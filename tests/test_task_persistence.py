@@ -0,0 +1,104 @@
+"""
+TaskPersistence的测试：保存过程（写临时文件、追加预写日志记录、替换原文件）在每一步出错或中断后，
+recover都能把任务文件恢复为最近一次完整保存的内容，并返回所采取的恢复操作。
+"""
+import os
+import pytest
+from task_model import Task
+import task_persistence
+from task_persistence import TaskPersistence
+
+OLD_TASKS = [Task("写报告", "", 30, "紧急重要"), Task("开会", "", 100, "重要不紧急")]
+NEW_TASKS = [Task("回邮件", "", 0, "紧急不重要")]
+
+
+def make_store(tmp_path):
+    path = str(tmp_path / "tasks.csv")
+    open(path, "w").close()
+    store = TaskPersistence(path, "always")
+    store.save_tasks(OLD_TASKS)
+    return store
+
+
+def names(store):
+    return [task.name for task in store.load_tasks()]
+
+
+def write_temp(store):
+    return store._write_temp(NEW_TASKS, True)[1]
+
+
+def append_record(store):
+    store._append_record(write_temp(store), True)
+
+
+def replace(store):
+    append_record(store)
+    os.replace(store.temp_path, store.csv_file_path)
+
+
+def tear_record(store):
+    with open(store.wal_path, "ab") as file:
+        file.write(task_persistence._format_record(write_temp(store))[:10])
+
+
+@pytest.mark.parametrize("crash, actions, expected", [
+    (write_temp, ["删除了中断时未写完的临时文件"], OLD_TASKS),
+    (tear_record, ["丢弃了预写日志末尾不完整的记录", "删除了中断时未写完的临时文件"], OLD_TASKS),
+    (append_record, ["补做了中断前已写完的保存"], NEW_TASKS),
+    (replace, [], NEW_TASKS),
+])
+def test_recover_after_crash_at_each_step(tmp_path, crash, actions, expected):
+    store = make_store(tmp_path)
+    crash(store)  # 进程在这一步之后终止，没有执行清理
+    reopened = TaskPersistence(store.csv_file_path, "always")
+    assert reopened.recovery_actions == actions
+    assert names(reopened) == [task.name for task in expected]
+    assert not os.path.exists(store.temp_path)
+    assert TaskPersistence(store.csv_file_path, "always").recovery_actions == []
+
+
+def fail_after_writing_temp(store, monkeypatch):
+    original = store._write_temp
+
+    def fail(tasks, sync):
+        original(tasks, sync)
+        raise IOError("磁盘已满")
+    monkeypatch.setattr(store, "_write_temp", fail)
+
+
+def fail_appending_record(store, monkeypatch):
+    def fail(record, sync):
+        raise IOError("磁盘已满")
+    monkeypatch.setattr(store, "_append_record", fail)
+
+
+def fail_replacing(store, monkeypatch):
+    def fail(source, destination):
+        raise IOError("磁盘已满")
+    monkeypatch.setattr(task_persistence.os, "replace", fail)
+
+
+@pytest.mark.parametrize("inject", [fail_after_writing_temp, fail_appending_record, fail_replacing])
+def test_failed_save_keeps_previous_tasks(tmp_path, monkeypatch, inject):
+    store = make_store(tmp_path)
+    inject(store, monkeypatch)
+    with pytest.raises(IOError):
+        store.save_tasks(NEW_TASKS)
+    monkeypatch.undo()
+    assert not os.path.exists(store.temp_path)
+    reopened = TaskPersistence(store.csv_file_path, "always")
+    assert reopened.recovery_actions == []
+    assert names(reopened) == [task.name for task in OLD_TASKS]
+    reopened.save_tasks(NEW_TASKS)
+    assert names(TaskPersistence(store.csv_file_path, "always")) == [task.name for task in NEW_TASKS]
+
+
+def test_torn_task_file_is_salvaged(tmp_path):
+    store = make_store(tmp_path)
+    with open(store.csv_file_path, "ab") as file:
+        file.write("半行,".encode("utf-8"))
+    reopened = TaskPersistence(store.csv_file_path, "always")
+    assert reopened.recovery_actions == [f"任务文件已损坏，原文件保存为{store.csv_file_path}.corrupt，保留了其中完整的行"]
+    assert names(reopened) == [task.name for task in OLD_TASKS]
+    assert os.path.exists(store.csv_file_path + ".corrupt")
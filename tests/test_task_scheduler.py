@@ -0,0 +1,51 @@
+"""
+NextActionScheduler的测试：任务存在时长按持久化的创建时间计算，打分权重从配置服务读取。
+"""
+from datetime import datetime, timedelta
+from config_store import ConfigStore
+from task_model import Task
+from task_persistence import TaskPersistence
+from task_logic import TaskManager
+from task_scheduler import NextActionScheduler, load_weights, save_weights, DEFAULT_AGE_WEIGHT, DEFAULT_QUADRANT_WEIGHTS
+
+
+def test_created_at_survives_save_load_and_edit(tmp_path):
+    path = tmp_path / "tasks.csv"
+    path.write_text("")
+    created_at = datetime(2024, 1, 2, 3, 4, 5)
+    manager = TaskManager(TaskPersistence(str(path), "never"))
+    manager.add_task(Task("写报告", "", 30, "紧急重要", created_at=created_at))
+    manager.edit_task(0, Task("写周报", "", 60, "紧急重要"))
+    assert manager.tasks[0].created_at == created_at
+    assert TaskPersistence(str(path), "never").load_tasks()[0].created_at == created_at
+
+
+def test_files_without_created_at_column_still_load(tmp_path):
+    path = tmp_path / "tasks.csv"
+    path.write_text("name,description,progress,category,due_date,id\n写报告,,30,紧急重要,,abc\n", encoding="utf-8")
+    task = TaskPersistence(str(path), "never").load_tasks()[0]
+    assert task.task_id == "abc"
+    assert datetime.now() - task.created_at < timedelta(minutes=1)
+
+
+def test_older_tasks_rank_first_with_default_weights():
+    now = datetime(2024, 6, 1)
+    scheduler = NextActionScheduler(clock=now.timestamp)
+    fresh = Task("新任务", "", 0, "重要不紧急", created_at=now)
+    stale = Task("旧任务", "", 0, "重要不紧急", created_at=now - timedelta(days=30))
+    scheduler.on_tasks_reset([fresh, stale])
+    assert scheduler.next_tasks(2) == [stale, fresh]
+    assert scheduler.score(stale) - scheduler.score(fresh) == DEFAULT_AGE_WEIGHT * 30
+
+
+def test_weights_round_trip_through_config(tmp_path):
+    config = ConfigStore(str(tmp_path / "config.json"))
+    assert load_weights(config)["age_weight"] == DEFAULT_AGE_WEIGHT
+    save_weights(config, {"紧急重要": 500}, 2.0, 0.5)
+    weights = load_weights(config)
+    assert weights == {"quadrant_weights": dict(DEFAULT_QUADRANT_WEIGHTS, 紧急重要=500.0), "remaining_weight": 2.0,
+                       "age_weight": 0.5}
+    config.set("next_action_weights", {"remaining_weight": "多", "age_weight": True})
+    assert load_weights(config)["remaining_weight"] == 1.0
+    assert load_weights(config)["age_weight"] == DEFAULT_AGE_WEIGHT
+    config.flush()
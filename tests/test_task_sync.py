@@ -0,0 +1,76 @@
+"""
+离线同步的测试：未经SyncTracker跟踪的修改（命令行批量修改、导入、恢复备份）也会在同步时传给对方。
+"""
+import os
+from task_model import Task
+from task_persistence import TaskPersistence
+from task_logic import TaskManager
+import eisentodo_cli
+import task_sync
+
+
+def make_replicas(tmp_path):
+    dir_a, dir_b = tmp_path / "a", tmp_path / "b"
+    dir_a.mkdir()
+    dir_b.mkdir()
+    store_a = str(dir_a / "tasks.csv")
+    open(store_a, "w").close()
+    TaskPersistence(store_a, "never").save_tasks([Task("写报告", "", 0, "紧急重要"), Task("开会", "", 30, "重要不紧急")])
+    assert task_sync.main([str(dir_a), str(dir_b)]) == 0
+    return store_a, str(dir_b / "tasks.csv")
+
+
+def load(store):
+    return {task.name: task for task in TaskPersistence(store, "never").load_tasks()}
+
+
+def synced_values(store):
+    return sorted((task.task_id, sorted(task_sync._field_values(task).items())) for task in load(store).values())
+
+
+def test_cli_bulk_update_is_synced(tmp_path):
+    store_a, store_b = make_replicas(tmp_path)
+    assert load(store_b)["开会"].progress == 30
+    assert eisentodo_cli.main(["--store", store_a, "bulk-update", "--keyword", "开会", "--set-progress", "50"]) == 0
+    assert task_sync.main([str(tmp_path / "a"), str(tmp_path / "b")]) == 0
+    assert load(store_b)["开会"].progress == 50
+    assert load(store_b)["写报告"].progress == 0
+
+
+def test_untracked_edit_does_not_override_newer_tracked_edit(tmp_path):
+    store_a, store_b = make_replicas(tmp_path)
+    eisentodo_cli.main(["--store", store_a, "bulk-update", "--keyword", "开会", "--set-progress", "50"])
+    manager_b = TaskManager(TaskPersistence(store_b, "never"))
+    tracker_b = task_sync.attach_tracker(manager_b)
+    index = next(i for i, task in enumerate(manager_b.tasks) if task.name == "写报告")
+    manager_b.edit_task(index, Task.from_dict({**manager_b.tasks[index].to_dict(), "description": "周五前"}))
+    task_sync.detach_tracker(manager_b, tracker_b)
+    assert task_sync.main([str(tmp_path / "a"), str(tmp_path / "b")]) == 0
+    assert synced_values(store_a) == synced_values(store_b)
+    assert load(store_a)["开会"].progress == 50
+    assert load(store_a)["写报告"].description == "周五前"
+
+
+def test_restored_backup_is_synced_as_changes(tmp_path):
+    store_a, store_b = make_replicas(tmp_path)
+    backup = str(tmp_path / "backup.csv")
+    open(backup, "w").close()
+    TaskPersistence(backup, "never").save_tasks([Task("写周报", "", 10, "紧急重要")])
+    manager_a = TaskManager(TaskPersistence(store_a, "never"))
+    tracker_a = task_sync.attach_tracker(manager_a)
+    manager_a.restore_tasks(backup)
+    task_sync.detach_tracker(manager_a, tracker_a)
+    assert task_sync.main([str(tmp_path / "a"), str(tmp_path / "b")]) == 0
+    assert set(load(store_b)) == {"写周报"}
+    assert os.path.exists(os.path.splitext(store_b)[0] + "_sync.json")
+
+
+def test_lazy_load_does_not_delete_tasks(tmp_path):
+    store_a, store_b = make_replicas(tmp_path)
+    manager_a = TaskManager(TaskPersistence(store_a, "never"), lazy=True)
+    tracker_a = task_sync.attach_tracker(manager_a)
+    for _ in manager_a.load_tasks_in_batches(1):
+        pass
+    task_sync.detach_tracker(manager_a, tracker_a)
+    assert task_sync.main([str(tmp_path / "a"), str(tmp_path / "b")]) == 0
+    assert set(load(store_b)) == {"写报告", "开会"}
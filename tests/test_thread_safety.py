@@ -0,0 +1,77 @@
+"""
+线程安全模式的测试：读锁内的查询不修改共享的堆和索引，并发查询的结果与单线程重新计算的结果一致。
+"""
+import sys
+import threading
+from datetime import datetime, timedelta
+import pytest
+from task_model import Task, TASK_CATEGORIES
+from task_persistence import TaskPersistence
+from task_logic import TaskManager
+from fuzzy_search import FuzzySearchIndex
+from task_benchmark import run_stress_test
+
+
+@pytest.fixture
+def frequent_switches():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # 频繁切换线程，使读写交错尽可能多地出现
+    yield
+    sys.setswitchinterval(interval)
+
+
+def make_manager(tmp_path, count=200):
+    path = tmp_path / "tasks.csv"
+    path.write_text("")
+    manager = TaskManager(TaskPersistence(str(path), "never"), thread_safe=True)
+    due = datetime.now() + timedelta(days=1)
+    manager.add_tasks([Task(f"任务 {i} 报告", "", i * 7 % 100, TASK_CATEGORIES[i % 4], due + timedelta(hours=i))
+                       for i in range(count)])
+    return manager
+
+
+def test_stress_queries_match_single_threaded_reference(frequent_switches):
+    result = run_stress_test(8, 100, 300, fsync_policy="never")
+    assert result["failures"] == []
+    assert result["failed_operations"] == 0
+
+
+def test_queries_do_not_modify_heaps_or_index(tmp_path):
+    manager = make_manager(tmp_path)
+    for index in range(0, 200, 3):
+        manager.edit_task(index, manager.tasks[index].replace(progress=50))  # 留下失效的堆条目
+    manager.fuzzy_search("报告")
+    before = (list(manager.scheduler._heap), list(manager.reminders._heap),
+              {gram: set(slots) for gram, slots in manager.search_index._postings.items()})
+    manager.next_tasks(20)
+    manager.next_reminder_deadline()
+    manager.fuzzy_search("任务报告", 5)
+    assert (list(manager.scheduler._heap), list(manager.reminders._heap),
+            {gram: set(slots) for gram, slots in manager.search_index._postings.items()}) == before
+
+
+def test_first_fuzzy_search_from_many_threads(tmp_path, frequent_switches):
+    manager = make_manager(tmp_path)
+    reference = FuzzySearchIndex()
+    reference.on_tasks_reset(list(manager.tasks))
+    expected = [(task.task_id, score) for task, score in reference.search("任务 1 报告", 10)]
+    barrier = threading.Barrier(8)
+    results = []
+
+    def search():
+        barrier.wait()
+        results.append([(task.task_id, score) for task, score in manager.fuzzy_search("任务 1 报告", 10)])
+    threads = [threading.Thread(target=search) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [expected] * 8
+
+
+def test_index_stays_built_after_replacing_tasks(tmp_path):
+    manager = make_manager(tmp_path)
+    manager.fuzzy_search("报告")
+    manager.replace_tasks([Task("新的周报", "", 0, "紧急重要")])
+    assert manager.search_index.built
+    assert [task.name for task, _ in manager.fuzzy_search("周报")] == ["新的周报"]
@@ -1,12 +1,10 @@
-import json
+from typing import Callable, Dict, List
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.popup import Popup
 from kivy.uix.button import Button
 from kivy.uix.textinput import TextInput
 from kivy.uix.label import Label
-from kivy.animation import Animation
-from kivy.properties import ListProperty
-from EisenTodo.animation_effects import show_success_animation, show_error_animation
+from config_store import CONFIG_PATH, config_store  # 配置文件路径及共用的配置服务，CONFIG_PATH由本模块转导出
 
 # 定义全局的颜色主题字典，方便统一管理界面的颜色风格
 COLOR_THEME = {
@@ -24,9 +22,52 @@ COLOR_THEME = {
     "not_important_not_urgent": [0.5, 0.5, 0.5, 1],
 }
 
-# 配置文件路径，用于存储一些应用相关的配置信息，如上次使用的备份路径等
-CONFIG_PATH = "config.json"
-config_data = {}
+# 配置服务中保存颜色主题修改的配置项名称，值为颜色键到RGBA列表的字典
+THEME_CONFIG_KEY = "color_theme"
+
+# 颜色主题变化时依次调用的回调函数，参数为更新后的COLOR_THEME，如任务行渲染器据此重新编译模板并清空缓存
+_theme_listeners: List[Callable[[Dict[str, List[float]]], None]] = []
+
+def add_theme_listener(listener: Callable[[Dict[str, List[float]]], None]) -> None:
+    """
+    注册颜色主题变化的回调函数。
+
+    参数：
+    - listener：颜色主题变化后调用的函数，参数为更新后的COLOR_THEME。
+    """
+    _theme_listeners.append(listener)
+
+def set_color_theme(changes: Dict[str, List[float]], save: bool = True) -> None:
+    """
+    修改颜色主题中的部分颜色，并通知已注册的回调函数，使按旧主题生成的缓存（如任务行的标记文本）失效。
+
+    参数：
+    - changes (Dict[str, List[float]])：要修改的颜色，键需为COLOR_THEME中已有的颜色键。
+    - save (bool)：是否将修改保存到配置服务中，默认为True；从配置中加载主题时为False。
+
+    抛出异常：
+    - ValueError：如果包含COLOR_THEME中不存在的颜色键，抛出此异常。
+    """
+    unknown = set(changes) - set(COLOR_THEME)
+    if unknown:
+        raise ValueError(f"未知的颜色键: {'、'.join(sorted(unknown))}")
+    COLOR_THEME.update({key: list(color) for key, color in changes.items()})
+    if save:
+        config_store.set(THEME_CONFIG_KEY, dict(config_store.get(THEME_CONFIG_KEY) or {}, **changes))
+    for listener in _theme_listeners:
+        listener(COLOR_THEME)
+
+def load_color_theme() -> None:
+    """
+    从配置服务中加载保存的颜色主题修改，配置中没有修改或修改不合法时保持默认主题。
+    """
+    saved = config_store.get(THEME_CONFIG_KEY)
+    if not saved:
+        return
+    try:
+        set_color_theme(saved, save=False)
+    except (ValueError, TypeError, AttributeError) as e:
+        print(f"加载颜色主题时出错，将使用默认主题: {str(e)}")
 
 def apply_color_theme(widget) -> None:
     """
@@ -52,23 +93,17 @@ def apply_color_theme(widget) -> None:
 
 def save_last_path(key: str, value: str) -> None:
     """
-    保存最后使用的路径到配置文件中。
+    保存最后使用的路径到共用的配置服务中，配置文件由配置服务延迟写入。
 
     参数：
     - key (str)：配置项的键。
     - value (str)：配置项的值。
     """
-    global config_data
-    config_data[key] = value
-    try:
-        with open(CONFIG_PATH, 'w') as file:
-            json.dump(config_data, file)
-    except IOError as e:
-        print(f"保存配置文件 {CONFIG_PATH} 时出错: {str(e)}")
+    config_store.set(key, value)
 
 def show_success_message(message: str) -> None:
     """
-    显示操作成功的提示消息，并应用动画效果。
+    显示操作成功的提示消息，并通过动画调度器应用动画效果。
 
     参数：
     - message (str)：要显示的提示消息。
@@ -76,12 +111,14 @@ def show_success_message(message: str) -> None:
     popup = Popup(title='提示', content=Label(text=message, color=COLOR_THEME["success_color"]),
                   size_hint=(0.4, 0.3), background_color=COLOR_THEME["popup_bg_color"])
     apply_color_theme(popup.content)
-    show_success_animation(popup.content)
+    from animation_effects import show_success_animation
+    from animation_scheduler import animation_scheduler
+    animation_scheduler.schedule(popup.content, show_success_animation)
     popup.open()
 
 def show_error_message(message: str) -> None:
     """
-    显示操作失败的提示消息，并应用动画效果。
+    显示操作失败的提示消息，并通过动画调度器应用动画效果。
 
     参数：
     - message (str)：要显示的提示消息。
@@ -89,5 +126,7 @@ def show_error_message(message: str) -> None:
     popup = Popup(title='提示', content=Label(text=message, color=COLOR_THEME["error_color"]),
                   size_hint=(0.4, 0.3), background_color=COLOR_THEME["popup_bg_color"])
     apply_color_theme(popup.content)
-    show_error_animation(popup.content)
+    from animation_effects import show_error_animation
+    from animation_scheduler import animation_scheduler
+    animation_scheduler.schedule(popup.content, show_error_animation)
     popup.open()
\ No newline at end of file
@@ -0,0 +1,280 @@
+"""
+工作区：每个工作区是一个独立的任务文件，由各自的TaskManager管理。工作区注册表记录工作区名称到任务文件路径的映射和当前工作区；
+WorkspaceStores在第一次访问某个工作区时才加载其任务，并以LRU方式最多同时保持MAX_OPEN_WORKSPACES个工作区打开，
+被换出的工作区先刷盘并保存同步状态再释放。跨工作区搜索逐个以流式方式读取未打开的任务文件，不会同时加载所有工作区。
+"""
+import json
+import os
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Tuple
+from task_model import Task
+from task_persistence import TaskPersistence
+from task_logic import TaskManager
+from task_sync import SyncTracker, attach_tracker, detach_tracker
+from file_path_utils import create_directory_for_path
+
+# 工作区注册表文件路径
+REGISTRY_PATH = "workspaces.json"
+
+# 默认工作区的名称和任务文件，沿用原来的tasks.csv
+DEFAULT_WORKSPACE = "默认"
+DEFAULT_WORKSPACE_PATH = "tasks.csv"
+
+# 新建工作区的任务文件所在的目录
+WORKSPACE_DIR = "workspaces"
+
+# 同时保持打开的工作区数量上限
+MAX_OPEN_WORKSPACES = 4
+
+
+class WorkspaceRegistry:
+    """
+    WorkspaceRegistry类维护工作区注册表：工作区名称到任务文件路径的映射（按创建顺序）以及当前工作区，
+    注册表以JSON格式保存，每次修改后以写入临时文件再原子替换的方式保存。
+    """
+    def __init__(self, registry_path: str = REGISTRY_PATH):
+        """
+        初始化WorkspaceRegistry对象并读取注册表，注册表不存在或无法解析时只包含默认工作区。
+
+        参数：
+        - registry_path (str)：注册表文件路径，默认为REGISTRY_PATH。
+        """
+        self.registry_path = registry_path
+        self._workspaces: Dict[str, str] = {DEFAULT_WORKSPACE: DEFAULT_WORKSPACE_PATH}
+        self._current = DEFAULT_WORKSPACE
+        if os.path.exists(registry_path):
+            try:
+                with open(registry_path, 'r', encoding='utf-8') as file:
+                    data = json.load(file)
+                self._workspaces = dict(data["workspaces"])
+                if data.get("current") in self._workspaces:
+                    self._current = data["current"]
+            except (IOError, ValueError, KeyError, TypeError) as e:
+                print(f"加载工作区注册表 {registry_path} 时出错，将只使用默认工作区: {str(e)}")
+
+    @property
+    def current(self) -> str:
+        """
+        当前工作区的名称。
+        """
+        return self._current
+
+    def list_workspaces(self) -> List[str]:
+        """
+        获取全部工作区的名称，按创建顺序排列。
+
+        返回：
+        - List[str]：工作区名称列表。
+        """
+        return list(self._workspaces)
+
+    def get_path(self, name: str) -> str:
+        """
+        获取工作区的任务文件路径。
+
+        参数：
+        - name (str)：工作区名称。
+
+        返回：
+        - str：任务文件路径。
+
+        抛出异常：
+        - ValueError：如果工作区不存在，抛出此异常。
+        """
+        if name not in self._workspaces:
+            raise ValueError(f"工作区 {name} 不存在")
+        return self._workspaces[name]
+
+    def add_workspace(self, name: str, path: Optional[str] = None) -> str:
+        """
+        创建一个工作区，任务文件不存在时创建空的任务文件。
+
+        参数：
+        - name (str)：工作区名称，不能为空，也不能包含路径分隔符。
+        - path (Optional[str])：任务文件路径，默认为WORKSPACE_DIR目录下以工作区名称命名的CSV文件。
+
+        返回：
+        - str：新工作区的任务文件路径。
+
+        抛出异常：
+        - ValueError：如果名称为空、包含路径分隔符或已存在，抛出此异常。
+        - IOError：如果创建任务文件或保存注册表时出现IO错误，抛出此异常并说明具体的IO问题所在。
+        """
+        name = name.strip()
+        if not name or "/" in name or "\\" in name:
+            raise ValueError("工作区名称不能为空，也不能包含路径分隔符")
+        if name in self._workspaces:
+            raise ValueError(f"工作区 {name} 已存在")
+        path = path or os.path.join(WORKSPACE_DIR, name + ".csv")
+        if not os.path.exists(path):
+            create_directory_for_path(path)
+            try:
+                open(path, 'w').close()
+            except IOError as e:
+                raise IOError(f"创建任务文件 {path} 时出错: {str(e)}")
+        self._workspaces[name] = path
+        self._save()
+        return path
+
+    def remove_workspace(self, name: str) -> None:
+        """
+        从注册表中移除工作区，任务文件本身保留在磁盘上。
+
+        参数：
+        - name (str)：工作区名称。
+
+        抛出异常：
+        - ValueError：如果工作区不存在或是当前工作区，抛出此异常。
+        - IOError：如果保存注册表时出现IO错误，抛出此异常。
+        """
+        self.get_path(name)
+        if name == self._current:
+            raise ValueError("不能移除当前工作区")
+        del self._workspaces[name]
+        self._save()
+
+    def set_current(self, name: str) -> None:
+        """
+        设置当前工作区并保存注册表，下次启动时打开该工作区。
+
+        参数：
+        - name (str)：工作区名称。
+
+        抛出异常：
+        - ValueError：如果工作区不存在，抛出此异常。
+        - IOError：如果保存注册表时出现IO错误，抛出此异常。
+        """
+        self.get_path(name)
+        if name != self._current:
+            self._current = name
+            self._save()
+
+    def _save(self) -> None:
+        """
+        私有方法，以写入临时文件后原子替换的方式保存注册表。
+        """
+        temp_path = self.registry_path + ".tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                json.dump({"workspaces": self._workspaces, "current": self._current}, file, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.registry_path)
+        except IOError as e:
+            raise IOError(f"保存工作区注册表 {self.registry_path} 时出错: {str(e)}")
+
+
+class WorkspaceStores:
+    """
+    WorkspaceStores类按需打开工作区的TaskManager，并以LRU方式限制同时打开的工作区数量。
+    每个打开的TaskManager都挂载了SyncTracker；被换出或关闭时先将任务文件刷盘、保存同步状态，再释放TaskManager。
+    pinned中的工作区（如界面正在显示的工作区）不会被换出。
+    """
+    def __init__(self, registry: WorkspaceRegistry, capacity: int = MAX_OPEN_WORKSPACES, thread_safe: bool = False):
+        """
+        初始化WorkspaceStores对象，不打开任何工作区。
+
+        参数：
+        - registry (WorkspaceRegistry)：工作区注册表。
+        - capacity (int)：同时打开的工作区数量上限，默认为MAX_OPEN_WORKSPACES。
+        - thread_safe (bool)：是否以线程安全模式打开工作区的TaskManager，默认为False。
+
+        抛出异常：
+        - ValueError：如果capacity不是正整数，抛出此异常。
+        """
+        if capacity <= 0:
+            raise ValueError("同时打开的工作区数量上限需为正整数")
+        self.registry = registry
+        self.capacity = capacity
+        self.thread_safe = thread_safe
+        self.pinned = set()
+        self._open: "OrderedDict[str, Tuple[TaskManager, SyncTracker]]" = OrderedDict()
+
+    def get(self, name: str, lazy: bool = False) -> TaskManager:
+        """
+        获取工作区的TaskManager，尚未打开时打开该工作区，必要时换出最久未使用的工作区。
+
+        参数：
+        - name (str)：工作区名称。
+        - lazy (bool)：新打开工作区时是否延迟加载任务（见TaskManager），已打开的工作区不受影响，默认为False。
+
+        返回：
+        - TaskManager：该工作区的TaskManager。
+
+        抛出异常：
+        - ValueError：如果工作区不存在，抛出此异常。
+        - FileNotFoundError、csv.Error、ValueError、IOError：与TaskPersistence和TaskManager的初始化一致。
+        """
+        if name in self._open:
+            self._open.move_to_end(name)
+            return self._open[name][0]
+        task_manager = TaskManager(TaskPersistence(self.registry.get_path(name)), lazy=lazy, thread_safe=self.thread_safe)
+        self._open[name] = (task_manager, attach_tracker(task_manager))
+        self._evict()
+        return task_manager
+
+    def is_open(self, name: str) -> bool:
+        """
+        判断工作区当前是否已打开。
+        """
+        return name in self._open
+
+    def open_workspaces(self) -> List[str]:
+        """
+        获取已打开的工作区名称，按最近使用的先后排列（最近使用的在最后）。
+        """
+        return list(self._open)
+
+    def close(self, name: str) -> None:
+        """
+        关闭工作区：任务文件刷盘并保存同步状态后释放其TaskManager，未打开的工作区会被忽略。
+
+        参数：
+        - name (str)：工作区名称。
+
+        抛出异常：
+        - IOError：如果刷盘或保存同步状态时出现IO错误，抛出此异常。
+        """
+        if name not in self._open:
+            return
+        task_manager, tracker = self._open.pop(name)
+        task_manager.persistence.flush()
+        detach_tracker(task_manager, tracker)
+
+    def close_all(self) -> None:
+        """
+        关闭全部已打开的工作区，用于应用退出时。
+        """
+        for name in list(self._open):
+            self.close(name)
+
+    def search(self, keyword: str) -> Iterator[Tuple[str, Task]]:
+        """
+        在全部工作区中查找名称或描述包含关键字的任务。已打开且加载完成的工作区直接查找内存中的任务，
+        其余工作区以流式方式逐条读取任务文件，不会被打开或加入LRU，任意时刻内存中最多只多出一个任务。
+
+        参数：
+        - keyword (str)：关键字。
+
+        返回：
+        - Iterator[Tuple[str, Task]]：依次产生(工作区名称, 任务对象)的迭代器，按工作区的创建顺序排列。
+
+        抛出异常：
+        - csv.Error、ValueError、IOError：读取任务文件出错时抛出，与TaskPersistence.iter_tasks一致。
+        """
+        for name in self.registry.list_workspaces():
+            if name in self._open and not self._open[name][0].loading:
+                tasks = self._open[name][0].snapshot()
+            else:
+                tasks = TaskPersistence(self.registry.get_path(name)).iter_tasks()
+            for task in tasks:
+                if keyword in task.name or keyword in task.description:
+                    yield name, task
+
+    def _evict(self) -> None:
+        """
+        私有方法，打开的工作区超过上限时，从最久未使用的开始关闭未被固定的工作区，刚打开的工作区不会被换出。
+        """
+        for name in list(self._open)[:-1]:
+            if len(self._open) <= self.capacity:
+                return
+            if name not in self.pinned:
+                self.close(name)